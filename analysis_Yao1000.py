@@ -5,33 +5,24 @@ Analysis script for Yao et al. 2022 network simulation results
 Compares simulation output with published data
 
 Usage:
-    python analysis_Yao1000.py Yao1000.pkl
+    python analysis_Yao1000.py Yao1000.results
+    python analysis_Yao1000.py Yao1000_data.pkl       # Converted once to Yao1000_data.results
 """
 
-import pickle
 import numpy as np
 import matplotlib.pyplot as plt
 import sys
 import os
 
-###############################################################################
-# TARGET FIRING RATES (from Yao et al. 2022)
-###############################################################################
-
-# Published firing rates from in vivo recordings
-TARGET_RATES = {
-    'HL23PYR': 1.5,   # Hz (pyramidal neurons, sparse firing)
-    'HL23SST': 5.0,   # Hz (SST interneurons, moderate activity)
-    'HL23PV': 10.0,   # Hz (PV interneurons, high frequency)
-    'HL23VIP': 8.0,   # Hz (VIP interneurons, moderate-high)
-}
+from results_Yao1000 import openResults
+from spikestats_Yao1000 import SpikeIndex, TARGET_RATES
 
 ###############################################################################
 # LOAD SIMULATION DATA
 ###############################################################################
 
 if len(sys.argv) < 2:
-    print("Usage: python analysis_Yao1000.py <simulation_file.pkl>")
+    print("Usage: python analysis_Yao1000.py <simulation.results | simulation_file.pkl>")
     sys.exit(1)
 
 sim_file = sys.argv[1]
@@ -44,53 +35,40 @@ print("=" * 80)
 print(f"Loading simulation data from: {sim_file}")
 print("=" * 80)
 
-with open(sim_file, 'rb') as f:
-    data = pickle.load(f)
+store = openResults(sim_file)
+pops = store.pops
 
-# Extract spike data
-spkt = np.array(data['simData']['spkt'])
-spkid = np.array(data['simData']['spkid'])
+# Analysis window (exclude initial 500ms transient)
+tstart = 500  # ms
+tstop = store.duration or 4500
+duration_s = (tstop - tstart) / 1000.0
 
-# Extract population information
-net = data['net']
-pops = net['pops']
+# The store is gid-sorted (CSR): all statistics come from the index, no per-gid masks
+index = SpikeIndex.fromStore(store)
+cellCounts = index.counts(tstart, tstop)
+popGids = {pop_name: np.asarray(pop_data['cellGids'], dtype=int) for pop_name, pop_data in pops.items()}
 
-print(f"\nLoaded {len(spkt)} spikes from {len(spkid)} unique cells")
+print(f"\nLoaded {store.numSpikes} spikes from {np.count_nonzero(store.counts())} unique cells")
 
 ###############################################################################
 # CALCULATE FIRING RATES
 ###############################################################################
 
-# Analysis window (exclude initial 500ms transient)
-tstart = 500  # ms
-tstop = max(spkt) if len(spkt) > 0 else 4500
-duration_s = (tstop - tstart) / 1000.0
-
 print(f"\nAnalysis window: {tstart} - {tstop} ms ({duration_s:.2f} s)")
 print("-" * 80)
 
 # Calculate firing rates per population
 results = {}
+popRates = index.popRates(popGids, tstart, tstop) if duration_s > 0 else {}
+meanIsi, isiCv = index.isiStats(tstart, tstop)
 
-for pop_name, pop_data in pops.items():
-    cell_gids = pop_data['cellGids']
-
-    # Count spikes in analysis window for this population
-    mask = np.isin(spkid, cell_gids) & (spkt >= tstart) & (spkt <= tstop)
-    spikes_in_window = np.sum(mask)
-
+for pop_name, cell_gids in popGids.items():
+    spikes_in_window = int(cellCounts[cell_gids].sum())
     num_cells = len(cell_gids)
-    if num_cells > 0 and duration_s > 0:
-        avg_rate = spikes_in_window / (num_cells * duration_s)
-    else:
-        avg_rate = 0.0
+    avg_rate, cell_rates = popRates.get(pop_name, (0.0, np.zeros(num_cells)))
 
     # Calculate per-cell statistics
-    rates_per_cell = []
-    for gid in cell_gids:
-        cell_spikes = np.sum((spkid == gid) & (spkt >= tstart) & (spkt <= tstop))
-        cell_rate = cell_spikes / duration_s
-        rates_per_cell.append(cell_rate)
+    rates_per_cell = list(cell_rates)
 
     results[pop_name] = {
         'avg_rate': avg_rate,
@@ -100,6 +78,7 @@ for pop_name, pop_data in pops.items():
         'num_cells': num_cells,
         'total_spikes': spikes_in_window,
         'rates_per_cell': rates_per_cell,
+        'isi_cv': float(np.nanmean(isiCv[cell_gids])) if np.isfinite(isiCv[cell_gids]).any() else np.nan,
     }
 
 ###############################################################################
@@ -108,7 +87,7 @@ for pop_name, pop_data in pops.items():
 
 print("\nFiring Rate Analysis:")
 print("=" * 80)
-print(f"{'Population':<15} {'Avg Rate':<12} {'Target':<12} {'Δ (%)':<12} {'Range':<20}")
+print(f"{'Population':<15} {'Avg Rate':<12} {'Target':<12} {'Δ (%)':<12} {'Range':<20} {'ISI CV':<8}")
 print("-" * 80)
 
 for pop_name in sorted(results.keys()):
@@ -125,7 +104,7 @@ for pop_name in sorted(results.keys()):
     range_str = f"{res['min_rate']:.2f} - {res['max_rate']:.2f} Hz"
 
     print(f"{pop_name:<15} {res['avg_rate']:>6.2f} Hz    {str(target):>6s} Hz    "
-          f"{delta_str:>8s}    {range_str:<20}")
+          f"{delta_str:>8s}    {range_str:<20} {res['isi_cv']:>6.2f}")
 
 print("=" * 80)
 
@@ -139,13 +118,8 @@ fig.suptitle('Yao et al. 2022 Network Simulation Analysis', fontsize=16, fontwei
 # 1. Raster plot
 ax = axes[0, 0]
 for pop_name in sorted(results.keys()):
-    pop_data = pops[pop_name]
-    cell_gids = pop_data['cellGids']
-
     # Get spikes for this population
-    mask = np.isin(spkid, cell_gids) & (spkt >= tstart)
-    pop_spkt = spkt[mask]
-    pop_spkid = spkid[mask]
+    pop_spkt, pop_spkid = index.spikes(popGids[pop_name], tstart, tstop)
 
     ax.scatter(pop_spkt, pop_spkid, s=1, alpha=0.5, label=pop_name)
 
@@ -179,7 +153,9 @@ ax.grid(axis='y', alpha=0.3)
 # 3. Firing rate distribution (box plot)
 ax = axes[1, 0]
 rate_distributions = [results[pop]['rates_per_cell'] for pop in pop_names]
-bp = ax.boxplot(rate_distributions, labels=pop_names, patch_artist=True)
+bp = ax.boxplot(rate_distributions, patch_artist=True)
+ax.set_xticks(np.arange(1, len(pop_names) + 1))
+ax.set_xticklabels(pop_names)  # boxplot's labels= was renamed tick_labels= in matplotlib 3.9
 
 # Color boxes
 colors = ['steelblue', 'coral', 'mediumseagreen', 'orchid']
@@ -196,17 +172,10 @@ plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
 # 4. Population spike histogram
 ax = axes[1, 1]
 bin_size = 50  # ms
-bins = np.arange(tstart, tstop, bin_size)
-
-for pop_name in sorted(results.keys()):
-    pop_data = pops[pop_name]
-    cell_gids = pop_data['cellGids']
-
-    # Get spikes for this population
-    mask = np.isin(spkid, cell_gids) & (spkt >= tstart) & (spkt <= tstop)
-    pop_spkt = spkt[mask]
+bins, pop_hist = index.histogram(bin_size, tstart, tstop, {pop: popGids[pop] for pop in pop_names})
 
-    hist, _ = np.histogram(pop_spkt, bins=bins)
+for pop_name, hist in zip(pop_names, pop_hist):
+    cell_gids = popGids[pop_name]
     hist_rate = hist / (len(cell_gids) * (bin_size / 1000.0))  # Convert to Hz
 
     ax.plot(bins[:-1], hist_rate, label=pop_name, alpha=0.7, linewidth=2)
@@ -220,7 +189,8 @@ ax.grid(alpha=0.3)
 plt.tight_layout()
 
 # Save figure
-output_file = sim_file.replace('.pkl', '_analysis.png')
+output_base = os.path.splitext(sim_file.rstrip('/'))[0]
+output_file = output_base + '_analysis.png'
 plt.savefig(output_file, dpi=300, bbox_inches='tight')
 print(f"\n✓ Analysis figure saved to: {output_file}")
 
@@ -228,7 +198,7 @@ print(f"\n✓ Analysis figure saved to: {output_file}")
 # GENERATE SUMMARY REPORT
 ###############################################################################
 
-report_file = sim_file.replace('.pkl', '_report.txt')
+report_file = output_base + '_report.txt'
 
 with open(report_file, 'w') as f:
     f.write("=" * 80 + "\n")
@@ -237,7 +207,7 @@ with open(report_file, 'w') as f:
 
     f.write(f"Simulation file: {sim_file}\n")
     f.write(f"Analysis window: {tstart} - {tstop} ms ({duration_s:.2f} s)\n")
-    f.write(f"Total spikes recorded: {len(spkt)}\n\n")
+    f.write(f"Total spikes recorded: {store.numSpikes}\n\n")
 
     f.write("Firing Rate Summary:\n")
     f.write("-" * 80 + "\n")
@@ -0,0 +1,477 @@
+"""
+benchmark_Yao1000.py
+
+Benchmark suite for the Yao network: single cells and whole networks across
+sizes and cell models, with stored results and regression checks
+Every case runs in a fresh worker process (clean NEURON state and peak RSS).
+
+Cases:
+    cell/<type>               instantiate a detailed HL23 cell (first load with its hoc files,
+                              then best of --repeats copies), simulate one copy for 1 s with a step
+    network/<model>/<cells>   build (initialize, create, connect, stims) and run the network
+                              scaled to <cells> cells for --duration ms (instrument_Yao1000 phases)
+
+Models:
+    izhi        netParams_Yao1000_v2 (Izhi2007b point neurons)
+    hh          netParams_Yao1000_HH (single-compartment HH cells, as init_Yao1000_HH.py)
+    detailed    hybrid_Yao1000 with every population detailed (template cells of models/,
+                synapses on their dendrites)
+
+Results are one JSON file with hardware and software information; compare
+flags every timing or memory metric that grew past the threshold (and above
+a noise floor) relative to a baseline, and exits with status 1 if any did.
+
+Usage:
+    python benchmark_Yao1000.py run                                    # Full suite -> benchmark_Yao1000.json
+    python benchmark_Yao1000.py run --sizes 20 100 --models izhi hh --out bench.json
+    python benchmark_Yao1000.py run --no-cells --duration 200
+    python benchmark_Yao1000.py show bench.json
+    python benchmark_Yao1000.py compare baseline.json bench.json       # Flag regressions
+    python benchmark_Yao1000.py compare baseline.json bench.json --threshold 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import importlib
+import subprocess
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+FORMAT = 'benchmark-v1'
+
+###############################################################################
+# SUITE
+###############################################################################
+
+CELL_TYPES = ('HL23PYR', 'HL23SST', 'HL23PV', 'HL23VIP')
+
+MODELS = {
+    'izhi': 'netParams_Yao1000_v2',
+    'hh': 'netParams_Yao1000_HH',
+    'detailed': 'hybrid_Yao1000',
+}
+
+SIZES = (20, 100, 1000)
+
+# 1 s single-cell simulation: one suprathreshold step
+CELL_STEP = {'delay': 100.0, 'dur': 800.0, 'tstop': 1000.0, 'amp': 0.3}
+
+# Metrics compared against a baseline (seconds, MB)
+TIME_METRICS = ('instantiate', 'simulate', 'build', 'run', 'total')
+MEMORY_METRICS = ('peakRSS',)
+
+THRESHOLD = 0.25   # relative increase flagged as a regression
+MIN_TIME = 0.05    # s: smaller absolute changes are noise
+MIN_MEMORY = 10.0  # MB
+
+def cellCase(cellName):
+    return f'cell/{cellName}'
+
+def networkCase(model, numCells):
+    return f'network/{model}/{numCells}'
+
+###############################################################################
+# WORKERS (one fresh process per case)
+###############################################################################
+
+def benchCell(cellName, repeats=3, dt=0.025):
+    """Instantiation and 1 s simulation time of one detailed cell"""
+
+    from mechanisms_Yao1000 import loadMechanisms
+    from instrument_Yao1000 import peakRSS
+    loadMechanisms()
+
+    from neuron import h
+    from cells_Yao1000 import loadCell
+    h.load_file('stdrun.hoc')
+
+    # First load opens the template and biophysics files; later copies reuse them
+    t0 = time.perf_counter()
+    cell = loadCell(cellName)
+    first = time.perf_counter() - t0
+
+    template = getattr(h, 'NeuronTemplate_' + cellName)
+    biophys = getattr(h, 'biophys_' + cellName)
+    morphpath = os.path.join(BASEDIR, 'morphologies', cellName + '.swc')
+    times = []
+    for _ in range(repeats):
+        del cell  # only the last copy is simulated
+        t0 = time.perf_counter()
+        cell = template(morphpath)
+        biophys(cell)
+        times.append(time.perf_counter() - t0)
+
+    soma = cell.soma[0]
+    stim = h.IClamp(soma(0.5))
+    stim.delay, stim.dur, stim.amp = CELL_STEP['delay'], CELL_STEP['dur'], CELL_STEP['amp']
+    detector = h.NetCon(soma(0.5)._ref_v, None, sec=soma)
+    detector.threshold = -20.0
+    spikes = h.Vector()
+    detector.record(spikes)
+
+    h.CVode().active(0)
+    h.celsius = 34.0
+    h.dt = dt
+    h.steps_per_ms = 1.0 / dt
+    h.finitialize(-80.0)
+    t0 = time.perf_counter()
+    h.continuerun(CELL_STEP['tstop'])
+    simulate = time.perf_counter() - t0
+
+    secs = list(cell.all)
+    return {'instantiate': min(times), 'instantiateFirst': first, 'simulate': simulate,
+            'spikes': int(spikes.size()), 'sections': len(secs),
+            'segments': sum(sec.nseg for sec in secs), 'peakRSS': peakRSS()}
+
+def scalePopulations(netParams, numCells):
+    """Scale every population to a network of about numCells cells (at least 1 per population)"""
+
+    pops = netParams.popParams
+    total = sum(pop['numCells'] for pop in pops.values())
+    for pop in pops.values():
+        pop['numCells'] = max(1, int(pop['numCells'] * numCells / total))
+
+def networkConfig(duration=1000.0, dt=0.025, seed=42):
+    """simConfig of the benchmark networks: spikes only, nothing saved"""
+
+    from netpyne import specs
+
+    simConfig = specs.SimConfig()
+    simConfig.duration = duration
+    simConfig.dt = dt
+    simConfig.verbose = False
+    simConfig.printRunTime = False
+    simConfig.recordCellsSpikes = -1
+    simConfig.recordTraces = {}
+    simConfig.recordStep = 1.0
+    simConfig.savePickle = False
+    simConfig.saveJson = False
+    simConfig.seeds = {'conn': seed, 'stim': seed, 'loc': seed}
+    simConfig.hParams = {'celsius': 34.0, 'v_init': -80.0}
+    return simConfig
+
+def runNetwork(model, numCells, duration=1000.0, dt=0.025, seed=42, profiler=None):
+    """
+    Build, run and gather one network model scaled to numCells cells
+
+    Returns:
+        NetPyNE sim (spikes in sim.allSimData)
+    """
+
+    from mechanisms_Yao1000 import loadMechanisms
+    from instrument_Yao1000 import PhaseProfiler, createNetwork
+    loadMechanisms()
+
+    sys.path.insert(0, BASEDIR)
+    from netpyne import sim
+
+    if model == 'detailed':
+        from hybrid_Yao1000 import CELL_TYPES, buildNetParams
+        netParams = buildNetParams({cellType: 'detailed' for cellType in CELL_TYPES}, numCells)
+    else:
+        netParams = importlib.import_module(MODELS[model]).netParams
+        scalePopulations(netParams, numCells)
+    simConfig = networkConfig(duration, dt, seed)
+
+    profiler = profiler or PhaseProfiler(script=f'benchmark {networkCase(model, numCells)}')
+    createNetwork(sim, netParams, simConfig, profiler)
+    with profiler.phase('record'):
+        sim.setupRecording()
+    with profiler.phase('run'):
+        sim.runSim()
+    with profiler.phase('gather'):
+        sim.gatherData()
+    return sim
+
+def benchNetwork(model, numCells, duration=1000.0, dt=0.025, seed=42):
+    """Build and run one network model scaled to numCells cells"""
+
+    from instrument_Yao1000 import PhaseProfiler
+
+    profiler = PhaseProfiler(script=f'benchmark {networkCase(model, numCells)}')
+    sim = runNetwork(model, numCells, duration, dt, seed, profiler)
+    record = profiler.record(sim)
+
+    phases = {name: t['max'] for name, t in record['phases'].items()}
+    build = sum(phases.get(name, 0.0) for name in ('initialize', 'create', 'connect', 'stims'))
+    out = {'build': build, 'run': phases['run'], 'total': sum(phases.values()),
+           'phases': phases, 'peakRSS': record['peakRSS'],
+           'spikes': len(sim.allSimData['spkt'])}
+    out.update(record['totals'])
+    return out
+
+def runCase(case, settings):
+    """Worker entry point of one benchmark case"""
+
+    kind, *spec = case.split('/')
+    if kind == 'cell':
+        return benchCell(spec[0], repeats=settings['repeats'], dt=settings['dt'])
+    return benchNetwork(spec[0], int(spec[1]), duration=settings['duration'],
+                        dt=settings['dt'], seed=settings['seed'])
+
+def _worker(path):
+    """Entry point of the worker process: run the call pickled in path, pickle the outcome to path.out"""
+
+    import pickle
+
+    with open(path, 'rb') as f:
+        module, name, args = pickle.load(f)
+    try:
+        result = ('ok', getattr(importlib.import_module(module), name)(*args))
+    except Exception as e:
+        result = ('error', f'{type(e).__name__}: {e}')
+    with open(path + '.out', 'wb') as f:
+        pickle.dump(result, f)
+
+def runIsolated(func, *args):
+    """
+    Call func(*args) in a fresh Python process with its output discarded
+
+    func must be a module-level function of an importable module. A plain
+    subprocess is used rather than a multiprocessing pool, so callers need no
+    __main__ guard. Exceptions of the worker are raised here as RuntimeError.
+    """
+
+    import pickle
+    import tempfile
+
+    module = func.__module__
+    if module == '__main__':
+        module = os.path.splitext(os.path.basename(sys.modules['__main__'].__file__))[0]
+
+    fd, path = tempfile.mkstemp(suffix='.pkl')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((module, func.__name__, args), f)
+        code = f"import sys; sys.path.insert(0, {BASEDIR!r}); import benchmark_Yao1000; benchmark_Yao1000._worker({path!r})"
+        proc = subprocess.run([sys.executable, '-c', code], cwd=BASEDIR, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, text=True)
+        if not os.path.exists(path + '.out'):
+            raise RuntimeError(f"worker exited with code {proc.returncode}: {proc.stderr.strip()[-500:]}")
+        with open(path + '.out', 'rb') as f:
+            status, result = pickle.load(f)
+        if status == 'error':
+            raise RuntimeError(result)
+        return result
+    finally:
+        for p in (path, path + '.out'):
+            if os.path.exists(p):
+                os.remove(p)
+
+###############################################################################
+# RUN
+###############################################################################
+
+def hardwareInfo():
+    """CPU, memory and platform of this machine"""
+
+    info = {'host': platform.node(), 'platform': platform.platform(), 'machine': platform.machine(),
+            'processor': platform.processor(), 'cpus': os.cpu_count()}
+    try:
+        with open('/proc/cpuinfo') as f:
+            models = [line.split(':', 1)[1].strip() for line in f if line.startswith('model name')]
+        if models:
+            info['processor'] = models[0]
+    except OSError:
+        pass
+    try:
+        info['memoryGB'] = round(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 2**30, 1)
+    except (ValueError, OSError, AttributeError):
+        info['memoryGB'] = None
+    return info
+
+def gitCommit():
+    """Commit of the working tree (None outside git)"""
+
+    try:
+        proc = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASEDIR,
+                              capture_output=True, text=True, timeout=10)
+        return proc.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def runSuite(cases, settings, verbose=True):
+    """
+    Run every case in its own worker process
+
+    Returns:
+        benchmark record {'format', 'created', 'commit', 'hardware', 'versions', 'settings', 'cases'}
+    """
+
+    from instrument_Yao1000 import versions
+
+    results = {}
+    for case in cases:
+        t0 = time.time()
+        try:
+            results[case] = runIsolated(runCase, case, settings)
+        except Exception as e:
+            results[case] = {'error': f'{type(e).__name__}: {e}'}
+        if verbose:
+            result = results[case]
+            if 'error' in result:
+                print(f"✗ {case:<28} {result['error'][:60]}")
+            else:
+                print(f"✓ {case:<28} {summarize(result)}  ({time.time() - t0:.1f} s)")
+
+    return {'format': FORMAT,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': gitCommit(),
+            'hardware': hardwareInfo(),
+            'versions': versions(),
+            'settings': settings,
+            'cases': results}
+
+def summarize(result):
+    """One-line summary of a case result"""
+
+    if 'instantiate' in result:
+        return (f"instantiate {result['instantiate']:.3f} s (first {result['instantiateFirst']:.3f} s), "
+                f"1 s sim {result['simulate']:.2f} s, {result['segments']} segs, {result['spikes']} spikes")
+    return (f"build {result['build']:.2f} s, run {result['run']:.2f} s, {result['peakRSS']:.0f} MB, "
+            f"{result['cells']} cells, {result['netcons']} NetCons, {result['spikes']} spikes")
+
+###############################################################################
+# COMPARE
+###############################################################################
+
+def compareResults(baseline, current, threshold=THRESHOLD, minTime=MIN_TIME, minMemory=MIN_MEMORY):
+    """
+    Metric-by-metric comparison of two benchmark records
+
+    Returns:
+        list of {'case', 'metric', 'baseline', 'current', 'ratio', 'status'}
+        with status 'regression', 'improved', 'ok', 'changed' (spike counts),
+        'error' (case failed now but not in the baseline) or 'missing'
+    """
+
+    rows = []
+    for case, base in baseline['cases'].items():
+        cur = current['cases'].get(case)
+        if cur is None:
+            rows.append({'case': case, 'metric': '-', 'baseline': None, 'current': None, 'ratio': None, 'status': 'missing'})
+            continue
+        if 'error' in cur or 'error' in base:
+            if 'error' in cur and 'error' not in base:
+                rows.append({'case': case, 'metric': '-', 'baseline': None, 'current': None, 'ratio': None, 'status': 'error'})
+            continue
+
+        for metric in TIME_METRICS + MEMORY_METRICS:
+            if metric not in base or metric not in cur:
+                continue
+            floor = minMemory if metric in MEMORY_METRICS else minTime
+            b, c = base[metric], cur[metric]
+            ratio = c / b if b > 0 else None
+            if c - b > floor and (ratio is None or ratio > 1 + threshold):
+                status = 'regression'
+            elif b - c > floor and ratio is not None and ratio < 1 / (1 + threshold):
+                status = 'improved'
+            else:
+                status = 'ok'
+            rows.append({'case': case, 'metric': metric, 'baseline': b, 'current': c, 'ratio': ratio, 'status': status})
+
+        if base.get('spikes') != cur.get('spikes'):
+            rows.append({'case': case, 'metric': 'spikes', 'baseline': base.get('spikes'),
+                         'current': cur.get('spikes'), 'ratio': None, 'status': 'changed'})
+    return rows
+
+def hardwareMismatch(baseline, current):
+    """Hardware fields that differ between two records"""
+
+    keys = ('processor', 'cpus', 'machine', 'memoryGB')
+    return [k for k in keys if baseline['hardware'].get(k) != current['hardware'].get(k)]
+
+def loadRecord(path):
+    with open(path) as f:
+        record = json.load(f)
+    if record.get('format') != FORMAT:
+        raise ValueError(f"{path} is not a {FORMAT} record")
+    return record
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark single cells and networks, compare against a baseline')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help='Run the benchmark suite')
+    p.add_argument('--models', nargs='+', default=list(MODELS), choices=list(MODELS), help='Network models')
+    p.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='Network sizes (cells)')
+    p.add_argument('--cells', nargs='+', default=list(CELL_TYPES), choices=CELL_TYPES, help='Single-cell types')
+    p.add_argument('--no-cells', action='store_true', help='Skip the single-cell cases')
+    p.add_argument('--no-networks', action='store_true', help='Skip the network cases')
+    p.add_argument('--duration', type=float, default=1000.0, help='Network simulation duration (ms)')
+    p.add_argument('--dt', type=float, default=0.025, help='Time step (ms)')
+    p.add_argument('--repeats', type=int, default=3, help='Cell instantiations (best is reported)')
+    p.add_argument('--seed', type=int, default=42, help='Network seed')
+    p.add_argument('--out', type=str, default='benchmark_Yao1000.json', help='Output JSON')
+
+    p = sub.add_parser('show', help='Print a benchmark record')
+    p.add_argument('record', help='Benchmark JSON')
+
+    p = sub.add_parser('compare', help='Flag regressions against a baseline')
+    p.add_argument('baseline', help='Baseline benchmark JSON')
+    p.add_argument('current', help='New benchmark JSON')
+    p.add_argument('--threshold', type=float, default=THRESHOLD, help='Relative increase flagged as a regression')
+    p.add_argument('--min-time', type=float, default=MIN_TIME, help='Ignore time changes below this (s)')
+    p.add_argument('--min-memory', type=float, default=MIN_MEMORY, help='Ignore memory changes below this (MB)')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        cases = [] if args.no_cells else [cellCase(c) for c in args.cells]
+        if not args.no_networks:
+            cases += [networkCase(m, n) for m in args.models for n in args.sizes]
+        settings = {'duration': args.duration, 'dt': args.dt, 'repeats': args.repeats, 'seed': args.seed}
+
+        hardware = hardwareInfo()
+        print("=" * 80)
+        print(f"BENCHMARK: {len(cases)} cases on {hardware['processor']} ({hardware['cpus']} CPUs)")
+        print("=" * 80)
+        record = runSuite(cases, settings)
+        with open(args.out, 'w') as f:
+            json.dump(record, f, indent=1)
+        failed = sum('error' in r for r in record['cases'].values())
+        print("=" * 80)
+        print(f"✓ Saved {args.out}" + (f" ({failed} cases failed)" if failed else ""))
+
+    elif args.command == 'show':
+        record = loadRecord(args.record)
+        hw = record['hardware']
+        print(f"{args.record}: {record['created']}, commit {record['commit']}")
+        print(f"{hw['processor']}, {hw['cpus']} CPUs, {hw['memoryGB']} GB; "
+              + ', '.join(f'{k} {v}' for k, v in record['versions'].items()))
+        print("-" * 80)
+        for case, result in record['cases'].items():
+            print(f"{case:<28} " + (f"✗ {result['error']}" if 'error' in result else summarize(result)))
+
+    else:
+        baseline, current = loadRecord(args.baseline), loadRecord(args.current)
+        rows = compareResults(baseline, current, args.threshold, args.min_time, args.min_memory)
+
+        print("=" * 80)
+        print(f"COMPARE: {args.current} ({current['commit']}) vs baseline {args.baseline} ({baseline['commit']})")
+        print("=" * 80)
+        mismatch = hardwareMismatch(baseline, current)
+        if mismatch:
+            print(f"⚠ Different hardware ({', '.join(mismatch)}): timings are not comparable")
+        print(f"{'Case':<28} {'Metric':<12} {'Baseline':>10} {'Current':>10} {'Ratio':>7}  Status")
+        print("-" * 80)
+        marks = {'regression': '✗', 'error': '✗', 'missing': '?', 'changed': '⚠', 'improved': '✓', 'ok': ''}
+        for row in rows:
+            fmt = lambda x: '-' if x is None else (f'{x:10.3f}' if isinstance(x, float) else f'{x:>10}')
+            ratio = '' if row['ratio'] is None else f"{row['ratio']:6.2f}x"
+            print(f"{row['case']:<28} {row['metric']:<12} {fmt(row['baseline']):>10} {fmt(row['current']):>10} "
+                  f"{ratio:>7}  {marks[row['status']]} {row['status']}")
+
+        regressions = [r for r in rows if r['status'] in ('regression', 'error')]
+        print("=" * 80)
+        print(f"{'✗' if regressions else '✓'} {len(regressions)} regressions "
+              f"(threshold +{100 * args.threshold:.0f}%, noise floor {args.min_time} s / {args.min_memory} MB)")
+        sys.exit(1 if regressions else 0)
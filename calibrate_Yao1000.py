@@ -0,0 +1,375 @@
+"""
+calibrate_Yao1000.py
+
+Firing-rate calibration of the Yao 1000-cell network weights to TARGET_RATES
+Adjusts the synConds and bgStim weight tables of a netParams module so that
+the four population rates match spikestats_Yao1000.TARGET_RATES. Each
+evaluation is a short, down-scaled network simulation (in-degree preserved)
+run in its own worker process; evaluations of one iteration run in parallel.
+
+The rate response is modelled as log-linear in the log weight gains. Its
+Jacobian is estimated once by finite differences and then refined with Broyden
+updates from every new simulation, so each iteration needs only a few runs.
+The calibrated tables are written as a JSON overlay that init_Yao1000.py
+applies with --overlay.
+
+Parameter groups (one log gain per postsynaptic population):
+    bg:  background (bgStim) weight
+    exc: all excitatory pathways onto the population
+    inh: all inhibitory pathways onto the population
+
+Usage:
+    python calibrate_Yao1000.py                                # bg + inh gains, 20% network
+    python calibrate_Yao1000.py --groups bg exc inh --workers 8
+    python calibrate_Yao1000.py --scale 0.1 --duration 1000 --iterations 6
+    python calibrate_Yao1000.py --output calibration_Yao1000.json
+    python init_Yao1000.py --overlay calibration_Yao1000.json
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import importlib
+import multiprocessing
+import numpy as np
+
+from spikestats_Yao1000 import TARGET_RATES
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# CALIBRATION SETTINGS
+###############################################################################
+
+POPS = ['HL23PYR', 'HL23SST', 'HL23PV', 'HL23VIP']
+GROUPS = ('bg', 'exc', 'inh')
+
+RATE_FLOOR = 0.1        # Hz added before taking logs (silent populations stay finite)
+FD_STEP = np.log(1.25)  # finite-difference step of the log gains
+MAX_STEP = np.log(2.0)  # largest change of any log gain per iteration
+DAMPING = 0.05          # Levenberg damping of the Gauss-Newton step
+TOLERANCE = 0.15        # stop when every population is within 15% of its target
+
+###############################################################################
+# OVERLAY
+###############################################################################
+
+def connKey(label):
+    """'HL23PYR_to_HL23SST_AMPA' -> ('HL23PYR', 'HL23SST')"""
+
+    pre, post = label.split('_to_')
+    return pre, post.split('_')[0]
+
+def makeOverlay(synConds, bgStim, gains, source=None, extra=None):
+    """
+    Calibrated weight tables for a set of log gains
+
+    Args:
+        synConds: base {(pre, post): conductance (S)} table
+        bgStim: base {pop: {'weight': ..., ...}} table
+        gains: {(group, pop): log gain}
+
+    Returns:
+        JSON-serializable overlay dict with calibrated and base tables
+    """
+
+    newConds = {}
+    for (pre, post), g in synConds.items():
+        group = 'exc' if 'PYR' in pre else 'inh'
+        newConds[f'{pre}_to_{post}'] = g * float(np.exp(gains.get((group, post), 0.0)))
+
+    newBg = {pop: {'weight': p['weight'] * float(np.exp(gains.get(('bg', pop), 0.0)))}
+             for pop, p in bgStim.items()}
+
+    overlay = {
+        'source': source,
+        'synConds': newConds,
+        'bgStim': newBg,
+        'base': {
+            'synConds': {f'{pre}_to_{post}': g for (pre, post), g in synConds.items()},
+            'bgStim': {pop: {'weight': p['weight']} for pop, p in bgStim.items()},
+        },
+        'gains': {f'{group}:{pop}': float(np.exp(v)) for (group, pop), v in gains.items()},
+    }
+    overlay.update(extra or {})
+    return overlay
+
+def loadOverlay(path):
+    with open(path) as f:
+        return json.load(f)
+
+def applyOverlay(netParams, overlay):
+    """
+    Rescale connParams and background stimTargetParams weights in place
+
+    Every rule is scaled by calibrated / base value of its table entry, so
+    splits such as the 80/20 AMPA/NMDA weights are preserved.
+
+    Returns:
+        number of rules changed
+    """
+
+    base = overlay['base']
+    changed = 0
+
+    for label, rule in netParams.connParams.items():
+        key = '_to_'.join(connKey(label))
+        old = base['synConds'].get(key)
+        if old:
+            rule['weight'] = rule['weight'] * overlay['synConds'][key] / old
+            changed += 1
+
+    for pop, params in overlay['bgStim'].items():
+        rule = netParams.stimTargetParams.get(f'bkg_{pop}_stim')
+        old = base['bgStim'][pop]['weight']
+        if rule is not None and old:
+            rule['weight'] = rule['weight'] * params['weight'] / old
+            changed += 1
+
+    return changed
+
+###############################################################################
+# DOWN-SCALED NETWORK SIMULATION (worker process)
+###############################################################################
+
+def scaleNetwork(netParams, scale):
+    """Shrink every population by scale, raising connection probabilities to keep in-degree"""
+
+    for pop in netParams.popParams.values():
+        pop['numCells'] = max(1, int(round(pop['numCells'] * scale)))
+    for rule in netParams.connParams.values():
+        if 'probability' in rule:
+            rule['probability'] = min(1.0, rule['probability'] / scale)
+
+def _simulateRates(task):
+    """Build and run one down-scaled network, return {pop: rate (Hz)}"""
+
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms(task.get('mechDir'))  # default: mod/ through the build cache
+
+    sys.path.insert(0, BASEDIR)
+    from netpyne import sim, specs
+
+    netParams = copy.deepcopy(importlib.import_module(task['module']).netParams)
+    applyOverlay(netParams, task['overlay'])
+    scaleNetwork(netParams, task['scale'])
+
+    simConfig = specs.SimConfig()
+    simConfig.duration = task['duration']
+    simConfig.dt = task['dt']
+    simConfig.verbose = False
+    simConfig.printRunTime = False
+    simConfig.recordCellsSpikes = -1
+    simConfig.recordTraces = {}
+    simConfig.recordStep = 1.0
+    simConfig.savePickle = False
+    simConfig.saveJson = False
+    simConfig.seeds = {'conn': task['seed'], 'stim': task['seed'], 'loc': task['seed']}
+    simConfig.hParams = {'celsius': 34.0, 'v_init': -80.0}
+
+    sim.create(netParams, simConfig)
+    sim.simulate()
+
+    spkt = np.asarray(sim.allSimData['spkt'])
+    spkid = np.asarray(sim.allSimData['spkid'], dtype=int)
+    keep = spkt >= task['transient']
+    numCells = sum(len(pop.cellGids) for pop in sim.net.pops.values())
+    counts = np.bincount(spkid[keep], minlength=numCells)
+    window = (task['duration'] - task['transient']) / 1000.0
+
+    rates = {}
+    for label, pop in sim.net.pops.items():
+        n = len(pop.cellGids)
+        rates[label] = float(counts[pop.cellGids].sum() / (n * window)) if n else 0.0
+
+    return rates
+
+###############################################################################
+# CALIBRATOR
+###############################################################################
+
+class RateCalibrator:
+    """
+    Broyden-updated Gauss-Newton solver for log rates vs. log weight gains
+
+    Args:
+        module: netParams module name (must define netParams, synConds, bgStim)
+        groups: parameter groups, subset of GROUPS
+        targets: {pop: rate (Hz)}
+        settings: dict of scale, duration, transient, dt, seed, mechDir
+        workers: worker processes
+    """
+
+    def __init__(self, module, groups=('bg', 'inh'), targets=TARGET_RATES, settings=None, workers=None):
+        mod = importlib.import_module(module)
+        self.module = module
+        self.synConds = mod.synConds
+        self.bgStim = mod.bgStim
+        self.targets = targets
+        self.pops = [p for p in POPS if p in targets]
+        self.settings = settings or {}
+        self.workers = workers or max(1, multiprocessing.cpu_count() - 1)
+
+        # Drop groups that would scale nothing (e.g. exc onto a pop without excitatory input)
+        self.params = []
+        for group in groups:
+            for pop in self.pops:
+                if group == 'bg':
+                    used = pop in self.bgStim
+                else:
+                    used = any(g > 0 and post == pop and (('PYR' in pre) == (group == 'exc'))
+                               for (pre, post), g in self.synConds.items())
+                if used:
+                    self.params.append((group, pop))
+
+        self.logTarget = np.log(np.array([targets[p] for p in self.pops]) + RATE_FLOOR)
+        self.history = []  # (theta, rates) of every simulation
+
+    def overlay(self, theta, extra=None):
+        return makeOverlay(self.synConds, self.bgStim, dict(zip(self.params, theta)),
+                           source=self.module, extra=extra)
+
+    def evaluate(self, thetas):
+        """Simulate every parameter vector in parallel, return (n, nPops) log rates"""
+
+        tasks = [dict(self.settings, module=self.module, overlay=self.overlay(theta)) for theta in thetas]
+        # One process per simulation: NetPyNE and NEURON keep global state between runs
+        with multiprocessing.Pool(min(self.workers, len(tasks)), maxtasksperchild=1) as pool:
+            results = pool.map(_simulateRates, tasks)
+
+        rates = np.array([[r.get(p, 0.0) for p in self.pops] for r in results])
+        for theta, r in zip(thetas, rates):
+            self.history.append((np.array(theta), r))
+        return np.log(rates + RATE_FLOOR)
+
+    def error(self, logRates):
+        """Largest relative rate error"""
+
+        rates = np.exp(logRates) - RATE_FLOOR
+        targets = np.exp(self.logTarget) - RATE_FLOOR
+        return np.max(np.abs(rates - targets) / targets)
+
+    def step(self, J, residual):
+        """Damped least-squares step, minimum-norm when under-determined"""
+
+        A = np.vstack([J, np.sqrt(DAMPING) * np.eye(J.shape[1])])
+        b = np.concatenate([-residual, np.zeros(J.shape[1])])
+        delta = np.linalg.lstsq(A, b, rcond=None)[0]
+        largest = np.abs(delta).max()
+        return delta * (MAX_STEP / largest) if largest > MAX_STEP else delta
+
+    def run(self, iterations=8, tol=TOLERANCE, verbose=True):
+        """
+        Calibrate the gains
+
+        Returns:
+            theta (log gains), log rates at theta
+        """
+
+        nParams = len(self.params)
+        theta = np.zeros(nParams)
+
+        # Base point and finite-difference Jacobian in one parallel batch
+        probes = [theta] + [theta + FD_STEP * e for e in np.eye(nParams)]
+        logRates = self.evaluate(probes)
+        y = logRates[0]
+        J = (logRates[1:] - y).T / FD_STEP
+        self._report(0, y, len(probes), verbose)
+
+        for it in range(1, iterations + 1):
+            if self.error(y) < tol:
+                break
+
+            # Line search along the Gauss-Newton direction, evaluated in parallel
+            delta = self.step(J, y - self.logTarget)
+            scales = (0.5, 1.0) if self.workers < 3 else (0.5, 1.0, 1.5)
+            candidates = [theta + s * delta for s in scales]
+            results = self.evaluate(candidates)
+
+            # Broyden rank-1 update from every new point
+            for cand, res in zip(candidates, results):
+                d = cand - theta
+                J = J + np.outer(res - y - J @ d, d) / (d @ d)
+
+            best = np.argmin([np.sum((res - self.logTarget) ** 2) for res in results])
+            if np.sum((results[best] - self.logTarget) ** 2) < np.sum((y - self.logTarget) ** 2):
+                theta, y = candidates[best], results[best]
+            self._report(it, y, len(candidates), verbose)
+
+        return theta, y
+
+    def _report(self, it, logRates, nSims, verbose):
+        if not verbose:
+            return
+        rates = np.exp(logRates) - RATE_FLOOR
+        line = '  '.join(f"{p[4:]:>3s} {r:6.2f}" for p, r in zip(self.pops, rates))
+        print(f"  Iteration {it:2d} ({nSims:2d} sims): {line}   max error {100 * self.error(logRates):6.1f}%")
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Calibrate Yao 1000-cell network weights to target firing rates')
+    parser.add_argument('--netparams', type=str, default='netParams_Yao1000', help='netParams module to calibrate')
+    parser.add_argument('--groups', type=str, nargs='+', default=['bg', 'inh'], choices=GROUPS, help='Gain groups')
+    parser.add_argument('--scale', type=float, default=0.2, help='Network size fraction of the calibration runs')
+    parser.add_argument('--duration', type=float, default=1500, help='Calibration run duration (ms)')
+    parser.add_argument('--transient', type=float, default=300, help='Initial transient excluded from rates (ms)')
+    parser.add_argument('--dt', type=float, default=0.025, help='Time step (ms)')
+    parser.add_argument('--iterations', type=int, default=8, help='Maximum calibration iterations')
+    parser.add_argument('--tol', type=float, default=TOLERANCE, help='Relative rate tolerance')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPUs - 1)')
+    parser.add_argument('--mech-dir', type=str, default=None, help='Directory of compiled mechanisms to load')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (fixed across all runs)')
+    parser.add_argument('--output', type=str, default='calibration_Yao1000.json', help='Output overlay file')
+    args = parser.parse_args()
+
+    sys.path.insert(0, BASEDIR)
+    settings = {'scale': args.scale, 'duration': args.duration, 'transient': args.transient,
+                'dt': args.dt, 'seed': args.seed, 'mechDir': args.mech_dir}
+    calibrator = RateCalibrator(args.netparams, groups=args.groups, settings=settings, workers=args.workers)
+
+    print("=" * 80)
+    print("FIRING-RATE CALIBRATION: Yao et al. 2022 network")
+    print("=" * 80)
+    print(f"netParams: {args.netparams}")
+    print("Targets: " + ", ".join(f"{p} {r} Hz" for p, r in TARGET_RATES.items()))
+    print(f"Gains: {len(calibrator.params)} ({', '.join(f'{g}:{p}' for g, p in calibrator.params)})")
+    print(f"Runs: {args.scale:.0%} network, {args.duration:.0f} ms "
+          f"(rates after {args.transient:.0f} ms), {calibrator.workers} workers")
+    print("=" * 80)
+
+    t0 = time.time()
+    theta, logRates = calibrator.run(iterations=args.iterations, tol=args.tol)
+    elapsed = time.time() - t0
+
+    rates = np.exp(logRates) - RATE_FLOOR
+    extra = {
+        'targets': TARGET_RATES,
+        'rates': dict(zip(calibrator.pops, rates.tolist())),
+        'settings': {k: v for k, v in settings.items() if k != 'mechDir'},
+        'simulations': len(calibrator.history),
+    }
+    overlay = calibrator.overlay(theta, extra)
+    with open(args.output, 'w') as f:
+        json.dump(overlay, f, indent=2)
+
+    print("=" * 80)
+    print(f"{'Population':<15} {'Rate':>10} {'Target':>10} {'Δ (%)':>10}")
+    print("-" * 80)
+    for pop, rate in zip(calibrator.pops, rates):
+        target = TARGET_RATES[pop]
+        print(f"{pop:<15} {rate:7.2f} Hz {target:7.2f} Hz {100 * (rate - target) / target:+9.1f}%")
+    print("-" * 80)
+    print("Gains:")
+    for key, gain in overlay['gains'].items():
+        print(f"  {key:15s}: x{gain:.3f}")
+    print(f"\n{len(calibrator.history)} simulations in {elapsed:.1f} s")
+    status = "✓" if calibrator.error(logRates) < args.tol else "✗ Not converged,"
+    print(f"{status} overlay written to: {args.output}")
+    print("=" * 80)
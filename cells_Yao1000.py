@@ -6,7 +6,6 @@ Interfaces with existing cellwrapper.py infrastructure
 """
 
 import os
-from neuron import h
 import cellwrapper
 
 # Get absolute path to this directory
@@ -67,10 +66,47 @@ def getCellRule(cellName):
 
     return cellRule
 
+def setRandomStreams(sim, seed):
+    """
+    Give every stochastic point process on this rank its own Random123 stream
+
+    ProbAMPANMDA, ProbUDFsyn and Gfluct2 draw from a RANDOM stream set by
+    setRNG(id1, id2, id3); here the ids are (gid, index of the point process
+    within its cell, seed). The index follows section and creation order,
+    which NetPyNE reproduces on every rank, so the random numbers do not
+    depend on the number of ranks or threads.
+
+    Args:
+        sim: NetPyNE sim after the network is created
+        seed: run seed (e.g. simConfig.seeds['stim'])
+
+    Returns:
+        number of streams set on this rank
+    """
+
+    count = 0
+    for cell in sim.net.cells:
+        objs = [stim['hObj'] for stim in getattr(cell, 'stims', []) if 'hObj' in stim]
+        for sec in getattr(cell, 'secs', {}).values():
+            objs.extend(mech['hObj'] for mech in sec.get('synMechs', []) if 'hObj' in mech)
+            objs.extend(pointp['hObj'] for pointp in sec.get('pointps', {}).values() if 'hObj' in pointp)
+
+        index = 0
+        for obj in objs:
+            if hasattr(obj, 'setRNG'):
+                obj.setRNG(cell.gid, index, seed)
+                index += 1
+        count += index
+
+    return count
+
 # Test function
 if __name__ == '__main__':
     print("Testing cell loading...")
 
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms()
+
     for cellName in ['HL23PYR', 'HL23SST', 'HL23PV', 'HL23VIP']:
         print(f"\nLoading {cellName}...")
         try:
@@ -6,21 +6,27 @@ _CELLWRAPPER_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # def loadCell_HL23PYR(cellName):
 
+def getBiophysicsPath(cellName, ad=False, ad_stage=None):
+    """
+    Path of the biophysics .hoc file for a cell type (healthy or AD stage)
+
+    AD variants only exist for HL23PYR; ad=True without a stage selects Stage 1
+    """
+
+    if ad:
+        if ad_stage == 3:
+            return os.path.join(_CELLWRAPPER_DIR, 'models', 'biophys_' + cellName + '_AD_Stage3.hoc')
+        # Default to Stage 1 if ad=True but no stage specified
+        return os.path.join(_CELLWRAPPER_DIR, 'models', 'biophys_' + cellName + '_AD_Stage1.hoc')
+    return os.path.join(_CELLWRAPPER_DIR, 'models', 'biophys_' + cellName + '.hoc')
+
+
 def loadCell_HL23PYR(cellName, ad=False, ad_stage=None):
 
     templatepath = os.path.join(_CELLWRAPPER_DIR, 'models', 'NeuronTemplate_HL23PYR.hoc')
 
     # Select biophysics file based on AD flag and stage
-    if ad:
-        if ad_stage == 1:
-            biophysics = os.path.join(_CELLWRAPPER_DIR, 'models', 'biophys_' + cellName + '_AD_Stage1.hoc')
-        elif ad_stage == 3:
-            biophysics = os.path.join(_CELLWRAPPER_DIR, 'models', 'biophys_' + cellName + '_AD_Stage3.hoc')
-        else:
-            # Default to Stage 1 if ad=True but no stage specified
-            biophysics = os.path.join(_CELLWRAPPER_DIR, 'models', 'biophys_' + cellName + '_AD_Stage1.hoc')
-    else:
-        biophysics = os.path.join(_CELLWRAPPER_DIR, 'models', 'biophys_' + cellName + '.hoc')
+    biophysics = getBiophysicsPath(cellName, ad, ad_stage)
 
     morphpath = os.path.join(_CELLWRAPPER_DIR, 'morphologies', cellName + '.swc')
 
@@ -186,4 +192,66 @@ def loadCell_HL23SST(cellName):
 
     h.biophys_HL23SST(cell)
 
-    return cell
\ No newline at end of file
+    return cell
+
+
+def loadCell(cellName, ad=False, ad_stage=None, segmentLength=None):
+    """
+    One quiet copy of a cell type (see loadCells), e.g. for NetPyNE's
+    importCellParams, which needs a function returning a single cell
+    """
+
+    return loadCells(cellName, 1, ad=ad, ad_stage=ad_stage, segmentLength=segmentLength)[0]
+
+
+def loadCells(cellName, numCells, ad=False, ad_stage=None, segmentLength=None):
+    """
+    Instantiate numCells independent copies of one cell type
+
+    Template and biophysics files are opened once for the whole batch and
+    nothing is printed per cell, so this is the loader to use when many
+    copies are needed (e.g. batched current-clamp sweeps).
+
+    Args:
+        cellName: 'HL23PYR', 'HL23SST', 'HL23PV', or 'HL23VIP'
+        numCells: number of copies
+        ad, ad_stage: AD biophysics selection (HL23PYR only)
+        segmentLength: maximum segment length (um), applied as
+            nseg = 1 + 2*int(L/segmentLength) to every section before the
+            biophysics proc distributes the channels; None keeps the
+            template's geom_nseg (40 um) and axon stub discretization
+
+    Returns:
+        list of NEURON cell objects
+    """
+
+    templatepath = os.path.join(_CELLWRAPPER_DIR, 'models', 'NeuronTemplate_' + cellName + '.hoc')
+    biophysics = getBiophysicsPath(cellName, ad, ad_stage)
+    morphpath = os.path.join(_CELLWRAPPER_DIR, 'morphologies', cellName + '.swc')
+
+    from neuron import h
+
+    h.load_file("stdrun.hoc")
+    h.load_file('import3d.hoc')
+
+    # Every biophysics variant defines the same proc name, so (re)opening the
+    # selected file makes it the active one for this batch
+    h.xopen(biophysics)
+
+    # A template cannot be redefined; open it only once per process
+    if not hasattr(h, 'NeuronTemplate_' + cellName):
+        h.xopen(templatepath)
+
+    template = getattr(h, 'NeuronTemplate_' + cellName)
+    biophys = getattr(h, 'biophys_' + cellName)
+
+    cells = []
+    for i in range(numCells):
+        cell = template(morphpath)
+        if segmentLength is not None:
+            for sec in cell.all:
+                sec.nseg = 1 + 2 * int(sec.L / segmentLength)
+        biophys(cell)
+        cells.append(cell)
+
+    return cells
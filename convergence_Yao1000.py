@@ -0,0 +1,266 @@
+"""
+convergence_Yao1000.py
+
+Time-step and spatial-discretization convergence study
+Runs one configuration -- a single cell under the regression step protocol
+(one copy per amplitude) or a small fixed-seed network -- over a grid of time
+steps and maximum segment lengths, every point in a fresh worker process, and
+compares its spikes with a reference run at a finer setting:
+
+    meanJitter / maxJitter   shift of spikes matched one-to-one per cell/sweep
+                             within --window ms of the reference spike (ms)
+    unmatched                fraction of spikes (reference + point) without a match
+    rateError                largest population (or sweep) spike-count change,
+                             relative to the reference (regression_Yao1000.compareSpikes)
+    run                      wall time of the integration (s); create is reported too
+
+The cheapest point (integration time) whose errors fit the budget is
+recommended. Network cells are single-compartment, so networks only have the
+dt axis. 'template' is the discretization of the cell templates (geom_nseg,
+1 + 2*int(L/40) per section, fixed axon stubs); numbers are maximum segment
+lengths in um applied to every section before the biophysics are distributed.
+
+Usage:
+    python convergence_Yao1000.py run --cell HL23PYR                          # Default grid -> convergence_HL23PYR.json
+    python convergence_Yao1000.py run --cell HL23PYR --stage 1 --amps 0.2 0.3
+    python convergence_Yao1000.py run --cell HL23PV --dts 0.1 0.05 0.025 --segments template 20
+    python convergence_Yao1000.py run --network hh --cells 100 --duration 500 --out conv_hh.json
+    python convergence_Yao1000.py show conv_hh.json --max-rate-error 0.1      # Re-evaluate with another budget
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# GRID AND BUDGET
+###############################################################################
+
+DTS = (0.1, 0.05, 0.025, 0.0125)
+SEGMENTS = (None, 20.0, 10.0)   # None: template discretization
+REFERENCE = {'dt': 0.003125, 'segmentLength': 5.0}
+CURRENT = {'dt': 0.025, 'segmentLength': None}  # setting used by the init scripts
+
+WINDOW = 5.0  # ms, largest spike shift still counted as the same spike
+
+BUDGET = {'meanJitter': 0.5, 'unmatched': 0.05, 'rateError': 0.05}
+
+def segmentLabel(segmentLength):
+    return 'template' if segmentLength is None else f'{segmentLength:g} um'
+
+def parseSegments(values):
+    """'template' or maximum segment lengths (um) -> [None or float]"""
+
+    return [None if str(v) == 'template' else float(v) for v in values]
+
+###############################################################################
+# STUDY
+###############################################################################
+
+def cellConfig(cellName, stage=None, amps=(0.2, 0.3)):
+    return {'kind': 'sweeps', 'cell': cellName, 'stage': stage, 'amps': [float(a) for a in amps]}
+
+def networkConfig(model, numCells, duration=500.0, seed=42):
+    return {'kind': 'network', 'model': model, 'cells': numCells, 'duration': duration, 'seed': seed}
+
+def runPoint(config, dt, segmentLength, reference=None, window=WINDOW):
+    """
+    Simulate one grid point in a worker process and score it against the reference
+
+    Returns:
+        {'dt', 'segmentLength', 'segments' (per cell), 'create', 'run' (s), 'spikes',
+         'output' (reference only) or the errors: 'meanJitter', 'maxJitter',
+         'unmatched', 'rateError', 'countDistance'}
+    """
+
+    from benchmark_Yao1000 import runIsolated
+    from regression_Yao1000 import simulateCase, compareSpikes
+
+    output = runIsolated(simulateCase, config, dt, segmentLength)
+    point = {'dt': dt, 'segmentLength': segmentLength, 'segments': output['segments'],
+             'create': output['phases'].get('create', 0.0), 'run': output['phases']['run'],
+             'spikes': len(output['t'])}
+    if reference is None:
+        point['output'] = {key: output[key] for key in ('t', 'id', 'groups', 'duration')}
+        return point
+
+    # Only the error measures are used here, tolerances are applied by withinBudget
+    errors = compareSpikes(reference, output, {'jitter': window, 'unmatched': 1.0,
+                                               'countDistance': float('inf'), 'rateDeviation': float('inf')})
+    point.update({'meanJitter': errors['meanJitter'], 'maxJitter': errors['maxJitter'],
+                  'unmatched': errors['unmatched'], 'rateError': errors['rateDeviation'],
+                  'countDistance': errors['countDistance']})
+    return point
+
+def runStudy(config, dts=DTS, segments=SEGMENTS, reference=REFERENCE, window=WINDOW, verbose=True):
+    """
+    Reference run, then every (dt, segment length) point of the grid
+
+    Returns:
+        JSON-ready study record: 'config', 'window', 'reference', 'points', 'created', 'versions'
+    """
+
+    from instrument_Yao1000 import versions
+
+    if config['kind'] == 'network' and any(s is not None for s in list(segments) + [reference['segmentLength']]):
+        raise ValueError("network cells are single-compartment: use the template discretization only")
+
+    t0 = time.time()
+    ref = runPoint(config, reference['dt'], reference['segmentLength'])
+    if verbose:
+        print(f"   reference dt {ref['dt']:g} ms, {segmentLabel(ref['segmentLength'])}: "
+              f"{ref['spikes']} spikes, run {ref['run']:.2f} s ({time.time() - t0:.1f} s)")
+
+    points = []
+    for dt in dts:
+        for segmentLength in segments:
+            t0 = time.time()
+            try:
+                point = runPoint(config, dt, segmentLength, reference=ref['output'], window=window)
+            except Exception as e:
+                point = {'dt': dt, 'segmentLength': segmentLength, 'error': f'{type(e).__name__}: {e}'}
+            points.append(point)
+            if verbose:
+                print(f"   {formatPoint(point)}  ({time.time() - t0:.1f} s)")
+
+    return {'config': config, 'window': window, 'reference': ref, 'points': points,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'versions': versions()}
+
+###############################################################################
+# RECOMMENDATION
+###############################################################################
+
+def withinBudget(point, budget):
+    return 'error' not in point and all(point[metric] <= limit for metric, limit in budget.items())
+
+def recommend(study, budget=BUDGET):
+    """Cheapest grid point (integration time) within the error budget, or None"""
+
+    candidates = [p for p in study['points'] if withinBudget(p, budget)]
+    return min(candidates, key=lambda p: p['run'], default=None)
+
+def isCurrent(point):
+    return point['dt'] == CURRENT['dt'] and point['segmentLength'] == CURRENT['segmentLength']
+
+def formatPoint(point):
+    head = f"dt {point['dt']:<7g} {segmentLabel(point['segmentLength']):<9}"
+    if 'error' in point:
+        return f"{head} ✗ {point['error']}"
+    return (f"{head} {point['segments']:7.0f} segs  run {point['run']:7.2f} s  "
+            f"jitter {point['meanJitter']:.3f}/{point['maxJitter']:.3f} ms  "
+            f"unmatched {point['unmatched']:.3f}  rate {point['rateError']:.3f}")
+
+def printStudy(study, budget=BUDGET):
+    """Error/cost table of a study and the recommended setting"""
+
+    config, ref = study['config'], study['reference']
+    name = (f"{config['model']} network, {config['cells']} cells, {config['duration']:g} ms"
+            if config['kind'] == 'network' else
+            f"{config['cell']}" + (f" AD stage {config['stage']}" if config['stage'] else '')
+            + f", steps {', '.join(f'{a:g}' for a in config['amps'])} nA")
+
+    print("=" * 80)
+    print(f"CONVERGENCE: {name}")
+    print(f"Reference: dt {ref['dt']:g} ms, {segmentLabel(ref['segmentLength'])} "
+          f"({ref['segments']:.0f} segs/cell, {ref['spikes']} spikes, run {ref['run']:.2f} s); "
+          f"match window {study['window']:g} ms")
+    print("Budget: " + ', '.join(f'{k} <= {v:g}' for k, v in budget.items()))
+    print("=" * 80)
+    print(f"  {'dt (ms)':<8} {'segments':<9} {'segs':>6} {'run (s)':>8} {'speedup':>8} "
+          f"{'jitter':>7} {'max':>7} {'unmatch':>8} {'rate':>7}")
+    print("-" * 80)
+    for p in study['points']:
+        mark = ('*' if isCurrent(p) else ' ') + ('✓' if withinBudget(p, budget) else '✗')
+        if 'error' in p:
+            print(f"{mark} {p['dt']:<8g} {segmentLabel(p['segmentLength']):<9} {p['error']}")
+            continue
+        print(f"{mark} {p['dt']:<8g} {segmentLabel(p['segmentLength']):<9} {p['segments']:6.0f} "
+              f"{p['run']:8.2f} {ref['run'] / p['run'] if p['run'] else 0:7.1f}x "
+              f"{p['meanJitter']:7.3f} {p['maxJitter']:7.3f} {p['unmatched']:8.3f} {p['rateError']:7.3f}")
+    print("-" * 80)
+    print("* current setting (dt 0.025 ms, template); jitter in ms")
+
+    best = recommend(study, budget)
+    current = next((p for p in study['points'] if isCurrent(p) and 'error' not in p), None)
+    if best is None:
+        print("✗ No setting of the grid is within the budget (refine the grid or relax the budget)")
+    else:
+        line = f"✓ Recommended: dt {best['dt']:g} ms, {segmentLabel(best['segmentLength'])} (run {best['run']:.2f} s"
+        if current is not None and best['run'] > 0:
+            line += f", {current['run'] / best['run']:.1f}x the speed of the current setting"
+        print(line + ")")
+    print("=" * 80)
+    return best
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='dt x segment-length convergence study with a recommendation')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def addBudget(p):
+        p.add_argument('--max-jitter', type=float, default=BUDGET['meanJitter'], help='Mean spike shift (ms)')
+        p.add_argument('--max-unmatched', type=float, default=BUDGET['unmatched'], help='Unmatched spike fraction')
+        p.add_argument('--max-rate-error', type=float, default=BUDGET['rateError'], help='Relative rate error')
+
+    p = sub.add_parser('run', help='Run a study')
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument('--cell', choices=('HL23PYR', 'HL23SST', 'HL23PV', 'HL23VIP'), help='Single cell')
+    target.add_argument('--network', choices=('izhi', 'hh'), help='Network model (benchmark_Yao1000.MODELS)')
+    p.add_argument('--stage', type=int, default=None, choices=(1, 3), help='AD stage (HL23PYR only)')
+    p.add_argument('--amps', type=float, nargs='+', default=[0.2, 0.3], help='Step amplitudes (nA)')
+    p.add_argument('--cells', type=int, default=100, help='Network size')
+    p.add_argument('--duration', type=float, default=500.0, help='Network duration (ms)')
+    p.add_argument('--seed', type=int, default=42, help='Network seed')
+    p.add_argument('--dts', type=float, nargs='+', default=list(DTS), help='Time steps (ms)')
+    p.add_argument('--segments', nargs='+', default=None,
+                   help="Maximum segment lengths (um) or 'template' (cells only)")
+    p.add_argument('--ref-dt', type=float, default=REFERENCE['dt'], help='Reference time step (ms)')
+    p.add_argument('--ref-segment', type=str, default=None,
+                   help=f"Reference segment length (um) or 'template' (default {REFERENCE['segmentLength']:g})")
+    p.add_argument('--window', type=float, default=WINDOW, help='Spike matching window (ms)')
+    p.add_argument('--out', type=str, default=None, help='Output JSON (default convergence_<cell|model>.json)')
+    addBudget(p)
+
+    p = sub.add_parser('show', help='Print a study against a (new) budget')
+    p.add_argument('study', help='Study JSON')
+    addBudget(p)
+
+    args = parser.parse_args()
+    budget = {'meanJitter': args.max_jitter, 'unmatched': args.max_unmatched, 'rateError': args.max_rate_error}
+
+    if args.command == 'show':
+        with open(args.study) as f:
+            study = json.load(f)
+        printStudy(study, budget)
+        sys.exit(0)
+
+    if args.network:
+        if args.segments or args.ref_segment:
+            parser.error("network cells are single-compartment: --segments/--ref-segment apply to --cell only")
+        config = networkConfig(args.network, args.cells, args.duration, args.seed)
+        segments, reference = [None], {'dt': args.ref_dt, 'segmentLength': None}
+    else:
+        if args.stage is not None and args.cell != 'HL23PYR':
+            parser.error("AD stages are only defined for HL23PYR")
+        config = cellConfig(args.cell, args.stage, args.amps)
+        segments = parseSegments(args.segments) if args.segments else list(SEGMENTS)
+        refSegment = parseSegments([args.ref_segment])[0] if args.ref_segment else REFERENCE['segmentLength']
+        reference = {'dt': args.ref_dt, 'segmentLength': refSegment}
+    out = args.out or f"convergence_{args.cell or args.network}.json"
+
+    print("=" * 80)
+    print(f"CONVERGENCE STUDY: {len(args.dts) * len(segments)} points + reference")
+    print("=" * 80)
+    study = runStudy(config, args.dts, segments, reference, args.window)
+    with open(out, 'w') as f:
+        json.dump(study, f, indent=1)
+    print(f"✓ Saved {out}\n")
+    printStudy(study, budget)
@@ -0,0 +1,351 @@
+"""
+dendrec_HL23PYR.py
+
+Bulk multi-site dendritic recording for the HL23PYR cell (healthy or AD stage)
+Selects every segment of a set of section lists within a path-distance range
+from the soma and records v, cai (CaDynamics) or any other range variable of
+all of them through a single PtrVector: one gather per record step (a
+self-rescheduling CVode event) into one contiguous h.Vector frame, buffered in
+time blocks and flushed into memory-mapped (segments x time) float32 arrays. Segment positions (section,
+x, path distance, 3-D coordinates) are stored alongside.
+
+Store layout (<name>.dendrec/):
+    meta.json          variables, sections, record step, sample count
+    t.npy              (nSamples,) float64 time base (ms)
+    <var>.npy          (nSegments, nSamples) float32, e.g. v.npy, cai.npy
+    segments.npy       (nSegments,) sec index, x, dist (μm), xyz (μm)
+
+Usage:
+    python dendrec_HL23PYR.py --amp 0.3 --save healthy.dendrec                 # apical + basal, 0-inf μm
+    python dendrec_HL23PYR.py --stage 1 --amp 0.3 --dist 200 600 --secs apical --save ad1.dendrec
+    python dendrec_HL23PYR.py --info ad1.dendrec
+
+    from dendrec_HL23PYR import DendriteRecorder
+    recorder = DendriteRecorder(cell, 'healthy.dendrec', secLists=('apical',), distRange=(100, 500))
+    recorder.attach(tstop=1500)            # before h.finitialize
+    h.finitialize(-80); h.continuerun(1500)
+    store = recorder.close()               # DendriteStore, store['cai'][i] is segment i
+"""
+
+import os
+import json
+import shutil
+import argparse
+import numpy as np
+
+FORMAT = 'dendrec-v1'
+BLOCK_SIZE = 2000          # samples buffered in memory between flushes
+VARIABLES = ('v', 'cai')
+
+SEGMENT_DTYPE = np.dtype([('sec', '<i4'), ('x', '<f8'), ('dist', '<f8'),
+                          ('xc', '<f8'), ('yc', '<f8'), ('zc', '<f8')])
+
+###############################################################################
+# SEGMENT SELECTION
+###############################################################################
+
+def segmentCoords(sec, x):
+    """3-D position (μm) of location x of a section, interpolated along its 3-D points"""
+
+    n = int(sec.n3d())
+    if n == 0:
+        return (np.nan, np.nan, np.nan)
+    arc = np.array([sec.arc3d(i) for i in range(n)]) / max(sec.L, 1e-9)
+    return tuple(float(np.interp(x, arc, [getattr(sec, c)(i) for i in range(n)]))
+                 for c in ('x3d', 'y3d', 'z3d'))
+
+def selectSegments(cell, secLists=('apical', 'basal'), distRange=(0.0, np.inf), origin=None):
+    """
+    Segments of the given section lists whose path distance lies in distRange
+
+    Args:
+        cell: NEURON cell object (NeuronTemplate_HL23PYR)
+        secLists: names of the template's SectionLists ('apical', 'basal',
+            'somatic', 'axonal', 'all') or section arrays ('apic', 'dend', ...)
+        distRange: (min, max) path distance from origin (μm)
+        origin: reference segment (default soma[0](0.5))
+
+    Returns:
+        segments: list of nrn.Segment
+        secNames: names of the sections, indexed by segments['sec']
+        info: (nSegments,) SEGMENT_DTYPE array
+    """
+
+    from neuron import h
+
+    origin = origin if origin is not None else cell.soma[0](0.5)
+    dmin, dmax = distRange
+
+    segments, secNames, rows = [], [], []
+    seen = set()
+    for name in secLists:
+        for sec in getattr(cell, name):
+            if sec.name() in seen:
+                continue
+            seen.add(sec.name())
+            secIndex = len(secNames)
+            secNames.append(sec.name())
+            for seg in sec:
+                dist = h.distance(origin, seg)
+                if dmin <= dist <= dmax:
+                    segments.append(seg)
+                    rows.append((secIndex, seg.x, dist) + segmentCoords(sec, seg.x))
+
+    info = np.array(rows, dtype=SEGMENT_DTYPE)
+    return segments, secNames, info
+
+###############################################################################
+# RECORDER
+###############################################################################
+
+class DendriteRecorder:
+    """
+    Records variables of many segments into one store, one gather per sample
+
+    Args:
+        cell: NEURON cell object
+        path: output store directory (replaced if it exists)
+        secLists, distRange, origin: segment selection (see selectSegments)
+        variables: range variables to record; segments without one (e.g. no
+            ca ion) are recorded as NaN
+        recordStep: sampling interval (ms)
+        blockSize: samples buffered between flushes to the memory maps
+    """
+
+    def __init__(self, cell, path, secLists=('apical', 'basal'), distRange=(0.0, np.inf), origin=None,
+                 variables=VARIABLES, recordStep=0.1, blockSize=BLOCK_SIZE):
+        self.path = path
+        self.variables = list(variables)
+        self.recordStep = recordStep
+        self.blockSize = blockSize
+        self.segments, self.secNames, self.info = selectSegments(cell, secLists, distRange, origin)
+        self.attrs = {'secLists': list(secLists), 'distRange': [float(d) for d in distRange]}
+
+    def attach(self, tstop):
+        """Allocate the store and register the sampling hooks (before finitialize)"""
+
+        from neuron import h
+
+        nSeg, nVar = len(self.segments), len(self.variables)
+        self.nSamples = int(round(tstop / self.recordStep)) + 1
+
+        # One pointer per (variable, segment), variable-major
+        self._missing = h.Vector(1)
+        self._missing.x[0] = np.nan
+        self.ptrs = h.PtrVector(nVar * nSeg)
+        for j, var in enumerate(self.variables):
+            for i, seg in enumerate(self.segments):
+                ref = getattr(seg, '_ref_' + var, None) if hasattr(seg, var) else None
+                self.ptrs.pset(j * nSeg + i, ref if ref is not None else self._missing._ref_x[0])
+
+        self.frame = h.Vector(nVar * nSeg)
+        self.block = np.empty((self.blockSize, nVar, nSeg), dtype=np.float32)
+
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.makedirs(self.path)
+        np.save(os.path.join(self.path, 'segments.npy'), self.info)
+        self.maps = {var: np.lib.format.open_memmap(os.path.join(self.path, var + '.npy'), mode='w+',
+                                                    dtype=np.float32, shape=(nSeg, self.nSamples))
+                     for var in self.variables}
+
+        self._init = h.FInitializeHandler(1, self._start)
+
+    def _start(self):
+        from neuron import h
+
+        self.written = 0
+        self.buffered = 0
+        self._gather()
+        if self.nSamples > 1:
+            h.CVode().event(self.recordStep, self._sample)
+
+    def _sample(self):
+        # Self-rescheduling event: all states are consistent at h.t when it fires
+        from neuron import h
+
+        self._gather()
+        n = self.written + self.buffered
+        if n < self.nSamples:
+            h.CVode().event(n * self.recordStep, self._sample)
+
+    def _gather(self):
+        self.ptrs.gather(self.frame)
+        self.block[self.buffered] = self.frame.as_numpy().reshape(len(self.variables), -1)
+        self.buffered += 1
+        if self.buffered == self.blockSize:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered samples into the memory maps"""
+
+        n = self.buffered
+        if n:
+            span = slice(self.written, self.written + n)
+            for j, var in enumerate(self.variables):
+                self.maps[var][:, span] = self.block[:n, j].T
+            self.written += n
+            self.buffered = 0
+
+    def close(self):
+        """Flush, detach from NEURON and write meta.json; returns the opened store"""
+
+        self._init = None
+        self.flush()
+        for mm in self.maps.values():
+            mm.flush()
+        self.maps = {}
+
+        np.save(os.path.join(self.path, 't.npy'), np.arange(self.written) * self.recordStep)
+        meta = {
+            'format': FORMAT,
+            'variables': self.variables,
+            'nSegments': len(self.segments),
+            'nSamples': self.written,
+            'recordStep': self.recordStep,
+            'sections': self.secNames,
+            'attrs': self.attrs,
+        }
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=1)
+
+        return DendriteStore(self.path)
+
+###############################################################################
+# STORE
+###############################################################################
+
+class DendriteStore:
+    """
+    Memory-mapped access to a dendritic recording
+
+    store.t                 time base (ms)
+    store.segments          SEGMENT_DTYPE table (sec, x, dist, xc, yc, zc)
+    store['v'], store['cai']  (nSegments, nSamples) float32 memmaps
+    store.select(distRange, sections)  segment indices
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} dendritic recording")
+
+        self.variables = self.meta['variables']
+        self.sections = self.meta['sections']
+        self.segments = np.load(os.path.join(path, 'segments.npy'))
+        self.t = np.load(os.path.join(path, 't.npy'), mmap_mode='r')
+        self._maps = {}
+
+    def __repr__(self):
+        return (f"DendriteStore('{self.path}', {self.meta['nSegments']} segments x "
+                f"{self.meta['nSamples']} samples: {', '.join(self.variables)})")
+
+    def __getitem__(self, var):
+        if var not in self._maps:
+            mm = np.load(os.path.join(self.path, var + '.npy'), mmap_mode='r')
+            self._maps[var] = mm[:, :self.meta['nSamples']]
+        return self._maps[var]
+
+    def select(self, distRange=None, sections=None):
+        """Indices of the segments within distRange (μm) and/or on sections matching a name prefix"""
+
+        keep = np.ones(len(self.segments), dtype=bool)
+        if distRange is not None:
+            keep &= (self.segments['dist'] >= distRange[0]) & (self.segments['dist'] <= distRange[1])
+        if sections is not None:
+            names = np.array(self.sections)[self.segments['sec']]
+            keep &= np.char.startswith(names.astype(str), sections)
+        return np.flatnonzero(keep)
+
+###############################################################################
+# STEP PROTOCOL
+###############################################################################
+
+def recordDendrites(path, amp, ad_stage=None, secLists=('apical', 'basal'), distRange=(0.0, np.inf),
+                    variables=VARIABLES, delay=200.0, dur=1000.0, tstop=1500.0, dt=0.025,
+                    recordStep=0.1, celsius=34.0, v_init=-80.0):
+    """
+    One somatic current step on HL23PYR with bulk dendritic recording
+
+    Returns:
+        DendriteStore
+    """
+
+    import cellwrapper
+    from neuron import h
+
+    cell = cellwrapper.loadCells('HL23PYR', 1, ad=ad_stage is not None, ad_stage=ad_stage)[0]
+
+    stim = h.IClamp(cell.soma[0](0.5))
+    stim.delay = delay
+    stim.dur = dur
+    stim.amp = amp
+
+    recorder = DendriteRecorder(cell, path, secLists, distRange, variables=variables, recordStep=recordStep)
+    recorder.attach(tstop)
+
+    h.CVode().active(0)
+    h.celsius = celsius
+    h.dt = dt
+    h.steps_per_ms = 1.0 / dt
+    h.finitialize(v_init)
+    h.continuerun(tstop)
+
+    store = recorder.close()
+    store.meta['attrs'].update({'amp': amp, 'ad_stage': ad_stage})
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(store.meta, f, indent=1)
+    return store
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Bulk dendritic v / cai recording of HL23PYR')
+    parser.add_argument('--stage', type=int, default=None, choices=(1, 3), help='AD stage')
+    parser.add_argument('--amp', type=float, default=0.3, help='Somatic step amplitude (nA)')
+    parser.add_argument('--secs', type=str, nargs='+', default=['apical', 'basal'], help='Section lists')
+    parser.add_argument('--dist', type=float, nargs=2, default=[0.0, np.inf], help='Path distance range (μm)')
+    parser.add_argument('--vars', type=str, nargs='+', default=list(VARIABLES), help='Range variables')
+    parser.add_argument('--record-step', type=float, default=0.1, help='Sampling interval (ms)')
+    parser.add_argument('--save', type=str, default='HL23PYR.dendrec', help='Output store')
+    parser.add_argument('--info', type=str, default=None, help='Summarize an existing store and exit')
+    args = parser.parse_args()
+
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms()
+
+    if args.info:
+        store = DendriteStore(args.info)
+    else:
+        label = 'HL23PYR' + (f' AD Stage {args.stage}' if args.stage else ' (healthy)')
+        print("=" * 80)
+        print(f"DENDRITIC RECORDING: {label}, {args.amp:.3f} nA step")
+        print("=" * 80)
+
+        import time
+        t0 = time.time()
+        store = recordDendrites(args.save, args.amp, ad_stage=args.stage, secLists=args.secs,
+                                distRange=args.dist, variables=args.vars, recordStep=args.record_step)
+        print(f"Simulated and recorded in {time.time() - t0:.2f} s")
+
+    print(store)
+    dist = store.segments['dist']
+    if len(dist):
+        print(f"Path distance: {dist.min():.0f} - {dist.max():.0f} μm in "
+              f"{len(np.unique(store.segments['sec']))} sections")
+    for var in store.variables:
+        data = store[var]
+        present = ~np.isnan(data[:, 0])
+        if present.any():
+            print(f"  {var:>6s}: min {np.min(data[present]):.4g}, max {np.max(data[present]):.4g} "
+                  f"({np.count_nonzero(present)} segments)")
+        else:
+            print(f"  {var:>6s}: not present in the selected segments")
+    if not args.info:
+        print(f"\n✓ Recording saved to: {args.save}")
+    print("=" * 80)
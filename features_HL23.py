@@ -0,0 +1,396 @@
+"""
+features_HL23.py
+
+Vectorized electrophysiology feature extraction over (sweeps x time) arrays
+Threshold crossings of all sweeps are detected at once and every per-spike
+feature is computed on gathered windows / reduceat segments, so there is no
+Python loop per spike or per sweep. Fast enough to sit inside an optimizer loop.
+
+Features (the quantities listed in the AD biophysics headers):
+    per spike:  threshold, peak, AP amplitude, half-width, AHP trough/depth
+    per sweep:  spike count, rate, latency, mean ISI, adaptation index
+    per cell:   rheobase (pA), F-I slope (Hz/pA)
+
+Usage:
+    python features_HL23.py healthy.sweeps                    # Sweeps saved by sweeps_HL23.py
+    python features_HL23.py healthy.sweeps stage1.sweeps      # Side-by-side comparison
+    python features_HL23.py data/sweep_45_sim.json --amps 0.17  # Any file sweepio_HL23 can open
+    python features_HL23.py --benchmark                  # Throughput on synthetic sweeps
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+
+###############################################################################
+# DETECTION PARAMETERS
+###############################################################################
+
+SPIKE_THRESHOLD = -20.0   # mV, upward crossing counts as a spike (= netParams.defaultThreshold)
+DVDT_THRESHOLD = 20.0     # mV/ms, AP threshold definition (Allen Cell Types convention)
+THRESHOLD_WINDOW = 3.0    # ms searched before the crossing for the AP threshold
+PEAK_WINDOW = 2.0         # ms searched after the crossing for the AP peak
+WIDTH_WINDOW = 2.0        # ms searched on each side of the peak for the half-width
+
+###############################################################################
+# SPIKE DETECTION
+###############################################################################
+
+def detectSpikes(V, start=0, stop=None, threshold=SPIKE_THRESHOLD):
+    """
+    Upward threshold crossings of every sweep
+
+    Args:
+        V: (nSweeps, nSamples) membrane potential (mV)
+        start, stop: sample range searched (e.g. the stimulus window)
+
+    Returns:
+        sweepIdx, sampleIdx: crossing positions ordered by sweep, then time
+    """
+
+    stop = V.shape[1] if stop is None else stop
+    above = (V[:, start:stop] >= threshold).view(np.int8)
+    flat = np.flatnonzero(np.diff(above, axis=1) == 1)  # flat search is much cheaper than 2-D nonzero
+    sweepIdx, sampleIdx = np.divmod(flat, stop - start - 1)
+    return sweepIdx, sampleIdx + start + 1
+
+def _windows(sampleIdx, offsets, nSamples):
+    """(nSpikes, len(offsets)) sample indices around each spike, clipped to the sweep"""
+
+    return np.clip(sampleIdx[:, None] + offsets[None, :], 0, nSamples - 1)
+
+def _gather(Vflat, rowStart, win):
+    """Values of V at window indices, gathered from the flattened array"""
+
+    return Vflat[rowStart[:, None] + win]
+
+###############################################################################
+# PER-SPIKE FEATURES
+###############################################################################
+
+def spikeFeatures(V, dt, sweepIdx, sampleIdx, segmentEnd=None, dvdtThreshold=DVDT_THRESHOLD):
+    """
+    Threshold, peak, amplitude, half-width and AHP of every detected spike
+
+    Args:
+        V: (nSweeps, nSamples) membrane potential (mV)
+        dt: sampling interval (ms)
+        sweepIdx, sampleIdx: output of detectSpikes()
+        segmentEnd: sample index closing the AHP search of each sweep's last
+            spike (default: end of sweep)
+
+    Returns:
+        dict of (nSpikes,) arrays; ahpV/ahpDepth are NaN for a spike whose
+        peak is the last sample of its sweep or segment
+    """
+
+    nSweeps, nSamples = V.shape
+    Vflat = np.ravel(V)
+    rowStart = sweepIdx * nSamples
+    k = np.arange(len(sweepIdx))
+
+    # AP peak: maximum shortly after the crossing
+    win = _windows(sampleIdx, np.arange(int(round(PEAK_WINDOW / dt)) + 1), nSamples)
+    peakIdx = win[k, np.argmax(_gather(Vflat, rowStart, win), axis=1)]
+    peakV = Vflat[rowStart + peakIdx]
+
+    # AP threshold: first sample after the last dV/dt < dvdtThreshold before the crossing
+    nBack = int(round(THRESHOLD_WINDOW / dt))
+    win = _windows(sampleIdx, np.arange(-nBack, 1), nSamples)
+    below = np.diff(_gather(Vflat, rowStart, win), axis=1) < dvdtThreshold * dt
+    lastBelow = below.shape[1] - 1 - np.argmax(below[:, ::-1], axis=1)
+    lastBelow[~below.any(axis=1)] = -1
+    thresholdIdx = win[k, lastBelow + 1]
+    thresholdV = Vflat[rowStart + thresholdIdx]
+
+    amplitude = peakV - thresholdV
+
+    # Half-width: linear interpolation of the half-amplitude crossings around the peak
+    halfV = 0.5 * (peakV + thresholdV)
+    nSide = int(round(WIDTH_WINDOW / dt))
+    win = _windows(peakIdx, np.arange(-nSide, nSide + 1), nSamples)
+    Vw = _gather(Vflat, rowStart, win)
+    under = Vw < halfV[:, None]
+    upUnder = nSide - 1 - np.argmax(under[:, nSide - 1::-1], axis=1)          # last sample below, before peak
+    downUnder = nSide + 1 + np.argmax(under[:, nSide + 1:], axis=1)           # first sample below, after peak
+    v0, v1 = Vw[k, upUnder], Vw[k, upUnder + 1]
+    tUp = upUnder + (halfV - v0) / np.where(v1 != v0, v1 - v0, 1.0)
+    v0, v1 = Vw[k, downUnder - 1], Vw[k, downUnder]
+    tDown = downUnder - 1 + (v0 - halfV) / np.where(v0 != v1, v0 - v1, 1.0)
+    halfWidth = (tDown - tUp) * dt
+    halfWidth[~under[:, :nSide].any(axis=1) | ~under[:, nSide + 1:].any(axis=1)] = np.nan
+
+    # AHP: minimum between this peak and the next one (or the segment end) via one reduceat
+    if segmentEnd is None:
+        segmentEnd = np.full(nSweeps, nSamples - 1)
+    segmentEnd = np.broadcast_to(segmentEnd, (nSweeps,))
+    flatStart = rowStart + peakIdx
+    flatEnd = np.empty_like(flatStart)
+    if len(flatStart):
+        sameSweep = sweepIdx[1:] == sweepIdx[:-1]
+        flatEnd[:-1] = np.where(sameSweep, flatStart[1:], sweepIdx[:-1] * nSamples + segmentEnd[sweepIdx[:-1]])
+        flatEnd[-1] = sweepIdx[-1] * nSamples + segmentEnd[sweepIdx[-1]]
+    noTrough = flatEnd <= flatStart + 1  # peak on the last sample of its sweep or segment
+    flatEnd = np.maximum(flatEnd, flatStart + 1)
+    bounds = np.column_stack([flatStart, np.minimum(flatEnd, V.size - 1)]).ravel()
+    ahpV = np.minimum.reduceat(Vflat, bounds)[::2] if len(bounds) else np.empty(0)
+    ahpV[noTrough] = np.nan
+
+    return {
+        'sweep': sweepIdx,
+        'index': sampleIdx,
+        't': thresholdIdx * dt,
+        'thresholdV': thresholdV,
+        'peakV': peakV,
+        'amplitude': amplitude,
+        'halfWidth': halfWidth,
+        'ahpV': ahpV,
+        'ahpDepth': thresholdV - ahpV,
+    }
+
+###############################################################################
+# PER-SWEEP FEATURES
+###############################################################################
+
+def _groupMean(values, groupIdx, nGroups):
+    """Mean of values within each group (NaN where a group has none)"""
+
+    valid = np.isfinite(values)
+    total = np.bincount(groupIdx[valid], weights=values[valid], minlength=nGroups)
+    count = np.bincount(groupIdx[valid], minlength=nGroups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / count
+
+def sweepFeatures(spikes, nSweeps, stimStart, stimDur):
+    """
+    Spike count, rate, latency, ISI and adaptation index of every sweep
+
+    Args:
+        spikes: output of spikeFeatures()
+        stimStart, stimDur: step onset and duration (ms)
+
+    Returns:
+        dict of (nSweeps,) arrays
+    """
+
+    sweepIdx = spikes['sweep']
+    times = spikes['t']
+
+    numSpikes = np.bincount(sweepIdx, minlength=nSweeps)
+
+    latency = np.full(nSweeps, np.nan)
+    first = np.ones(len(sweepIdx), dtype=bool)
+    first[1:] = sweepIdx[1:] != sweepIdx[:-1]
+    latency[sweepIdx[first]] = times[first] - stimStart
+
+    # ISIs and the Allen adaptation index mean((ISI[n+1]-ISI[n]) / (ISI[n+1]+ISI[n]))
+    sameSweep = sweepIdx[1:] == sweepIdx[:-1]
+    isi = np.diff(times)[sameSweep]
+    isiSweep = sweepIdx[1:][sameSweep]
+    pair = isiSweep[1:] == isiSweep[:-1]
+    norm = ((isi[1:] - isi[:-1]) / (isi[1:] + isi[:-1]))[pair]
+
+    return {
+        'numSpikes': numSpikes,
+        'rate': numSpikes / (stimDur / 1000.0),
+        'latency': latency,
+        'meanISI': _groupMean(isi, isiSweep, nSweeps),
+        'adaptation': _groupMean(norm, isiSweep[1:][pair], nSweeps),
+        'amplitude': _groupMean(spikes['amplitude'], sweepIdx, nSweeps),
+        'halfWidth': _groupMean(spikes['halfWidth'], sweepIdx, nSweeps),
+        'ahpDepth': _groupMean(spikes['ahpDepth'], sweepIdx, nSweeps),
+    }
+
+###############################################################################
+# PER-CELL FEATURES
+###############################################################################
+
+def cellFeatures(amps, sweeps, groups=None):
+    """
+    Rheobase and F-I slope, optionally for many cells (groups) at once
+
+    Args:
+        amps: (nSweeps,) step amplitudes (nA)
+        sweeps: output of sweepFeatures()
+        groups: (nSweeps,) cell/candidate index of every sweep (default: one cell)
+
+    Returns:
+        dict of (nGroups,) arrays: rheobase (pA), fiSlope (Hz/pA) and the
+        AP features of the rheobase sweep
+    """
+
+    ampsPA = np.asarray(amps, dtype=float) * 1000.0
+    groups = np.zeros(len(ampsPA), dtype=int) if groups is None else np.asarray(groups)
+    nGroups = groups.max() + 1 if len(groups) else 0
+    firing = sweeps['numSpikes'] > 0
+
+    # Rheobase: smallest amplitude with at least one spike
+    rheobase = np.full(nGroups, np.inf)
+    np.minimum.at(rheobase, groups[firing], ampsPA[firing])
+    rheobase[np.isinf(rheobase)] = np.nan
+
+    # F-I slope: least-squares line through the suprathreshold sweeps of each group
+    x = ampsPA[firing]
+    y = sweeps['rate'][firing]
+    g = groups[firing]
+    n = np.bincount(g, minlength=nGroups)
+    sx = np.bincount(g, weights=x, minlength=nGroups)
+    sy = np.bincount(g, weights=y, minlength=nGroups)
+    sxx = np.bincount(g, weights=x * x, minlength=nGroups)
+    sxy = np.bincount(g, weights=x * y, minlength=nGroups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fiSlope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    fiSlope[n < 2] = np.nan
+
+    # AP shape at rheobase (first spike sweep of each group)
+    atRheobase = firing & (ampsPA == rheobase[groups])
+    rheoSweep = np.full(nGroups, -1)
+    rheoSweep[groups[atRheobase][::-1]] = np.flatnonzero(atRheobase)[::-1]
+    cell = {'rheobase': rheobase, 'fiSlope': fiSlope}
+    for key in ['amplitude', 'halfWidth', 'ahpDepth']:
+        values = np.full(nGroups, np.nan)
+        values[rheoSweep >= 0] = sweeps[key][rheoSweep[rheoSweep >= 0]]
+        cell[key] = values
+
+    # Adaptation index: mean over all sweeps with at least three spikes
+    cell['adaptation'] = _groupMean(sweeps['adaptation'], groups, nGroups)
+
+    return cell
+
+###############################################################################
+# ALL FEATURES
+###############################################################################
+
+def extractFeatures(t, V, amps, stimStart, stimDur, groups=None, threshold=SPIKE_THRESHOLD):
+    """
+    Per-spike, per-sweep and per-cell features of a batch of current steps
+
+    Args:
+        t: (nSamples,) uniform time base (ms)
+        V: (nSweeps, nSamples) membrane potential (mV)
+        amps: (nSweeps,) step amplitudes (nA)
+        stimStart, stimDur: step onset and duration (ms)
+        groups: (nSweeps,) cell index of every sweep when V stacks many cells
+
+    Returns:
+        {'spikes': {...}, 'sweeps': {...}, 'cell': {...}}
+    """
+
+    V = np.asarray(V)
+    dt = t[1] - t[0]
+    start = int(round((stimStart - t[0]) / dt))
+    stop = min(int(round((stimStart + stimDur - t[0]) / dt)) + 1, V.shape[1])
+
+    sweepIdx, sampleIdx = detectSpikes(V, start, stop, threshold)
+    spikes = spikeFeatures(V, dt, sweepIdx, sampleIdx, segmentEnd=stop - 1)
+    spikes['t'] = spikes['t'] + t[0]
+    sweeps = sweepFeatures(spikes, V.shape[0], stimStart, stimDur)
+    cell = cellFeatures(amps, sweeps, groups)
+
+    return {'spikes': spikes, 'sweeps': sweeps, 'cell': cell}
+
+###############################################################################
+# BENCHMARK
+###############################################################################
+
+def syntheticSweeps(nSweeps, duration=1500.0, dt=0.1, stimStart=200.0, stimDur=1000.0, seed=0):
+    """Adapting spike trains with a stereotyped AP waveform (no NEURON required)"""
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(round(duration / dt)) + 1) * dt
+    V = np.full((nSweeps, len(t)), -75.0) + rng.normal(0, 0.2, (nSweeps, len(t)))
+
+    # AP waveform: fast rise to +40 mV, 1 ms decay, 10 ms AHP
+    w = np.arange(0, 15.0, dt)
+    wave = np.where(w < 0.5, -45 + 170 * w, 40 - 95 * (1 - np.exp(-(w - 0.5) / 0.4)))
+    wave = np.where(w >= 0.5, wave + 8 * (1 - np.exp(-(w - 0.5) / 10.0)), wave) - (-75.0)
+
+    rates = rng.uniform(0, 40, nSweeps)
+    for i in range(nSweeps):
+        n = int(rates[i] * stimDur / 1000.0)
+        if n == 0:
+            continue
+        isi = np.linspace(1.0, 1.6, n) * stimDur / (1.25 * n)
+        k = ((stimStart + np.cumsum(isi) - isi[0] + 5.0) / dt).astype(int)
+        k = k[k + len(w) < len(t)]
+        idx = k[:, None] + np.arange(len(w))[None, :]
+        np.maximum.at(V[i], idx.ravel(), np.tile(wave - 75.0, len(k)))
+
+    return t, V, rates
+
+def benchmark(nSweeps=2000, dt=0.1):
+    """Print sweeps/second of extractFeatures() on synthetic data"""
+
+    import time
+
+    t, V, _ = syntheticSweeps(nSweeps, dt=dt)
+    amps = np.linspace(0.0, 0.4, nSweeps)
+
+    t0 = time.time()
+    out = extractFeatures(t, V, amps, stimStart=200.0, stimDur=1000.0)
+    elapsed = time.time() - t0
+
+    print(f"{nSweeps} sweeps x {V.shape[1]} samples, {len(out['spikes']['sweep'])} spikes: "
+          f"{elapsed * 1000:.1f} ms ({nSweeps / elapsed:,.0f} sweeps/s)")
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Extract electrophysiology features from current-step sweeps')
+    parser.add_argument('files', nargs='*', help='Sweep stores or files readable by sweepio_HL23')
+    parser.add_argument('--start', type=float, default=None, help='Step onset (ms), default from the store')
+    parser.add_argument('--dur', type=float, default=None, help='Step duration (ms), default from the store')
+    parser.add_argument('--amps', type=float, nargs='+', default=None, help='Step amplitudes (nA) if not in the store')
+    parser.add_argument('--benchmark', action='store_true', help='Measure throughput on synthetic sweeps')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for n in [100, 1000, 10000]:
+            benchmark(n)
+        sys.exit(0)
+
+    if not args.files:
+        parser.print_help()
+        sys.exit(1)
+
+    import sweepio_HL23
+
+    results = {}
+    for path in args.files:
+        store = sweepio_HL23.openSweeps(path)
+        amps = np.array(args.amps) if args.amps else store.amps
+        start = args.start if args.start is not None else store.attrs.get('delay', 200.0)
+        dur = args.dur if args.dur is not None else store.attrs.get('dur', 1000.0)
+        V = store.sweeps(dtype=np.float64)
+        results[path] = (amps, extractFeatures(np.asarray(store.t), V, amps, start, dur))
+
+    print("=" * 80)
+    print("CELL FEATURES")
+    print("=" * 80)
+
+    rows = [
+        ('Rheobase (pA)', 'rheobase'),
+        ('F-I slope (Hz/pA)', 'fiSlope'),
+        ('AP amplitude (mV)', 'amplitude'),
+        ('AP half-width (ms)', 'halfWidth'),
+        ('AHP depth (mV)', 'ahpDepth'),
+        ('Adaptation index', 'adaptation'),
+    ]
+    names = [os.path.basename(p.rstrip('/')) for p in args.files]
+    print(f"{'Feature':<22}" + ''.join(f"{n:>18s}" for n in names))
+    print("-" * 80)
+    for label, key in rows:
+        print(f"{label:<22}" + ''.join(f"{results[p][1]['cell'][key][0]:>18.4f}" for p in args.files))
+
+    print("=" * 80)
+    print("SPIKES PER SWEEP")
+    print("-" * 80)
+    for path, name in zip(args.files, names):
+        amps, feats = results[path]
+        counts = ', '.join(f"{a * 1000:.0f}:{n}" for a, n in zip(amps, feats['sweeps']['numSpikes']))
+        print(f"{name}: {counts}")
+    print("=" * 80)
@@ -0,0 +1,451 @@
+"""
+fitIzhi_HL23.py
+
+Izhikevich (Izhi2007b) parameters fitted to the detailed HL23 cells
+Every detailed cell type (healthy, plus AD stages 1 and 3 of HL23PYR) is run
+over a current-step protocol once; its F-I curve, rheobase, adaptation index,
+resting potential and input resistance are the targets. C, k, vr, vt, a, b, c
+and d of the point neuron of netParams_Yao1000_v2 (same soma section, same
+mechanism, same integration step) are then fitted by differential evolution
+(optimize_HL23PYR.differentialEvolution), each generation simulated as one
+NEURON run. The variants are fitted in parallel worker processes.
+
+The fitted table is written to data/izhi_HL23.json, which netParams_Yao1000_v2
+loads when present: the healthy fits replace the generic cellTypes
+parameters, the AD fits add 'HL23PYR_AD<stage>_rule' cell rules (used by
+hybrid_Yao1000 point populations with an AD stage). Detailed-cell targets are
+kept in the table and reused while the mod, hoc and morphology files and the
+protocol are unchanged.
+
+Each table entry records poorFit (score above POOR_FIT_SCORE) and atBounds
+(parameters left at the edge of BOUNDS); netParams_Yao1000_v2 and
+hybrid_Yao1000 report poorly fitted variants before they are used. The AD
+stage 3 cell enters depolarization block at strong steps, which the
+Izhikevich neuron cannot reproduce, so its fit is only approximate.
+
+Note that the mechanism divides its current by C: C scales the membrane time
+constant and the gain of every other current on the section (steps, synapses)
+together, so it is fitted like any other parameter.
+
+Usage:
+    python fitIzhi_HL23.py                                  # Fit all variants, write data/izhi_HL23.json
+    python fitIzhi_HL23.py --variants HL23PYR HL23PYR:1     # Refit some variants (others are kept)
+    python fitIzhi_HL23.py --workers 6 --popsize 24 --generations 40
+    python fitIzhi_HL23.py --remeasure                      # Re-simulate the detailed targets
+    python fitIzhi_HL23.py --show                           # Print the current table
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import hashlib
+import argparse
+import multiprocessing
+import numpy as np
+
+import features_HL23
+from sweeps_HL23 import LONG_SQUARE
+from optimize_HL23PYR import scoreCandidates, differentialEvolution
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+TABLE_PATH = os.path.join(BASEDIR, 'data', 'izhi_HL23.json')
+
+###############################################################################
+# PROTOCOL AND PARAMETERS
+###############################################################################
+
+# Detailed variants: (cellType, AD stage)
+VARIANTS = (('HL23PYR', None), ('HL23PYR', 1), ('HL23PYR', 3),
+            ('HL23SST', None), ('HL23PV', None), ('HL23VIP', None))
+
+# Step amplitudes (nA): one hyperpolarizing step for the input resistance,
+# then 25 pA steps up to 2-8x the rheobase of the detailed types
+HYPER_AMP = -0.05
+FIT_AMPS = np.round(np.concatenate([[HYPER_AMP], np.arange(0.0, 0.4001, 0.025)]), 3)
+
+# The point neuron starts at rest (v = vr, u = 0), so its sweeps skip most of the settling time
+IZHI_DELAY = 50.0  # ms
+
+DT = 0.025  # ms, as in the network simConfig
+
+# Fitted parameters: (lower, upper, log-scaled search)
+BOUNDS = {
+    'C': (0.1, 20.0, True),
+    'k': (0.05, 10.0, True),
+    'vr': (-95.0, -55.0, False),
+    'vt': (-60.0, -15.0, False),
+    'a': (0.00005, 0.5, True),
+    'b': (-60.0, 60.0, False),
+    'c': (-90.0, -20.0, False),
+    'd': (0.0, 1500.0, False),
+}
+PARAM_NAMES = tuple(BOUNDS)
+
+# Fit quality flags stored with every table entry
+POOR_FIT_SCORE = 50.0  # scores above this do not reproduce the detailed F-I curve
+BOUND_MARGIN = 0.005   # parameters within this fraction of the search range of a bound
+
+REFIT_SPAN = 0.2  # a refit searches +- this fraction of every range around the previous fit
+
+# Target tolerances (score = sum of squared z-scores, see optimize_HL23PYR.scoreCandidates)
+TARGET_SD = {
+    'rheobase': 25.0,          # pA, the step resolution
+    'adaptation': 0.02,
+    'restingV': 1.0,           # mV
+    'inputResistance': 0.1,    # relative
+    'numSpikes': (2.0, 0.1),   # max(absolute, relative) spike-count tolerance
+}
+
+def variantLabel(cellType, stage=None):
+    return cellType + (f'_AD{stage}' if stage else '')
+
+def fitQuality(entry):
+    """{'poorFit', 'atBounds'} of a table entry: score above POOR_FIT_SCORE, parameters stuck at a bound"""
+
+    lower, upper = searchBox()
+    x = encode(entry['params'])
+    margin = BOUND_MARGIN * (upper - lower)
+    near = (x <= lower + margin) | (x >= upper - margin)
+    atBounds = [name for name, flag in zip(PARAM_NAMES, near) if flag]
+    return {'poorFit': bool(entry['score'] > POOR_FIT_SCORE), 'atBounds': atBounds}
+
+###############################################################################
+# FEATURES
+###############################################################################
+
+def subthreshold(t, V, amps, stimStart, stimDur):
+    """
+    Resting potential and input resistance of every sweep
+
+    Returns:
+        restingV: (nSweeps,) mean potential over the 50 ms before the step (mV)
+        inputResistance: (nSweeps,) steady-state deflection over the last 100 ms
+            of the step / amplitude (MOhm), NaN for non-hyperpolarizing sweeps
+    """
+
+    rest = V[:, (t >= stimStart - 50.0) & (t < stimStart)].mean(axis=1)
+    steady = V[:, (t >= stimStart + stimDur - 100.0) & (t < stimStart + stimDur)].mean(axis=1)
+    amps = np.asarray(amps, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        resistance = np.where(amps < 0, (steady - rest) / amps, np.nan)
+    return rest, resistance
+
+def sweepTargets(t, V, amps, stimStart, stimDur, groups=None):
+    """Features of stacked sweeps: extractFeatures() output with restingV and inputResistance added to 'cell'"""
+
+    feats = features_HL23.extractFeatures(t, V, amps, stimStart, stimDur, groups)
+    groups = np.zeros(len(amps), dtype=int) if groups is None else np.asarray(groups)
+    nGroups = groups.max() + 1
+    rest, resistance = subthreshold(t, V, amps, stimStart, stimDur)
+    feats['cell']['restingV'] = features_HL23._groupMean(np.where(np.asarray(amps) == 0, rest, np.nan),
+                                                         groups, nGroups)
+    feats['cell']['inputResistance'] = features_HL23._groupMean(resistance, groups, nGroups)
+    return feats
+
+def measureTarget(cellType, stage=None):
+    """Features of the detailed cell over FIT_AMPS (run in a worker process)"""
+
+    from mechanisms_Yao1000 import loadMechanisms
+    from sweeps_HL23 import runSweeps
+    loadMechanisms()
+
+    t, V = runSweeps(FIT_AMPS, cellName=cellType, ad_stage=stage, delay=LONG_SQUARE['delay'],
+                     dur=LONG_SQUARE['dur'], tstop=LONG_SQUARE['delay'] + LONG_SQUARE['dur'] + 50.0, dt=DT)
+    feats = sweepTargets(t, V, FIT_AMPS, LONG_SQUARE['delay'], LONG_SQUARE['dur'])
+    cell = feats['cell']
+    return {'rheobase': float(cell['rheobase'][0]), 'adaptation': float(cell['adaptation'][0]),
+            'restingV': float(cell['restingV'][0]), 'inputResistance': float(cell['inputResistance'][0]),
+            'numSpikes': {f'{a:g}': int(n) for a, n in zip(FIT_AMPS, feats['sweeps']['numSpikes']) if a >= 0}}
+
+def scoringTargets(measured):
+    """Measured detailed-cell features -> optimize_HL23PYR targets {'features', 'numSpikes'}"""
+
+    features = {}
+    for name in ('rheobase', 'adaptation', 'restingV'):
+        if np.isfinite(measured[name]):
+            features[name] = (measured[name], TARGET_SD[name])
+    features['inputResistance'] = (measured['inputResistance'],
+                                   TARGET_SD['inputResistance'] * measured['inputResistance'])
+    absolute, relative = TARGET_SD['numSpikes']
+    numSpikes = {float(a): (n, max(absolute, relative * n)) for a, n in measured['numSpikes'].items()}
+    return {'features': features, 'numSpikes': numSpikes}
+
+###############################################################################
+# POINT-NEURON SIMULATION (worker process)
+###############################################################################
+
+def decode(x):
+    """Search vector -> {name: value}"""
+
+    return {name: float(np.exp(v) if BOUNDS[name][2] else v) for name, v in zip(PARAM_NAMES, x)}
+
+def encode(params):
+    return np.array([np.log(params[name]) if BOUNDS[name][2] else params[name] for name in PARAM_NAMES])
+
+def searchBox():
+    lower = np.array([np.log(lo) if log else lo for lo, hi, log in BOUNDS.values()])
+    upper = np.array([np.log(hi) if log else hi for lo, hi, log in BOUNDS.values()])
+    return lower, upper
+
+def izhiRule(cellType, params):
+    """The netParams_Yao1000_v2 cell rule of cellType with the Izhi2007b parameters replaced"""
+
+    import netParams_Yao1000_v2 as point
+
+    rule = json.loads(json.dumps(point.netParams.cellParams[cellType + '_rule']))
+    rule['secs']['soma']['pointps']['Izhi'].update(params)
+    return rule
+
+def simulateIzhi(cellType, candidates, amps=FIT_AMPS):
+    """
+    Current steps of many parameter sets in one NEURON run
+
+    Args:
+        candidates: list of {name: value} parameter sets
+        amps: step amplitudes (nA), applied to every candidate
+
+    Returns:
+        t, V (nCandidates * nAmps, nSamples), allAmps, groups (candidate of every sweep)
+    """
+
+    from neuron import h
+    from hybrid_Yao1000 import singleSectionCell
+
+    h.load_file('stdrun.hoc')
+    amps = np.asarray(amps, dtype=float)
+    tstop = IZHI_DELAY + LONG_SQUARE['dur'] + 50.0
+    cells, stims, vecs = [], [], []
+    for params in candidates:
+        rule = izhiRule(cellType, params)
+        for amp in amps:
+            soma, pointps = singleSectionCell(rule)
+            stim = h.IClamp(soma(0.5))
+            stim.delay, stim.dur, stim.amp = IZHI_DELAY, LONG_SQUARE['dur'], amp
+            vec = h.Vector().record(soma(0.5)._ref_v, 0.1)
+            cells.append((soma, pointps))
+            stims.append(stim)
+            vecs.append(vec)
+
+    h.CVode().active(0)
+    h.celsius, h.dt, h.steps_per_ms = 34.0, DT, 1.0 / DT
+    h.finitialize(-80.0)  # the mechanism sets v = vr at t = 0
+    h.continuerun(tstop)
+
+    nSamples = min(int(vec.size()) for vec in vecs)
+    V = np.array([vec.as_numpy()[:nSamples] for vec in vecs])
+    t = np.arange(nSamples) * 0.1
+    return t, V, np.tile(amps, len(candidates)), np.repeat(np.arange(len(candidates)), len(amps))
+
+def scoreIzhi(cellType, candidates, targets):
+    """Scores (and features) of parameter sets against scoringTargets()"""
+
+    t, V, amps, groups = simulateIzhi(cellType, candidates)
+    np.nan_to_num(V, copy=False, nan=-100.0, posinf=100.0, neginf=-100.0)  # diverging candidates
+    feats = sweepTargets(t, V, amps, IZHI_DELAY, LONG_SQUARE['dur'], groups)
+    return scoreCandidates(feats, groups, amps, targets), feats
+
+def fitVariant(task):
+    """
+    Fit one variant (run in a worker process)
+
+    Args:
+        task: {'cellType', 'stage', 'measured', 'start' (previous fit or None), 'popsize',
+               'generations', 'seed'}
+
+    Returns:
+        table entry {'cellType', 'stage', 'params', 'score', 'features', 'targets', 'evaluations'}
+    """
+
+    from mechanisms_Yao1000 import loadMechanisms
+    import netParams_Yao1000_v2 as point
+    loadMechanisms()
+
+    cellType, measured = task['cellType'], task['measured']
+    targets = scoringTargets(measured)
+    lower, upper = searchBox()
+
+    # A refit searches around the previous fit (DE keeps it unless beaten); a first fit starts
+    # from the generic parameters with vr at rest and searches the whole box
+    start = task['start']
+    if start is None:
+        start = {name: point.cellTypes[cellType][name] for name in PARAM_NAMES}
+        start['vr'] = measured['restingV']
+    x0 = np.clip(encode(start), lower, upper)
+    if task['start'] is not None:
+        span = REFIT_SPAN * (upper - lower)
+        lower, upper = np.maximum(x0 - span, lower), np.minimum(x0 + span, upper)
+
+    evaluations = []
+
+    def evaluate(X):
+        evaluations.append(len(X))
+        return scoreIzhi(cellType, [decode(x) for x in X], targets)[0]
+
+    best, score, history = differentialEvolution(evaluate, lower, upper, popsize=task['popsize'],
+                                                 generations=task['generations'], x0=x0,
+                                                 seed=task['seed'], verbose=False)
+    params = decode(best)
+    feats = scoreIzhi(cellType, [params], targets)[1]
+    cell = feats['cell']
+    fitted = {name: float(cell[name][0]) for name in ('rheobase', 'adaptation', 'restingV', 'inputResistance')}
+    fitted['numSpikes'] = {f'{a:g}': int(n) for a, n in zip(FIT_AMPS, feats['sweeps']['numSpikes']) if a >= 0}
+
+    return {'cellType': cellType, 'stage': task['stage'], 'params': params, 'score': float(score),
+            'initialScore': float(history[0]), 'features': fitted, 'targets': measured,
+            'evaluations': int(sum(evaluations))}
+
+###############################################################################
+# TABLE
+###############################################################################
+
+def targetsHash():
+    """Hash of what the detailed targets depend on: protocol, mod, hoc and morphology files"""
+
+    from mechanisms_Yao1000 import modHash
+
+    key = hashlib.sha1(modHash().encode())
+    key.update(json.dumps([FIT_AMPS.tolist(), LONG_SQUARE, DT]).encode())
+    for path in sorted(glob.glob(os.path.join(BASEDIR, 'models', '*.hoc'))
+                       + glob.glob(os.path.join(BASEDIR, 'morphologies', '*.swc'))):
+        with open(path, 'rb') as f:
+            key.update(f.read())
+    return key.hexdigest()[:16]
+
+def loadTable(path=TABLE_PATH):
+    """The fitted table, or None"""
+
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def fitVariants(variants=VARIANTS, path=TABLE_PATH, workers=None, popsize=20, generations=30,
+                seed=42, remeasure=False, verbose=True):
+    """
+    Measure the detailed targets (or reuse them), fit the variants in parallel and update the table
+
+    Returns:
+        the table {'targetsHash', 'created', 'versions', 'protocol', 'cells': {label: entry}}
+    """
+
+    from instrument_Yao1000 import versions
+
+    source = targetsHash()
+    table = loadTable(path) or {}
+    if table.get('targetsHash') != source:
+        table = {'cells': {}}  # fits to other targets are not comparable
+    cells = table['cells']
+    workers = workers or max(1, multiprocessing.cpu_count() - 1)
+
+    # Detailed targets, one worker process per variant
+    todo = [(c, s) for c, s in variants if remeasure or variantLabel(c, s) not in cells]
+    measured = {variantLabel(c, s): cells[variantLabel(c, s)]['targets']
+                for c, s in variants if (c, s) not in todo}
+    if todo:
+        if verbose:
+            print(f"Simulating detailed targets: {', '.join(variantLabel(c, s) for c, s in todo)}")
+        t0 = time.time()
+        with multiprocessing.Pool(min(workers, len(todo)), maxtasksperchild=1) as pool:
+            results = pool.starmap(measureTarget, todo)
+        measured.update({variantLabel(c, s): r for (c, s), r in zip(todo, results)})
+        if verbose:
+            print(f"  done in {time.time() - t0:.1f} s")
+
+    tasks = [{'cellType': c, 'stage': s, 'measured': measured[variantLabel(c, s)],
+              'start': None if (c, s) in todo else cells[variantLabel(c, s)]['params'],
+              'popsize': popsize, 'generations': generations, 'seed': seed} for c, s in variants]
+    if verbose:
+        print(f"Fitting {len(tasks)} variants ({popsize} candidates x {generations} generations, "
+              f"{min(workers, len(tasks))} workers)")
+    t0 = time.time()
+    with multiprocessing.Pool(min(workers, len(tasks)), maxtasksperchild=1) as pool:
+        for entry in pool.imap(fitVariant, tasks):
+            cells[variantLabel(entry['cellType'], entry['stage'])] = entry
+            if verbose:
+                print(f"  ✓ {variantLabel(entry['cellType'], entry['stage']):<14} score {entry['score']:9.2f} "
+                      f"(start {entry['initialScore']:.2f}), {time.time() - t0:.1f} s")
+
+    for entry in cells.values():
+        entry.update(fitQuality(entry))
+    table.update({'targetsHash': source, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  'versions': versions(),
+                  'protocol': {'amps': FIT_AMPS.tolist(), 'dur': LONG_SQUARE['dur'], 'dt': DT},
+                  'cells': {label: cells[label] for label in sorted(cells)}})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(table, f, indent=1)
+    return table
+
+def printTable(table, labels=None):
+    print("=" * 80)
+    print("FITTED IZHIKEVICH PARAMETERS (detailed target → point neuron)")
+    print("=" * 80)
+    for label, entry in table['cells'].items():
+        if labels and label not in labels:
+            continue
+        p, target, fit = entry['params'], entry['targets'], entry['features']
+        flags = [f"⚠ poor fit (score > {POOR_FIT_SCORE:g})"] if entry.get('poorFit') else []
+        flags += [f"⚠ at bounds: {', '.join(entry['atBounds'])}"] if entry.get('atBounds') else []
+        print(f"{label}  (score {entry['score']:.2f}, {entry['evaluations']} evaluations)"
+              + "".join(f"  {flag}" for flag in flags))
+        print("   " + "  ".join(f"{name}={p[name]:.4g}" for name in PARAM_NAMES))
+        for name, unit in (('rheobase', 'pA'), ('adaptation', ''), ('restingV', 'mV'), ('inputResistance', 'MΩ')):
+            print(f"   {name:16s} {target[name]:9.3f} → {fit[name]:9.3f} {unit}")
+        amps = [a for a in target['numSpikes'] if float(a) > 0]
+        print("   spikes @ pA      " + " ".join(f"{float(a) * 1000:4.0f}" for a in amps))
+        print("     detailed       " + " ".join(f"{target['numSpikes'][a]:4d}" for a in amps))
+        print("     point          " + " ".join(f"{fit['numSpikes'][a]:4d}" for a in amps))
+    print("=" * 80)
+
+###############################################################################
+# MAIN
+###############################################################################
+
+def parseVariant(text):
+    """'TYPE' or 'TYPE:STAGE' -> (cellType, stage)"""
+
+    parts = text.split(':')
+    variant = (parts[0], int(parts[1]) if len(parts) > 1 else None)
+    if variant not in VARIANTS:
+        raise argparse.ArgumentTypeError(f"unknown variant '{text}' "
+                                         f"(available: {', '.join(variantLabel(*v) for v in VARIANTS)})")
+    return variant
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Fit Izhi2007b parameters to the detailed HL23 cells')
+    parser.add_argument('--variants', type=parseVariant, nargs='+', default=list(VARIANTS),
+                        help='TYPE[:STAGE] variants to fit (default: all)')
+    parser.add_argument('--popsize', type=int, default=20, help='Candidates per generation')
+    parser.add_argument('--generations', type=int, default=30, help='Number of generations')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPUs - 1)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--remeasure', action='store_true', help='Re-simulate the detailed targets')
+    parser.add_argument('--output', type=str, default=TABLE_PATH, help='Parameter table (.json)')
+    parser.add_argument('--show', action='store_true', help='Print the table and exit')
+    args = parser.parse_args()
+
+    if args.show:
+        table = loadTable(args.output)
+        if table is None:
+            print(f"✗ No table at {args.output}; run python fitIzhi_HL23.py")
+            sys.exit(1)
+        printTable(table)
+        sys.exit(0)
+
+    print("=" * 80)
+    print("IZHIKEVICH FIT TO DETAILED HL23 CELLS")
+    print("=" * 80)
+    print(f"Variants: {', '.join(variantLabel(*v) for v in args.variants)}")
+    print(f"Steps: {len(FIT_AMPS)} amplitudes, {FIT_AMPS.min() * 1000:.0f} to {FIT_AMPS.max() * 1000:.0f} pA, "
+          f"{LONG_SQUARE['dur']:.0f} ms")
+    print("=" * 80)
+
+    t0 = time.time()
+    table = fitVariants(args.variants, args.output, workers=args.workers, popsize=args.popsize,
+                        generations=args.generations, seed=args.seed, remeasure=args.remeasure)
+    printTable(table, [variantLabel(*v) for v in args.variants])
+    print(f"✓ Parameter table written to: {args.output} ({time.time() - t0:.1f} s)")
+    print("  netParams_Yao1000_v2.py loads it on import")
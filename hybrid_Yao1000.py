@@ -0,0 +1,568 @@
+"""
+hybrid_Yao1000.py
+
+Hybrid Yao network: detailed, reduced and point-neuron cells in one netParams
+Every population -- or a sampled subset of its cells -- is built with one of
+three cell models, and all variants of a cell type share its positions and
+connectivity rules:
+
+    detailed    template morphology and biophysics (models/, healthy or AD stage),
+                imported with NetPyNE's importCellParams
+    reduced     single-compartment HH cell of netParams_Yao1000_HH
+    point       Izhi2007b point neuron of netParams_Yao1000_v2 (AD stages of
+                HL23PYR once fitted by fitIzhi_HL23.py; fits flagged as poor
+                are reported when a layout uses them)
+
+A subset gets its own population, '<type>_<model>' (plus '_AD<stage>'), with
+the same spatial ranges as the rest of the type, which keeps the type's name.
+
+Synaptic weights are derived from one set of pathway parameters, the
+per-contact conductances synConds (uS), contact counts numContacts and
+background drive bgStim of netParams_Yao1000:
+
+    detailed target   numContacts synapses of synConds each, spread over the
+                      target section list (dendritic, perisomatic for PV input)
+    reduced / point   one somatic synapse of numContacts * synConds * scale
+
+scale is chosen per cell type, model and pathway (presynaptic type or
+background) so that the somatic PSP of one activation, with every cell held
+at HOLD, equals the PSP of the pathway's contacts on the detailed cell (same stage);
+the PSP matching covers dendritic attenuation as well as the different input
+resistance and time constant of the models. The scales are measured once with
+short single-cell simulations and cached in data/hybrid_Yao1000.json (keyed
+by the mod, hoc, morphology and netParams files and the fitted Izhikevich table).
+
+Usage:
+    python hybrid_Yao1000.py --detailed HL23PYR:50:1                  # 50 detailed AD-1 PYR in a 1000-cell point network
+    python hybrid_Yao1000.py --model reduced --detailed HL23PV:10 --cells 200 --duration 500
+    python hybrid_Yao1000.py --pop HL23SST:reduced --detailed HL23PYR:5 --cells 100
+    python hybrid_Yao1000.py --pop HL23PYR:point:3                   # Fitted AD-3 point PYR
+    python hybrid_Yao1000.py --translation                             # Print (and if needed measure) the weight translation
+
+    from hybrid_Yao1000 import buildNetParams
+    netParams = buildNetParams({'HL23PYR': [('detailed', 50, 1), ('point', None, None)]}, numCells=1000)
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import hashlib
+import argparse
+import numpy as np
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+TRANSLATION_PATH = os.path.join(BASEDIR, 'data', 'hybrid_Yao1000.json')
+
+###############################################################################
+# MODELS AND PATHWAYS
+###############################################################################
+
+CELL_TYPES = ('HL23PYR', 'HL23SST', 'HL23PV', 'HL23VIP')
+CELL_MODELS = ('detailed', 'reduced', 'point')
+AD_STAGES = (1, 3)  # HL23PYR stages with a detailed (and possibly a fitted point) model
+
+# Section list of the detailed cell that receives each presynaptic type
+TARGET_SECS = {'HL23PYR': 'dendritic', 'HL23SST': 'dendritic', 'HL23PV': 'somatic', 'HL23VIP': 'dendritic'}
+
+# Synaptic mechanisms of each presynaptic type and their share of the conductance
+SYN_MECHS = {'exc': {'AMPA': 0.8, 'NMDA': 0.2}, 'inh': {'GABA': 1.0}}
+
+DELAYS = {'exc': 2.0, 'inh': 1.0}  # ms
+
+# PSP matching protocol of the weight translation
+HOLD = -70.0     # mV, somatic potential every model is held at by a constant current
+ONSET = 300.0    # ms, synaptic activation after the cell settled
+WINDOW = 150.0   # ms after the activation searched for the PSP peak
+MAX_PSP = 10.0   # mV; pathways that fire the detailed cell are matched at a fraction of their conductance
+
+def synClass(preType):
+    return 'exc' if 'PYR' in preType else 'inh'
+
+def variantKey(model, cellType, stage=None):
+    return f'{model}/{cellType}' + (f'/AD{stage}' if stage else '')
+
+def popLabel(cellType, model, stage=None, bulk=False):
+    """Population label of a variant; the bulk of a type keeps the type's name"""
+
+    return cellType if bulk else f'{cellType}_{model}' + (f'_AD{stage}' if stage else '')
+
+###############################################################################
+# CELL RULES
+###############################################################################
+
+def pointCellRule(cellType, stage=None):
+    import netParams_Yao1000_v2 as point
+
+    label = cellType + (f'_AD{stage}' if stage else '') + '_rule'
+    if label not in point.netParams.cellParams:
+        raise ValueError(f"no point model of {cellType} AD stage {stage}; fit it with fitIzhi_HL23.py")
+    return json.loads(json.dumps(point.netParams.cellParams[label]))
+
+def warnPoorFit(cellType, stage=None):
+    """Report a point variant whose Izhikevich fit the table flags as poor"""
+
+    import netParams_Yao1000_v2 as point
+
+    label = cellType + (f'_AD{stage}' if stage else '')
+    if label in point.poorFits:
+        print(f"⚠ {label} point neuron: poor fit to the detailed cell (score {point.poorFits[label]:.1f}); "
+              f"see python fitIzhi_HL23.py --show")
+
+def reducedCellRule(cellType):
+    import netParams_Yao1000_HH as reduced
+    return json.loads(json.dumps(reduced.netParams.cellParams[cellType]))
+
+def addDetailedCellRule(netParams, label, cellType, stage=None):
+    """Import the template cell (healthy or AD stage) as the rule label, with a 'dendritic' section list"""
+
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms()  # the template cell is instantiated to read its sections
+
+    rule = netParams.importCellParams(label, conds={}, fileName=os.path.join(BASEDIR, 'cellwrapper.py'),
+                                      cellName='loadCell', importSynMechs=False,
+                                      cellArgs={'cellName': cellType, 'ad': stage is not None, 'ad_stage': stage})
+    rule['conds'] = {}
+    rule['secLists']['dendritic'] = list(rule['secLists'].get('basal', [])) + list(rule['secLists'].get('apical', []))
+    return rule
+
+def detailedSomaSec(rule):
+    return rule['secLists']['somatic'][0]
+
+###############################################################################
+# WEIGHT TRANSLATION (worker process)
+###############################################################################
+
+def singleSectionCell(rule):
+    """Instantiate a one-section NetPyNE rule (reduced or point) outside NetPyNE"""
+
+    from neuron import h
+
+    spec = rule['secs']['soma']
+    sec = h.Section(name='soma')
+    for key, value in spec['geom'].items():
+        setattr(sec, key, value)
+    for mech, params in spec.get('mechs', {}).items():
+        sec.insert(mech)
+        for key, value in params.items():
+            setattr(sec, f'{key}_{mech}', value)
+    for ion, params in spec.get('ions', {}).items():
+        for key, value in params.items():
+            setattr(sec, f'{key}{ion}', value)
+    pointps = []
+    for params in spec.get('pointps', {}).values():
+        pp = getattr(h, params['mod'])(sec(0.5))
+        for key, value in params.items():
+            if key not in ('mod', 'loc', 'vref', 'synList'):
+                setattr(pp, key, value)
+        pointps.append(pp)
+    return sec, pointps
+
+def spreadLocations(sections, n):
+    """n segments spread evenly over the path length of a section list"""
+
+    lengths = np.array([sec.L for sec in sections])
+    ends = np.cumsum(lengths)
+    targets = (np.arange(n) + 0.5) / n * ends[-1]
+    idx = np.searchsorted(ends, targets)
+    return [sections[i](min(1.0, (x - ends[i] + lengths[i]) / lengths[i])) for i, x in zip(idx, targets)]
+
+def pathways(cellType):
+    """Presynaptic types that contact cellType, plus 'bkg' (background input)"""
+
+    import netParams_Yao1000 as detailed
+    return [pre for pre in CELL_TYPES if detailed.synConds[(pre, cellType)] > 0] + ['bkg']
+
+def pathwayInput(pathway, cellType):
+    """(synaptic mechanism shares, total conductance per connection or event (uS), contacts)"""
+
+    import netParams_Yao1000 as detailed
+
+    if pathway == 'bkg':
+        return {'AMPA': 1.0}, detailed.bgStim[cellType]['weight'], 1
+    numContacts = max(1, detailed.numContacts[(pathway, cellType)])
+    return SYN_MECHS[synClass(pathway)], numContacts * detailed.synConds[(pathway, cellType)], numContacts
+
+def holdingCurrent(soma):
+    """Current (nA) that holds the soma at HOLD (voltage clamp until it settles)"""
+
+    from neuron import h
+
+    clamp = h.SEClamp(soma(0.5))
+    clamp.dur1, clamp.amp1, clamp.rs = ONSET, HOLD, 0.001
+    h.finitialize(HOLD)
+    h.continuerun(ONSET)
+    return clamp.i  # electrode current into the cell
+
+def measurePSP(soma, segments, mechs, weight, iHold):
+    """Peak somatic PSP (mV, absolute) of one synchronous activation of the contacts at segments"""
+
+    from neuron import h
+    import netParams_Yao1000 as detailed
+
+    hold = h.IClamp(soma(0.5))
+    hold.delay, hold.dur, hold.amp = 0.0, ONSET + WINDOW, iHold
+    source = h.NetStim()
+    source.number, source.start = 1, ONSET
+    syns, netcons = [], []
+    for mech, share in mechs.items():
+        params = detailed.netParams.synMechParams[mech]
+        for seg in segments:
+            syn = h.Exp2Syn(seg)
+            syn.tau1, syn.tau2, syn.e = params['tau1'], params['tau2'], params['e']
+            nc = h.NetCon(source, syn)
+            nc.weight[0], nc.delay = weight * share / len(segments), 0.0
+            syns.append(syn)
+            netcons.append(nc)
+
+    v, t = h.Vector().record(soma(0.5)._ref_v), h.Vector().record(h._ref_t)
+    h.finitialize(HOLD)
+    h.continuerun(ONSET + WINDOW)
+    v, t = v.as_numpy(), t.as_numpy()
+    base = v[(t >= ONSET - 5) & (t < ONSET)].mean()
+    return float(np.abs(v[t >= ONSET] - base).max())
+
+def measureVariants(keys):
+    """
+    Weight scales of reduced/point variants (run in a fresh process)
+
+    The PSP of every pathway onto the detailed cell of the variant's stage (its contacts spread
+    over the target section list) is measured first, at the largest fraction
+    (1, 1/2, 1/4, ...) of the pathway's conductance that stays below MAX_PSP;
+    each variant's somatic weight is then scaled until its PSP matches within
+    1% (the PSP grows sublinearly with the weight, so the fixed-point update
+    converges). All cells are held at HOLD by a constant current.
+
+    Returns:
+        {key: {'scale': {pathway: weight / total conductance}, 'fraction': {pathway: f},
+               'psp': {pathway: mV}, 'pspDetailed': {pathway: mV}}}
+    """
+
+    import cellwrapper
+    from neuron import h
+    from mechanisms_Yao1000 import loadMechanisms
+
+    loadMechanisms()
+    h.load_file('stdrun.hoc')
+    h.celsius, h.dt = 34.0, 0.025
+
+    reference = {}
+    out = {}
+    for key in keys:
+        model, cellType, *ad = key.split('/')
+        stage = int(ad[0][2:]) if ad else None
+        if (cellType, stage) not in reference:
+            cell = cellwrapper.loadCell(cellType, ad=stage is not None, ad_stage=stage)
+            soma = cell.soma[0]
+            iHold = holdingCurrent(soma)
+            reference[cellType, stage] = {}
+            for pathway in pathways(cellType):
+                mechs, g, numContacts = pathwayInput(pathway, cellType)
+                target = 'somatic' if pathway == 'bkg' else TARGET_SECS[pathway]
+                sections = list(cell.somatic) if target == 'somatic' else list(cell.basal) + list(cell.apical)
+                segments = spreadLocations(sections, numContacts)
+                fraction = 1.0
+                psp = measurePSP(soma, segments, mechs, g, iHold)
+                while psp > MAX_PSP:
+                    fraction /= 2
+                    psp = measurePSP(soma, segments, mechs, g * fraction, iHold)
+                reference[cellType, stage][pathway] = (fraction, psp)
+            cell = soma = None
+
+        rule = pointCellRule(cellType, stage) if model == 'point' else reducedCellRule(cellType)
+        soma, pointps = singleSectionCell(rule)
+        iHold = holdingCurrent(soma)
+        entry = {'scale': {}, 'fraction': {}, 'psp': {}, 'pspDetailed': {}}
+        for pathway, (fraction, target) in reference[cellType, stage].items():
+            mechs, g, _ = pathwayInput(pathway, cellType)
+            scale = 1.0
+            for _ in range(25):
+                psp = measurePSP(soma, [soma(0.5)], mechs, g * fraction * scale, iHold)
+                if abs(psp - target) <= 0.01 * target:
+                    break
+                scale *= target / psp
+            entry['scale'][pathway] = scale
+            entry['fraction'][pathway] = fraction
+            entry['psp'][pathway] = psp
+            entry['pspDetailed'][pathway] = target
+        out[key] = entry
+        soma = None
+    return out
+
+def sourceHash():
+    """Hash of everything the translation depends on: protocol, mod/hoc/morphology, netParams and Izhikevich fits"""
+
+    from mechanisms_Yao1000 import modHash
+    from netParams_Yao1000_v2 import IZHI_TABLE
+
+    key = hashlib.sha1(modHash().encode())
+    key.update(json.dumps([HOLD, ONSET, WINDOW, SYN_MECHS, TARGET_SECS], sort_keys=True).encode())
+    for path in sorted(glob.glob(os.path.join(BASEDIR, 'models', '*.hoc'))
+                       + glob.glob(os.path.join(BASEDIR, 'morphologies', '*.swc'))
+                       + [os.path.join(BASEDIR, f) for f in ('netParams_Yao1000.py', 'netParams_Yao1000_v2.py',
+                                                              'netParams_Yao1000_HH.py')]
+                       + ([IZHI_TABLE] if os.path.exists(IZHI_TABLE) else [])):
+        with open(path, 'rb') as f:
+            key.update(f.read())
+    return key.hexdigest()[:16]
+
+def translationTable(keys, path=TRANSLATION_PATH, force=False):
+    """
+    Measurements of the variant keys, from the cache or measured in a worker process (and cached)
+
+    force measures the keys again; other cached variants of the same source are kept.
+    """
+
+    from benchmark_Yao1000 import runIsolated
+
+    source = sourceHash()
+    cache = {'source': source, 'variants': {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            cached = json.load(f)
+        if cached.get('source') == source:
+            cache = cached
+
+    missing = sorted(set(keys) if force else set(keys) - set(cache['variants']))
+    if missing:
+        cache['variants'].update(runIsolated(measureVariants, missing))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+    return {key: cache['variants'][key] for key in keys}
+
+###############################################################################
+# NETPARAMS BUILDER
+###############################################################################
+
+def parseLayout(layout):
+    """
+    Normalize a layout to {cellType: [(model, numCells or None for the rest, stage)]}
+
+    Each type entry is a model name or a list of (model, numCells, stage) tuples
+    (stage only for detailed or point HL23PYR); one entry may have numCells None and takes
+    the cells the others leave, otherwise the remainder is a point population.
+    """
+
+    out = {}
+    for cellType in CELL_TYPES:
+        entries = layout.get(cellType, 'point')
+        if isinstance(entries, str):
+            entries = [(entries, None, None)]
+        entries = [tuple(e) + (None,) * (3 - len(e)) for e in entries]
+        for model, numCells, stage in entries:
+            if model not in CELL_MODELS:
+                raise ValueError(f"unknown cell model '{model}' (available: {', '.join(CELL_MODELS)})")
+            if stage is not None and (model == 'reduced' or cellType != 'HL23PYR' or stage not in AD_STAGES):
+                raise ValueError(f"AD stage {stage} needs a detailed or point HL23PYR variant")
+            if stage is not None and model == 'point':
+                pointCellRule(cellType, stage)  # fitted parameters exist
+                warnPoorFit(cellType, stage)
+        if sum(numCells is None for _, numCells, _ in entries) > 1:
+            raise ValueError(f"{cellType}: only one variant can take the remaining cells")
+        if all(numCells is not None for _, numCells, _ in entries):
+            entries.append(('point', None, None))
+        out[cellType] = entries
+    return out
+
+def buildNetParams(layout=None, numCells=1000, path=TRANSLATION_PATH):
+    """
+    NetPyNE netParams of a hybrid network
+
+    Args:
+        layout: see parseLayout (default: all point neurons)
+        numCells: network size; type sizes follow netParams_Yao1000.cellTypes
+        path: translation cache
+
+    Returns:
+        netParams; netParams.hybrid holds {'pops': {label: {'cellType', 'model', 'stage'}},
+        'translation': {variant key: measurements}}
+    """
+
+    from netpyne import specs
+    import netParams_Yao1000 as detailed
+
+    layout = parseLayout(layout or {})
+    netParams = specs.NetParams()
+    for key in ('sizeX', 'sizeY', 'sizeZ', 'shape', 'radius', 'defaultThreshold', 'defaultTemp', 'defaultV'):
+        setattr(netParams, key, getattr(detailed.netParams, key))
+    for mech, params in detailed.netParams.synMechParams.items():
+        netParams.synMechParams[mech] = dict(params)
+
+    # Populations: subsets first, the bulk of each type keeps the type's name
+    pops = {}
+    for cellType, entries in layout.items():
+        remaining = max(1, int(round(numCells * detailed.cellTypes[cellType]['numCells'] / 1000.0)))
+        sizes = []
+        for model, count, stage in entries:
+            n = 0 if count is None else min(count, remaining)
+            remaining -= n
+            sizes.append(n)
+        for (model, count, stage), n in zip(entries, sizes):
+            n = remaining if count is None else n
+            if n <= 0:
+                continue
+            label = popLabel(cellType, model, stage, bulk=count is None)
+            pops[label] = {'cellType': cellType, 'model': model, 'stage': stage, 'numCells': n}
+
+    # Cell rules: one per variant, the population's cellType names it
+    translation = translationTable(sorted({variantKey(p['model'], p['cellType'], p['stage']) for p in pops.values()
+                                           if p['model'] != 'detailed'}), path)
+    rules = {}
+    for label, pop in pops.items():
+        key = variantKey(pop['model'], pop['cellType'], pop['stage'])
+        ruleLabel = key.replace('/', '_')
+        if ruleLabel not in rules:
+            if pop['model'] == 'detailed':
+                rules[ruleLabel] = addDetailedCellRule(netParams, ruleLabel, pop['cellType'], pop['stage'])
+            else:
+                rule = pointCellRule(pop['cellType'], pop['stage']) if pop['model'] == 'point' \
+                    else reducedCellRule(pop['cellType'])
+                rule['conds'] = {}
+                netParams.cellParams[ruleLabel] = rules[ruleLabel] = rule
+        params = dict(detailed.netParams.popParams[pop['cellType']])
+        params.update({'cellType': ruleLabel, 'numCells': pop['numCells']})
+        params.pop('cellModel', None)
+        netParams.popParams[label] = params
+
+    def somaSec(pop):
+        return detailedSomaSec(rules[variantKey('detailed', pop['cellType'], pop['stage']).replace('/', '_')]) \
+            if pop['model'] == 'detailed' else 'soma'
+
+    def scale(pop, pathway):
+        return translation[variantKey(pop['model'], pop['cellType'], pop['stage'])]['scale'][pathway]
+
+    # Connections: presynaptic type (any variant) onto each postsynaptic population
+    for preType in CELL_TYPES:
+        preLabels = [label for label, p in pops.items() if p['cellType'] == preType]
+        kind = synClass(preType)
+        for postLabel, post in pops.items():
+            connKey = (preType, post['cellType'])
+            prob, g = detailed.connProbs[connKey], detailed.synConds[connKey]
+            if prob == 0.0 or g == 0.0 or not preLabels:
+                continue
+            numContacts = max(1, detailed.numContacts[connKey])
+            for mech, share in SYN_MECHS[kind].items():
+                rule = {'preConds': {'pop': preLabels}, 'postConds': {'pop': postLabel},
+                        'probability': prob, 'delay': DELAYS[kind], 'synMech': mech}
+                if post['model'] == 'detailed':
+                    rule.update({'weight': g * share, 'synsPerConn': numContacts, 'sec': TARGET_SECS[preType]})
+                else:
+                    rule.update({'weight': g * share * numContacts * scale(post, preType), 'sec': 'soma', 'loc': 0.5})
+                netParams.connParams[f'{preType}_to_{postLabel}_{mech}'] = rule
+
+    # Background: pooled Poisson input at the soma (numStims sources of rate each)
+    for label, pop in pops.items():
+        bg = detailed.bgStim[pop['cellType']]
+        netParams.stimSourceParams[f'bkg_{label}'] = {'type': 'NetStim', 'rate': bg['rate'] * bg['numStims'],
+                                                      'noise': 1.0, 'start': 0, 'number': 1e9}
+        weight = bg['weight'] if pop['model'] == 'detailed' else bg['weight'] * scale(pop, 'bkg')
+        netParams.stimTargetParams[f'bkg_{label}_stim'] = {'source': f'bkg_{label}', 'conds': {'pop': label},
+                                                           'weight': weight, 'delay': 0, 'synMech': 'AMPA',
+                                                           'sec': somaSec(pop), 'loc': 0.5}
+
+    netParams.hybrid = {'pops': {label: {k: p[k] for k in ('cellType', 'model', 'stage')} for label, p in pops.items()},
+                        'translation': translation}
+    return netParams
+
+###############################################################################
+# RUN
+###############################################################################
+
+def runHybrid(netParams, duration=1000.0, dt=0.025, seed=42, profiler=None):
+    """Build, run and gather a hybrid network (see benchmark_Yao1000.runNetwork); returns sim"""
+
+    from mechanisms_Yao1000 import loadMechanisms
+    from instrument_Yao1000 import PhaseProfiler, createNetwork
+    loadMechanisms()
+
+    from benchmark_Yao1000 import networkConfig
+    from netpyne import sim
+
+    simConfig = networkConfig(duration, dt, seed)
+    profiler = profiler or PhaseProfiler(script='hybrid')
+    createNetwork(sim, netParams, simConfig, profiler)
+    with profiler.phase('record'):
+        sim.setupRecording()
+    with profiler.phase('run'):
+        sim.runSim()
+    with profiler.phase('gather'):
+        sim.gatherData()
+    return sim
+
+def parseVariant(text, withCount):
+    """'TYPE:MODEL[:STAGE]' (--pop) or 'TYPE:N[:STAGE]' (--detailed) -> (type, value, stage)"""
+
+    parts = text.split(':')
+    if len(parts) not in (2, 3) or parts[0] not in CELL_TYPES:
+        raise argparse.ArgumentTypeError(f"expected TYPE:{'N' if withCount else 'MODEL'}[:STAGE], got '{text}'")
+    stage = int(parts[2]) if len(parts) == 3 else None
+    return parts[0], int(parts[1]) if withCount else parts[1], stage
+
+def printTranslation(translation):
+    """Weight scale per pathway and the PSPs it gives (variant / detailed)"""
+
+    print(f"{'Variant':<18} {'Pathway':<9} {'scale':>8} {'PSP (mV)':>9} {'detailed':>9} {'at g x':>7}")
+    print("-" * 80)
+    for key, entry in sorted(translation.items()):
+        for pathway, scale in entry['scale'].items():
+            print(f"{key:<18} {pathway:<9} {scale:8.4f} {entry['psp'][pathway]:9.3f} "
+                  f"{entry['pspDetailed'][pathway]:9.3f} {entry['fraction'][pathway]:7.3g}")
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Build and run a hybrid detailed / reduced / point-neuron Yao network')
+    parser.add_argument('--model', choices=CELL_MODELS, default='point', help='Model of every population not set otherwise')
+    parser.add_argument('--pop', type=lambda s: parseVariant(s, False), action='append', default=[],
+                        metavar='TYPE:MODEL[:STAGE]', help='Whole-population model (repeatable)')
+    parser.add_argument('--detailed', type=lambda s: parseVariant(s, True), action='append', default=[],
+                        metavar='TYPE:N[:STAGE]', help='Detailed subset of a population (repeatable)')
+    parser.add_argument('--cells', type=int, default=1000, help='Network size')
+    parser.add_argument('--duration', type=float, default=1000.0, help='Simulation duration (ms)')
+    parser.add_argument('--seed', type=int, default=42, help='Connectivity and stimulus seed')
+    parser.add_argument('--translation', action='store_true', help='Print the weight translation and exit')
+    parser.add_argument('--remeasure', action='store_true', help='Measure the translation again')
+    args = parser.parse_args()
+
+    if args.translation or args.remeasure:
+        import netParams_Yao1000_v2 as point
+        keys = [variantKey(m, t) for m in CELL_MODELS if m != 'detailed' for t in CELL_TYPES]
+        keys += [variantKey('point', 'HL23PYR', s) for s in AD_STAGES
+                 if f'HL23PYR_AD{s}_rule' in point.netParams.cellParams]
+        t0 = time.time()
+        printTranslation(translationTable(keys, force=args.remeasure))
+        print(f"\n✓ {TRANSLATION_PATH} ({time.time() - t0:.1f} s)")
+        sys.exit(0)
+
+    layout = {t: [(args.model, None, None)] for t in CELL_TYPES}
+    for cellType, model, stage in args.pop:
+        layout[cellType] = [(model, None, stage)]
+    for cellType, count, stage in args.detailed:
+        layout[cellType] = [('detailed', count, stage)] + layout[cellType]
+
+    print("=" * 80)
+    print(f"HYBRID NETWORK: {args.cells} cells, {args.duration:g} ms")
+    print("=" * 80)
+    t0 = time.time()
+    try:
+        netParams = buildNetParams(layout, args.cells)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"✓ netParams built ({time.time() - t0:.1f} s)")
+
+    sim = runHybrid(netParams, args.duration, seed=args.seed)
+    spkid = np.asarray(sim.allSimData['spkid'], dtype=int)
+    print("-" * 80)
+    print(f"{'Population':<22} {'model':<9} {'cells':>6} {'rate (Hz)':>10}")
+    for label, pop in sim.net.pops.items():
+        info = netParams.hybrid['pops'][label]
+        gids = pop.cellGids
+        rate = np.isin(spkid, gids).sum() / max(len(gids), 1) / (args.duration / 1000.0)
+        model = info['model'] + (f" AD{info['stage']}" if info['stage'] else '')
+        print(f"{label:<22} {model:<9} {len(gids):6d} {rate:10.2f}")
+    print("=" * 80)
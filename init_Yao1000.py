@@ -8,10 +8,18 @@ Usage:
     python init_Yao1000.py                    # Full 1000-cell simulation
     python init_Yao1000.py --test             # Test with 100 cells
     python init_Yao1000.py --duration 1000    # Custom duration (ms)
-    python init_Yao1000.py --record           # Record detailed variables
+    python init_Yao1000.py --record           # Record V_soma of 10 cells per population
+    python init_Yao1000.py --record --record-cells 50 --record-step 0.5 --compress
+    python init_Yao1000.py --record --record-step 0.025 --envelope 1.0   # min/max envelopes
+    python init_Yao1000.py --overlay calibration_Yao1000.json  # Calibrated weights (calibrate_Yao1000.py)
+    python init_Yao1000.py --abort-runaway    # Stop early on runaway activity (monitor_Yao1000.py)
+    python init_Yao1000.py --rates-only       # Keep binned rates and spike counts, not spike times
+    python init_Yao1000.py --stream-spikes Yao1000.spikes  # Per-rank spike files, no gather (spikeio_Yao1000.py)
+    python init_Yao1000.py --lfp              # Laminar LFP + current dipole (lfp_Yao1000.py)
+    python init_Yao1000.py --format pickle    # Legacy pickle output instead of a result store
+    python init_Yao1000.py --profile runs.jsonl   # Append the phase profile to a log (instrument_Yao1000.py)
 """
 
-from netpyne import sim
 import numpy as np
 import sys
 import os
@@ -26,17 +34,47 @@ parser.add_argument('--test', action='store_true', help='Run test with 100 cells
 parser.add_argument('--duration', type=float, default=4500, help='Simulation duration (ms)')
 parser.add_argument('--dt', type=float, default=0.025, help='Time step (ms)')
 parser.add_argument('--record', action='store_true', help='Record detailed traces')
+parser.add_argument('--record-cells', type=int, default=10, help='Cells recorded per population')
+parser.add_argument('--record-step', type=float, default=0.1, help='Trace sampling interval (ms)')
+parser.add_argument('--envelope', type=float, default=None, help='Keep only min/max envelopes with this bin (ms)')
+parser.add_argument('--compress', action='store_true', help='Losslessly compress stored traces')
 parser.add_argument('--no-gui', action='store_true', help='Run without GUI')
 parser.add_argument('--save', type=str, default='Yao1000', help='Save file prefix')
 parser.add_argument('--seed', type=int, default=42, help='Random seed')
+parser.add_argument('--overlay', type=str, default=None, help='Calibrated weight overlay (JSON)')
+parser.add_argument('--abort-runaway', action='store_true', help='Abort the run if population rates run away')
+parser.add_argument('--rates-only', action='store_true', help='Accumulate binned rates instead of storing spikes')
+parser.add_argument('--stream-spikes', type=str, default=None, help='Stream spikes to this directory during the run')
+parser.add_argument('--lfp', action='store_true', help='Record LFP and current dipole')
+parser.add_argument('--lfp-cutoff', type=float, default=None, help='Segment-electrode distance cutoff for the LFP (um)')
+parser.add_argument('--format', type=str, default='results', choices=['results', 'pickle'],
+                    help='Output format (results: columnar store, see results_Yao1000.py)')
+parser.add_argument('--profile', type=str, default=None, help='Phase profile JSON (default: <save>_profile.json)')
 
 args = parser.parse_args()
 
+# Per-rank phase timings, memory and model counts (instrument_Yao1000.py)
+from instrument_Yao1000 import PhaseProfiler, createNetwork
+profiler = PhaseProfiler()
+
 ###############################################################################
 # IMPORT NETWORK PARAMETERS
 ###############################################################################
 
-from netParams_Yao1000 import netParams, cellTypes
+# NEURON / NetPyNE only after the arguments parsed; mod/ is built through the cache
+with profiler.phase('load'):
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms()
+
+    from netpyne import sim
+    from netParams_Yao1000 import netParams, cellTypes, printSummary
+printSummary()
+
+# Apply calibrated synConds/bgStim weights
+if args.overlay:
+    from calibrate_Yao1000 import loadOverlay, applyOverlay
+    numChanged = applyOverlay(netParams, loadOverlay(args.overlay))
+    print(f"Applied weight overlay {args.overlay} ({numChanged} rules rescaled)")
 
 # Modify for test run
 if args.test:
@@ -63,7 +101,7 @@ simConfig.verbose = False
 simConfig.recordTraces = {}
 simConfig.recordStep = 0.1  # ms (record at 10 kHz)
 simConfig.filename = args.save
-simConfig.savePickle = True
+simConfig.savePickle = args.format == 'pickle'
 simConfig.saveJson = False
 simConfig.saveDat = False
 simConfig.printRunTime = 0.1  # print run time every 0.1 fraction
@@ -71,21 +109,14 @@ simConfig.seeds = {'conn': args.seed, 'stim': args.seed, 'loc': args.seed}
 
 # Recording configuration
 simConfig.recordStim = False
-simConfig.recordLFP = False  # LFP recording (can be enabled later)
+simConfig.recordLFP = False  # LFP is computed by lfp_Yao1000.LFPRecorder (--lfp)
 
 # Record spikes from all cells
 simConfig.recordCells = []  # Record from all cells
 simConfig.recordTraces = {}
 
-if args.record:
-    # Record detailed traces from sample cells
-    simConfig.recordTraces = {
-        'V_soma': {'sec': 'soma', 'loc': 0.5, 'var': 'v'},
-    }
-    # Record from 10 cells of each type
-    simConfig.recordCellsSpikes = -1  # all cells
-else:
-    simConfig.recordCellsSpikes = -1  # Record spikes from all cells
+# Traces (--record) are recorded by traces_Yao1000.TraceRecorder, not simConfig.recordTraces
+simConfig.recordCellsSpikes = -1  # Record spikes from all cells
 
 # Analysis and plotting
 simConfig.analysis = {
@@ -142,8 +173,8 @@ print(f"Temperature: {simConfig.hParams['celsius']} °C")
 print(f"Random seed: {args.seed}")
 print("=" * 80)
 
-# Create network
-sim.initialize(netParams, simConfig)
+# Create network (sim.create in timed phases: initialize, create, connect, stims)
+createNetwork(sim, netParams, simConfig, profiler)
 
 # Print network statistics
 print("\nNetwork Statistics:")
@@ -155,14 +186,56 @@ print(f"\nTotal cells: {sum([len(pop.cellGids) for pop in sim.net.pops.values()]
 print(f"Total connections: {len(sim.net.params.connParams)} connection types")
 print("=" * 80)
 
+# Per-gid Random123 streams of the stochastic synapses (same for any number of ranks / threads)
+from cells_Yao1000 import setRandomStreams
+setRandomStreams(sim, args.seed)
+
 # Set up recording
-sim.setupRecording()
+with profiler.phase('record'):
+    sim.setupRecording()
+
+    if args.record:
+        from traces_Yao1000 import TraceRecorder, selectCells
+        recorder = TraceRecorder(selectCells(sim, perPop=args.record_cells),
+                                 recordStep=args.record_step, envelope=args.envelope)
+        recorder.attach(sim)
+        print(f"Recording V_soma of {len(recorder.gids)} cells every {args.record_step} ms"
+              + (f" ({args.envelope} ms min/max envelopes)" if args.envelope else ""))
+
+    if args.lfp:
+        from lfp_Yao1000 import LFPRecorder
+        lfp = LFPRecorder(recordStep=simConfig.recordStep, maxDistance=args.lfp_cutoff)
+        lfp.attach(sim)
+        print(f"Recording LFP on {len(lfp.electrodes)} electrodes ({lfp.matrix.nnz} transfer entries"
+              + (", cached)" if lfp.cached else ")"))
 
 # Run simulation
 print("\nSTARTING SIMULATION...")
 print("=" * 80)
 
-sim.runSim()
+if args.abort_runaway or args.rates_only or args.stream_spikes or args.record:
+    import monitor_Yao1000
+    consumers = [recorder] if args.record else []
+    if args.stream_spikes:
+        from spikeio_Yao1000 import SpikeWriter
+        consumers.append(SpikeWriter(args.stream_spikes))
+    if args.abort_runaway:
+        monitor = monitor_Yao1000.RunawayMonitor()
+        consumers.append(monitor)
+    if args.rates_only:
+        accumulator = monitor_Yao1000.RateAccumulator()
+        consumers.append(accumulator)
+    with profiler.phase('run'):
+        monitor_Yao1000.runSimMonitored(consumers)
+    with profiler.phase('gather'):
+        sim.gatherData(gatherOnlySimData=args.rates_only or bool(args.stream_spikes))
+    if args.abort_runaway:
+        monitor_Yao1000.flagResult(monitor)
+    if args.rates_only:
+        monitor_Yao1000.storeRates(accumulator)
+else:
+    with profiler.phase('run'):
+        sim.runSim()
 
 print("=" * 80)
 print("SIMULATION COMPLETE")
@@ -174,46 +247,89 @@ print("=" * 80)
 
 # Save simulation data
 print("\nSaving data...")
-sim.saveData()
-
-# Calculate firing rates for each population
-print("\nFiring Rate Analysis:")
-print("-" * 80)
-
-spkts = sim.allSimData['spkt']
-spkids = sim.allSimData['spkid']
-
-# Analysis window (exclude initial transient)
-tstart = 500  # ms
-tstop = simConfig.duration  # ms
-duration_s = (tstop - tstart) / 1000.0  # Convert to seconds
-
-# Calculate firing rates per population
-for popLabel, pop in sim.net.pops.items():
-    cellGids = pop.cellGids
-
-    # Count spikes in analysis window
-    spikes_in_window = [spkts[i] for i, gid in enumerate(spkids)
-                        if gid in cellGids and tstart <= spkts[i] <= tstop]
-
-    total_spikes = len(spikes_in_window)
-    num_cells = len(cellGids)
-
-    if num_cells > 0 and duration_s > 0:
-        avg_rate = total_spikes / (num_cells * duration_s)
+if args.format == 'results':
+    if not getattr(sim, 'allSimData', None):
+        with profiler.phase('gather'):
+            sim.gatherData()
+    with profiler.phase('save'):
+        if sim.rank == 0:
+            from results_Yao1000 import saveResults
+            saveResults(args.save + '.results', spikeStream=args.stream_spikes)
+        if args.record:
+            recorder.save(args.save + '.results', compress=args.compress)
+        if args.lfp:
+            lfp.save(args.save + '.results', compress=args.compress)
+else:
+    with profiler.phase('gather'):
+        if args.record:
+            traces = recorder.gather()
+            if sim.rank == 0:
+                for label, (t, gids, data) in traces.items():
+                    sim.allSimData[label] = {f'cell_{gid}': row for gid, row in zip(gids, data)}
+        if args.lfp:
+            t, lfpData, dipole = lfp.gather()
+            if sim.rank == 0:
+                sim.allSimData['LFP'] = lfpData.T  # (time x electrodes) as NetPyNE's recordLFP
+                sim.allSimData['dipole'] = dipole.T
+    with profiler.phase('save'):
+        sim.saveData()
+
+with profiler.phase('analysis'):
+
+    # Calculate firing rates for each population
+    print("\nFiring Rate Analysis:")
+    print("-" * 80)
+
+    spkts = sim.allSimData['spkt']
+    spkids = sim.allSimData['spkid']
+    if args.stream_spikes:
+        from spikeio_Yao1000 import readSpikes
+        spkts, spkids = readSpikes(args.stream_spikes)
+
+    # Analysis window (exclude initial transient)
+    tstart = 500  # ms
+    tstop = simConfig.duration  # ms
+    duration_s = (tstop - tstart) / 1000.0  # Convert to seconds
+
+    # Spike times were not kept: rates come from the accumulated histograms
+    if args.rates_only:
+        for popLabel, rate in accumulator.meanRates(tstart, tstop).items():
+            print(f"{popLabel:15s}: {rate:6.2f} Hz")
+
+    # Calculate firing rates per population (CSR index, see spikestats_Yao1000.py)
     else:
-        avg_rate = 0.0
+        from spikestats_Yao1000 import SpikeIndex
+        numCells = sum(len(pop.cellGids) for pop in sim.net.pops.values())
+        index = SpikeIndex.fromSpikes(spkts, spkids, numCells)
+        counts = index.counts(tstart, tstop)
+        for popLabel, pop in sim.net.pops.items():
+            cellGids = np.asarray(pop.cellGids, dtype=int)
+            total_spikes = int(counts[cellGids].sum())
+            num_cells = len(cellGids)
+
+            if num_cells > 0 and duration_s > 0:
+                avg_rate = total_spikes / (num_cells * duration_s)
+            else:
+                avg_rate = 0.0
+
+            print(f"{popLabel:15s}: {avg_rate:6.2f} Hz (total spikes: {total_spikes})")
 
-    print(f"{popLabel:15s}: {avg_rate:6.2f} Hz (total spikes: {total_spikes})")
+    print("=" * 80)
 
-print("=" * 80)
+    # Generate plots
+    if not args.no_gui:
+        print("\nGenerating plots...")
+        sim.analysis.plotData()
 
-# Generate plots
-if not args.no_gui:
-    print("\nGenerating plots...")
-    sim.analysis.plotData()
+# Phase profile of all ranks (one JSON record per run)
+profilePath = args.profile or args.save + '_profile.json'
+record = profiler.write(sim, profilePath)
+if sim.rank == 0:
+    from instrument_Yao1000 import printRecord
+    printRecord(record)
 
 print("\n✓ Simulation complete!")
-print(f"✓ Data saved to: {args.save}.pkl")
+print(f"✓ Data saved to: {args.save + ('.results' if args.format == 'results' else '_data.pkl')}")
 print(f"✓ Figures saved with prefix: {args.save}_")
+print(f"✓ Profile saved to: {profilePath}")
 print("=" * 80)
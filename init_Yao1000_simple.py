@@ -5,9 +5,15 @@ Simple version using Izhikevich point neurons
 Good for quick testing before moving to detailed morphologies
 """
 
-from netpyne import sim
 import sys
 
+# Per-rank phase timings, memory and model counts (instrument_Yao1000.py)
+from instrument_Yao1000 import PhaseProfiler, createNetwork, printRecord
+profiler = PhaseProfiler()
+
+with profiler.phase('load'):
+    from netpyne import sim
+
 ###############################################################################
 # Parse arguments
 ###############################################################################
@@ -19,7 +25,9 @@ duration = 4500 if not test_mode else 1000
 # Import network
 ###############################################################################
 
-from netParams_Yao1000_v2 import netParams, cellTypes
+with profiler.phase('load'):
+    from netParams_Yao1000_v2 import netParams, cellTypes, printSummary
+printSummary()
 
 if test_mode:
     print("=" * 80)
@@ -74,38 +82,50 @@ print("=" * 80)
 print(f"Duration: {duration} ms")
 print("=" * 80)
 
-sim.initialize(netParams, simConfig)
+createNetwork(sim, netParams, simConfig, profiler)
 
 print("\nNetwork Statistics:")
 for popLabel, pop in sim.net.pops.items():
     print(f"{popLabel:15s}: {len(pop.cellGids):5d} cells")
 print(f"Total: {sum([len(p.cellGids) for p in sim.net.pops.values()])} cells")
 
-sim.setupRecording()
-sim.runSim()
-sim.saveData()
+with profiler.phase('record'):
+    sim.setupRecording()
+with profiler.phase('run'):
+    sim.runSim()
+with profiler.phase('gather'):
+    sim.gatherData()
+with profiler.phase('save'):
+    sim.saveData()
 
 # Calculate firing rates
 print("\n" + "=" * 80)
 print("FIRING RATE ANALYSIS")
 print("=" * 80)
 
-spkts = sim.allSimData['spkt']
-spkids = sim.allSimData['spkid']
-tstart = 500
-tstop = duration
-duration_s = (tstop - tstart) / 1000.0
+with profiler.phase('analysis'):
+    spkts = sim.allSimData['spkt']
+    spkids = sim.allSimData['spkid']
+    tstart = 500
+    tstop = duration
+    duration_s = (tstop - tstart) / 1000.0
 
-for popLabel, pop in sim.net.pops.items():
-    cellGids = pop.cellGids
-    spikes = [t for t, gid in zip(spkts, spkids) if gid in cellGids and tstart <= t <= tstop]
-    if len(cellGids) > 0:
-        rate = len(spikes) / (len(cellGids) * duration_s)
-        print(f"{popLabel:15s}: {rate:6.2f} Hz")
+    for popLabel, pop in sim.net.pops.items():
+        cellGids = pop.cellGids
+        spikes = [t for t, gid in zip(spkts, spkids) if gid in cellGids and tstart <= t <= tstop]
+        if len(cellGids) > 0:
+            rate = len(spikes) / (len(cellGids) * duration_s)
+            print(f"{popLabel:15s}: {rate:6.2f} Hz")
 
 print("=" * 80)
 print("SIMULATION COMPLETE!")
 print(f"Data saved to: {simConfig.filename}.pkl")
 print("=" * 80)
 
-sim.analysis.plotData()
+with profiler.phase('analysis'):
+    sim.analysis.plotData()
+
+# Phase profile of all ranks (one JSON record per run)
+record = profiler.write(sim, f'{simConfig.filename}_profile.json')
+if sim.rank == 0:
+    printRecord(record)
@@ -0,0 +1,292 @@
+"""
+instrument_Yao1000.py
+
+Phase-level profiling shared by the Yao network init scripts
+A PhaseProfiler times every phase of a run on every rank (initialize, cell
+creation, connections, stims, recording setup, run, gather, save, analysis),
+tracks the peak resident memory after each phase, counts what the rank
+instantiated (cells, sections, segments, NetCons, point processes by type)
+and reads NEURON's ParallelContext step/wait/send/event times. record()
+gathers all ranks into one JSON record per run, written by rank 0.
+
+Usage (inside an init script):
+    from instrument_Yao1000 import PhaseProfiler, createNetwork
+    profiler = PhaseProfiler()
+    createNetwork(sim, netParams, simConfig, profiler)   # initialize + create/connect/stims phases
+    with profiler.phase('record'):
+        sim.setupRecording()
+    with profiler.phase('run'):
+        sim.runSim()
+    ...
+    profiler.write(sim, 'Yao1000_profile.json')          # collective; rank 0 writes
+
+    python instrument_Yao1000.py Yao1000_profile.json      # Phase table of a record
+    python instrument_Yao1000.py runs/*_profile.json       # One table per record
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+from contextlib import contextmanager
+
+# Phase order of a run (records keep any other phase names after these)
+PHASES = ('load', 'initialize', 'create', 'connect', 'stims', 'record', 'run', 'gather', 'save', 'analysis')
+
+###############################################################################
+# PER-RANK MEASUREMENTS
+###############################################################################
+
+def peakRSS():
+    """Peak resident set size of this process (MB)"""
+
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10  # bytes on macOS, kB elsewhere
+
+def modelCounts():
+    """
+    Objects instantiated in this process
+
+    Returns:
+        {'sections', 'segments', 'netcons', 'pointProcesses' (total),
+         'pointProcessTypes' ({name: count}, artificial cells included)}
+    """
+
+    from neuron import h
+
+    sections = segments = 0
+    for sec in h.allsec():
+        sections += 1
+        segments += sec.nseg
+
+    types = {}
+    mt = h.MechanismType(1)
+    name = h.ref('')
+    for i in range(int(mt.count())):
+        mt.select(i)
+        mt.selected(name)
+        count = int(h.List(name[0]).count())
+        if count:
+            types[name[0]] = count
+
+    return {'sections': sections, 'segments': segments, 'netcons': int(h.List('NetCon').count()),
+            'pointProcesses': sum(types.values()), 'pointProcessTypes': types}
+
+def parallelTimes(pc):
+    """ParallelContext timers of this rank (s): integration, spike exchange wait, send, events"""
+
+    return {'step': pc.step_time(), 'wait': pc.wait_time(), 'send': pc.send_time(),
+            'event': pc.event_time()}
+
+###############################################################################
+# PROFILER
+###############################################################################
+
+class PhaseProfiler:
+    """
+    Wall time and peak memory of every phase of a run on this rank
+
+    profiler.phase(name)        context manager; repeated phases accumulate
+    profiler.times              {phase: seconds}
+    profiler.memory             {phase: peak RSS (MB) at the end of the phase}
+    profiler.count(name)        keep modelCounts() of this moment in profiler.counts[name]
+    profiler.record(sim)        collective; all ranks -> one JSON-ready dict
+    profiler.write(sim, path)   record() and write it on rank 0
+    """
+
+    def __init__(self, script=None):
+        self.script = os.path.basename(script or sys.argv[0])
+        self.argv = sys.argv[1:]
+        self.start = time.time()
+        self.t0 = time.perf_counter()
+        self.times = {}
+        self.memory = {}
+        self.counts = {}
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - t0
+            self.memory[name] = peakRSS()
+
+    def count(self, name):
+        self.counts[name] = modelCounts()
+        return self.counts[name]
+
+    def local(self, sim):
+        """Measurements of this rank"""
+
+        out = {'rank': int(sim.rank),
+               'wall': time.perf_counter() - self.t0,
+               'phases': dict(self.times),
+               'peakRSS': peakRSS(),
+               'phaseRSS': dict(self.memory),
+               'cells': len(sim.net.cells),
+               'parallel': parallelTimes(sim.pc)}
+        out.update(modelCounts())
+        return out
+
+    def record(self, sim):
+        """
+        Gather every rank's measurements into one run record (call on all ranks)
+
+        Returns:
+            {'script', 'argv', 'start', 'host', 'nhosts', 'nthreads', 'versions',
+             'config', 'ranks' (per-rank measurements), 'phases' ({phase: min/mean/max s}),
+             'totals' (counts summed over ranks), 'peakRSS' (max MB), 'loadBalance'}
+        """
+
+        import platform
+        import numpy as np
+
+        ranks = sim.pc.py_allgather(self.local(sim))
+
+        names = [name for name in PHASES if any(name in r['phases'] for r in ranks)]
+        names += sorted({name for r in ranks for name in r['phases']} - set(names))
+        phases = {}
+        for name in names:
+            seconds = np.array([r['phases'].get(name, 0.0) for r in ranks])
+            phases[name] = {'min': float(seconds.min()), 'mean': float(seconds.mean()), 'max': float(seconds.max())}
+
+        step = np.array([r['parallel']['step'] for r in ranks])
+        wait = np.array([r['parallel']['wait'] for r in ranks])
+        types = {}
+        for r in ranks:
+            for name, count in r['pointProcessTypes'].items():
+                types[name] = types.get(name, 0) + count
+
+        return {
+            'script': self.script,
+            'argv': self.argv,
+            'start': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.start)),
+            'host': platform.node(),
+            'nhosts': int(sim.nhosts),
+            'nthreads': int(sim.pc.nthread()),
+            'versions': versions(),
+            'config': {'duration': float(sim.cfg.duration), 'dt': float(sim.cfg.dt)},
+            'ranks': ranks,
+            'phases': phases,
+            'wall': max(r['wall'] for r in ranks),
+            'totals': {key: int(sum(r[key] for r in ranks))
+                       for key in ('cells', 'sections', 'segments', 'netcons', 'pointProcesses')},
+            'pointProcessTypes': types,
+            'peakRSS': max(r['peakRSS'] for r in ranks),
+            # max / mean integration time over ranks (1 = balanced); wait is time lost at spike exchange
+            'loadBalance': {'step': float(step.max() / step.mean()) if step.mean() > 0 else None,
+                            'maxWait': float(wait.max())},
+        }
+
+    def write(self, sim, path):
+        """Write the run record (collective; only rank 0 writes). '.jsonl' paths are appended to"""
+
+        record = self.record(sim)
+        if sim.rank == 0:
+            writeRecord(record, path)
+        return record
+
+def versions():
+    """Versions of the simulation stack (from package metadata)"""
+
+    from importlib import metadata
+
+    out = {'python': sys.version.split()[0]}
+    for dist in ('neuron', 'netpyne', 'numpy'):
+        try:
+            out[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            out[dist] = None
+    return out
+
+def writeRecord(record, path):
+    """One JSON record per file, or one line per run appended to a .jsonl log"""
+
+    if path.endswith('.jsonl'):
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    else:
+        with open(path, 'w') as f:
+            json.dump(record, f, indent=1)
+
+def readRecords(path):
+    """Run records of a .json file or a .jsonl log"""
+
+    with open(path) as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return [json.load(f)]
+
+###############################################################################
+# INSTRUMENTED NETWORK CREATION
+###############################################################################
+
+def createNetwork(sim, netParams, simConfig, profiler):
+    """
+    sim.create() without setupRecording, one profiler phase per step
+
+    Returns:
+        (pops, cells, conns, stims) as returned by sim.net
+    """
+
+    with profiler.phase('initialize'):
+        sim.initialize(netParams, simConfig)
+    with profiler.phase('create'):
+        pops = sim.net.createPops()
+        cells = sim.net.createCells()
+    with profiler.phase('connect'):
+        conns = sim.net.connectCells()
+    with profiler.phase('stims'):
+        stims = sim.net.addStims()
+    return pops, cells, conns, stims
+
+###############################################################################
+# REPORT
+###############################################################################
+
+def printRecord(record, out=sys.stdout):
+    """Phase table of one run record"""
+
+    print("=" * 80, file=out)
+    print(f"PROFILE: {record['script']} {' '.join(record['argv'])}  ({record['start']}, {record['host']})", file=out)
+    print(f"Ranks: {record['nhosts']}, threads: {record['nthreads']}, "
+          f"duration {record['config']['duration']:g} ms, dt {record['config']['dt']:g} ms", file=out)
+    print("=" * 80, file=out)
+    print(f"{'Phase':<14} {'min (s)':>10} {'mean (s)':>10} {'max (s)':>10} {'% wall':>8} {'RSS (MB)':>10}", file=out)
+    print("-" * 80, file=out)
+    wall = record['wall']
+    for name, t in record['phases'].items():
+        rss = max(r['phaseRSS'].get(name, 0.0) for r in record['ranks'])
+        print(f"{name:<14} {t['min']:10.3f} {t['mean']:10.3f} {t['max']:10.3f} "
+              f"{100 * t['max'] / wall if wall else 0:7.1f}% {rss:10.1f}", file=out)
+    print("-" * 80, file=out)
+    print(f"{'wall':<14} {wall:10.3f}", file=out)
+
+    totals = record['totals']
+    print(f"\nCells: {totals['cells']}, sections: {totals['sections']}, segments: {totals['segments']}", file=out)
+    print(f"NetCons: {totals['netcons']}, point processes: {totals['pointProcesses']} "
+          f"({', '.join(f'{k} {v}' for k, v in sorted(record['pointProcessTypes'].items()))})", file=out)
+    print(f"Peak RSS: {record['peakRSS']:.1f} MB (max over ranks)", file=out)
+    step = [r['parallel']['step'] for r in record['ranks']]
+    balance = record['loadBalance']['step']
+    print(f"Step time: {min(step):.3f}-{max(step):.3f} s, max wait {record['loadBalance']['maxWait']:.3f} s"
+          + (f", load balance (max/mean) {balance:.2f}" if balance else ''), file=out)
+    print("=" * 80, file=out)
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Print run profiles written by the init scripts')
+    parser.add_argument('paths', nargs='+', help='Profile records (.json) or logs (.jsonl)')
+    args = parser.parse_args()
+
+    for path in args.paths:
+        for record in readRecords(path):
+            printRecord(record)
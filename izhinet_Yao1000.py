@@ -0,0 +1,630 @@
+"""
+izhinet_Yao1000.py
+
+Vectorized NumPy simulator of the Izhikevich network (netParams_Yao1000_v2)
+The populations, Izhi2007b parameters, connection rules, Exp2Syn kinetics and
+Poisson background of the v2 netParams are simulated as (batch x cells)
+arrays, with one sparse matrix per synaptic mechanism and delay routing the
+spikes into a ring buffer of synaptic input. The batch dimension runs many
+independent trials (background seeds) and parameter points (Izhikevich
+parameters, synaptic gains, background rates) on the same connectivity in one
+pass, so there is no per-cell overhead and the cost per step hardly grows
+with the batch.
+
+The integration reproduces NEURON's fixed step (secondorder 0) on the v2
+soma: events are delivered up to t + dt/2, the membrane potential takes a
+linearized backward-Euler step (di/dv by the same 0.001 mV difference),
+Exp2Syn states decay exactly, u takes the derivimplicit step at the new v,
+and spikes (upward crossing of netParams.defaultThreshold) and the WATCH
+reset (v > vpeak) are checked at the end of the step. Only the generic reset
+of Izhi2007b (celltype 1-3) is supported, as used by v2.
+
+Validation runs the NEURON network in a worker process, replays its exact
+connectivity and background spike trains through the engine and compares the
+spikes with the tolerance-aware check of regression_Yao1000 (network
+tolerances), plus the population rates of an independent engine run with its
+own connectivity and Poisson drive.
+
+Usage:
+    python izhinet_Yao1000.py run --cells 1000 --duration 1000 --batch 20     # 20 trials, rates per population
+    python izhinet_Yao1000.py run --batch 8 --scan HL23PYR:d:50:250            # Parameter scan over the batch
+    python izhinet_Yao1000.py validate --cells 200 --duration 500              # Against the NEURON run
+    python izhinet_Yao1000.py benchmark --cells 1000 --batches 1 10 50
+
+    from izhinet_Yao1000 import buildNetwork, simulate
+    net = buildNetwork(numCells=1000, seed=42)
+    out = simulate(net, duration=1000.0, batch=16, gains={'GABA': np.linspace(0.5, 2, 16)})
+"""
+
+import os
+import sys
+import copy
+import time
+import argparse
+import numpy as np
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# NETWORK TABLES
+###############################################################################
+
+PARAM_NAMES = ('C', 'k', 'vr', 'vt', 'vpeak', 'a', 'b', 'c', 'd')
+
+def exp2Factor(tau1, tau2):
+    """Exp2Syn normalization: an event of weight w gives a conductance peak of w"""
+
+    tp = tau1 * tau2 / (tau2 - tau1) * np.log(tau2 / tau1)
+    return 1.0 / (np.exp(-tp / tau2) - np.exp(-tp / tau1))
+
+def _cellRule(netParams, cellType):
+    for rule in netParams.cellParams.values():
+        if rule.get('conds', {}).get('cellType') == cellType:
+            return rule
+    raise ValueError(f"no cell rule for cellType {cellType}")
+
+def _izhiSoma(rule):
+    """(Izhi2007b parameters, membrane capacitance in nF) of a one-section v2 cell rule"""
+
+    soma = rule['secs']['soma']
+    izhi = [p for p in soma.get('pointps', {}).values() if p.get('mod') == 'Izhi2007b']
+    if len(izhi) != 1 or soma.get('mechs'):
+        raise ValueError("expected a soma with one Izhi2007b point process and no membrane mechanisms")
+    if int(izhi[0].get('celltype', 1)) not in (1, 2, 3):
+        raise ValueError(f"Izhi2007b celltype {izhi[0]['celltype']} is not supported (generic reset only)")
+    geom = soma['geom']
+    area = np.pi * geom['diam'] * geom['L']  # um2, one segment
+    return {name: float(izhi[0][name]) for name in PARAM_NAMES}, geom.get('cm', 1.0) * area * 1e-5
+
+def _assemble(pops, cellParams, synMechs, threshold, conns, bkg):
+    """
+    Network dict from per-cell and per-connection tables
+
+    Args:
+        pops: {label: (first gid, number of cells)}
+        cellParams: list of (gid range, Izhi parameters, capacitance nF)
+        synMechs: {mech: {'tau1', 'tau2', 'e'}}
+        conns: (pre, post, mech, weight uS, delay ms) arrays
+        bkg: {mech: (rate Hz per cell, weight uS per cell)}
+    """
+
+    from scipy import sparse
+
+    numCells = sum(n for _, n in pops.values())
+    params = {name: np.zeros(numCells) for name in PARAM_NAMES}
+    cm = np.zeros(numCells)
+    for (start, n), values, capacitance in cellParams:
+        for name in PARAM_NAMES:
+            params[name][start:start + n] = values[name]
+        cm[start:start + n] = capacitance
+
+    mechs = sorted(synMechs)
+    pre, post, mech, weight, delay = conns
+    matrices = {}
+    for m in mechs:
+        for d in np.unique(delay[mech == m]):
+            sel = (mech == m) & (delay == d)
+            # duplicates (several contacts of a pair) are summed by the sparse constructor
+            matrices[(m, float(d))] = sparse.csc_matrix((weight[sel], (post[sel], pre[sel])),
+                                                        shape=(numCells, numCells))
+
+    return {'numCells': numCells, 'pops': dict(pops), 'params': params, 'cm': cm,
+            'synMechs': {m: dict(synMechs[m], factor=exp2Factor(synMechs[m]['tau1'], synMechs[m]['tau2']))
+                         for m in mechs},
+            'conns': matrices, 'numConns': len(pre), 'bkg': bkg, 'threshold': threshold}
+
+def buildNetwork(netParams=None, numCells=None, seed=42):
+    """
+    Engine network of a v2-style netParams: same populations, rules and background
+
+    Connections are drawn with the rule probabilities from numpy's generator;
+    as in NetPyNE, there are no self-connections and every cell pair has one
+    uniform draw shared by all rules (the AMPA and NMDA rules of a pathway
+    connect the same pairs). The network is statistically, not synapse by
+    synapse, the one NetPyNE builds (see neuronReference for that).
+
+    Args:
+        netParams: NetPyNE netParams (default: netParams_Yao1000_v2, copied)
+        numCells: scale the populations to about this size (benchmark_Yao1000.scalePopulations)
+        seed: connectivity seed
+    """
+
+    from benchmark_Yao1000 import scalePopulations
+
+    if netParams is None:
+        import netParams_Yao1000_v2
+        netParams = netParams_Yao1000_v2.netParams
+    netParams = copy.deepcopy(netParams)
+    if numCells is not None:
+        scalePopulations(netParams, numCells)
+
+    pops, cellParams, start = {}, [], 0
+    for label, pop in netParams.popParams.items():
+        pops[label] = (start, int(pop['numCells']))
+        params, capacitance = _izhiSoma(_cellRule(netParams, pop['cellType']))
+        cellParams.append((pops[label], params, capacitance))
+        start += int(pop['numCells'])
+
+    rng = np.random.default_rng(seed)
+    draws = {}
+    pre, post, mech, weight, delay = [], [], [], [], []
+    for label, rule in netParams.connParams.items():
+        if 'probability' not in rule or isinstance(rule['probability'], str) or isinstance(rule['weight'], str):
+            raise ValueError(f"{label}: only constant probability, weight and delay are supported")
+        p0, nPre = pops[rule['preConds']['pop']]
+        q0, nPost = pops[rule['postConds']['pop']]
+        key = (rule['preConds']['pop'], rule['postConds']['pop'])
+        if key not in draws:
+            draws[key] = rng.random((nPost, nPre))
+        connected = draws[key] < rule['probability']
+        if p0 == q0:
+            np.fill_diagonal(connected, False)
+        i, j = np.nonzero(connected)
+        post.append(i + q0)
+        pre.append(j + p0)
+        mech += [rule['synMech']] * len(i)
+        weight.append(np.full(len(i), float(rule['weight'])))
+        delay.append(np.full(len(i), float(rule['delay'])))
+
+    bkg = {}
+    for label, target in netParams.stimTargetParams.items():
+        source = netParams.stimSourceParams[target['source']]
+        if source.get('type') != 'NetStim' or source.get('noise', 0) != 1.0:
+            raise ValueError(f"{label}: only Poisson NetStim background (noise 1) is supported")
+        s0, n = pops[target['conds']['pop']]
+        rate, w = bkg.setdefault(target['synMech'], (np.zeros(start), np.zeros(start)))
+        if rate[s0:s0 + n].any():
+            raise ValueError(f"{label}: one background source per cell and mechanism")
+        rate[s0:s0 + n] = source['rate']
+        w[s0:s0 + n] = target['weight']
+
+    conns = (np.concatenate(pre), np.concatenate(post), np.array(mech),
+             np.concatenate(weight), np.concatenate(delay))
+    synMechs = {m: {k: netParams.synMechParams[m][k] for k in ('tau1', 'tau2', 'e')} for m in netParams.synMechParams}
+    return _assemble(pops, cellParams, synMechs, float(netParams.defaultThreshold), conns, bkg)
+
+###############################################################################
+# SIMULATION
+###############################################################################
+
+def _batchParams(net, batch, params):
+    """(batch, numCells) arrays of the Izhikevich parameters with the overrides applied"""
+
+    out = {name: np.repeat(net['params'][name][None, :], batch, axis=0) for name in PARAM_NAMES}
+    for pop, values in (params or {}).items():
+        start, n = net['pops'][pop]
+        for name, value in values.items():
+            out[name][:, start:start + n] = np.reshape(np.broadcast_to(value, (batch,)), (batch, 1))
+    return out
+
+def _gain(gains, key, batch):
+    return np.reshape(np.broadcast_to(np.asarray((gains or {}).get(key, 1.0), dtype=float), (batch,)), (batch, 1))
+
+def _poissonEvents(rng, rate, dt, steps):
+    """
+    Binned Poisson events of a chunk of steps
+
+    Args:
+        rate: (n,) rate (Hz) of every source
+
+    Returns:
+        step, source: event positions sorted by step
+    """
+
+    counts = rng.poisson(rate * dt * 1e-3 * steps)
+    source = np.repeat(np.arange(len(rate)), counts)
+    step = rng.integers(0, steps, len(source))
+    order = np.argsort(step, kind='stable')
+    return step[order], source[order]
+
+def simulate(net, duration=1000.0, dt=0.025, batch=1, seed=0, params=None, gains=None,
+             bkgRate=None, inputs=None, record=None, chunk=2000):
+    """
+    Simulate a batch of independent runs of one network
+
+    Args:
+        net: buildNetwork() or networkFromTables() output
+        duration, dt: ms
+        batch: number of runs; every run gets its own background events
+        seed: background seed
+        params: {pop: {Izhi parameter: value or (batch,) array}} overrides
+        gains: {synMech or 'bkg': value or (batch,) array} weight multipliers
+        bkgRate: {pop: rate (Hz) or (batch,) array} background rate overrides
+        inputs: recorded background events {'t', 'id', 'weight', 'mech'} replayed in every
+            run instead of the Poisson drive (see neuronReference)
+        record: cell indices whose membrane potential is returned
+        chunk: steps of Poisson background drawn at once
+
+    Returns:
+        {'spkt', 'spkid', 'trial': spikes of all runs, 'batch', 'duration', 'pops',
+         'v': (batch, len(record), steps + 1) if record}
+    """
+
+    N = net['numCells']
+    steps = int(round(duration / dt))
+    p = _batchParams(net, batch, params)
+    C, k, vr, vt, vpeak, a, b, c, d = (p[name] for name in PARAM_NAMES)
+    izhiScale = 1.0 / (1000.0 * C)
+    cmdt = np.broadcast_to(net['cm'] / dt, (batch, N))
+    threshold = net['threshold']
+
+    mechs = list(net['synMechs'])
+    syn = [net['synMechs'][m] for m in mechs]
+    decay1 = [np.exp(-dt / s['tau1']) for s in syn]
+    decay2 = [np.exp(-dt / s['tau2']) for s in syn]
+    A = [np.zeros((batch, N)) for _ in mechs]
+    B = [np.zeros((batch, N)) for _ in mechs]
+
+    # Ring buffer of synaptic input, one slot per step up to the longest delay
+    routes = [(mechs.index(m), int(round(delay / dt)), W, _gain(gains, m, batch))
+              for (m, delay), W in net['conns'].items()]
+    slots = max([r[1] for r in routes] + [0]) + 1
+    buffer = np.zeros((len(mechs), slots, batch, N))
+
+    # Background: per-mechanism Poisson drive, or replayed events
+    rng = np.random.default_rng(seed)
+    sources = []
+    for m, (rate, weight) in net['bkg'].items():
+        rate = np.repeat(rate[None, :], batch, axis=0)
+        for pop, value in (bkgRate or {}).items():
+            start, n = net['pops'][pop]
+            rate[:, start:start + n] = np.reshape(np.broadcast_to(value, (batch,)), (batch, 1))
+        sources.append((mechs.index(m), rate, weight[None, :] * _gain(gains, 'bkg', batch)))
+    if inputs is not None:
+        on = np.ceil(np.asarray(inputs['t']) / dt - 0.5 - 1e-9).astype(int)  # delivered when t_event <= t + dt/2
+        replay = []
+        for m in np.unique(inputs['mech']):
+            sel = (np.asarray(inputs['mech']) == m) & (on < steps)
+            order = np.argsort(on[sel], kind='stable')
+            replay.append((mechs.index(m), on[sel][order], np.asarray(inputs['id'])[sel][order],
+                           np.asarray(inputs['weight'])[sel][order]))
+        sources = []
+
+    v = vr.copy()  # the mechanism sets v = vr at t = 0
+    u = np.zeros((batch, N))
+    below = np.ones((batch, N), dtype=bool)
+    spikes = []
+    trace = None
+    if record is not None:
+        record = np.asarray(record)
+        trace = np.empty((batch, len(record), steps + 1))
+        trace[:, :, 0] = v[:, record]
+
+    events = []
+    for n in range(steps):
+        # Events with t <= t_n + dt/2
+        slot = n % slots
+        for i in range(len(mechs)):
+            inc = buffer[i, slot]
+            A[i] += inc * syn[i]['factor']
+            B[i] += inc * syn[i]['factor']
+            inc.fill(0.0)
+        if inputs is not None:
+            for i, on, cells, weight in replay:
+                lo, hi = np.searchsorted(on, [n, n + 1])
+                if hi > lo:
+                    inc = np.bincount(cells[lo:hi], weights=weight[lo:hi], minlength=N) * syn[i]['factor']
+                    A[i] += inc
+                    B[i] += inc
+        elif sources:
+            if n % chunk == 0:
+                events = [(i, _poissonEvents(rng, rate.ravel(), dt, min(chunk, steps - n)), weight)
+                          for i, rate, weight in sources]
+            for i, (step, source), weight in events:
+                lo, hi = np.searchsorted(step, [n % chunk, n % chunk + 1])
+                if hi > lo:
+                    trial, cell = np.divmod(source[lo:hi], N)
+                    inc = np.zeros((batch, N))
+                    np.add.at(inc, (trial, cell), weight[trial, cell] * syn[i]['factor'])
+                    A[i] += inc
+                    B[i] += inc
+
+        # Linearized backward-Euler step of v (NEURON's fixed step)
+        current = -(k * (v - vr) * (v - vt) - u) * izhiScale
+        conductance = -k * (2.0 * v - vr - vt + 0.001) * izhiScale
+        for i in range(len(mechs)):
+            g = B[i] - A[i]
+            current += g * (v - syn[i]['e'])
+            conductance += g
+        v = v - current / (cmdt + conductance)
+
+        # States at the new v
+        for i in range(len(mechs)):
+            A[i] *= decay1[i]
+            B[i] *= decay2[i]
+        u = (u + dt * a * b * (v - vr)) / (1.0 + dt * a)
+
+        # Threshold detection and WATCH reset at t_{n+1}
+        fired = (v >= threshold) & below
+        below = v < threshold
+        reset = v > vpeak
+        if reset.any():
+            v = np.where(reset, c, v)
+            u = np.where(reset, u + d, u)
+        if fired.any():
+            trial, cell = np.nonzero(fired)
+            spikes.append((n + 1, trial, cell))
+            active = np.flatnonzero(fired.any(axis=0))
+            S = fired[:, active].T.astype(float)  # (active cells, batch)
+            for i, delaySteps, W, gain in routes:
+                buffer[i, (n + 1 + delaySteps) % slots] += (W[:, active] @ S).T * gain
+        if trace is not None:
+            trace[:, :, n + 1] = v[:, record]
+
+    if spikes:
+        step = np.concatenate([np.full(len(t), s) for s, t, _ in spikes])
+        trial = np.concatenate([t for _, t, _ in spikes])
+        cell = np.concatenate([c for _, _, c in spikes])
+    else:
+        step = trial = cell = np.zeros(0, dtype=int)
+    out = {'spkt': step * dt, 'spkid': cell, 'trial': trial, 'batch': batch, 'duration': duration,
+           'pops': net['pops']}
+    if trace is not None:
+        out['v'] = trace
+    return out
+
+def populationRates(out):
+    """(batch, pops) firing rates (Hz) and the population labels"""
+
+    labels = list(out['pops'])
+    rates = np.zeros((out['batch'], len(labels)))
+    for j, label in enumerate(labels):
+        start, n = out['pops'][label]
+        sel = (out['spkid'] >= start) & (out['spkid'] < start + n)
+        rates[:, j] = np.bincount(out['trial'][sel], minlength=out['batch']) / n / (out['duration'] / 1000.0)
+    return rates, labels
+
+###############################################################################
+# NEURON REFERENCE (worker process)
+###############################################################################
+
+def neuronReference(numCells, duration=1000.0, dt=0.025, seed=42):
+    """
+    The v2 network run by NetPyNE/NEURON (as benchmark_Yao1000.runNetwork), with its tables
+
+    Returns:
+        {'spkt', 'spkid', 'pops', 'cellParams', 'synMechs', 'threshold', 'conns': (pre, post,
+         mech, weight, delay), 'inputs': {'t', 'id', 'weight', 'mech'} background events,
+         'phases': {phase: s}}
+    """
+
+    from neuron import h
+    from mechanisms_Yao1000 import loadMechanisms
+    from instrument_Yao1000 import PhaseProfiler, createNetwork
+    from benchmark_Yao1000 import scalePopulations, networkConfig
+    loadMechanisms()
+
+    from netpyne import sim
+    import netParams_Yao1000_v2
+
+    netParams = netParams_Yao1000_v2.netParams
+    scalePopulations(netParams, numCells)
+    profiler = PhaseProfiler(script='izhinet reference')
+    createNetwork(sim, netParams, networkConfig(duration, dt, seed), profiler)
+
+    pops, cellParams = {}, []
+    for label, pop in sim.net.pops.items():
+        gids = list(pop.cellGids)
+        pops[label] = (min(gids), len(gids))
+        rule = sim.net.params.cellParams[sim.net.cells[min(gids)].tags['label'][0]]
+        for gid in gids:
+            cell = sim.net.cells[gid]
+            izhi = cell.secs['soma']['pointps']['Izhi']
+            seg = cell.secs['soma']['hObj'](0.5)
+            cellParams.append(((gid, 1), {name: float(izhi[name]) for name in PARAM_NAMES},
+                               seg.cm * seg.area() * 1e-5))
+        _izhiSoma(rule)  # supported configuration
+
+    pre, post, mech, weight, delay = [], [], [], [], []
+    recorders = []
+    for cell in sim.net.cells:
+        for conn in cell.conns:
+            if conn['preGid'] == 'NetStim':
+                vec = h.Vector()
+                conn['hObj'].record(vec)
+                recorders.append((cell.gid, conn['synMech'], conn['weight'], vec))
+            else:
+                pre.append(conn['preGid'])
+                post.append(cell.gid)
+                mech.append(conn['synMech'])
+                weight.append(conn['weight'])
+                delay.append(conn['delay'])
+
+    with profiler.phase('record'):
+        sim.setupRecording()
+    with profiler.phase('run'):
+        sim.runSim()
+    with profiler.phase('gather'):
+        sim.gatherData()
+
+    inputs = {'t': [], 'id': [], 'weight': [], 'mech': []}
+    for gid, m, w, vec in recorders:
+        times = vec.as_numpy().tolist()
+        inputs['t'] += times
+        inputs['id'] += [gid] * len(times)
+        inputs['weight'] += [w] * len(times)
+        inputs['mech'] += [m] * len(times)
+
+    return {'spkt': [float(t) for t in sim.allSimData['spkt']], 'spkid': [int(i) for i in sim.allSimData['spkid']],
+            'pops': pops, 'cellParams': cellParams,
+            'synMechs': {m: {k: p[k] for k in ('tau1', 'tau2', 'e')} for m, p in netParams.synMechParams.items()},
+            'threshold': float(netParams.defaultThreshold),
+            'conns': (pre, post, mech, weight, delay), 'inputs': inputs, 'phases': dict(profiler.times)}
+
+def networkFromTables(reference):
+    """Engine network with exactly the cells and connections of a neuronReference() run"""
+
+    pre, post, mech, weight, delay = reference['conns']
+    conns = (np.asarray(pre, dtype=int), np.asarray(post, dtype=int), np.asarray(mech),
+             np.asarray(weight, dtype=float), np.asarray(delay, dtype=float))
+    numCells = sum(n for _, n in reference['pops'].values())
+    return _assemble(reference['pops'], reference['cellParams'], reference['synMechs'], reference['threshold'],
+                     conns, {m: (np.zeros(numCells), np.zeros(numCells)) for m in reference['synMechs']})
+
+###############################################################################
+# VALIDATION AND BENCHMARK
+###############################################################################
+
+def validate(numCells=200, duration=500.0, dt=0.025, seed=42, trials=8, verbose=True):
+    """
+    Engine vs NEURON on the same v2 network
+
+    replay: the NEURON connectivity and background events replayed, compared
+        spike by spike (regression_Yao1000.compareSpikes, network tolerances)
+    rates: population rates of the NEURON run and of a batch of trials engine
+        runs with the engine's Poisson drive, on the NEURON connectivity and on
+        the engine's own (buildNetwork); small populations make the latter vary
+        between connectivity seeds
+
+    Returns:
+        {'replay': comparison, 'rates': {pop: (NEURON, same connectivity mean, sd, own mean, sd)},
+         'seconds': {...}, 'passed'}
+    """
+
+    from benchmark_Yao1000 import runIsolated
+    from regression_Yao1000 import compareSpikes, TOLERANCES
+
+    t0 = time.time()
+    reference = runIsolated(neuronReference, numCells, duration, dt, seed)
+    tNeuron = time.time() - t0
+
+    groups = {label: list(range(s, s + n)) for label, (s, n) in reference['pops'].items()}
+    golden = {'t': reference['spkt'], 'id': reference['spkid'], 'groups': groups}
+
+    t0 = time.time()
+    replay = simulate(networkFromTables(reference), duration, dt, inputs=reference['inputs'])
+    tReplay = time.time() - t0
+    comparison = compareSpikes(golden, {'t': replay['spkt'].tolist(), 'id': replay['spkid'].tolist(),
+                                        'groups': groups}, TOLERANCES['network'])
+
+    own = buildNetwork(numCells=numCells, seed=seed)
+    same = networkFromTables(reference)
+    same['bkg'] = own['bkg']
+    t0 = time.time()
+    sameRates, labels = populationRates(simulate(same, duration, dt, batch=trials, seed=seed))
+    tBatch = time.time() - t0
+    ownRates, _ = populationRates(simulate(own, duration, dt, batch=trials, seed=seed))
+    ref = [np.isin(reference['spkid'], groups[label]).sum() / len(groups[label]) / (duration / 1000.0)
+           for label in labels]
+
+    out = {'replay': comparison,
+           'rates': {label: (float(ref[j]), float(sameRates[:, j].mean()), float(sameRates[:, j].std()),
+                             float(ownRates[:, j].mean()), float(ownRates[:, j].std()))
+                     for j, label in enumerate(labels)},
+           'seconds': {'neuronRun': reference['phases'].get('run', tNeuron), 'neuronTotal': tNeuron,
+                       'replay': tReplay, 'batch': tBatch, 'trials': trials},
+           'passed': not comparison['failed']}
+    if verbose:
+        printValidation(out)
+    return out
+
+def printValidation(out):
+    r = out['replay']
+    n0, n1 = r['spikes']
+    print(f"Replay (NEURON connectivity and background): spikes {n1}/{n0}, max jitter {r['maxJitter']:.3f} ms, "
+          f"mean {r['meanJitter']:.4f} ms")
+    print(f"   unmatched {r['unmatched']:.3f}  count {r['countDistance']:.3f}  rate {r['rateDeviation']:.3f}  "
+          + ('✓' if not r['failed'] else f"✗ FAILED: {', '.join(r['failed'])}"))
+    print(f"Engine Poisson drive ({out['seconds']['trials']} trials) vs NEURON, rates (Hz):")
+    print(f"   {'Population':<10} {'NEURON':>9} {'same connectivity':>20} {'own connectivity':>20}")
+    for label, (ref, mean, sd, ownMean, ownSd) in out['rates'].items():
+        print(f"   {label:<10} {ref:9.2f} {mean:12.2f} ± {sd:5.2f} {ownMean:12.2f} ± {ownSd:5.2f}")
+    s = out['seconds']
+    print(f"Time: NEURON run {s['neuronRun']:.2f} s, engine replay {s['replay']:.2f} s, "
+          f"engine {s['trials']} trials {s['batch']:.2f} s")
+
+def benchmark(numCells=1000, duration=1000.0, batches=(1, 10, 50), dt=0.025, seed=42, verbose=True):
+    """Wall time of the NEURON run and of engine batches (per run and total)"""
+
+    from benchmark_Yao1000 import runIsolated, benchNetwork
+
+    neuron = runIsolated(benchNetwork, 'izhi', numCells, duration, dt, seed)
+    net = buildNetwork(numCells=numCells, seed=seed)
+    out = {'neuron': {'run': neuron['run'], 'build': neuron['build']}, 'engine': {}}
+    if verbose:
+        print(f"NEURON ({numCells} cells, {duration:g} ms): build {neuron['build']:.2f} s, run {neuron['run']:.2f} s")
+    for batch in batches:
+        t0 = time.time()
+        simulate(net, duration, dt, batch=batch, seed=seed)
+        seconds = time.time() - t0
+        out['engine'][batch] = seconds
+        if verbose:
+            print(f"Engine batch {batch:4d}: {seconds:7.2f} s total, {seconds / batch:7.3f} s per run "
+                  f"({neuron['run'] * batch / seconds:6.1f}x NEURON)")
+    return out
+
+###############################################################################
+# MAIN
+###############################################################################
+
+def parseScan(text):
+    """'POP:PARAM:LO:HI' -> (pop, param, lo, hi)"""
+
+    parts = text.split(':')
+    if len(parts) != 4 or parts[1] not in PARAM_NAMES:
+        raise argparse.ArgumentTypeError(f"expected POP:PARAM:LO:HI with PARAM in {', '.join(PARAM_NAMES)}")
+    return parts[0], parts[1], float(parts[2]), float(parts[3])
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Vectorized NumPy simulator of the Izhikevich Yao network')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help='Simulate a batch of runs and print population rates')
+    p.add_argument('--cells', type=int, default=1000, help='Network size')
+    p.add_argument('--duration', type=float, default=1000.0, help='Simulation duration (ms)')
+    p.add_argument('--batch', type=int, default=10, help='Runs simulated at once')
+    p.add_argument('--seed', type=int, default=42, help='Connectivity and background seed')
+    p.add_argument('--scan', type=parseScan, default=None, metavar='POP:PARAM:LO:HI',
+                   help='Izhikevich parameter swept linearly over the batch')
+
+    p = sub.add_parser('validate', help='Compare with the NEURON run of the same network')
+    p.add_argument('--cells', type=int, default=200, help='Network size')
+    p.add_argument('--duration', type=float, default=500.0, help='Simulation duration (ms)')
+    p.add_argument('--trials', type=int, default=8, help='Independent engine runs for the rate comparison')
+    p.add_argument('--seed', type=int, default=42, help='Connectivity and background seed')
+
+    p = sub.add_parser('benchmark', help='Engine batches vs one NEURON run')
+    p.add_argument('--cells', type=int, default=1000, help='Network size')
+    p.add_argument('--duration', type=float, default=1000.0, help='Simulation duration (ms)')
+    p.add_argument('--batches', type=int, nargs='+', default=[1, 10, 50], help='Batch sizes')
+    p.add_argument('--seed', type=int, default=42, help='Seed')
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"IZHIKEVICH NETWORK ENGINE: {args.command}, {args.cells} cells, {args.duration:g} ms")
+    print("=" * 80)
+
+    if args.command == 'run':
+        net = buildNetwork(numCells=args.cells, seed=args.seed)
+        params, values = None, None
+        if args.scan:
+            pop, name, lo, hi = args.scan
+            if pop not in net['pops']:
+                parser.error(f"unknown population {pop}")
+            values = np.linspace(lo, hi, args.batch)
+            params = {pop: {name: values}}
+        t0 = time.time()
+        out = simulate(net, args.duration, batch=args.batch, seed=args.seed, params=params)
+        seconds = time.time() - t0
+        rates, labels = populationRates(out)
+        print(f"{net['numCells']} cells, {net['numConns']} connections, {args.batch} runs in {seconds:.2f} s")
+        print("-" * 80)
+        print(f"{'run':>4} {(args.scan[1] if args.scan else ''):>9} " + " ".join(f"{label:>9}" for label in labels))
+        for i in range(args.batch):
+            print(f"{i:4d} {(f'{values[i]:9.4g}' if values is not None else ''):>9} "
+                  + " ".join(f"{r:9.2f}" for r in rates[i]))
+        if args.batch > 1:
+            print(f"{'mean':>4} {'':>9} " + " ".join(f"{r:9.2f}" for r in rates.mean(axis=0)))
+        print("=" * 80)
+
+    elif args.command == 'validate':
+        out = validate(args.cells, args.duration, seed=args.seed, trials=args.trials)
+        print("=" * 80)
+        print("✓ Engine matches NEURON" if out['passed'] else "✗ Engine deviates from NEURON")
+        sys.exit(0 if out['passed'] else 1)
+
+    else:
+        benchmark(args.cells, args.duration, args.batches, seed=args.seed)
+        print("=" * 80)
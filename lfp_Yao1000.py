@@ -0,0 +1,267 @@
+"""
+lfp_Yao1000.py
+
+Extracellular potential (LFP) and current dipole for Yao network simulations
+NetPyNE's recordLFP loops over every cell in Python at every time step. Here
+the line-source transfer resistances of all local segments to all electrodes
+are computed once per network geometry into one sparse matrix, stacked with
+the (3 x segments) current-dipole matrix, and cached on disk. During the run
+the membrane currents (i_membrane_, use_fast_imem) of all local segments are
+gathered through one PtrVector and a single sparse matrix-vector product per
+record step yields the LFP of every electrode plus the dipole moment for EEG.
+
+Units: LFP in mV (transfer resistance MΩ x current nA), dipole in nA·μm.
+Coordinates: network frame of the cell tags (μm; y is negative below pia),
+morphologies are placed with their soma center on the cell position.
+
+Usage:
+    python init_Yao1000.py --lfp                      # Laminar probe on the column axis
+    python init_Yao1000.py --lfp --lfp-cutoff 500     # Drop segments > 500 μm from an electrode
+
+    from lfp_Yao1000 import LFPRecorder
+    lfp = LFPRecorder(recordStep=0.1)
+    lfp.attach(sim)                        # after sim.create / setupRecording, before the run
+    sim.runSim()                           # or runSimMonitored(...)
+    lfp.save('Yao1000.results')            # all ranks; traces 'LFP' and 'dipole'
+"""
+
+import os
+import hashlib
+import numpy as np
+import scipy.sparse
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# ELECTRODES
+###############################################################################
+
+SIGMA = 0.3                                  # extracellular conductivity (S/m)
+LFP_CACHE = os.path.join(BASEDIR, '.lfpcache')
+
+# Laminar probe on the column axis, one contact every 100 μm from 250 to 1150 μm below pia
+PROBE = np.array([[0.0, y, 0.0] for y in np.arange(-250.0, -1200.0, -100.0)])
+
+###############################################################################
+# GEOMETRY
+###############################################################################
+
+def somaCenter(cell):
+    """Mean 3-D point of the soma sections of a NetPyNE cell (morphology frame)"""
+
+    pts = [(sec['hObj'].x3d(i), sec['hObj'].y3d(i), sec['hObj'].z3d(i))
+           for name, sec in cell.secs.items() if 'soma' in name
+           for i in range(int(sec['hObj'].n3d()))]
+    return np.mean(pts, axis=0) if pts else np.zeros(3)
+
+def segmentGeometry(cells):
+    """
+    Segment end points of the local cells, in PtrVector order
+
+    Returns:
+        p0, p1: (nSeg, 3) segment start / end points in the network frame (μm)
+        diam: (nSeg,) segment diameters (μm)
+        origin: (nSeg, 3) soma position of the segment's cell
+    """
+
+    from neuron import h
+
+    h.define_shape()  # 3-D points for sections built from L/diam only
+
+    p0, p1, diam, origin = [], [], [], []
+    for cell in cells:
+        offset = np.array([cell.tags.get('x', 0.0), cell.tags.get('y', 0.0), cell.tags.get('z', 0.0)])
+        shift = offset - somaCenter(cell)
+        for sec in cell.secs.values():
+            hSec = sec['hObj']
+            n = int(hSec.n3d())
+            arc = np.array([hSec.arc3d(i) for i in range(n)]) / max(hSec.L, 1e-9)
+            xyz = np.array([[hSec.x3d(i), hSec.y3d(i), hSec.z3d(i)] for i in range(n)])
+            edges = np.linspace(0.0, 1.0, hSec.nseg + 1)
+            ends = np.column_stack([np.interp(edges, arc, xyz[:, k]) for k in range(3)]) + shift
+            p0.append(ends[:-1])
+            p1.append(ends[1:])
+            diam.extend(seg.diam for seg in hSec)
+            origin.append(np.repeat(offset[None], hSec.nseg, axis=0))
+
+    if not p0:
+        empty = np.empty((0, 3))
+        return empty, empty, np.empty(0), empty
+    return np.concatenate(p0), np.concatenate(p1), np.asarray(diam), np.concatenate(origin)
+
+###############################################################################
+# TRANSFER MATRIX
+###############################################################################
+
+def lineSourceMatrix(electrodes, p0, p1, diam, sigma=SIGMA, maxDistance=None):
+    """
+    Sparse (electrodes x segments) line-source transfer resistances (MΩ)
+
+    Each segment is a line current source in an infinite homogeneous medium;
+    the perpendicular distance is clipped to the segment radius. Segments
+    whose midpoint is farther than maxDistance (μm) from an electrode are
+    left out of its row.
+    """
+
+    electrodes = np.atleast_2d(electrodes)
+    mid = (p0 + p1) / 2
+    dl = p1 - p0
+    length = np.linalg.norm(dl, axis=1)
+    axis = np.divide(dl, length[:, None], out=np.zeros_like(dl), where=length[:, None] > 0)
+    radius2 = (np.asarray(diam) / 2) ** 2
+
+    rows, cols, vals = [], [], []
+    for j, pos in enumerate(electrodes):
+        rel = pos - mid
+        r2 = np.einsum('ij,ij->i', rel, rel)
+        keep = np.arange(len(mid)) if maxDistance is None else np.flatnonzero(r2 <= maxDistance ** 2)
+
+        rll = np.abs(np.einsum('ij,ij->i', rel[keep], axis[keep]))
+        rT2 = np.maximum(r2[keep] - rll ** 2, radius2[keep])
+        L = length[keep]
+        up = rll + L / 2
+        low = rll - L / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            line = np.log((up + np.sqrt(up ** 2 + rT2)) / (low + np.sqrt(low ** 2 + rT2))) / L
+        point = 1.0 / np.sqrt(rll ** 2 + rT2)  # zero-length segments
+        rows.append(np.full(len(keep), j))
+        cols.append(keep)
+        vals.append(np.where(L > 1e-9, line, point))
+
+    # 1/μm / (4π S/m) -> MΩ
+    tr = np.concatenate(vals) / (4 * np.pi * sigma) if vals else np.empty(0)
+    return scipy.sparse.csr_matrix((tr, (np.concatenate(rows), np.concatenate(cols))),
+                                   shape=(len(electrodes), len(mid)))
+
+def dipoleMatrix(p0, p1, origin):
+    """(3 x segments) matrix giving the current dipole (nA·μm) from segment currents (nA)"""
+
+    return scipy.sparse.csr_matrix(((p0 + p1) / 2 - origin).T)
+
+def transferMatrix(electrodes, p0, p1, diam, origin, sigma=SIGMA, maxDistance=None, cache=LFP_CACHE):
+    """
+    LFP rows stacked over dipole rows, loaded from / saved to the cache
+
+    The cache key hashes the segment geometry, the electrodes and the
+    parameters, so a changed network or probe is never served a stale matrix.
+    """
+
+    key = hashlib.sha1()
+    for array in (electrodes, p0, p1, diam, origin):
+        key.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+    key.update(repr((sigma, maxDistance)).encode())
+    path = os.path.join(cache, key.hexdigest() + '.npz') if cache else None
+
+    if path and os.path.exists(path):
+        return scipy.sparse.load_npz(path), True
+
+    matrix = scipy.sparse.vstack([lineSourceMatrix(electrodes, p0, p1, diam, sigma, maxDistance),
+                                  dipoleMatrix(p0, p1, origin)]).tocsr()
+    if path:
+        os.makedirs(cache, exist_ok=True)
+        scipy.sparse.save_npz(path + '.tmp.npz', matrix)
+        os.replace(path + '.tmp.npz', path)
+    return matrix, False
+
+###############################################################################
+# RECORDER
+###############################################################################
+
+class LFPRecorder:
+    """
+    LFP and current dipole of the whole network, one sparse product per sample
+
+    Args:
+        electrodes: (nElectrodes, 3) positions (μm); default PROBE
+        recordStep: sampling interval (ms); default sim.cfg.recordStep
+        sigma: extracellular conductivity (S/m)
+        maxDistance: segment-electrode cutoff (μm), None for no cutoff
+        cache: transfer-matrix cache directory (None to disable)
+    """
+
+    def __init__(self, electrodes=None, recordStep=None, sigma=SIGMA, maxDistance=None, cache=LFP_CACHE):
+        self.electrodes = np.atleast_2d(PROBE if electrodes is None else electrodes).astype(float)
+        self.recordStep = recordStep
+        self.sigma = sigma
+        self.maxDistance = maxDistance
+        self.cache = cache
+
+    def attach(self, sim):
+        """Build (or load) the transfer matrix and register the sampling hooks (before finitialize)"""
+
+        from neuron import h
+
+        self.sim = sim
+        self.recordStep = self.recordStep or sim.cfg.recordStep
+        self.nSamples = int(round(sim.cfg.duration / self.recordStep)) + 1
+
+        # Cells without sections (artificial cells, point neurons) carry no membrane current
+        self.cells = [cell for cell in sim.net.cells if getattr(cell, 'secs', None)]
+        p0, p1, diam, origin = segmentGeometry(self.cells)
+        self.matrix, self.cached = transferMatrix(self.electrodes, p0, p1, diam, origin,
+                                                  self.sigma, self.maxDistance, self.cache)
+
+        # i_membrane_ must be enabled before the pointers are set; NetPyNE re-applies cfg.use_fast_imem in preRun
+        sim.cfg.use_fast_imem = True
+        h.CVode().use_fast_imem(1)
+        self.ptrs = h.PtrVector(len(p0))
+        if hasattr(self.ptrs, 'ptr_update_callback'):  # NEURON < 9 moves the data on cache reorganization
+            self.ptrs.ptr_update_callback(self._setPointers)
+        self._setPointers()
+
+        self.imem = h.Vector(len(p0))
+        self.out = np.zeros((self.matrix.shape[0], self.nSamples))
+        self._init = h.FInitializeHandler(1, self._start)
+
+    def _setPointers(self):
+        i = 0
+        for cell in self.cells:
+            for sec in cell.secs.values():
+                for seg in sec['hObj']:
+                    self.ptrs.pset(i, seg._ref_i_membrane_)
+                    i += 1
+
+    def _start(self):
+        self.samples = 0
+        self._sample()
+
+    def _sample(self):
+        # Self-rescheduling event (see dendrec_HL23PYR.py): states are consistent at h.t
+        from neuron import h
+
+        self.ptrs.gather(self.imem)
+        self.out[:, self.samples] = self.matrix @ self.imem.as_numpy()
+        self.samples += 1
+        if self.samples < self.nSamples:
+            h.CVode().event(self.samples * self.recordStep, self._sample)
+
+    def gather(self):
+        """
+        Network LFP and dipole summed over ranks
+
+        Returns:
+            t: (nSamples,) time base (ms)
+            lfp: (nElectrodes, nSamples) in mV
+            dipole: (3, nSamples) in nA·μm
+        """
+
+        from monitor_Yao1000 import reduceSum
+
+        n = self.samples
+        total = reduceSum(self.sim, self.out[:, :n].ravel()).reshape(-1, n)
+        nElec = len(self.electrodes)
+        return np.arange(n) * self.recordStep, total[:nElec], total[nElec:]
+
+    def save(self, path, compress=False):
+        """Reduce and add 'LFP' and 'dipole' traces to a result store (call on every rank)"""
+
+        from results_Yao1000 import addTraces
+
+        t, lfp, dipole = self.gather()
+        if self.sim.rank == 0:
+            addTraces(path, 'LFP', np.arange(len(lfp)), lfp, t=t, compress=compress,
+                      attrs={'units': 'mV', 'electrodes': self.electrodes.tolist(), 'sigma': self.sigma,
+                             'maxDistance': self.maxDistance})
+            addTraces(path, 'dipole', np.arange(3), dipole, t=t, compress=compress,
+                      attrs={'units': 'nA um', 'axes': ['x', 'y', 'z']})
+        return t, lfp, dipole
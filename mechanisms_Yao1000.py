@@ -0,0 +1,162 @@
+"""
+mechanisms_Yao1000.py
+
+Content-addressed build cache for the NMODL mechanisms in mod/
+The mod files are hashed (names, contents and the NEURON version) and
+compiled with nrnivmodl into .mechcache/<hash>/, which is reused for as long
+as nothing changed, so a stale or foreign-platform build can never be
+loaded and a cold start only pays for compilation once per mod-file set.
+Builds go to a temporary directory that is renamed into place, so parallel
+workers racing on an empty cache stay safe.
+
+Usage:
+    python mechanisms_Yao1000.py                 # Build (no-op when up to date) and print the cache entry
+    python mechanisms_Yao1000.py --force         # Rebuild
+    python mechanisms_Yao1000.py --clean         # Remove entries of older mod-file sets
+
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms()                              # before creating cells
+"""
+
+import os
+import time
+import glob
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+MOD_DIR = os.path.join(BASEDIR, 'mod')
+MECH_CACHE = os.path.join(BASEDIR, '.mechcache')
+
+_loaded = set()
+timings = {}  # seconds spent in this process: 'build' (hash / nrnivmodl), 'load'
+
+###############################################################################
+# CACHE KEY
+###############################################################################
+
+def neuronVersion():
+    """Installed NEURON version, read from the package metadata (no import of neuron)"""
+
+    from importlib import metadata
+
+    for dist in ('neuron', 'NEURON', 'neuron-nightly', 'neuron-gpu'):
+        try:
+            return metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            continue
+    return 'unknown'
+
+def modHash(modDir=MOD_DIR):
+    """SHA-1 of the mod files (names and contents) and the NEURON version"""
+
+    key = hashlib.sha1(neuronVersion().encode())
+    for path in sorted(glob.glob(os.path.join(modDir, '*.mod'))):
+        key.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            key.update(f.read())
+    return key.hexdigest()[:16]
+
+def findLibrary(path):
+    """Compiled mechanism library under a build directory, or None"""
+
+    for pattern in ('*/libnrnmech.*', '*/.libs/libnrnmech.*'):
+        found = glob.glob(os.path.join(path, pattern))
+        if found:
+            return found[0]
+    return None
+
+###############################################################################
+# BUILD AND LOAD
+###############################################################################
+
+def buildMechanisms(modDir=MOD_DIR, cache=MECH_CACHE, force=False):
+    """
+    Compile modDir into the cache unless an up-to-date build exists
+
+    Returns:
+        path: cache entry to pass to neuron.load_mechanisms
+        built: True if nrnivmodl ran
+    """
+
+    path = os.path.join(cache, modHash(modDir))
+    if not force and findLibrary(path):
+        return path, False
+
+    os.makedirs(cache, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=cache, prefix='build-')
+    try:
+        for mod in glob.glob(os.path.join(modDir, '*.mod')):
+            shutil.copy2(mod, tmp)
+        proc = subprocess.run(['nrnivmodl', '.'], cwd=tmp, capture_output=True, text=True)
+        if proc.returncode != 0 or not findLibrary(tmp):
+            raise RuntimeError(f"nrnivmodl failed in {tmp}:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+
+        if os.path.exists(path):
+            shutil.rmtree(path)  # forced rebuild, or a stale entry without a library
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            if not findLibrary(path):  # another process finished first
+                raise
+    finally:
+        if os.path.exists(tmp):
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    return path, True
+
+def loadMechanisms(path=None):
+    """
+    Load compiled mechanisms into NEURON once per process
+
+    Args:
+        path: directory with a compiled build (default: build mod/ through the cache)
+
+    Returns:
+        the loaded directory
+    """
+
+    if path is None:
+        t0 = time.perf_counter()
+        path, _ = buildMechanisms()
+        timings['build'] = timings.get('build', 0.0) + time.perf_counter() - t0
+    path = os.path.abspath(path)
+    if path not in _loaded:
+        from neuron import load_mechanisms
+        t0 = time.perf_counter()
+        load_mechanisms(path, warn_if_already_loaded=False)
+        timings['load'] = timings.get('load', 0.0) + time.perf_counter() - t0
+        _loaded.add(path)
+    return path
+
+def cleanCache(cache=MECH_CACHE, modDir=MOD_DIR):
+    """Remove cache entries of other mod-file sets (not builds in progress); returns the removed names"""
+
+    keep = modHash(modDir)
+    removed = []
+    for entry in sorted(glob.glob(os.path.join(cache, '*'))):
+        if os.path.basename(entry) != keep and not os.path.basename(entry).startswith('build-'):
+            shutil.rmtree(entry, ignore_errors=True)
+            removed.append(os.path.basename(entry))
+    return removed
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Build mod/ into the mechanism cache')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the cache is up to date')
+    parser.add_argument('--clean', action='store_true', help='Remove cache entries of older mod-file sets')
+    args = parser.parse_args()
+
+    t0 = time.time()
+    path, built = buildMechanisms(force=args.force)
+    print(f"{'✓ Built' if built else '✓ Up to date'}: {path} ({time.time() - t0:.2f} s)")
+    if args.clean:
+        removed = cleanCache()
+        print(f"Removed {len(removed)} old cache entries" + (f": {', '.join(removed)}" if removed else ''))
@@ -5,6 +5,7 @@ NEURON	{
 	SUFFIX CaDynamics
 	USEION ca READ ica WRITE cai
 	RANGE decay, gamma, minCai, depth
+	THREADSAFE
 }
 
 UNITS	{
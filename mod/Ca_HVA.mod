@@ -5,6 +5,7 @@ NEURON	{
 	SUFFIX Ca_HVA
 	USEION ca READ eca WRITE ica
 	RANGE gbar, g, ica 
+	THREADSAFE
 }
 
 UNITS	{
@@ -56,16 +57,21 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+	vRates(v)
+}
+
+PROCEDURE vRates(u (mV)){
+	TABLE mInf, mTau, hInf, hTau FROM -150 TO 150 WITH 3001
 	UNITSOFF
-        if((v == -27) ){        
-            v = v+0.0001
+        if(fabs(u - -27) < 1e-6){
+            u = u+0.0001
         }
-		mAlpha =  (0.055*(-27-v))/(exp((-27-v)/3.8) - 1)        
-		mBeta  =  (0.94*exp((-75-v)/17))
+		mAlpha =  (0.055*(-27-u))/(exp((-27-u)/3.8) - 1)
+		mBeta  =  (0.94*exp((-75-u)/17))
 		mInf = mAlpha/(mAlpha + mBeta)
 		mTau = 1/(mAlpha + mBeta)
-		hAlpha =  (0.000457*exp((-13-v)/50))
-		hBeta  =  (0.0065/(exp((-v-15)/28)+1))
+		hAlpha =  (0.000457*exp((-13-u)/50))
+		hBeta  =  (0.0065/(exp((-u-15)/28)+1))
 		hInf = hAlpha/(hAlpha + hBeta)
 		hTau = 1/(hAlpha + hBeta)
 	UNITSON
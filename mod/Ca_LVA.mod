@@ -7,6 +7,7 @@ NEURON	{
 	SUFFIX Ca_LVA
 	USEION ca READ eca WRITE ica
 	RANGE gbar, g, ica
+	THREADSAFE
 }
 
 UNITS	{
@@ -54,15 +55,19 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+	vRates(v)
+}
+
+PROCEDURE vRates(u (mV)){
   LOCAL qt
+  TABLE mInf, mTau, hInf, hTau FROM -150 TO 150 WITH 3001
   qt = 2.3^((34-21)/10)
 
 	UNITSOFF
-		v = v + 10
-		mInf = 1.0000/(1+ exp((v - -30.000)/-6))
-		mTau = (5.0000 + 20.0000/(1+exp((v - -25.000)/5)))/qt
-		hInf = 1.0000/(1+ exp((v - -80.000)/6.4))
-		hTau = (20.0000 + 50.0000/(1+exp((v - -40.000)/7)))/qt
-		v = v - 10
+		u = u + 10
+		mInf = 1.0000/(1+ exp((u - -30.000)/-6))
+		mTau = (5.0000 + 20.0000/(1+exp((u - -25.000)/5)))/qt
+		hInf = 1.0000/(1+ exp((u - -80.000)/6.4))
+		hTau = (20.0000 + 50.0000/(1+exp((u - -40.000)/7)))/qt
 	UNITSON
 }
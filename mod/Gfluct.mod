@@ -43,6 +43,11 @@ NUMERICAL RESOLUTION
   where A = sqrt( D*tau/2 * (1-exp(-2*dt/tau)) ) and N(0,1) is a normal
   random number (avg=0, sigma=1)
 
+  N(0,1) is drawn from a Random123 stream (RANDOM rng) owned by each
+  instance and identified by three ids, set with setRNG(gid, instance id,
+  seed). The noise is then the same for any number of threads or ranks
+  and the stream restarts at every finitialize.
+
 
 IMPLEMENTATION
 
@@ -92,10 +97,9 @@ NEURON {
 	POINT_PROCESS Gfluct2
 	RANGE g_e, g_i, E_e, E_i, g_e0, g_i0, g_e1, g_i1
 	RANGE std_e, std_i, tau_e, tau_i, D_e, D_i
-	RANGE new_seed
 	NONSPECIFIC_CURRENT i
 	THREADSAFE
-    POINTER donotuse
+	RANDOM rng
 }
 
 UNITS {
@@ -133,10 +137,10 @@ ASSIGNED {
 	exp_i
 	amp_e	(umho)
 	amp_i	(umho)
-    donotuse
 }
 
 INITIAL {
+	random_setseq(rng, 0)
 	g_e1 = 0
 	g_i1 = 0
 	if(tau_e != 0) {
@@ -177,53 +181,12 @@ PROCEDURE oup() {		: use grand()
 }
 
 
-PROCEDURE new_seed(seed) {		: procedure to set the seed
-	set_seed(seed)
-	VERBATIM
-	  printf("Setting random generator with seed = %g\n", _lseed);
-	ENDVERBATIM
+PROCEDURE setRNG(id1, id2, id3) {
+	: e.g. setRNG(gid, instance index within the cell, seed)
+	random_setids(rng, id1, id2, id3)
+	random_setseq(rng, 0)
 }
 
-VERBATIM
-double nrn_random_pick(void* r);
-void* nrn_random_arg(int argpos);
-ENDVERBATIM
-
 FUNCTION grand() {
-VERBATIM
-    if (_p_donotuse) {
-        /*
-         : Supports separate independent but reproducible streams for
-         : each instance. However, the corresponding hoc Random
-         : distribution MUST be set to Random.uniform(0,1)
-         */
-            _lgrand = nrn_random_pick(_p_donotuse);
-    }else{
-        /* only can be used in main thread */
-        if (_nt != nrn_threads) {
-hoc_execerror("multithread random in InUnif"," only via hoc Random");
-        }
-ENDVERBATIM
-        : the old standby. Cannot use if reproducible parallel sim
-        : independent of nhost or which host this instance is on
-        : is desired, since each instance on this cpu draws from
-        : the same stream
-        grand = normrand(0,1)
-VERBATIM
-    }
-ENDVERBATIM
+	grand = random_normal(rng)
 }
-
-PROCEDURE noiseFromRandom() {
-VERBATIM
- {
-    void** pv = (void**)(&_p_donotuse);
-    if (ifarg(1)) {
-        *pv = nrn_random_arg(1);
-    }else{
-        *pv = (void*)0;
-    }
- }
-ENDVERBATIM
-}
-
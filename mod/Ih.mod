@@ -5,6 +5,7 @@ NEURON	{
 	SUFFIX Ih
 	NONSPECIFIC_CURRENT ihcn
 	RANGE gbar, g, ihcn, shift1, shift2, shift3, shift4, shift5, shift6
+	THREADSAFE
 }
 
 UNITS	{
@@ -56,18 +57,32 @@ INITIAL{
 
 PROCEDURE rates(){
 	UNITSOFF
-				if(v == -shift1){
-						v = v + 0.0001
-				}
 				if(shift4 == 0){
 						shift4 = shift4 + 0.0001
 				}
 				if(shift2 == 0){
 						shift2 = shift2 + 0.0001
 				}
-		mAlpha =  0.001*(shift5)*(v+shift1)/(exp((v+shift1)/(shift2))-1)
-		mBeta  =  0.001*(shift6)*exp((v+shift3)/(shift4))
+		: shift1-6 are per-section RANGE variables: the exponentials are tabled
+		: on the shifted, scaled voltages and the shifts applied outside the tables
+		mAlpha =  0.001*(shift5)*(shift2)*linexp((v+shift1)/(shift2))
+		mBeta  =  0.001*(shift6)*expTable((v+shift3)/(shift4))
 		mInf = mAlpha/(mAlpha + mBeta)
 		mTau = 1/(mAlpha + mBeta)
 	UNITSON
 }
+
+FUNCTION linexp(x){
+	TABLE FROM -30 TO 30 WITH 3001
+	: x/(exp(x)-1), 1 at x = 0
+	if(fabs(x) < 1e-6){
+		linexp = 1 - x/2
+	}else{
+		linexp = x/(exp(x)-1)
+	}
+}
+
+FUNCTION expTable(x){
+	TABLE FROM -15 TO 15 WITH 3001
+	expTable = exp(x)
+}
@@ -5,6 +5,7 @@ NEURON	{
 	SUFFIX Im
 	USEION k READ ek WRITE ik
 	RANGE gbar, g, ik
+	THREADSAFE
 }
 
 UNITS	{
@@ -49,12 +50,17 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+	vRates(v)
+}
+
+PROCEDURE vRates(u (mV)){
   LOCAL qt
+  TABLE mInf, mTau FROM -150 TO 150 WITH 3001
   qt = 2.3^((34-21)/10)
 
 	UNITSOFF
-		mAlpha = 3.3e-3*exp(2.5*0.04*(v - -35))
-		mBeta = 3.3e-3*exp(-2.5*0.04*(v - -35))
+		mAlpha = 3.3e-3*exp(2.5*0.04*(u - -35))
+		mBeta = 3.3e-3*exp(-2.5*0.04*(u - -35))
 		mInf = mAlpha/(mAlpha + mBeta)
 		mTau = (1/(mAlpha + mBeta))/qt
 	UNITSON
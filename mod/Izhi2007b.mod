@@ -0,0 +1,141 @@
+: Izhikevich "simple model" point process (section-based)
+
+COMMENT
+Two-variable model of Izhikevich (2007), "Dynamical Systems in Neuroscience",
+MIT Press, in the form used by NetPyNE's Izhi2007b cellModel: the point
+process injects the model current into its section, so v is the section
+voltage and synapses can be added to the same section.
+
+    C v' = k (v - vr) (v - vt) - u + Iin
+    u'   = a (b (v - vr) - u)
+    v >= vpeak:  v = c,  u = u + d
+
+celltype selects the variants of the 2007 book (1 RS, 2 IB, 3 CH: generic
+reset; 4 LTS, 5 FS, 6 TC, 7 RTN: modified threshold, reset or u dynamics).
+Used by netParams_Yao1000_v2.py.
+ENDCOMMENT
+
+NEURON {
+    THREADSAFE
+    POINT_PROCESS Izhi2007b
+    RANGE C, k, vr, vt, vpeak, u, a, b, c, d, Iin, celltype, alive, cellid, derivtype, t0
+    NONSPECIFIC_CURRENT i
+}
+
+UNITS {
+    (mV) = (millivolt)
+    (nA) = (nanoamp)
+}
+
+PARAMETER {
+    C = 1           : capacitance (pF, scaled by 1000 with the current)
+    k = 0.7
+    vr = -60 (mV)   : resting potential
+    vt = -40 (mV)   : instantaneous threshold potential
+    vpeak = 35 (mV) : spike cutoff
+    a = 0.03
+    b = -2
+    c = -50         : voltage reset (mV)
+    d = 100         : recovery jump
+    Iin = 0         : injected current (pA)
+    celltype = 1
+    alive = 1       : 0 silences the output events
+    cellid = -1
+}
+
+ASSIGNED {
+    v (mV)
+    i (nA)
+    t0 (ms)
+    derivtype
+}
+
+STATE {
+    u
+}
+
+INITIAL {
+    u = 0
+    derivtype = 2
+    net_send(0, 1)  : activates the WATCH statements; v = vr is set there
+}
+
+BREAKPOINT {
+    SOLVE states METHOD derivimplicit
+    i = -(k*(v - vr)*(v - vt) - u + Iin)/C/1000
+}
+
+FUNCTION derivfunc() {
+    if (celltype == 5 && derivtype == 2) {
+        derivfunc = a*(0 - u)                          : FS below vb = d: U(v) = 0
+    } else if (celltype == 5) {
+        derivfunc = a*(0.025*(v - d)*(v - d)*(v - d) - u)
+    } else {
+        derivfunc = a*(b*(v - vr) - u)
+    }
+}
+
+DERIVATIVE states {
+    u' = derivfunc()
+}
+
+NET_RECEIVE (w) {
+    if (flag == 1) {
+        if (celltype == 4) {
+            WATCH (v > (vpeak - 0.1*u)) 2
+        } else if (celltype == 6) {
+            WATCH (v > (vpeak + 0.1*u)) 2
+        } else {
+            WATCH (v > vpeak) 2
+        }
+        if (celltype == 6 || celltype == 7) {
+            WATCH (v > -65) 3
+            WATCH (v < -65) 4
+        }
+        if (celltype == 5) {
+            WATCH (v > d) 3
+            WATCH (v < d) 4
+        }
+        v = vr
+    } else if (flag == 2) {
+        if (alive) {
+            net_event(t)
+        }
+        if (celltype == 4) {
+            v = c + 0.04*u
+            if ((u + d) < 670) {
+                u = u + d
+            } else {
+                u = 670
+            }
+        } else if (celltype == 5) {
+            v = c
+        } else if (celltype == 6) {
+            v = c - 0.1*u
+            u = u + d
+        } else if (celltype == 7) {
+            v = c + 0.04*u
+            u = u + d
+        } else {
+            v = c
+            u = u + d
+        }
+        t0 = t
+    } else if (flag == 3) {
+        if (celltype == 5) {
+            derivtype = 1
+        } else if (celltype == 6) {
+            b = 0
+        } else if (celltype == 7) {
+            b = 2
+        }
+    } else if (flag == 4) {
+        if (celltype == 5) {
+            derivtype = 2
+        } else if (celltype == 6) {
+            b = 15
+        } else if (celltype == 7) {
+            b = 10
+        }
+    }
+}
@@ -8,6 +8,7 @@ NEURON	{
 	SUFFIX K_P
 	USEION k READ ek WRITE ik
 	RANGE gbar, g, ik
+	THREADSAFE
 }
 
 UNITS	{
@@ -55,18 +56,22 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+	vRates(v)
+}
+
+PROCEDURE vRates(u (mV)){
   LOCAL qt
+  TABLE mInf, mTau, hInf, hTau FROM -150 TO 150 WITH 3001
   qt = 2.3^((34-21)/10)
 	UNITSOFF
-		v = v + 10
-		mInf =  (1/(1 + exp(-(v+1)/12)))
-        if(v<-50){
-		    mTau =  (1.25+175.03*exp(-v * -0.026))/qt
+		u = u + 10
+		mInf =  (1/(1 + exp(-(u+1)/12)))
+        if(u<-50){
+		    mTau =  (1.25+175.03*exp(-u * -0.026))/qt
         }else{
-            mTau = ((1.25+13*exp(-v*0.026)))/qt
+            mTau = ((1.25+13*exp(-u*0.026)))/qt
         }
-		hInf =  1/(1 + exp(-(v+54)/-11))
-		hTau =  (360+(1010+24*(v+55))*exp(-((v+75)/48)^2))/qt
-		v = v - 10
+		hInf =  1/(1 + exp(-(u+54)/-11))
+		hTau =  (360+(1010+24*(u+55))*exp(-((u+75)/48)^2))/qt
 	UNITSON
 }
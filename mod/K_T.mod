@@ -7,6 +7,7 @@ NEURON	{
 	SUFFIX K_T
 	USEION k READ ek WRITE ik
 	RANGE gbar, g, ik
+	THREADSAFE
 }
 
 UNITS	{
@@ -54,15 +55,19 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+	vRates(v)
+}
+
+PROCEDURE vRates(u (mV)){
   LOCAL qt
+  TABLE mInf, mTau, hInf, hTau FROM -150 TO 150 WITH 3001
   qt = 2.3^((34-21)/10)
 
 	UNITSOFF
-		v = v + 10
-		mInf =  1/(1 + exp(-(v+0)/19))
-		mTau =  (0.34+0.92*exp(-((v+71)/59)^2))/qt
-		hInf =  1/(1 + exp(-(v+66)/-10))
-		hTau =  (8+49*exp(-((v+73)/23)^2))/qt
-		v = v - 10
+		u = u + 10
+		mInf =  1/(1 + exp(-(u+0)/19))
+		mTau =  (0.34+0.92*exp(-((u+71)/59)^2))/qt
+		hInf =  1/(1 + exp(-(u+66)/-10))
+		hTau =  (8+49*exp(-((u+73)/23)^2))/qt
 	UNITSON
 }
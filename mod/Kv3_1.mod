@@ -5,6 +5,7 @@ NEURON	{
 	SUFFIX Kv3_1
 	USEION k READ ek WRITE ik
 	RANGE gbar, g, ik 
+	THREADSAFE
 }
 
 UNITS	{
@@ -48,8 +49,14 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+	: table keyed on the shifted voltage, valid for any vshift
+	mRates(v - vshift)
+}
+
+PROCEDURE mRates(u (mV)){
+	TABLE mInf, mTau FROM -150 TO 150 WITH 3001
 	UNITSOFF
-		mInf =  1/(1+exp(((v -(18.700 + vshift))/(-9.700))))
-		mTau =  0.2*20.000/(1+exp(((v -(-46.560 + vshift))/(-44.140))))
+		mInf =  1/(1+exp(((u -18.700)/(-9.700))))
+		mTau =  0.2*20.000/(1+exp(((u - -46.560)/(-44.140))))
 	UNITSON
 }
@@ -17,6 +17,7 @@ NEURON {
         RANGE Use
         RANGE i,  i_NMDA,  g_NMDA, e, gmax
         NONSPECIFIC_CURRENT i
+        THREADSAFE
 }
 
 PARAMETER {
@@ -4,6 +4,7 @@ NEURON	{
 	SUFFIX NaTg
 	USEION na READ ena WRITE ina
 	RANGE gbar, g, ina, vshifth, vshiftm, slopeh, slopem
+	THREADSAFE
 }
 
 UNITS	{
@@ -59,24 +60,45 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+  UNITSOFF
+	: vshiftm/vshifth/slopem/slopeh are per-section RANGE variables, so the
+	: tables are keyed on the shifted, slope-scaled voltage x = (v - vhalf)/slope.
+	: Alpha and beta are both slope * f(x): mInf depends on x only and
+	: mTau on x and a 1/slope factor.
+	mRates((v - (-38+vshiftm))/slopem)
+	mTau = mTau/slopem
+	hRates((v - (-66+vshifth))/slopeh)
+	hTau = hTau/slopeh
+  UNITSON
+}
+
+PROCEDURE mRates(x){
   LOCAL qt
+  TABLE mInf, mTau FROM -30 TO 30 WITH 3001
   qt = 2.3^((34-21)/10)
-	
+
   UNITSOFF
-    if(v == (-38+vshiftm)){
-    	v = v+0.0001
+    if(fabs(x) < 1e-6){
+    	x = 1e-6
     }
-		mAlpha = (0.182 * (v- (-38+vshiftm)))/(1-(exp(-(v- (-38+vshiftm))/slopem)))
-		mBeta  = (0.124 * (-v + (-38+vshiftm)))/(1-(exp(-(-v + (-38+vshiftm))/slopem)))
+		mAlpha = 0.182 * x/(1-exp(-x))
+		mBeta  = 0.124 * -x/(1-exp(x))
 		mTau = (1/(mAlpha + mBeta))/qt
 		mInf = mAlpha/(mAlpha + mBeta)
+	UNITSON
+}
 
-    if(v == (-66+vshifth)){
-      v = v + 0.0001
-    }
+PROCEDURE hRates(x){
+  LOCAL qt
+  TABLE hInf, hTau FROM -30 TO 30 WITH 3001
+  qt = 2.3^((34-21)/10)
 
-		hAlpha = (-0.015 * (v- (-66+vshifth)))/(1-(exp((v- (-66+vshifth))/slopeh)))
-		hBeta  = (-0.015 * (-v +(-66+vshifth)))/(1-(exp((-v +(-66+vshifth))/slopeh)))
+  UNITSOFF
+    if(fabs(x) < 1e-6){
+      x = 1e-6
+    }
+		hAlpha = -0.015 * x/(1-exp(x))
+		hBeta  = -0.015 * -x/(1-exp(-x))
 		hTau = (1/(hAlpha + hBeta))/qt
 		hInf = hAlpha/(hAlpha + hBeta)
 	UNITSON
@@ -7,6 +7,7 @@ NEURON	{
 	SUFFIX Nap
 	USEION na READ ena WRITE ina
 	RANGE gbar, g, ina
+	THREADSAFE
 }
 
 UNITS	{
@@ -58,28 +59,33 @@ INITIAL{
 }
 
 PROCEDURE rates(){
+	vRates(v)
+}
+
+PROCEDURE vRates(u (mV)){
   LOCAL qt
+  TABLE mInf, mTau, hInf, hTau FROM -150 TO 150 WITH 3001
   qt = 2.3^((34-21)/10)
 
 	UNITSOFF
-		mInf = 1.0/(1+exp((v- -52.6)/-4.6))
-    if(v == -38){
-    	v = v+0.0001
+		mInf = 1.0/(1+exp((u- -52.6)/-4.6))
+    if(fabs(u - -38) < 1e-6){
+    	u = u+0.0001
     }
-		mAlpha = (0.182 * (v- -38))/(1-(exp(-(v- -38)/6)))
-		mBeta  = (0.124 * (-v -38))/(1-(exp(-(-v -38)/6)))
+		mAlpha = (0.182 * (u- -38))/(1-(exp(-(u- -38)/6)))
+		mBeta  = (0.124 * (-u -38))/(1-(exp(-(-u -38)/6)))
 		mTau = 6*(1/(mAlpha + mBeta))/qt
 
-  	if(v == -17){
-   		v = v + 0.0001
+  	if(fabs(u - -17) < 1e-6){
+   		u = u + 0.0001
   	}
-    if(v == -64.4){
-      v = v+0.0001
+    if(fabs(u - -64.4) < 1e-6){
+      u = u+0.0001
     }
 
-		hInf = 1.0/(1+exp((v- -48.8)/10))
-    hAlpha = -2.88e-6 * (v + 17) / (1 - exp((v + 17)/4.63))
-    hBeta = 6.94e-6 * (v + 64.4) / (1 - exp(-(v + 64.4)/2.63))
+		hInf = 1.0/(1+exp((u- -48.8)/10))
+    hAlpha = -2.88e-6 * (u + 17) / (1 - exp((u + 17)/4.63))
+    hBeta = 6.94e-6 * (u + 64.4) / (1 - exp(-(u + 64.4)/2.63))
 		hTau = (1/(hAlpha + hBeta))/qt
 	UNITSON
 }
\ No newline at end of file
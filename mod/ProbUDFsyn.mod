@@ -17,7 +17,8 @@ NEURON {
         RANGE Use, u, Dep, Fac, u0
         RANGE i, g, e, gmax
         NONSPECIFIC_CURRENT i
-	POINTER rng
+	RANDOM rng
+	THREADSAFE
 }
 
 PARAMETER {
@@ -33,20 +34,12 @@ PARAMETER {
 }
 
 COMMENT
-The Verbatim block is needed to generate random nos. from a uniform distribution between 0 and 1 
-for comparison with Pr to decide whether to activate the synapse or not
+Release is decided by comparing a random number with Pr. The numbers come
+from a Random123 stream (RANDOM rng) owned by each synapse instance and
+identified by three ids, set with setRNG(gid, synapse id, seed): the
+sequence does not depend on the number of threads or ranks, or on the
+order in which synapses are created, and is restarted at every finitialize.
 ENDCOMMENT
-   
-VERBATIM
-
-#include<stdlib.h>
-#include<stdio.h>
-#include<math.h>
-
-double nrn_random_pick(void* r);
-void* nrn_random_arg(int argpos);
-
-ENDVERBATIM
   
 
 ASSIGNED {
@@ -55,7 +48,6 @@ ASSIGNED {
         i (nA)
 	g (uS)
         factor
-	rng
 	weight_NMDA
 }
 
@@ -67,6 +59,8 @@ STATE {
 INITIAL{
 
   LOCAL tp
+
+	random_setseq(rng, 0)
         
 	A = 0
   B = 0
@@ -127,56 +121,13 @@ NET_RECEIVE (weight, Pv, Pv_tmp, Pr, u, tsyn (ms)){
                 }
 }
 
-PROCEDURE setRNG() {
-VERBATIM
-    {
-        /**
-         * This function takes a NEURON Random object declared in hoc and makes it usable by this mod file.
-         * Note that this method is taken from Brett paper as used by netstim.hoc and netstim.mod
-         * which points out that the Random must be in negexp(1) mode
-         */
-        void** pv = (void**)(&_p_rng);
-        if( ifarg(1)) {
-            *pv = nrn_random_arg(1);
-        } else {
-            *pv = (void*)0;
-        }
-    }
-ENDVERBATIM
+PROCEDURE setRNG(id1, id2, id3) {
+	: e.g. setRNG(gid, synapse index within the cell, seed)
+	random_setids(rng, id1, id2, id3)
+	random_setseq(rng, 0)
 }
 
 FUNCTION erand() {
-VERBATIM
-	    //FILE *fi;
-        double value;
-        if (_p_rng) {
-                /*
-                :Supports separate independent but reproducible streams for
-                : each instance. However, the corresponding hoc Random
-                : distribution MUST be set to Random.negexp(1)
-                */
-                value = nrn_random_pick(_p_rng);
-		        //fi = fopen("RandomStreamMCellRan4.txt", "w");
-                //fprintf(fi,"random stream for this simulation = %lf\n",value);
-                //printf("random stream for this simulation = %lf\n",value);
-                return value;
-        }else{
-ENDVERBATIM
-                : the old standby. Cannot use if reproducible parallel sim
-                : independent of nhost or which host this instance is on
-                : is desired, since each instance on this cpu draws from
-                : the same stream
-                erand = exprand(1)
-VERBATIM
-        }
-ENDVERBATIM
-        :erand = value :This line must have been a mistake in Hay et al.'s code, it would basically set the return value to a non-initialized double value.
-                       :The reason it sometimes works could be that the memory allocated for the non-initialized happened to contain the random value
-                       :previously generated (or if _p_rng is always a null pointer). However, here we commented this line out.
+	: negexp(1) numbers, as drawn from the hoc Random of the original implementation
+	erand = random_negexp(rng)
 }
-
-
-
-
-
-
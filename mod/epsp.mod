@@ -20,6 +20,7 @@ NEURON {
 	POINT_PROCESS epsp
 	RANGE onset, tau0, tau1, imax, i, myv
 	NONSPECIFIC_CURRENT i
+	THREADSAFE
 }
 UNITS {
 	(nA) = (nanoamp)
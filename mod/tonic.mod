@@ -4,7 +4,9 @@
 NEURON{
 SUFFIX tonic
 NONSPECIFIC_CURRENT i
-RANGE i, v, a, b, g, e_gaba}
+RANGE i, v, a, b, g, e_gaba
+THREADSAFE
+}
 
 PARAMETER{
 g = 0.001 (siemens/cm2)
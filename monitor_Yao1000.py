@@ -0,0 +1,323 @@
+"""
+monitor_Yao1000.py
+
+In-run monitoring for Yao 1000-cell network simulations
+runSimMonitored() replaces sim.runSim(): it advances the network with
+ParallelContext.psolve in fixed intervals (tens of ms) and hands the spikes
+recorded since the previous interval to a list of consumers. Any consumer can
+request an early stop; the decision is reduced over all MPI ranks so every
+rank stops at the same time.
+
+RunawayMonitor keeps a rolling population rate per pop and aborts the run
+when a rate leaves its bounds (epileptiform activity). The spikes recorded up
+to that point are kept, and the result is flagged in sim.allSimData['runaway'].
+
+RateAccumulator bins spikes into preallocated per-cell counts and
+per-population histograms and empties the spike vectors after every interval,
+so memory stays constant whatever the duration; only the compact arrays are
+reduced over ranks.
+
+Usage (inside an init script, after sim.setupRecording()):
+    from monitor_Yao1000 import RunawayMonitor, runSimMonitored, flagResult
+    monitor = RunawayMonitor()
+    runSimMonitored([monitor], interval=25.0)
+    sim.gatherData()
+    flagResult(monitor)
+
+    from monitor_Yao1000 import RateAccumulator, storeRates
+    accumulator = RateAccumulator(binSize=5.0)      # rates only, spikes not kept
+    runSimMonitored([accumulator])
+    sim.gatherData(gatherOnlySimData=True)
+    storeRates(accumulator)
+"""
+
+from collections import deque
+import numpy as np
+
+###############################################################################
+# RATE BOUNDS
+###############################################################################
+
+# Rolling population rate bounds (Hz) - roughly 20x spikestats_Yao1000.TARGET_RATES
+RATE_BOUNDS = {
+    'HL23PYR': (0.0, 30.0),
+    'HL23SST': (0.0, 100.0),
+    'HL23PV': (0.0, 200.0),
+    'HL23VIP': (0.0, 160.0),
+}
+
+CHECK_INTERVAL = 25.0  # ms between checks
+RATE_WINDOW = 100.0    # ms rolling window of the population rates
+GRACE = 200.0          # ms initial transient without checks
+PATIENCE = 2           # consecutive out-of-bound checks before aborting
+
+###############################################################################
+# MONITORED RUN
+###############################################################################
+
+class SpikeConsumer:
+    """
+    Base class of runSimMonitored() consumers
+
+    setup() is called after initialization, update() after every interval with
+    the local spikes recorded since the previous call, finalize() at the end.
+    update() returns True to request an early stop. Consumers with
+    drainSpikes = True get the spike vectors emptied after every interval.
+    """
+
+    drainSpikes = False
+
+    def setup(self, sim):
+        pass
+
+    def update(self, t, spkt, spkid):
+        return False
+
+    def finalize(self, sim):
+        pass
+
+def runSimMonitored(consumers, interval=CHECK_INTERVAL):
+    """
+    Run the current NetPyNE simulation in intervals, feeding new spikes to consumers
+
+    Args:
+        consumers: list of SpikeConsumer
+        interval: simulated time between consumer updates (ms)
+
+    Returns:
+        time (ms) at which the run stopped
+    """
+
+    from netpyne import sim
+    from neuron import h
+
+    stopTime, _ = sim.run.prepareSimWithIntervalFunc()  # preRun + finitialize
+
+    for consumer in consumers:
+        consumer.setup(sim)
+
+    spkt, spkid = sim.simData['spkt'], sim.simData['spkid']
+    read = 0
+    stop = False
+    drain = any(consumer.drainSpikes for consumer in consumers)
+
+    while h.t < stopTime - 0.5 * h.dt and not stop:
+        sim.pc.psolve(min(stopTime, h.t + interval))
+
+        n = int(spkt.size())
+        newT = spkt.as_numpy()[read:n]
+        newId = spkid.as_numpy()[read:n]
+        read = n
+
+        requests = [consumer.update(h.t, newT, newId) for consumer in consumers]
+        stop = sim.pc.allreduce(float(any(requests)), 2) > 0  # max over ranks
+
+        if drain:
+            spkt.resize(0)
+            spkid.resize(0)
+            read = 0
+
+    sim.pc.barrier()
+    sim.timing('stop', 'runTime')
+
+    for consumer in consumers:
+        consumer.finalize(sim)
+
+    if sim.rank == 0:
+        status = f'stopped early at {h.t:.1f} ms' if stop else 'done'
+        print(f'  Monitored run {status}; run time = {sim.timingData["runTime"]:0.2f} s')
+
+    return h.t
+
+###############################################################################
+# RUNAWAY ACTIVITY MONITOR
+###############################################################################
+
+def popIndex(sim):
+    """
+    Population lookup for the cells of this rank
+
+    Returns:
+        labels: population labels
+        index: array mapping local gid -> population index (-1 elsewhere)
+        numCells: (nPops,) global cell count per population
+    """
+
+    labels = list(sim.net.pops.keys())
+    lookup = {label: i for i, label in enumerate(labels)}
+    maxGid = max([cell.gid for cell in sim.net.cells], default=-1)
+
+    index = np.full(maxGid + 1, -1, dtype=np.int32)
+    for cell in sim.net.cells:
+        index[cell.gid] = lookup.get(cell.tags.get('pop'), -1)
+
+    numCells = np.bincount(index[index >= 0], minlength=len(labels)).astype(float)
+    numCells = reduceSum(sim, numCells)
+
+    return labels, index, numCells
+
+def reduceSum(sim, values):
+    """Sum a numpy array over MPI ranks"""
+
+    from neuron import h
+
+    vec = h.Vector(np.asarray(values, dtype=float))
+    sim.pc.allreduce(vec, 1)
+    return vec.as_numpy().copy()
+
+def countByPop(spkid, index, nPops):
+    """Spike count per population of a batch of local spikes"""
+
+    gids = spkid.astype(np.int64)
+    gids = gids[(gids >= 0) & (gids < len(index))]
+    pops = index[gids]
+    return np.bincount(pops[pops >= 0], minlength=nPops).astype(float)
+
+class RunawayMonitor(SpikeConsumer):
+    """
+    Aborts a run whose rolling population rates leave their bounds
+
+    Args:
+        bounds: {pop: (minRate, maxRate)} in Hz; pops without bounds are not checked
+        window: rolling window of the rates (ms)
+        grace: no checks before this time (ms)
+        patience: consecutive violations needed to abort
+    """
+
+    def __init__(self, bounds=RATE_BOUNDS, window=RATE_WINDOW, grace=GRACE, patience=PATIENCE):
+        self.bounds = bounds
+        self.window = window
+        self.grace = grace
+        self.patience = patience
+
+        self.history = deque()  # (t, counts) of the intervals in the window
+        self.strikes = 0
+        self.aborted = False
+        self.stopTime = None
+        self.violations = {}
+        self.lastRates = {}
+
+    def setup(self, sim):
+        self.labels, self.index, self.numCells = popIndex(sim)
+        self.sim = sim
+
+    def update(self, t, spkt, spkid):
+        counts = reduceSum(self.sim, countByPop(spkid, self.index, len(self.labels)))
+        self.history.append((t, counts))
+        while self.history and self.history[0][0] <= t - self.window:
+            self.history.popleft()
+
+        span = min(self.window, t) / 1000.0
+        total = np.sum([c for _, c in self.history], axis=0)
+        rates = total / (np.maximum(self.numCells, 1) * span)
+        self.lastRates = dict(zip(self.labels, rates.tolist()))
+
+        if t < self.grace:
+            return False
+
+        violations = {pop: rate for pop, rate in self.lastRates.items()
+                      if pop in self.bounds and not self.bounds[pop][0] <= rate <= self.bounds[pop][1]}
+        self.strikes = self.strikes + 1 if violations else 0
+
+        if self.strikes >= self.patience:
+            self.aborted = True
+            self.stopTime = t
+            self.violations = violations
+            return True
+        return False
+
+    def report(self):
+        """Summary stored with the result"""
+
+        return {
+            'aborted': self.aborted,
+            'stopTime': self.stopTime,
+            'violations': self.violations,
+            'rates': self.lastRates,
+            'bounds': {pop: list(b) for pop, b in self.bounds.items()},
+        }
+
+def flagResult(monitor):
+    """Record the monitor report in sim.allSimData (call after sim.gatherData())"""
+
+    from netpyne import sim
+
+    if sim.rank == 0:
+        sim.allSimData['runaway'] = monitor.report()
+        if monitor.aborted:
+            rates = ', '.join(f'{pop} {rate:.1f} Hz' for pop, rate in monitor.violations.items())
+            print(f"✗ Runaway activity at {monitor.stopTime:.0f} ms ({rates}); partial spikes kept")
+
+###############################################################################
+# RATE ACCUMULATION
+###############################################################################
+
+class RateAccumulator(SpikeConsumer):
+    """
+    Per-cell spike counts and per-population rate histograms accumulated in-run
+
+    Spikes are binned as they arrive and then dropped from the spike vectors,
+    so memory is fixed by the number of cells and bins, not by the spike count.
+
+    Args:
+        binSize: histogram bin (ms)
+        duration: simulated duration (ms); sim.cfg.duration if None
+    """
+
+    drainSpikes = True
+
+    def __init__(self, binSize=5.0, duration=None):
+        self.binSize = binSize
+        self.duration = duration
+
+    def setup(self, sim):
+        self.sim = sim
+        self.labels, self.index, self.numCells = popIndex(sim)
+        duration = self.duration if self.duration is not None else sim.cfg.duration
+        self.nBins = int(np.ceil(duration / self.binSize))
+        totalCells = int(max(self.numCells.sum(), len(self.index)))
+
+        self.cellCounts = np.zeros(totalCells)
+        self.popHist = np.zeros((len(self.labels), self.nBins))
+        self.endTime = 0.0
+
+    def update(self, t, spkt, spkid):
+        gids = spkid.astype(np.int64)
+        pops = self.index[gids]
+        bins = np.minimum((spkt / self.binSize).astype(np.int64), self.nBins - 1)
+
+        self.cellCounts += np.bincount(gids, minlength=len(self.cellCounts))
+        keep = pops >= 0
+        flat = pops[keep] * self.nBins + bins[keep]
+        self.popHist += np.bincount(flat, minlength=self.popHist.size).reshape(self.popHist.shape)
+        self.endTime = t
+        return False
+
+    def finalize(self, sim):
+        # Only the compact arrays cross ranks
+        self.cellCounts = reduceSum(sim, self.cellCounts)
+        self.popHist = reduceSum(sim, self.popHist.ravel()).reshape(self.popHist.shape)
+
+    def popRates(self):
+        """(nPops, nBins) population rates in Hz"""
+
+        return self.popHist / (np.maximum(self.numCells, 1)[:, None] * self.binSize / 1000.0)
+
+    def meanRates(self, tstart=0.0, tstop=None):
+        """{pop: mean rate (Hz)} over whole bins in [tstart, tstop)"""
+
+        tstop = self.endTime if tstop is None else min(tstop, self.endTime)
+        first, last = int(tstart // self.binSize), int(np.ceil(tstop / self.binSize))
+        window = max(last - first, 1) * self.binSize / 1000.0
+        counts = self.popHist[:, first:last].sum(axis=1)
+        return dict(zip(self.labels, (counts / (np.maximum(self.numCells, 1) * window)).tolist()))
+
+def storeRates(accumulator):
+    """Record accumulated rates in sim.allSimData (call after sim.gatherData())"""
+
+    from netpyne import sim
+
+    if sim.rank == 0:
+        sim.allSimData['popRates'] = {pop: rates.tolist() for pop, rates in zip(accumulator.labels, accumulator.popRates())}
+        sim.allSimData['popRateBinSize'] = accumulator.binSize
+        sim.allSimData['cellSpikeCounts'] = accumulator.cellCounts.tolist()
@@ -369,14 +369,20 @@ netParams.defaultThreshold = -20.0  # mV (spike detection threshold)
 netParams.defaultTemp = 34.0  # Celsius (body temperature)
 netParams.defaultV = -80.0    # mV (initial membrane potential)
 
-print("=" * 80)
-print("NetPyNE Network Parameters: Yao et al. 2022 (1000 cells)")
-print("=" * 80)
-print(f"Total cells: {sum([p['numCells'] for p in cellTypes.values()])}")
-print(f"  - HL23PYR: {cellTypes['HL23PYR']['numCells']}")
-print(f"  - HL23SST: {cellTypes['HL23SST']['numCells']}")
-print(f"  - HL23PV: {cellTypes['HL23PV']['numCells']}")
-print(f"  - HL23VIP: {cellTypes['HL23VIP']['numCells']}")
-print(f"Connection types: {len([k for k in connProbs.keys() if connProbs[k] > 0])}")
-print(f"Network volume: {netParams.sizeX}x{netParams.sizeY}x{netParams.sizeZ} μm³")
-print("=" * 80)
+def printSummary():
+    """Print the network composition (import stays silent)"""
+
+    print("=" * 80)
+    print("NetPyNE Network Parameters: Yao et al. 2022 (1000 cells)")
+    print("=" * 80)
+    print(f"Total cells: {sum([p['numCells'] for p in cellTypes.values()])}")
+    print(f"  - HL23PYR: {cellTypes['HL23PYR']['numCells']}")
+    print(f"  - HL23SST: {cellTypes['HL23SST']['numCells']}")
+    print(f"  - HL23PV: {cellTypes['HL23PV']['numCells']}")
+    print(f"  - HL23VIP: {cellTypes['HL23VIP']['numCells']}")
+    print(f"Connection types: {len([k for k in connProbs.keys() if connProbs[k] > 0])}")
+    print(f"Network volume: {netParams.sizeX}x{netParams.sizeY}x{netParams.sizeZ} μm³")
+    print("=" * 80)
+
+if __name__ == '__main__':
+    printSummary()
@@ -0,0 +1,194 @@
+"""
+netParams_Yao1000_HH.py
+
+NetPyNE network parameters for the Yao 1000-cell network with
+single-compartment Hodgkin-Huxley-type cells (NaTg, Kv3_1, SK from mod/)
+Used by init_Yao1000_HH.py; population sizes are for 1000 cells and are
+scaled by the scripts that import it.
+"""
+
+from netpyne import specs
+
+###############################################################################
+# Network Parameters
+###############################################################################
+
+netParams = specs.NetParams()
+
+# Network dimensions
+netParams.sizeX = 500.0
+netParams.sizeY = 950.0
+netParams.sizeZ = 500.0
+
+# Cell types and numbers
+cellTypes = {
+    'HL23PYR': {'frac': 0.80, 'E': True},
+    'HL23SST': {'frac': 0.05, 'E': False},
+    'HL23PV': {'frac': 0.07, 'E': False},
+    'HL23VIP': {'frac': 0.08, 'E': False},
+}
+
+# Cell numbers of the 1000-cell network
+for cellType, cfg in cellTypes.items():
+    cfg['numCells'] = max(1, int(1000 * cfg['frac']))
+
+###############################################################################
+# Define cell rules (simplified for NetPyNE)
+###############################################################################
+
+for cellType in cellTypes.keys():
+    # Create simplified single-compartment version for NetPyNE
+    netParams.cellParams[cellType] = {
+        'conds': {'cellType': cellType},
+        'secs': {
+            'soma': {
+                'geom': {
+                    'diam': 18.8,
+                    'L': 18.8,
+                    'Ra': 100,
+                    'cm': 1
+                },
+                'ions': {
+                    'k': {'e': -85},
+                    'na': {'e': 50},
+                },
+                'mechs': {
+                    'pas': {'g': 0.00008, 'e': -80},
+                    'NaTg': {'gbar': 0.2},
+                    'Kv3_1': {'gbar': 0.02},
+                    'SK': {'gbar': 0.0005},
+                },
+            }
+        }
+    }
+
+###############################################################################
+# Population parameters
+###############################################################################
+
+yMin, yMax = -1200, -250
+
+for cellType, cfg in cellTypes.items():
+    netParams.popParams[cellType] = {
+        'cellType': cellType,
+        'numCells': cfg['numCells'],
+        'xRange': [-250, 250],
+        'yRange': [yMin, yMax],
+        'zRange': [-250, 250],
+    }
+
+###############################################################################
+# Synaptic mechanisms
+###############################################################################
+
+netParams.synMechParams['AMPA'] = {
+    'mod': 'Exp2Syn',
+    'tau1': 0.3,
+    'tau2': 3.0,
+    'e': 0
+}
+
+netParams.synMechParams['GABA'] = {
+    'mod': 'Exp2Syn',
+    'tau1': 1.0,
+    'tau2': 10.0,
+    'e': -80
+}
+
+###############################################################################
+# Connectivity
+###############################################################################
+
+connProbs = {
+    ('HL23PYR', 'HL23PYR'): 0.150,
+    ('HL23PYR', 'HL23SST'): 0.190,
+    ('HL23PYR', 'HL23PV'):  0.090,
+    ('HL23PYR', 'HL23VIP'): 0.090,
+    ('HL23SST', 'HL23PYR'): 0.190,
+    ('HL23SST', 'HL23SST'): 0.040,
+    ('HL23SST', 'HL23PV'):  0.200,
+    ('HL23SST', 'HL23VIP'): 0.060,
+    ('HL23PV', 'HL23PYR'):  0.094,
+    ('HL23PV', 'HL23SST'):  0.050,
+    ('HL23PV', 'HL23PV'):   0.370,
+    ('HL23PV', 'HL23VIP'):  0.030,
+    ('HL23VIP', 'HL23PYR'): 0.000,
+    ('HL23VIP', 'HL23SST'): 0.350,
+    ('HL23VIP', 'HL23PV'):  0.100,
+    ('HL23VIP', 'HL23VIP'): 0.050,
+}
+
+synWeights = {
+    ('HL23PYR', 'HL23PYR'): 0.248,
+    ('HL23PYR', 'HL23SST'): 0.380,
+    ('HL23PYR', 'HL23PV'):  0.337,
+    ('HL23PYR', 'HL23VIP'): 0.310,
+    ('HL23SST', 'HL23PYR'): 1.240,
+    ('HL23SST', 'HL23SST'): 0.340,
+    ('HL23SST', 'HL23PV'):  0.330,
+    ('HL23SST', 'HL23VIP'): 0.460,
+    ('HL23PV', 'HL23PYR'):  2.910,
+    ('HL23PV', 'HL23SST'):  0.330,
+    ('HL23PV', 'HL23PV'):   0.330,
+    ('HL23PV', 'HL23VIP'):  0.340,
+    ('HL23VIP', 'HL23PYR'): 0.000,
+    ('HL23VIP', 'HL23SST'): 0.360,
+    ('HL23VIP', 'HL23PV'):  0.340,
+    ('HL23VIP', 'HL23VIP'): 0.340,
+}
+
+# Create connections
+for (prePop, postPop), prob in connProbs.items():
+    if prob == 0:
+        continue
+
+    connLabel = f'{prePop}_to_{postPop}'
+    weight = synWeights[(prePop, postPop)]
+
+    if 'PYR' in prePop:
+        synMech = 'AMPA'
+        delay = 2.0
+    else:
+        synMech = 'GABA'
+        delay = 1.0
+
+    netParams.connParams[connLabel] = {
+        'preConds': {'pop': prePop},
+        'postConds': {'pop': postPop},
+        'probability': prob,
+        'weight': weight,
+        'delay': delay,
+        'synMech': synMech,
+        'sec': 'soma',
+        'loc': 0.5,
+    }
+
+###############################################################################
+# Background stimulation
+###############################################################################
+
+bgRates = {
+    'HL23PYR': 5.0,
+    'HL23SST': 8.0,
+    'HL23PV': 12.0,
+    'HL23VIP': 10.0,
+}
+
+for cellType, rate in bgRates.items():
+    netParams.stimSourceParams[f'bkg_{cellType}'] = {
+        'type': 'NetStim',
+        'rate': rate,
+        'noise': 1.0,
+        'start': 0,
+        'number': 1e9,
+    }
+
+    netParams.stimTargetParams[f'bkg_{cellType}_stim'] = {
+        'source': f'bkg_{cellType}',
+        'conds': {'pop': cellType},
+        'weight': 0.1,
+        'delay': 0,
+        'synMech': 'AMPA',
+        'sec': 'soma',
+        'loc': 0.5,
+    }
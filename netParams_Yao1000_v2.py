@@ -5,11 +5,21 @@ NetPyNE network parameters for 1000-cell human L2/3 cortical microcircuit
 Replicating: Yao et al. (2022) Cell Reports
 
 Simplified version using point neurons initially, can be upgraded to detailed morphologies
+
+The Izhi2007b parameters below are generic; when data/izhi_HL23.json exists
+(written by fitIzhi_HL23.py) its fits to the detailed cells replace them, and
+the fitted AD stages add 'HL23PYR_AD<stage>_rule' cell rules. Fits the table
+flags as poor (poorFit: they do not reproduce the detailed F-I curve) are
+listed in poorFits and reported before use.
 """
 
+import os
+import json
 from netpyne import specs
 import numpy as np
 
+IZHI_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'izhi_HL23.json')
+
 netParams = specs.NetParams()
 
 ###############################################################################
@@ -32,8 +42,23 @@ cellTypes = {
     'HL23VIP': {'numCells': 80, 'C': 0.6, 'k': 0.6, 'vr': -60, 'vt': -40, 'vpeak': 35, 'a': 0.15, 'b': 0.1, 'c': -58, 'd': 2},
 }
 
+# Fitted parameters (fitIzhi_HL23.py): healthy types override cellTypes, AD stages get their own rules
+izhiVariants = {}
+poorFits = {}  # {label: score} of fits flagged as not reproducing the detailed cell
+if os.path.exists(IZHI_TABLE):
+    with open(IZHI_TABLE) as f:
+        for label, entry in json.load(f)['cells'].items():
+            if entry.get('poorFit'):
+                poorFits[label] = entry['score']
+            if label in cellTypes:
+                cellTypes[label].update(entry['params'])
+                if label in poorFits:
+                    print(f"⚠ {label}: poorly fitted Izhikevich parameters (score {entry['score']:.1f}, {IZHI_TABLE})")
+            else:
+                izhiVariants[label] = dict(cellTypes[entry['cellType']], **entry['params'])
+
 # Define cell rules using Izhikevich model
-for cellType, params in cellTypes.items():
+for cellType, params in list(cellTypes.items()) + list(izhiVariants.items()):
     netParams.cellParams[cellType + '_rule'] = {
         'conds': {'cellType': cellType},
         'secs': {
@@ -70,7 +95,8 @@ for cellType, params in cellTypes.items():
     netParams.popParams[cellType] = {
         'cellType': cellType,
         'numCells': params['numCells'],
-        'cellModel': 'Izhi2007b',
+        # no 'cellModel' here: NetPyNE would build an artificial PointCell from the
+        # Izhi2007b mechanism; the cell rule places it in a soma section instead
         'xRange': [-250, 250],
         'yRange': [yMin, yMax],
         'zRange': [-250, 250],
@@ -230,11 +256,20 @@ for cellType, params in bgStim.items():
 
 netParams.defaultThreshold = -20.0
 
-print("=" * 80)
-print("NetPyNE Network Parameters: Yao et al. 2022 (1000 cells - Point Neurons)")
-print("=" * 80)
-print(f"Total cells: {sum([p['numCells'] for p in cellTypes.values()])}")
-for cellType, params in cellTypes.items():
-    print(f"  - {cellType}: {params['numCells']}")
-print(f"Connection types: {len([k for k in connProbs.keys() if connProbs[k] > 0])}")
-print("=" * 80)
+def printSummary():
+    """Print the network composition (import stays silent)"""
+
+    print("=" * 80)
+    print("NetPyNE Network Parameters: Yao et al. 2022 (1000 cells - Point Neurons)")
+    print("=" * 80)
+    print(f"Total cells: {sum([p['numCells'] for p in cellTypes.values()])}")
+    for cellType, params in cellTypes.items():
+        print(f"  - {cellType}: {params['numCells']}")
+    print(f"Connection types: {len([k for k in connProbs.keys() if connProbs[k] > 0])}")
+    print(f"Izhikevich parameters: {'fitted (' + IZHI_TABLE + ')' if os.path.exists(IZHI_TABLE) else 'generic'}")
+    for label, score in poorFits.items():
+        print(f"  ⚠ {label}: poor fit (score {score:.1f})")
+    print("=" * 80)
+
+if __name__ == '__main__':
+    printSummary()
@@ -0,0 +1,483 @@
+"""
+optimize_HL23PYR.py
+
+Parallel biophysics optimizer for HL23PYR (healthy baseline or AD stage)
+A candidate is a vector of uniform channel densities from the
+distribute_channels() lines of biophys_HL23PYR*.hoc. Candidates are scored on
+current-step features (rheobase, spike counts, AP shape, adaptation) against
+Allen specimen features, the expected phenotype of an AD stage header, or
+recorded sweeps. Each worker process simulates a batch of candidates x
+amplitudes in one NEURON run; repeated parameter vectors are memoized (and
+optionally cached on disk). The best candidate is written as a biophys hoc file.
+
+Usage:
+    python optimize_HL23PYR.py                                       # Fit healthy model to Allen specimen
+    python optimize_HL23PYR.py --stage 1 --targets stage1            # Fit Stage 1 to its expected phenotype
+    python optimize_HL23PYR.py --targets sweeps:recorded.sweeps      # Fit to recorded sweeps
+    python optimize_HL23PYR.py --workers 8 --popsize 24 --generations 30 --cache fit_cache.jsonl
+    python optimize_HL23PYR.py --params soma:gbar_SK axon:gbar_SK soma:gbar_Im
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import multiprocessing
+import numpy as np
+
+import features_HL23
+from sweeps_HL23 import LONG_SQUARE, allenLongSquare
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# PARAMETERS
+###############################################################################
+
+# Channel densities tuned by default: (section list, range variable)
+PARAMS = [
+    ('soma', 'gbar_NaTg'),
+    ('soma', 'gbar_Kv3_1'),
+    ('soma', 'gbar_SK'),
+    ('soma', 'gbar_Im'),
+    ('soma', 'gbar_K_T'),
+    ('soma', 'gbar_K_P'),
+    ('soma', 'gbar_Ca_HVA'),
+    ('soma', 'gbar_Ca_LVA'),
+    ('axon', 'gbar_NaTg'),
+    ('axon', 'gbar_Kv3_1'),
+    ('axon', 'gbar_SK'),
+    ('axon', 'gbar_Nap'),
+]
+
+# Search range relative to the base value (log-uniform)
+SCALE_RANGE = (0.5, 2.0)
+
+# Step amplitudes (nA) simulated for every candidate
+FIT_AMPS = np.array([0.10, 0.13, 0.15, 0.17, 0.19, 0.25, 0.31])
+
+_DISTRIBUTE = re.compile(r'(distribute_channels\("(\w+)","(\w+)",(?:[^,()]*,){5})([-+\d.eE]+)\)')
+
+def readChannelDensities(hocPath):
+    """Uniform densities set by distribute_channels() lines: {(secList, var): value}"""
+
+    with open(hocPath) as f:
+        return {(m.group(2), m.group(3)): float(m.group(4)) for m in _DISTRIBUTE.finditer(f.read())}
+
+def writeBiophys(basePath, values, outPath, notes=()):
+    """
+    Write a copy of a biophys hoc file with new distribute_channels() values
+
+    The leading comment block of the base file is replaced by a header that
+    records the base file, the changed densities and any notes.
+    """
+
+    with open(basePath, newline='') as f:
+        text = f.read()
+    newline = '\r\n' if '\r\n' in text else '\n'  # keep the base file's line endings
+    lines = text.replace('\r\n', '\n').split('\n')
+    while lines and (lines[0].startswith('//') or not lines[0].strip()):
+        lines.pop(0)
+    body = newline.join(lines)
+
+    base = readChannelDensities(basePath)
+
+    def replace(m):
+        key = (m.group(2), m.group(3))
+        return m.group(1) + f'{values[key]:.10f})' if key in values else m.group(0)
+
+    body = _DISTRIBUTE.sub(replace, body)
+
+    header = [
+        '// ' + '=' * 76,
+        '// FITTED HL23PYR BIOPHYSICS (generated by optimize_HL23PYR.py)',
+        '// ' + '=' * 76,
+        f'// Based on: {os.path.basename(basePath)}',
+        '//',
+        '// FITTED CHANNEL DENSITIES (S/cm²):',
+        '// ' + '-' * 76,
+    ]
+    for (region, var), value in values.items():
+        old = base.get((region, var))
+        change = f' ({100 * (value / old - 1):+.1f}%)' if old else ''
+        header.append(f'// {region:5s} {var:14s}: {old:.7f} → {value:.7f}{change}')
+    if notes:
+        header.append('//')
+        header.extend(f'// {note}' for note in notes)
+    header.append('// ' + '=' * 76)
+
+    with open(outPath, 'w', newline='') as f:
+        f.write(newline.join(header + ['', body]))
+
+###############################################################################
+# TARGETS
+###############################################################################
+
+def targetsFromAllen(xmlPath):
+    """
+    Targets from an Allen specimen: cell features plus the Long Square F-I curve
+
+    Returns:
+        {'features': {name: (mean, sd)}, 'numSpikes': {amp (nA): (count, sd)}}
+    """
+
+    import xml.etree.ElementTree as ET
+
+    root = ET.parse(xmlPath).getroot()
+    feat = root.find('.//ephys-feature')
+    get = lambda key: float(feat.findtext(key))
+
+    thresholdV = get('threshold-v-long-square')
+    features = {
+        'rheobase': (get('threshold-i-long-square'), 20.0),
+        'fiSlope': (get('f-i-curve-slope'), 0.03),
+        'amplitude': (get('peak-v-long-square') - thresholdV, 5.0),
+        'ahpDepth': (thresholdV - get('trough-v-long-square'), 3.0),
+    }
+
+    numSpikes = {}
+    for sweep in allenLongSquare(xmlPath):
+        if sweep['amp'] > 0:
+            numSpikes.setdefault(sweep['amp'], []).append(sweep['numSpikes'])
+    numSpikes = {amp: (float(np.mean(n)), 2.0) for amp, n in numSpikes.items()}
+
+    return {'features': features, 'numSpikes': numSpikes}
+
+# Expected phenotypes quoted in the AD biophysics headers (Stage 1 vs healthy)
+STAGE_TARGETS = {
+    'healthy': {
+        'features': {'rheobase': (170.0, 10.0)},
+        'numSpikes': {0.17: (15.0, 1.5), 0.31: (21.0, 2.0)},
+    },
+    'stage1': {
+        'features': {'rheobase': (150.0, 10.0)},
+        'numSpikes': {0.17: (20.0, 2.0), 0.31: (27.5, 2.5)},
+    },
+}
+
+def targetsFromSweeps(path, stimStart=None, stimDur=None):
+    """Targets from recorded sweeps (any file sweepio_HL23 can open)"""
+
+    import sweepio_HL23
+
+    store = sweepio_HL23.openSweeps(path)
+    stimStart = stimStart if stimStart is not None else store.attrs.get('delay', LONG_SQUARE['delay'])
+    stimDur = stimDur if stimDur is not None else store.attrs.get('dur', LONG_SQUARE['dur'])
+    feats = features_HL23.extractFeatures(np.asarray(store.t), store.sweeps(dtype=np.float64),
+                                          store.amps, stimStart, stimDur)
+
+    cell = feats['cell']
+    features = {
+        'rheobase': (cell['rheobase'][0], 20.0),
+        'fiSlope': (cell['fiSlope'][0], 0.03),
+        'amplitude': (cell['amplitude'][0], 5.0),
+        'halfWidth': (cell['halfWidth'][0], 0.1),
+        'ahpDepth': (cell['ahpDepth'][0], 3.0),
+        'adaptation': (cell['adaptation'][0], 0.02),
+    }
+    features = {k: v for k, v in features.items() if np.isfinite(v[0])}
+    numSpikes = {round(float(a), 4): (float(n), 2.0)
+                 for a, n in zip(store.amps, feats['sweeps']['numSpikes']) if a > 0}
+
+    return {'features': features, 'numSpikes': numSpikes}
+
+def loadTargets(spec):
+    """'allen[:xml]', 'healthy', 'stage1' or 'sweeps:<path>'"""
+
+    if spec.startswith('sweeps:'):
+        return targetsFromSweeps(spec.split(':', 1)[1])
+    if spec.startswith('allen'):
+        xmlPath = spec.split(':', 1)[1] if ':' in spec else os.path.join(BASEDIR, 'PYR_531526539.xml')
+        return targetsFromAllen(xmlPath)
+    if spec in STAGE_TARGETS:
+        return STAGE_TARGETS[spec]
+    raise ValueError(f"Unknown targets: {spec}")
+
+###############################################################################
+# SCORING
+###############################################################################
+
+FAIL_SCORE = 100.0  # per-feature penalty when a feature is undefined (e.g. no spikes)
+
+def scoreCandidates(feats, groups, amps, targets):
+    """
+    Sum of squared z-scores of every candidate in a feature batch
+
+    Args:
+        feats: extractFeatures() output for stacked candidates
+        groups: candidate index of every sweep
+        amps: amplitude of every sweep (nA)
+        targets: {'features': {...}, 'numSpikes': {...}}
+
+    Returns:
+        (nCandidates,) scores
+    """
+
+    nCand = groups.max() + 1
+    scores = np.zeros(nCand)
+
+    for name, (mean, sd) in targets.get('features', {}).items():
+        z2 = ((feats['cell'][name] - mean) / sd) ** 2
+        scores += np.where(np.isfinite(z2), np.minimum(z2, FAIL_SCORE), FAIL_SCORE)
+
+    counts = feats['sweeps']['numSpikes']
+    for amp, (mean, sd) in targets.get('numSpikes', {}).items():
+        sel = np.isclose(amps, amp)
+        if sel.any():
+            z2 = np.zeros(nCand)
+            z2[groups[sel]] = ((counts[sel] - mean) / sd) ** 2
+            scores += np.minimum(z2, FAIL_SCORE)
+
+    return scores
+
+###############################################################################
+# EVALUATION
+###############################################################################
+
+_config = {}
+
+def _initWorker(config):
+    """Pool initializer: keep the fit configuration in the worker"""
+
+    _config.update(config)
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms(config.get('mechDir'))  # default: mod/ through the build cache
+
+def _evaluateBatch(vectors):
+    """Simulate a batch of candidates in one NEURON run and score them"""
+
+    from sweeps_HL23 import runSweeps
+
+    names = _config['names']
+    amps = np.array(_config['amps'])
+    nCand = len(vectors)
+
+    allAmps = np.tile(amps, nCand)
+    groups = np.repeat(np.arange(nCand), len(amps))
+    params = [dict(zip(names, vectors[g])) for g in groups]
+
+    t, V = runSweeps(allAmps, ad_stage=_config['ad_stage'], params=params,
+                     delay=LONG_SQUARE['delay'], dur=LONG_SQUARE['dur'], tstop=LONG_SQUARE['tstop'])
+    feats = features_HL23.extractFeatures(t, V, allAmps, LONG_SQUARE['delay'], LONG_SQUARE['dur'], groups)
+
+    return scoreCandidates(feats, groups, allAmps, _config['targets']).tolist()
+
+def configHash(config, lower, upper, basePath):
+    """Hash of everything a cached score depends on besides the vector itself"""
+
+    key = hashlib.sha1(json.dumps(
+        [config['names'], config['amps'], config['ad_stage'], config['targets'],
+         np.asarray(lower).tolist(), np.asarray(upper).tolist()],
+        sort_keys=True, default=float).encode())
+    with open(basePath, 'rb') as f:
+        key.update(f.read())
+    return key.hexdigest()[:16]
+
+class EvaluationCache:
+    """
+    Memo of parameter vector -> score, optionally persisted as JSON lines
+
+    Vectors are keyed after rounding to 6 significant digits, so a candidate
+    revisited by the optimizer (or by a later run) is never re-simulated. The
+    first line of the file records the configHash() it was written under; a
+    file from another configuration (targets, base model, amplitudes,
+    parameters or bounds) raises ValueError instead of being reused.
+    """
+
+    def __init__(self, path=None, config=None):
+        self.path = path
+        self.config = config
+        self.scores = {}
+        self.hits = 0
+        if path and os.path.exists(path) and os.path.getsize(path):
+            with open(path) as f:
+                header = json.loads(f.readline())
+                if header.get('config') != config:
+                    raise ValueError(f"{path} was written for another configuration "
+                                     f"({header.get('config')} != {config})")
+                for line in f:
+                    entry = json.loads(line)
+                    self.scores[tuple(entry['x'])] = entry['score']
+        elif path:
+            with open(path, 'w') as f:
+                f.write(json.dumps({'config': config}) + '\n')
+
+    @staticmethod
+    def key(vector):
+        return tuple(float(f'{v:.6g}') for v in vector)
+
+    def get(self, vector):
+        return self.scores.get(self.key(vector))
+
+    def put(self, vector, score):
+        key = self.key(vector)
+        self.scores[key] = score
+        if self.path:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps({'x': list(key), 'score': score}) + '\n')
+
+class Evaluator:
+    """Scores candidate vectors in a process pool, consulting the cache first"""
+
+    def __init__(self, config, workers=None, perTask=2, cache=None):
+        self.config = config
+        self.perTask = perTask
+        self.cache = cache or EvaluationCache()
+        self.evaluations = 0
+        workers = workers or max(1, multiprocessing.cpu_count() - 1)
+        self.pool = multiprocessing.Pool(workers, initializer=_initWorker, initargs=(config,),
+                                         maxtasksperchild=20)
+
+    def __call__(self, vectors):
+        scores = [self.cache.get(v) for v in vectors]
+
+        # Unique uncached vectors only
+        todo = {}
+        for v, s in zip(vectors, scores):
+            if s is None:
+                todo.setdefault(self.cache.key(v), v)
+            else:
+                self.cache.hits += 1
+        keys = list(todo)
+        batches = [[todo[k] for k in keys[i:i + self.perTask]] for i in range(0, len(keys), self.perTask)]
+
+        for batch, result in zip(batches, self.pool.map(_evaluateBatch, batches)):
+            for v, s in zip(batch, result):
+                self.cache.put(v, s)
+        self.evaluations += len(keys)
+
+        return np.array([self.cache.get(v) for v in vectors])
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+###############################################################################
+# OPTIMIZER
+###############################################################################
+
+def differentialEvolution(evaluate, lower, upper, popsize=16, generations=20, F=0.7, CR=0.8,
+                          x0=None, seed=42, verbose=True):
+    """
+    DE/rand/1/bin over the box [lower, upper]; every generation is evaluated as one batch
+
+    Returns:
+        best vector, best score, history of best scores
+    """
+
+    rng = np.random.default_rng(seed)
+    dim = len(lower)
+
+    pop = lower + rng.random((popsize, dim)) * (upper - lower)
+    if x0 is not None:
+        pop[0] = x0
+    scores = evaluate(pop)
+    history = [scores.min()]
+
+    for gen in range(generations):
+        idx = np.array([rng.choice(np.delete(np.arange(popsize), i), 3, replace=False) for i in range(popsize)])
+        mutant = np.clip(pop[idx[:, 0]] + F * (pop[idx[:, 1]] - pop[idx[:, 2]]), lower, upper)
+        cross = rng.random((popsize, dim)) < CR
+        cross[np.arange(popsize), rng.integers(dim, size=popsize)] = True
+        trial = np.where(cross, mutant, pop)
+
+        trialScores = evaluate(trial)
+        better = trialScores <= scores
+        pop[better] = trial[better]
+        scores[better] = trialScores[better]
+        history.append(scores.min())
+
+        if verbose:
+            print(f"  Generation {gen + 1:3d}: best {scores.min():10.3f}, median {np.median(scores):10.3f}")
+
+    best = np.argmin(scores)
+    return pop[best], scores[best], history
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Fit HL23PYR channel densities to current-step targets')
+    parser.add_argument('--stage', type=int, default=None, choices=(1, 3), help='AD stage of the base model')
+    parser.add_argument('--targets', type=str, default='allen', help="allen[:xml], healthy, stage1 or sweeps:<path>")
+    parser.add_argument('--params', type=str, nargs='+', default=None, help='secList:var parameters to tune')
+    parser.add_argument('--popsize', type=int, default=16, help='Candidates per generation')
+    parser.add_argument('--generations', type=int, default=20, help='Number of generations')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPUs - 1)')
+    parser.add_argument('--per-task', type=int, default=2, help='Candidates simulated per NEURON run')
+    parser.add_argument('--cache', type=str, default=None, help='Persistent evaluation cache (.jsonl)')
+    parser.add_argument('--mech-dir', type=str, default=None, help='Directory of compiled mechanisms to load')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', type=str, default=None, help='Output biophys hoc file')
+    args = parser.parse_args()
+
+    import cellwrapper
+
+    basePath = cellwrapper.getBiophysicsPath('HL23PYR', ad=args.stage is not None, ad_stage=args.stage)
+    base = readChannelDensities(basePath)
+    names = [tuple(p.split(':')) for p in args.params] if args.params else PARAMS
+    missing = [n for n in names if n not in base]
+    if missing:
+        print(f"✗ Not set by distribute_channels() in {os.path.basename(basePath)}: {missing}")
+        sys.exit(1)
+
+    targets = loadTargets(args.targets)
+    amps = np.union1d(FIT_AMPS, list(targets.get('numSpikes', {}).keys()))
+
+    output = args.output or os.path.join(
+        BASEDIR, 'models', os.path.basename(basePath).replace('.hoc', '_fit.hoc'))
+
+    print("=" * 80)
+    print("HL23PYR BIOPHYSICS OPTIMIZATION")
+    print("=" * 80)
+    print(f"Base model: {os.path.basename(basePath)}")
+    print(f"Targets: {args.targets}")
+    for name, (mean, sd) in targets['features'].items():
+        print(f"  {name:12s}: {mean:9.3f} ± {sd}")
+    for amp, (mean, sd) in sorted(targets.get('numSpikes', {}).items()):
+        print(f"  spikes @ {amp * 1000:4.0f} pA: {mean:5.1f} ± {sd}")
+    print(f"Parameters: {len(names)}, amplitudes per candidate: {len(amps)}")
+    print("=" * 80)
+
+    x0 = np.log([base[n] for n in names])
+    lower = x0 + np.log(SCALE_RANGE[0])
+    upper = x0 + np.log(SCALE_RANGE[1])
+
+    config = {'names': names, 'amps': amps.tolist(), 'ad_stage': args.stage,
+              'targets': targets, 'mechDir': args.mech_dir}
+    try:
+        cache = EvaluationCache(args.cache, configHash(config, lower, upper, basePath))
+    except ValueError as e:
+        print(f"✗ Refusing evaluation cache: {e}")
+        sys.exit(1)
+    evaluator = Evaluator(config, workers=args.workers, perTask=args.per_task, cache=cache)
+
+    t0 = time.time()
+    try:
+        best, bestScore, history = differentialEvolution(
+            lambda X: evaluator(np.exp(X)), lower, upper, popsize=args.popsize,
+            generations=args.generations, x0=x0, seed=args.seed)
+    finally:
+        evaluator.close()
+    elapsed = time.time() - t0
+
+    values = dict(zip(names, np.exp(best)))
+    notes = [
+        f'Targets: {args.targets}',
+        f'Score: {bestScore:.4f} (initial generation best: {history[0]:.4f})',
+        f'Evaluations: {evaluator.evaluations} simulated, {evaluator.cache.hits} from cache',
+    ]
+    writeBiophys(basePath, values, output, notes)
+
+    print("=" * 80)
+    print(f"Best score: {bestScore:.4f}")
+    print(f"Evaluations: {evaluator.evaluations} simulated, {evaluator.cache.hits} cache hits, {elapsed:.1f} s")
+    for (region, var), value in values.items():
+        print(f"  {region:5s} {var:14s}: {base[(region, var)]:.7f} → {value:.7f}")
+    print(f"\n✓ Fitted biophysics written to: {output}")
+    print("=" * 80)
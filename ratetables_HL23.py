@@ -0,0 +1,217 @@
+"""
+ratetables_HL23.py
+
+Accuracy and speed benchmark of the gating-rate lookup tables in mod/
+The voltage-gated channels (NaTg, Kv3_1, K_T, K_P, Nap, Im, Ih, Ca_HVA,
+Ca_LVA) tabulate their rate functions instead of evaluating exp() for every
+segment at every step. Per-section shifts and slopes (NaTg vshiftm/vshifth/
+slopem/slopeh, Ih shift1-6, Kv3_1 vshift) are applied outside the tables:
+the tables are keyed on the shifted (and slope-scaled) voltage, so one table
+serves every section. usetable_<SUFFIX> = 0 switches back to the analytic
+rates, which this script uses as the reference.
+
+Gating error: steady states and time constants are recovered from the
+states of a bank of isolated, voltage-frozen compartments (one per test
+voltage, off the table grid) after finitialize and one cnexp step.
+Speed: the HL23 current-step sweeps (sweeps_HL23.py) are timed with and
+without tables, and the somatic traces are compared.
+
+Usage:
+    python ratetables_HL23.py                          # Gating errors + HL23PYR step benchmark
+    python ratetables_HL23.py --cell HL23PV --amps 0.2 0.4
+    python ratetables_HL23.py --errors-only
+"""
+
+import time
+import argparse
+import numpy as np
+
+from sweeps_HL23 import runSweeps, countSpikes
+
+###############################################################################
+# MECHANISMS
+###############################################################################
+
+# Suffix: gating states
+GATES = {
+    'NaTg': ('m', 'h'),
+    'Kv3_1': ('m',),
+    'K_T': ('m', 'h'),
+    'K_P': ('m', 'h'),
+    'Nap': ('m', 'h'),
+    'Im': ('m',),
+    'Ih': ('m',),
+    'Ca_HVA': ('m', 'h'),
+    'Ca_LVA': ('m', 'h'),
+}
+
+# Per-section RANGE parameters used in models/biophys_*.hoc (defaults first)
+PARAM_SETS = {
+    'NaTg': [
+        {},
+        {'vshiftm': 13, 'vshifth': 15, 'slopem': 7},              # HL23PYR soma
+        {'vshiftm': 0, 'vshifth': 10, 'slopem': 9, 'slopeh': 6},  # HL23PV, HL23PYR axon
+    ],
+}
+
+def setTables(on):
+    """Switch the rate tables of all benchmarked mechanisms on or off"""
+
+    from neuron import h
+
+    for mech in GATES:
+        setattr(h, 'usetable_' + mech, int(on))
+
+###############################################################################
+# GATING ERROR
+###############################################################################
+
+def gatingCurves(mech, V, params=None, dt=0.025):
+    """
+    Steady states and time constants of every gate of one mechanism
+
+    Args:
+        mech: mechanism suffix
+        V: (nV,) test voltages (mV)
+        params: {RANGE parameter: value} applied to every compartment
+
+    Returns:
+        {gate: (inf, tau)} with (nV,) arrays (tau in ms)
+    """
+
+    from neuron import h
+
+    secs = []
+    for v in V:
+        sec = h.Section(name=f'{mech}_{len(secs)}')
+        sec.cm = 1e9  # freezes v during the probing step
+        sec.insert(mech)
+        for name, value in (params or {}).items():
+            setattr(sec(0.5), f'{name}_{mech}', value)
+        sec.v = v
+        secs.append(sec)
+
+    h.CVode().active(0)
+    h.dt = dt
+    h.finitialize()  # without an argument every compartment keeps its own v
+
+    gates = GATES[mech]
+    segs = [getattr(sec(0.5), mech) for sec in secs]
+    inf = {gate: np.array([getattr(seg, gate) for seg in segs]) for gate in gates}
+
+    # Relax from the far end: x1 = inf + (x0 - inf) exp(-dt / tau)
+    x0 = {gate: np.where(inf[gate] > 0.5, 0.0, 1.0) for gate in gates}
+    for i, seg in enumerate(segs):
+        for gate in gates:
+            setattr(seg, gate, x0[gate][i])
+    h.fadvance()
+
+    out = {}
+    for gate in gates:
+        x1 = np.array([getattr(seg, gate) for seg in segs])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau = -dt / np.log((x1 - inf[gate]) / (x0[gate] - inf[gate]))
+        out[gate] = (inf[gate], tau)
+    return out
+
+def gatingErrors(V=None):
+    """
+    Maximum table error per mechanism, gate and parameter set
+
+    Returns:
+        list of {'mech', 'params', 'gate', 'infError' (abs), 'tauError' (relative)}
+    """
+
+    if V is None:
+        V = np.arange(-100.0, 60.0, 0.037) + 0.0113  # off the 0.1 mV table grid
+
+    rows = []
+    for mech in GATES:
+        for params in PARAM_SETS.get(mech, [{}]):
+            setTables(False)
+            exact = gatingCurves(mech, V, params)
+            setTables(True)
+            tabled = gatingCurves(mech, V, params)
+            for gate in GATES[mech]:
+                (inf0, tau0), (inf1, tau1) = exact[gate], tabled[gate]
+                ok = np.isfinite(tau0) & np.isfinite(tau1)  # inf ~ x0: tau not resolvable
+                rows.append({'mech': mech, 'params': params, 'gate': gate,
+                             'infError': float(np.max(np.abs(inf1 - inf0))),
+                             'tauError': float(np.max(np.abs(tau1[ok] - tau0[ok]) / tau0[ok]))})
+    return rows
+
+###############################################################################
+# SPEED
+###############################################################################
+
+def speedBenchmark(amps, cellName='HL23PYR', ad_stage=None, repeats=1, **kwargs):
+    """
+    Time the batched step sweeps with analytic rates and with tables
+
+    Returns:
+        {'analytic': seconds, 'tables': seconds, 'maxDV': mV,
+         'spikes': (analytic counts, table counts),
+         'maxShift': largest spike-time difference (ms, NaN if the counts differ)}
+    """
+
+    out = {}
+    traces = {}
+    for label, on in (('analytic', False), ('tables', True)):
+        setTables(on)
+        best = np.inf
+        for _ in range(repeats):
+            t0 = time.time()
+            t, V = runSweeps(amps, cellName=cellName, ad_stage=ad_stage, **kwargs)
+            best = min(best, time.time() - t0)
+        out[label] = best
+        traces[label] = V
+
+    out['maxDV'] = float(np.max(np.abs(traces['tables'] - traces['analytic'])))
+    out['spikes'] = (countSpikes(traces['analytic']), countSpikes(traces['tables']))
+
+    # Upward -20 mV crossings (sample resolution, as countSpikes)
+    crossings = {label: np.flatnonzero((V[:, :-1] < -20.0) & (V[:, 1:] >= -20.0)) for label, V in traces.items()}
+    same = np.array_equal(*out['spikes'])
+    out['maxShift'] = float(np.max(np.abs(crossings['tables'] - crossings['analytic']), initial=0.0)) * (t[1] - t[0]) if same else np.nan
+    return out
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark the channel rate tables against the analytic rates')
+    parser.add_argument('--cell', type=str, default='HL23PYR', help='Cell type for the speed benchmark')
+    parser.add_argument('--stage', type=int, default=None, help='AD stage (HL23PYR only)')
+    parser.add_argument('--amps', type=float, nargs='+', default=[0.1, 0.2, 0.3], help='Step amplitudes (nA)')
+    parser.add_argument('--repeats', type=int, default=1, help='Timed repeats (best is reported)')
+    parser.add_argument('--errors-only', action='store_true', help='Skip the speed benchmark')
+    args = parser.parse_args()
+
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms()
+
+    print("=" * 80)
+    print("RATE TABLES: MAXIMUM GATING ERROR (table vs analytic)")
+    print("=" * 80)
+    print(f"{'Mechanism':<10} {'Gate':<5} {'|Δinf|':>10} {'Δtau/tau':>10}  Parameters")
+    print("-" * 80)
+    for row in gatingErrors():
+        params = ', '.join(f'{k}={v}' for k, v in row['params'].items()) or 'defaults'
+        print(f"{row['mech']:<10} {row['gate']:<5} {row['infError']:10.2e} {row['tauError']:10.2e}  {params}")
+
+    if not args.errors_only:
+        label = args.cell + (f' AD Stage {args.stage}' if args.stage else '')
+        print("=" * 80)
+        print(f"SPEED: {label}, {len(args.amps)} step sweeps")
+        print("=" * 80)
+        res = speedBenchmark(args.amps, args.cell, args.stage, args.repeats)
+        print(f"Analytic rates: {res['analytic']:8.2f} s")
+        print(f"Rate tables:    {res['tables']:8.2f} s   ({res['analytic'] / res['tables']:.2f}x)")
+        print(f"Max |ΔV|:       {res['maxDV']:8.3f} mV (spike upstrokes)")
+        print(f"Spike shift:    {res['maxShift']:8.3f} ms")
+        print(f"Spike counts:   {res['spikes'][0].tolist()} analytic, {res['spikes'][1].tolist()} tables")
+        same = np.array_equal(*res['spikes'])
+        print(f"{'✓' if same else '✗'} Spike counts {'identical' if same else 'differ'}")
+    print("=" * 80)
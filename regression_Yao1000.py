@@ -0,0 +1,253 @@
+"""
+regression_Yao1000.py
+
+Golden-output regression check of the Yao network dynamics
+Small fixed-seed networks and single-cell current-step sweeps are simulated
+(each in a fresh worker process, about a minute in total) and their spikes
+are compared with the golden outputs stored in data/golden/. Comparison is
+tolerance-aware, so a change that only moves spikes by floating-point noise
+passes while one that changes the dynamics fails:
+
+    jitter         spikes of the same cell/sweep are matched one-to-one when
+                   they are at most this far apart (ms); maxJitter is reported
+    unmatched      fraction of spikes (golden + new) left without a match
+    countDistance  sum over cells of |count - golden count| / golden spikes
+    rateDeviation  largest population rate change, relative to the golden
+                   rate (populations with few spikes use a floor of RATE_FLOOR spikes)
+
+Run through test_Yao1000.py:
+    python test_Yao1000.py --regression                       # Check all cases, exit 1 on failure
+    python test_Yao1000.py --regression --cases net_hh_20
+    python test_Yao1000.py --update-golden                    # Regenerate data/golden/ (review the diff!)
+"""
+
+import os
+import json
+import time
+import numpy as np
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(BASEDIR, 'data', 'golden')
+
+###############################################################################
+# CASES AND TOLERANCES
+###############################################################################
+
+# Short step protocol for the sweep cases
+STEP = {'delay': 100.0, 'dur': 500.0, 'tstop': 700.0}
+
+CASES = {
+    'net_hh_20': {'kind': 'network', 'model': 'hh', 'cells': 20, 'duration': 500.0, 'seed': 42},
+    'net_hh_100': {'kind': 'network', 'model': 'hh', 'cells': 100, 'duration': 300.0, 'seed': 7},
+    'net_izhi_20': {'kind': 'network', 'model': 'izhi', 'cells': 20, 'duration': 500.0, 'seed': 42},
+    'net_izhi_100': {'kind': 'network', 'model': 'izhi', 'cells': 100, 'duration': 300.0, 'seed': 7},
+    'sweeps_HL23PYR': {'kind': 'sweeps', 'cell': 'HL23PYR', 'stage': None, 'amps': [0.2, 0.3]},
+    'sweeps_HL23PYR_AD1': {'kind': 'sweeps', 'cell': 'HL23PYR', 'stage': 1, 'amps': [0.3]},
+    'sweeps_HL23SST': {'kind': 'sweeps', 'cell': 'HL23SST', 'stage': None, 'amps': [0.1, 0.3]},
+    'sweeps_HL23PV': {'kind': 'sweeps', 'cell': 'HL23PV', 'stage': None, 'amps': [0.3]},
+    'sweeps_HL23VIP': {'kind': 'sweeps', 'cell': 'HL23VIP', 'stage': None, 'amps': [0.1, 0.3]},
+}
+
+# Recurrent networks amplify tiny perturbations, single cells do not
+TOLERANCES = {
+    'network': {'jitter': 1.0, 'unmatched': 0.05, 'countDistance': 0.05, 'rateDeviation': 0.10},
+    'sweeps': {'jitter': 0.1, 'unmatched': 0.0, 'countDistance': 0.0, 'rateDeviation': 0.0},
+}
+
+RATE_FLOOR = 10  # spikes
+
+###############################################################################
+# SIMULATION (worker processes)
+###############################################################################
+
+def simulateCase(spec, dt=0.025, segmentLength=None):
+    """
+    Spikes of one case
+
+    Args:
+        spec: case specification (see CASES)
+        dt: integration time step (ms); sweeps are also sampled at dt
+        segmentLength: maximum segment length (um) of the sweep cells, None
+            for the template discretization (network cells are single-compartment)
+
+    Returns:
+        {'t': spike times (ms), 'id': gid or sweep index, 'groups': {label: [ids]}, 'duration',
+         'phases': {phase: s}, 'segments': segments per cell}
+    """
+
+    from neuron import h
+    from instrument_Yao1000 import PhaseProfiler
+
+    profiler = PhaseProfiler(script='regression')
+
+    if spec['kind'] == 'network':
+        from benchmark_Yao1000 import runNetwork
+
+        if segmentLength is not None:
+            raise ValueError("network cells are single-compartment; segmentLength must be None")
+        sim = runNetwork(spec['model'], spec['cells'], duration=spec['duration'], dt=dt,
+                         seed=spec['seed'], profiler=profiler)
+        groups = {label: [int(g) for g in pop.cellGids] for label, pop in sim.net.pops.items()}
+        return {'t': [float(t) for t in sim.allSimData['spkt']],
+                'id': [int(i) for i in sim.allSimData['spkid']],
+                'groups': groups, 'duration': spec['duration'], 'phases': dict(profiler.times),
+                'segments': sum(sec.nseg for sec in h.allsec()) / max(len(sim.net.cells), 1)}
+
+    from mechanisms_Yao1000 import loadMechanisms
+    from sweeps_HL23 import runSweeps
+    loadMechanisms()
+
+    t, V = runSweeps(spec['amps'], cellName=spec['cell'], ad_stage=spec['stage'],
+                     delay=STEP['delay'], dur=STEP['dur'], tstop=STEP['tstop'], dt=dt, recordStep=dt,
+                     segmentLength=segmentLength, profiler=profiler)
+    times, ids = crossingTimes(t, V)
+    return {'t': times.tolist(), 'id': ids.tolist(),
+            'groups': {f"{amp:g} nA": [i] for i, amp in enumerate(spec['amps'])},
+            'duration': STEP['tstop'], 'phases': dict(profiler.times),
+            'segments': profiler.counts['create']['segments'] / len(spec['amps'])}
+
+def crossingTimes(t, V, threshold=-20.0):
+    """Upward threshold crossings of every sweep, linearly interpolated between samples"""
+
+    from features_HL23 import detectSpikes
+
+    sweepIdx, sampleIdx = detectSpikes(V, threshold=threshold)
+    v0, v1 = V[sweepIdx, sampleIdx - 1], V[sweepIdx, sampleIdx]
+    frac = (threshold - v0) / (v1 - v0)
+    return t[sampleIdx - 1] + frac * (t[1] - t[0]), sweepIdx
+
+###############################################################################
+# COMPARISON
+###############################################################################
+
+def matchSpikes(a, b, jitter):
+    """
+    One-to-one matching of two sorted spike trains within +-jitter
+
+    Returns:
+        (number of matched pairs, absolute time differences of the matches)
+    """
+
+    i = j = 0
+    diffs = []
+    while i < len(a) and j < len(b):
+        d = b[j] - a[i]
+        if abs(d) <= jitter:
+            diffs.append(abs(d))
+            i += 1
+            j += 1
+        elif d > 0:
+            i += 1
+        else:
+            j += 1
+    return len(diffs), diffs
+
+def compareSpikes(golden, current, tolerance):
+    """
+    Tolerance-aware comparison of two case outputs
+
+    Returns:
+        {'spikes': (golden, current), 'maxJitter', 'meanJitter', 'unmatched', 'countDistance',
+         'rateDeviation', 'failed': [metrics over tolerance]}
+    """
+
+    t0, id0 = np.asarray(golden['t'], dtype=float), np.asarray(golden['id'], dtype=int)
+    t1, id1 = np.asarray(current['t'], dtype=float), np.asarray(current['id'], dtype=int)
+    numIds = max([max(ids) + 1 for ids in golden['groups'].values()] + [0])
+
+    # Trains per id (stable sort keeps each train's times ordered)
+    order0, order1 = np.lexsort((t0, id0)), np.lexsort((t1, id1))
+    t0, id0, t1, id1 = t0[order0], id0[order0], t1[order1], id1[order1]
+    off0 = np.searchsorted(id0, np.arange(numIds + 1))
+    off1 = np.searchsorted(id1, np.arange(numIds + 1))
+    counts0, counts1 = np.diff(off0), np.diff(off1)
+
+    matched = 0
+    diffs = []
+    for i in range(numIds):
+        n, d = matchSpikes(t0[off0[i]:off0[i + 1]], t1[off1[i]:off1[i + 1]], tolerance['jitter'])
+        matched += n
+        diffs.extend(d)
+
+    total0, total1 = len(t0), len(t1)
+    rateDeviation = 0.0
+    for ids in golden['groups'].values():
+        n0, n1 = counts0[ids].sum(), counts1[ids].sum()
+        rateDeviation = max(rateDeviation, abs(int(n1) - int(n0)) / max(int(n0), RATE_FLOOR))
+
+    out = {'spikes': (total0, total1),
+           'maxJitter': float(max(diffs, default=0.0)),
+           'meanJitter': float(np.mean(diffs)) if diffs else 0.0,
+           'unmatched': (total0 + total1 - 2 * matched) / max(total0 + total1, 1),
+           'countDistance': float(np.abs(counts1 - counts0).sum() / max(total0, 1)),
+           'rateDeviation': float(rateDeviation)}
+    out['failed'] = [m for m in ('unmatched', 'countDistance', 'rateDeviation') if out[m] > tolerance[m]]
+    if golden['groups'] != current['groups']:
+        out['failed'].append('groups')
+    return out
+
+###############################################################################
+# GOLDEN OUTPUTS
+###############################################################################
+
+def goldenPath(case):
+    return os.path.join(GOLDEN_DIR, case + '.json')
+
+def saveGolden(case, spec, output):
+    """Store one case output as its golden reference"""
+
+    from instrument_Yao1000 import versions
+
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    record = {'case': case, 'spec': spec, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'versions': versions(), 'duration': output['duration'], 'groups': output['groups'],
+              't': [round(t, 6) for t in output['t']], 'id': output['id']}
+    with open(goldenPath(case), 'w') as f:
+        json.dump(record, f, separators=(',', ':'))
+
+def loadGolden(case):
+    with open(goldenPath(case)) as f:
+        return json.load(f)
+
+def runRegression(cases=None, update=False, verbose=True):
+    """
+    Simulate the cases and compare with (or, with update=True, overwrite) the golden outputs
+
+    Returns:
+        {case: comparison (see compareSpikes), or {'error': message}, or {'updated': n spikes}}
+    """
+
+    from benchmark_Yao1000 import runIsolated
+
+    results = {}
+    for case in cases or CASES:
+        spec = CASES[case]
+        t0 = time.time()
+        try:
+            output = runIsolated(simulateCase, spec)
+            if update:
+                saveGolden(case, spec, output)
+                results[case] = {'updated': len(output['t'])}
+            else:
+                golden = loadGolden(case)
+                if golden['spec'] != spec:
+                    raise ValueError(f"golden output was made for {golden['spec']}; run --update-golden")
+                results[case] = compareSpikes(golden, output, TOLERANCES[spec['kind']])
+        except Exception as e:
+            results[case] = {'error': f'{type(e).__name__}: {e}'}
+        if verbose:
+            printResult(case, results[case], time.time() - t0)
+    return results
+
+def printResult(case, result, seconds):
+    if 'error' in result:
+        print(f"   ✗ {case:<20} {result['error']}")
+    elif 'updated' in result:
+        print(f"   ✓ {case:<20} golden output written ({result['updated']} spikes, {seconds:.1f} s)")
+    else:
+        mark = '✗' if result['failed'] else '✓'
+        n0, n1 = result['spikes']
+        print(f"   {mark} {case:<20} spikes {n1:5d}/{n0:<5d} jitter {result['maxJitter']:.4f} ms  "
+              f"unmatched {result['unmatched']:.3f}  count {result['countDistance']:.3f}  "
+              f"rate {result['rateDeviation']:.3f}  ({seconds:.1f} s)"
+              + (f"  FAILED: {', '.join(result['failed'])}" if result['failed'] else ''))
@@ -0,0 +1,418 @@
+"""
+results_Yao1000.py
+
+Columnar, memory-mappable result store for Yao 1000-cell network simulations
+Replaces the pickle output: spikes are stored sorted by gid with a CSR offset
+index, traces as float32 (cells x time) arrays, and the network description
+as a small JSON sidecar. Readers memory-map only the arrays they touch, so
+per-cell counts or one population's spikes in a time window never load the
+rest of the run.
+
+Store layout (<name>.results/):
+    meta.json                  pops (gids), duration, dt, traces, run metadata
+    spikes_t.npy               (nSpikes,) float64 spike times, grouped by gid, time-sorted
+    spikes_offsets.npy         (numCells + 1,) int64 CSR offsets: gid g owns t[off[g]:off[g+1]]
+    t.npy                      (nSamples,) float64 trace time base (ms)
+    trace_<var>.npy            (nRecorded, nSamples) float32
+    trace_<var>.zdelta         same, losslessly compressed (see encodeDelta), instead of .npy
+    trace_<var>_gids.npy       (nRecorded,) int32 gid of every trace row
+    trace_<var>_t.npy          time base of a trace with its own sampling (e.g. envelopes)
+
+Usage:
+    python results_Yao1000.py convert Yao1000.pkl                 # -> Yao1000.results
+    python results_Yao1000.py convert yao_network_20cells.pkl -o run20.results
+    python results_Yao1000.py info Yao1000.results
+"""
+
+import os
+import sys
+import json
+import shutil
+import pickle
+import zlib
+import argparse
+import numpy as np
+
+from spikestats_Yao1000 import SpikeIndex
+
+FORMAT = 'results-v1'
+
+###############################################################################
+# RESULT STORE
+###############################################################################
+
+class ResultStore:
+    """
+    Lazy, memory-mapped access to a result store
+
+    store.pops                  {pop: {'cellGids': [...], ...}}
+    store.numCells              total cells (gids 0..numCells-1)
+    store.spikeTimes(gid)       spike times of one cell
+    store.spikes(gids, t0, t1)  (t, gid) arrays, time-sorted
+    store.counts(t0, t1)        spike count of every gid
+    store.index                 SpikeIndex of the spikes (spikes/counts delegate to it)
+    store.traces(var, gids, t0, t1)  (t, float32 rows, gids)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} result store")
+
+        self.pops = self.meta['pops']
+        self.numCells = self.meta['numCells']
+        self.duration = self.meta.get('duration')
+        self._arrays = {}
+        self._index = None
+
+    def __repr__(self):
+        return (f"ResultStore('{self.path}', {self.numCells} cells, {self.numSpikes} spikes, "
+                f"traces: {', '.join(self.meta['traces']) or 'none'})")
+
+    def _load(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    @property
+    def offsets(self):
+        return self._load('spikes_offsets')
+
+    @property
+    def numSpikes(self):
+        return int(self.offsets[-1])
+
+    def popGids(self, pop):
+        return np.asarray(self.pops[pop]['cellGids'], dtype=np.int64)
+
+    def spikeTimes(self, gid):
+        off = self.offsets
+        return np.asarray(self._load('spikes_t')[off[gid]:off[gid + 1]])
+
+    @property
+    def index(self):
+        """SpikeIndex over the memory-mapped spikes (no copy)"""
+
+        if self._index is None:
+            self._index = SpikeIndex.fromStore(self)
+        return self._index
+
+    def spikes(self, gids=None, tstart=None, tstop=None):
+        """
+        Spikes of a set of cells within [tstart, tstop]
+
+        Returns:
+            t, gid arrays sorted by time
+        """
+
+        return self.index.spikes(gids, tstart, tstop)
+
+    def counts(self, tstart=None, tstop=None):
+        """(numCells,) spike count per gid within [tstart, tstop]"""
+
+        return self.index.counts(tstart, tstop)
+
+    def traces(self, var, gids=None, tstart=None, tstop=None):
+        """
+        Recorded traces of one variable
+
+        Returns:
+            t: (nSamples,) time base of the window
+            data: (len(gids), nSamples) float32 (memmap view when possible)
+            gids: gid of every row
+        """
+
+        if var not in self.meta['traces']:
+            raise KeyError(f"no '{var}' traces in {self.path}")
+
+        codec = self.meta.get('traceCodecs', {}).get(var)
+        t = self._load(f'trace_{var}_t' if var in self.meta.get('traceTimes', []) else 't')
+        first = 0 if tstart is None else int(np.searchsorted(t, tstart))
+        last = len(t) if tstop is None else int(np.searchsorted(t, tstop, side='right'))
+
+        if codec == 'delta-zlib':
+            if f'trace_{var}' not in self._arrays:
+                with open(os.path.join(self.path, f'trace_{var}.zdelta'), 'rb') as f:
+                    self._arrays[f'trace_{var}'] = decodeDelta(f.read())
+        data = self._load(f'trace_{var}')
+        rowGids = np.asarray(self._load(f'trace_{var}_gids'))
+        if gids is None:
+            return np.asarray(t[first:last]), data[:, first:last], rowGids
+
+        row = {g: i for i, g in enumerate(rowGids)}
+        rows = [row[g] for g in gids if g in row]
+        return np.asarray(t[first:last]), data[rows, first:last], rowGids[rows]
+
+###############################################################################
+# WRITER
+###############################################################################
+
+def encodeDelta(data, level=6):
+    """
+    Lossless compression of a float32 (rows x samples) array
+
+    The float32 bit patterns are read as int32 and differenced along time,
+    and the delta bytes are grouped by significance before zlib: smooth
+    traces give small deltas whose high bytes are nearly constant. Decoding
+    restores the exact float32 values.
+    """
+
+    data = np.ascontiguousarray(data, dtype=np.float32)
+    bits = data.view(np.int32)
+    delta = np.empty_like(bits)
+    delta[:, :1] = bits[:, :1]
+    np.subtract(bits[:, 1:], bits[:, :-1], out=delta[:, 1:])  # wraps like the int32 cumsum below
+    header = np.array(data.shape, dtype=np.int64).tobytes()
+    shuffled = delta.view(np.uint8).reshape(-1, 4).T
+    return header + zlib.compress(shuffled.tobytes(), level)
+
+def decodeDelta(blob):
+    """Inverse of encodeDelta"""
+
+    shape = tuple(np.frombuffer(blob[:16], dtype=np.int64))
+    shuffled = np.frombuffer(zlib.decompress(blob[16:]), dtype=np.uint8).reshape(4, -1)
+    delta = np.ascontiguousarray(shuffled.T).view(np.int32).reshape(shape)
+    return np.cumsum(delta, axis=1, dtype=np.int32).view(np.float32)
+
+def addTraces(path, var, gids, data, t=None, compress=False, attrs=None):
+    """
+    Add one traced variable to an existing store
+
+    Args:
+        path: store directory
+        var: variable label (e.g. 'V_soma', 'V_soma_min', 'LFP')
+        gids: gid (or channel) of every row
+        data: (nRows, nSamples) array, stored as float32
+        t: own time base (default: the store's t.npy)
+        compress: lossless delta + zlib compression
+        attrs: JSON-serializable description (units, electrode positions, ...)
+    """
+
+    metaPath = os.path.join(path, 'meta.json')
+    with open(metaPath) as f:
+        meta = json.load(f)
+
+    data = np.asarray(data, dtype=np.float32)
+    if compress:
+        with open(os.path.join(path, f'trace_{var}.zdelta'), 'wb') as f:
+            f.write(encodeDelta(data))
+        meta.setdefault('traceCodecs', {})[var] = 'delta-zlib'
+    else:
+        np.save(os.path.join(path, f'trace_{var}.npy'), data)
+    np.save(os.path.join(path, f'trace_{var}_gids.npy'), np.asarray(gids, dtype=np.int32))
+    if t is not None:
+        np.save(os.path.join(path, f'trace_{var}_t.npy'), np.asarray(t, dtype=np.float64))
+        if var not in meta.setdefault('traceTimes', []):
+            meta['traceTimes'].append(var)
+    if attrs:
+        meta.setdefault('traceAttrs', {})[var] = _jsonSafe(attrs)
+
+    if var not in meta['traces']:
+        meta['traces'].append(var)
+    with open(metaPath, 'w') as f:
+        json.dump(meta, f, indent=1)
+
+def _jsonSafe(value):
+    """Tuple dict keys (e.g. connection tables) to 'pre->post' strings"""
+
+    if isinstance(value, dict):
+        return {('->'.join(map(str, k)) if isinstance(k, tuple) else str(k)): _jsonSafe(v)
+                for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonSafe(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+def writeResults(path, spkt, spkid, pops, numCells=None, t=None, traces=None, meta=None):
+    """
+    Write a result store
+
+    Args:
+        path: store directory (replaced if it exists)
+        spkt, spkid: spike times (ms) and gids, any order
+        pops: {pop: {'cellGids': [...], ...}}
+        numCells: total number of gids (default: from pops)
+        t: (nSamples,) trace time base
+        traces: {var: (gids, (nRecorded, nSamples) array)}
+        meta: extra JSON-serializable metadata (duration, dt, ...)
+
+    Returns:
+        ResultStore
+    """
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    if numCells is None:
+        numCells = max([max(p['cellGids'], default=-1) for p in pops.values()], default=-1) + 1
+
+    spkt = np.asarray(spkt, dtype=np.float64)
+    spkid = np.asarray(spkid, dtype=np.int64)
+    order = np.lexsort((spkt, spkid))  # by gid, then time
+    offsets = np.zeros(numCells + 1, dtype=np.int64)
+    np.cumsum(np.bincount(spkid, minlength=numCells)[:numCells], out=offsets[1:])
+    np.save(os.path.join(path, 'spikes_t.npy'), spkt[order])
+    np.save(os.path.join(path, 'spikes_offsets.npy'), offsets)
+
+    traces = traces or {}
+    if traces:
+        np.save(os.path.join(path, 't.npy'), np.asarray(t, dtype=np.float64))
+    for var, (gids, data) in traces.items():
+        np.save(os.path.join(path, f'trace_{var}.npy'), np.asarray(data, dtype=np.float32))
+        np.save(os.path.join(path, f'trace_{var}_gids.npy'), np.asarray(gids, dtype=np.int32))
+
+    info = {
+        'format': FORMAT,
+        'numCells': int(numCells),
+        'numSpikes': int(len(spkt)),
+        'pops': _jsonSafe(pops),
+        'traces': list(traces),
+    }
+    info.update(_jsonSafe(meta or {}))
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(info, f, indent=1)
+
+    return ResultStore(path)
+
+def _netpyneTraces(simData, reserved=('spkt', 'spkid', 't', 'stims')):
+    """{var: (gids, array)} from NetPyNE {'V_soma': {'cell_12': [...]}} entries"""
+
+    traces = {}
+    for var, cells in simData.items():
+        if var in reserved or not isinstance(cells, dict):
+            continue
+        keys = [k for k in cells if str(k).startswith('cell_')]
+        if not keys:
+            continue
+        gids = [int(str(k)[5:]) for k in keys]
+        traces[var] = (gids, np.array([np.asarray(cells[k], dtype=np.float32) for k in keys]))
+    return traces
+
+def saveResults(path, extra=None, spikeStream=None):
+    """
+    Write the gathered NetPyNE results (sim.allSimData, sim.net.allPops) to a store
+
+    Call on rank 0 after sim.gatherData(). With spikeStream (the directory of a
+    spikeio_Yao1000.SpikeWriter run, whose spikes were never gathered) the
+    spikes are read from that directory instead, and its path is kept in meta.
+    """
+
+    from netpyne import sim
+
+    allPops = getattr(sim.net, 'allPops', None) or {label: pop.__getstate__() for label, pop in sim.net.pops.items()}
+    pops = {label: {'cellGids': list(pop['cellGids']), 'tags': pop.get('tags', {})} for label, pop in allPops.items()}
+    simData = sim.allSimData
+
+    t = simData.get('t')
+    meta = {'duration': sim.cfg.duration, 'dt': sim.cfg.dt, 'recordStep': sim.cfg.recordStep,
+            'seeds': sim.cfg.seeds, 'filename': sim.cfg.filename}
+    for key in ('runaway', 'popRateBinSize', 'popRates', 'cellSpikeCounts'):
+        if key in simData:
+            meta[key] = simData[key]
+    meta.update(extra or {})
+
+    spkt, spkid = simData['spkt'], simData['spkid']
+    if spikeStream:
+        from spikeio_Yao1000 import readSpikes
+        spkt, spkid = readSpikes(spikeStream)
+        meta['spikeStream'] = os.path.abspath(spikeStream)
+
+    return writeResults(path, spkt, spkid, pops,
+                        t=None if t is None else np.asarray(t), traces=_netpyneTraces(simData), meta=meta)
+
+def convertPickle(pklPath, path=None):
+    """
+    Convert a pickled result to a store
+
+    Handles NetPyNE pickles (simData/net) and the trace-only pickles with
+    v_traces/tvec/cell_types (e.g. yao_network_20cells.pkl).
+    """
+
+    path = path or os.path.splitext(pklPath)[0] + '.results'
+    with open(pklPath, 'rb') as f:
+        data = pickle.load(f)
+
+    if 'simData' in data:
+        simData = data['simData']
+        pops = {label: {'cellGids': list(pop['cellGids']), 'tags': pop.get('tags', {})}
+                for label, pop in data['net']['pops'].items()}
+        cfg = data.get('simConfig', {})
+        t = simData.get('t')
+        meta = {k: cfg[k] for k in ('duration', 'dt', 'recordStep', 'seeds') if k in cfg}
+        return writeResults(path, simData['spkt'], simData['spkid'], pops,
+                            t=None if t is None else np.asarray(t), traces=_netpyneTraces(simData),
+                            meta=dict(meta, source=os.path.basename(pklPath)))
+
+    if 'v_traces' in data:
+        types = data['cell_types']
+        pops = {}
+        for gid, cellType in enumerate(types):
+            pops.setdefault(cellType, {'cellGids': []})['cellGids'].append(gid)
+        gids = sorted(data['v_traces'])
+        V = np.array([np.asarray(data['v_traces'][g], dtype=np.float32) for g in gids])
+        meta = {k: data[k] for k in ('duration', 'dt', 'params') if k in data}
+        return writeResults(path, [], [], pops, numCells=len(types), t=np.asarray(data['tvec']),
+                            traces={'V_soma': (gids, V)}, meta=dict(meta, source=os.path.basename(pklPath)))
+
+    raise ValueError(f"don't know how to read results from {pklPath}")
+
+def openResults(path):
+    """
+    Open a result store, converting a pickle once on first access
+
+    A .pkl is converted to <stem>.results next to it and reused while newer
+    than the pickle.
+    """
+
+    if os.path.isdir(path):
+        return ResultStore(path)
+
+    store = os.path.splitext(path)[0] + '.results'
+    if os.path.isdir(store) and os.path.getmtime(store) >= os.path.getmtime(path):
+        return ResultStore(store)
+    return convertPickle(path, store)
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Convert and inspect network result stores')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('convert', help='Convert a pickled result into a result store')
+    p.add_argument('file', help='Pickle file')
+    p.add_argument('-o', '--output', type=str, default=None, help='Store directory (default: <stem>.results)')
+
+    p = sub.add_parser('info', help='Summarize a result store')
+    p.add_argument('store', help='Store directory or pickle')
+
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        try:
+            store = convertPickle(args.file, args.output)
+        except ValueError as e:
+            print(f"✗ Conversion failed: {e}")
+            sys.exit(1)
+        before = os.path.getsize(args.file)
+        after = sum(os.path.getsize(os.path.join(store.path, f)) for f in os.listdir(store.path))
+        print(f"✓ {store}")
+        print(f"  {before / 1e6:.2f} MB pickle → {after / 1e6:.2f} MB store")
+    else:
+        store = openResults(args.store)
+        print(store)
+        counts = store.counts()
+        for pop, info in store.pops.items():
+            gids = np.asarray(info['cellGids'], dtype=np.int64)
+            print(f"  {pop:12s}: {len(gids):5d} cells, {int(counts[gids].sum()):8d} spikes")
+        for var in store.meta['traces']:
+            t, data, gids = store.traces(var)
+            print(f"  trace {var}: {data.shape[0]} cells x {data.shape[1]} samples ({t[0]:.1f}-{t[-1]:.1f} ms)")
@@ -0,0 +1,166 @@
+"""
+run_Yao1000.py
+
+Single entry point for the Yao network tools, with a fast cold start
+Only the standard library is imported here; each command's module (and
+through it numpy, scipy, NEURON or NetPyNE) is loaded when that command
+runs. Analysis commands never touch NEURON or NetPyNE, and commands that
+simulate load mod/ through the mechanism build cache (mechanisms_Yao1000.py).
+--timing prints where the startup went: interpreter start, mechanism
+build/load, the first import of each heavy package, and the command itself.
+
+Usage:
+    python run_Yao1000.py                                  # List commands
+    python run_Yao1000.py simulate --test --no-gui
+    python run_Yao1000.py spectral runs/*.results --out spectral.csv
+    python run_Yao1000.py --timing synchrony Yao1000.results
+    python run_Yao1000.py mechanisms --clean
+"""
+
+import os
+import sys
+import time
+import runpy
+import builtins
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+
+# Command: (script, help)
+COMMANDS = {
+    'simulate': ('init_Yao1000.py', 'Run the network (NEURON/NetPyNE)'),
+    'calibrate': ('calibrate_Yao1000.py', 'Calibrate synaptic weights to target rates'),
+    'sweeps': ('sweeps_HL23.py', 'Batched single-cell current steps'),
+    'optimize': ('optimize_HL23PYR.py', 'Fit HL23PYR channel densities'),
+    'dendrec': ('dendrec_HL23PYR.py', 'Bulk dendritic recording'),
+    'ratetables': ('ratetables_HL23.py', 'Rate-table accuracy and speed benchmark'),
+    'mechanisms': ('mechanisms_Yao1000.py', 'Build mod/ into the mechanism cache'),
+    'benchmark': ('benchmark_Yao1000.py', 'Cell and network benchmarks, regression check'),
+    'profile': ('instrument_Yao1000.py', 'Print phase profiles of init-script runs'),
+    'test': ('test_Yao1000.py', 'Smoke test, golden-output regression check'),
+    'convergence': ('convergence_Yao1000.py', 'dt and segment-length convergence study'),
+    'hybrid': ('hybrid_Yao1000.py', 'Mixed detailed / reduced / point-neuron network'),
+    'fitizhi': ('fitIzhi_HL23.py', 'Fit Izhikevich point neurons to the detailed cells'),
+    'izhinet': ('izhinet_Yao1000.py', 'Batched NumPy simulator of the Izhikevich network'),
+    'features': ('features_HL23.py', 'Electrophysiology features of sweep stores'),
+    'analyze': ('analysis_Yao1000.py', 'Rates, raster and report of one run'),
+    'results': ('results_Yao1000.py', 'Inspect or convert result stores'),
+    'spikes': ('spikeio_Yao1000.py', 'Merge streamed per-rank spike files'),
+    'spectral': ('spectral_Yao1000.py', 'Multitaper rate spectra of many runs'),
+    'synchrony': ('synchrony_Yao1000.py', 'Correlations, synchrony and E/I balance'),
+}
+
+# Packages whose first import is reported separately
+HEAVY = ('numpy', 'scipy', 'matplotlib', 'neuron', 'netpyne', 'mpi4py')
+
+###############################################################################
+# STARTUP TIMING
+###############################################################################
+
+def processAge():
+    """Seconds since this process started (Linux /proc), or None"""
+
+    try:
+        with open('/proc/self/stat') as f:
+            startTicks = float(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - startTicks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class ImportTimer:
+    """Accumulates the time of outermost imports of heavy packages, per package"""
+
+    def __init__(self, packages=HEAVY):
+        self.packages = packages
+        self.times = {}
+        self._depth = 0
+        self._import = builtins.__import__
+
+    def __enter__(self):
+        builtins.__import__ = self._timedImport
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._import
+
+    def _timedImport(self, name, *args, **kwargs):
+        top = name.partition('.')[0]
+        if self._depth or top not in self.packages or (name in sys.modules and top in self.times):
+            return self._import(name, *args, **kwargs)
+
+        self._depth += 1
+        t0 = time.perf_counter()
+        try:
+            return self._import(name, *args, **kwargs)
+        finally:
+            self._depth -= 1
+            self.times[top] = self.times.get(top, 0.0) + time.perf_counter() - t0
+
+def printTiming(phases, details):
+    """Startup breakdown table (stderr, so command output stays clean)"""
+
+    out = sys.stderr
+    print("=" * 80, file=out)
+    print("STARTUP TIME BREAKDOWN", file=out)
+    print("=" * 80, file=out)
+    for label, seconds in phases[:-1]:
+        print(f"  {label:<34} {seconds:8.3f} s", file=out)
+        if label == 'command':
+            for name, t in sorted(details.items(), key=lambda item: -item[1]):
+                print(f"    {name:<32} {t:8.3f} s", file=out)
+    label, seconds = phases[-1]
+    print("-" * 80, file=out)
+    print(f"  {label:<34} {seconds:8.3f} s", file=out)
+    print("=" * 80, file=out)
+
+###############################################################################
+# MAIN
+###############################################################################
+
+def main(argv):
+
+    timing = '--timing' in argv[:1]
+    if timing:
+        argv = argv[1:]
+    t0 = time.perf_counter()
+    age = processAge()
+
+    if not argv or argv[0] in ('-h', '--help') or argv[0] not in COMMANDS:
+        if argv and argv[0] not in ('-h', '--help'):
+            print(f"Unknown command: {argv[0]}\n")
+        print("Usage: python run_Yao1000.py [--timing] <command> [args...]\n")
+        for name, (script, text) in COMMANDS.items():
+            print(f"  {name:<12} {text:<48} ({script})")
+        return 0 if not argv or argv[0] in ('-h', '--help') else 2
+
+    script, _ = COMMANDS[argv[0]]
+    path = os.path.join(BASEDIR, script)
+    sys.argv = [path] + argv[1:]
+    sys.path.insert(0, BASEDIR)
+
+    status = 0
+    with ImportTimer() as imports:
+        tCommand = time.perf_counter()
+        try:
+            runpy.run_path(path, run_name='__main__')
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        tEnd = time.perf_counter()
+
+    if timing:
+        phases = []
+        if age is not None:
+            phases.append(('python interpreter start', age))
+        phases.append(('dispatch', tCommand - t0))
+        phases.append(('command', tEnd - tCommand))
+        phases.append(('total', (age or 0.0) + tEnd - t0))
+        details = {'import ' + pkg: t for pkg, t in imports.times.items()}
+        mechanisms = sys.modules.get('mechanisms_Yao1000')
+        for step, t in (mechanisms.timings.items() if mechanisms else ()):
+            details[f'mechanisms ({step})'] = t
+        printTiming(phases, details)
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
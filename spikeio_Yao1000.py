@@ -0,0 +1,281 @@
+"""
+spikeio_Yao1000.py
+
+Chunked streaming spike output for Yao 1000-cell network simulations
+SpikeWriter is a runSimMonitored() consumer (see monitor_Yao1000.py): every
+rank buffers its own spikes and appends them to its own binary file every
+flushInterval ms of simulated time, then empties the NEURON spike vectors.
+Nothing is gathered to rank 0, memory is bounded by one flush interval, and a
+crashed run keeps everything flushed so far.
+
+Layout of a spike directory:
+    rank_0000.bin      (t float64, gid int32) records of rank 0, in flush order
+    rank_0000.chunks   one JSON line per flush: offset, count, tmin, tmax
+    index.json         written at the end: ranks, chunks, totals, run metadata
+
+Usage (inside an init script, after sim.setupRecording()):
+    from spikeio_Yao1000 import SpikeWriter
+    writer = SpikeWriter('Yao1000.spikes', flushInterval=500.0)
+    runSimMonitored([writer])
+
+    python spikeio_Yao1000.py Yao1000.spikes                  # Summary
+    python spikeio_Yao1000.py Yao1000.spikes --recover        # Rebuild index.json after a crash
+"""
+
+import os
+import json
+import glob
+import argparse
+import numpy as np
+
+from monitor_Yao1000 import SpikeConsumer
+
+###############################################################################
+# FORMAT
+###############################################################################
+
+FORMAT = 'spikes-v1'
+SPIKE_DTYPE = np.dtype([('t', '<f8'), ('gid', '<i4')])
+FLUSH_INTERVAL = 500.0  # ms of simulated time between flushes
+
+def rankPath(path, rank, ext):
+    return os.path.join(path, f'rank_{rank:04d}.{ext}')
+
+def clearSpikeDir(path):
+    """Remove the index and rank files of an earlier run (other files are left alone)"""
+
+    stale = glob.glob(os.path.join(path, 'rank_*.bin')) + glob.glob(os.path.join(path, 'rank_*.chunks'))
+    stale += glob.glob(os.path.join(path, 'index.json'))
+    for name in stale:
+        os.remove(name)
+    return len(stale)
+
+###############################################################################
+# WRITER
+###############################################################################
+
+class SpikeWriter(SpikeConsumer):
+    """
+    Per-rank streaming spike sink
+
+    Args:
+        path: output directory (created if needed; rank 0 removes the index and
+            rank files of any earlier run in it before writing)
+        flushInterval: simulated time between flushes (ms)
+        fsync: force each flush to disk (safer, slower on network filesystems)
+    """
+
+    drainSpikes = True
+
+    def __init__(self, path, flushInterval=FLUSH_INTERVAL, fsync=False):
+        self.path = path
+        self.flushInterval = flushInterval
+        self.fsync = fsync
+
+    def setup(self, sim):
+        self.sim = sim
+        self.rank = sim.rank
+        if self.rank == 0:
+            os.makedirs(self.path, exist_ok=True)
+            clearSpikeDir(self.path)
+        sim.pc.barrier()
+
+        self.binFile = open(rankPath(self.path, self.rank, 'bin'), 'wb')
+        self.chunkFile = open(rankPath(self.path, self.rank, 'chunks'), 'w')
+        self.buffer = []
+        self.lastFlush = 0.0
+        self.offset = 0
+        self.chunks = []
+
+    def update(self, t, spkt, spkid):
+        if len(spkt):
+            records = np.empty(len(spkt), dtype=SPIKE_DTYPE)
+            records['t'] = spkt
+            records['gid'] = spkid
+            self.buffer.append(records)
+        if t - self.lastFlush >= self.flushInterval:
+            self.flush(t)
+        return False
+
+    def flush(self, t):
+        """Append the buffered spikes and log the chunk"""
+
+        records = np.concatenate(self.buffer) if self.buffer else np.empty(0, dtype=SPIKE_DTYPE)
+        self.buffer = []
+
+        if len(records):
+            records.tofile(self.binFile)
+            chunk = {'offset': self.offset, 'count': len(records),
+                     'tmin': float(records['t'].min()), 'tmax': float(records['t'].max()), 'tflush': t}
+            self.offset += len(records)
+            self.chunks.append(chunk)
+            self.chunkFile.write(json.dumps(chunk) + '\n')
+
+        self.binFile.flush()
+        self.chunkFile.flush()
+        if self.fsync:
+            os.fsync(self.binFile.fileno())
+            os.fsync(self.chunkFile.fileno())
+        self.lastFlush = t
+
+    def finalize(self, sim):
+        from neuron import h
+
+        self.flush(h.t)
+        self.binFile.close()
+        self.chunkFile.close()
+
+        # Only the small chunk tables travel to rank 0
+        allChunks = sim.pc.py_gather(self.chunks, 0)
+        if self.rank == 0:
+            writeIndex(self.path, allChunks, stopTime=h.t, duration=sim.cfg.duration)
+
+def writeIndex(path, rankChunks, **meta):
+    """Write index.json from the chunk tables of every rank"""
+
+    ranks = []
+    for rank, chunks in enumerate(rankChunks):
+        ranks.append({
+            'rank': rank,
+            'file': os.path.basename(rankPath(path, rank, 'bin')),
+            'count': int(sum(c['count'] for c in chunks)),
+            'chunks': chunks,
+        })
+
+    index = {
+        'format': FORMAT,
+        'dtype': [list(field) for field in SPIKE_DTYPE.descr],
+        'numSpikes': int(sum(r['count'] for r in ranks)),
+        'ranks': ranks,
+    }
+    index.update(meta)
+
+    with open(os.path.join(path, 'index.json'), 'w') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+def recoverIndex(path):
+    """Rebuild index.json from the per-rank chunk logs (e.g. after a crash)"""
+
+    rankChunks = []
+    for rank in range(len(glob.glob(os.path.join(path, 'rank_*.bin')))):
+        chunks = []
+        size = os.path.getsize(rankPath(path, rank, 'bin')) // SPIKE_DTYPE.itemsize
+        logPath = rankPath(path, rank, 'chunks')
+        if os.path.exists(logPath):
+            with open(logPath) as f:
+                for line in f:
+                    try:
+                        chunk = json.loads(line)
+                    except ValueError:
+                        break  # torn last line
+                    if chunk['offset'] + chunk['count'] > size:
+                        break  # data of this chunk not fully on disk
+                    chunks.append(chunk)
+        rankChunks.append(chunks)
+
+    stopTime = max((c['tflush'] for chunks in rankChunks for c in chunks), default=0.0)
+    return writeIndex(path, rankChunks, stopTime=stopTime, recovered=True)
+
+###############################################################################
+# READER
+###############################################################################
+
+class SpikeStore:
+    """
+    Read access to a spike directory
+
+    Each rank file is memory-mapped; chunks outside a requested time range are
+    skipped using their tmin/tmax.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        indexPath = os.path.join(path, 'index.json')
+        if os.path.exists(indexPath):
+            with open(indexPath) as f:
+                self.index = json.load(f)
+        else:
+            self.index = recoverIndex(path)
+        self.numSpikes = self.index['numSpikes']
+
+    def _records(self, rank):
+        info = self.index['ranks'][rank]
+        if not info['count']:
+            return np.empty(0, dtype=SPIKE_DTYPE)
+        return np.memmap(os.path.join(self.path, info['file']), dtype=SPIKE_DTYPE, mode='r', shape=(info['count'],))
+
+    def iterChunks(self, tstart=None, tstop=None):
+        """Yield (t, gid) arrays chunk by chunk (bounded memory)"""
+
+        for info in self.index['ranks']:
+            records = self._records(info['rank'])
+            for chunk in info['chunks']:
+                if tstart is not None and chunk['tmax'] < tstart:
+                    continue
+                if tstop is not None and chunk['tmin'] > tstop:
+                    continue
+                block = records[chunk['offset']:chunk['offset'] + chunk['count']]
+                keep = np.ones(len(block), dtype=bool)
+                if tstart is not None:
+                    keep &= block['t'] >= tstart
+                if tstop is not None:
+                    keep &= block['t'] <= tstop
+                yield np.asarray(block['t'][keep]), np.asarray(block['gid'][keep])
+
+    def read(self, tstart=None, tstop=None, sort=True):
+        """All spikes in [tstart, tstop] as (t, gid) arrays, time-sorted by default"""
+
+        parts = list(self.iterChunks(tstart, tstop))
+        t = np.concatenate([p[0] for p in parts]) if parts else np.empty(0)
+        gid = np.concatenate([p[1] for p in parts]) if parts else np.empty(0, dtype=np.int32)
+        if sort:
+            order = np.argsort(t, kind='stable')
+            t, gid = t[order], gid[order]
+        return t, gid
+
+    def counts(self, numCells=None, tstart=None, tstop=None):
+        """Spike count per gid, streamed chunk by chunk"""
+
+        total = np.zeros(numCells or 0, dtype=np.int64)
+        for _, gid in self.iterChunks(tstart, tstop):
+            c = np.bincount(gid, minlength=len(total))
+            if len(c) > len(total):
+                total = np.pad(total, (0, len(c) - len(total)))
+            total += c
+        return total
+
+def readSpikes(path, tstart=None, tstop=None):
+    """(t, gid) of a spike directory"""
+
+    return SpikeStore(path).read(tstart, tstop)
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Inspect a streamed spike directory')
+    parser.add_argument('path', type=str, help='Spike directory')
+    parser.add_argument('--recover', action='store_true', help='Rebuild index.json from the chunk logs')
+    args = parser.parse_args()
+
+    if args.recover:
+        recoverIndex(args.path)
+
+    store = SpikeStore(args.path)
+
+    print("=" * 80)
+    print(f"SPIKE STORE: {args.path}")
+    print("=" * 80)
+    print(f"Spikes: {store.numSpikes}")
+    print(f"Ranks: {len(store.index['ranks'])}")
+    print(f"Stop time: {store.index.get('stopTime', float('nan')):.1f} ms"
+          + (" (recovered index)" if store.index.get('recovered') else ""))
+    for info in store.index['ranks']:
+        print(f"  rank {info['rank']:4d}: {info['count']:10d} spikes in {len(info['chunks'])} chunks")
+    counts = store.counts()
+    if len(counts):
+        print(f"Active cells: {np.count_nonzero(counts)} of {len(counts)} gids seen")
+    print("=" * 80)
@@ -0,0 +1,232 @@
+"""
+spikestats_Yao1000.py
+
+CSR spike index and vectorized spike analytics for Yao network simulations
+Spikes are sorted once by gid (then time) into a CSR layout: the times of
+gid g are t[offsets[g]:offsets[g+1]]. Per-cell counts, per-population rates,
+ISI statistics and binned histograms are then derived with bincount /
+cumsum over the whole array instead of per-gid masks, so a million spikes
+take milliseconds. A result store (results_Yao1000.py) is already in this
+layout and is wrapped without copying.
+
+Usage:
+    from spikestats_Yao1000 import SpikeIndex
+    index = SpikeIndex.fromSpikes(spkt, spkid, numCells)      # or SpikeIndex.fromStore(store)
+    counts = index.counts(500, 4500)                           # (numCells,)
+    rates = index.popRates({'HL23PYR': gids, ...}, 500, 4500)  # {pop: (mean Hz, per-cell Hz)}
+    meanIsi, cv = index.isiStats(500, 4500)
+    edges, hist = index.histogram(50.0, 500, 4500, groups)     # (nGroups, nBins) counts
+"""
+
+import numpy as np
+
+###############################################################################
+# TARGET FIRING RATES (from Yao et al. 2022)
+###############################################################################
+
+# Published firing rates from in vivo recordings
+TARGET_RATES = {
+    'HL23PYR': 1.5,   # Hz (pyramidal neurons, sparse firing)
+    'HL23SST': 5.0,   # Hz (SST interneurons, moderate activity)
+    'HL23PV': 10.0,   # Hz (PV interneurons, high frequency)
+    'HL23VIP': 8.0,   # Hz (VIP interneurons, moderate-high)
+}
+
+###############################################################################
+# SPIKE INDEX
+###############################################################################
+
+class SpikeIndex:
+    """
+    Spike times grouped by gid (CSR)
+
+    Args:
+        times: (nSpikes,) spike times grouped by gid, time-sorted within a gid
+        offsets: (numCells + 1,) CSR offsets
+    """
+
+    def __init__(self, times, offsets):
+        self.times = times
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.numCells = len(self.offsets) - 1
+        self._gids = None
+
+    @classmethod
+    def fromSpikes(cls, spkt, spkid, numCells=None):
+        """Build the index from (t, gid) arrays in any order"""
+
+        spkt = np.asarray(spkt, dtype=np.float64)
+        spkid = np.asarray(spkid, dtype=np.int64)
+        if numCells is None:
+            numCells = int(spkid.max()) + 1 if len(spkid) else 0
+
+        order = np.lexsort((spkt, spkid))
+        offsets = np.zeros(numCells + 1, dtype=np.int64)
+        np.cumsum(np.bincount(spkid, minlength=numCells)[:numCells], out=offsets[1:])
+        return cls(spkt[order][:offsets[-1]], offsets)
+
+    @classmethod
+    def fromStore(cls, store):
+        """Wrap the memory-mapped spikes of a ResultStore (no copy)"""
+
+        return cls(store._load('spikes_t'), store.offsets)
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def __repr__(self):
+        return f"SpikeIndex({len(self)} spikes, {self.numCells} cells)"
+
+    @property
+    def gids(self):
+        """(nSpikes,) gid of every spike, in index order"""
+
+        if self._gids is None:
+            self._gids = np.repeat(np.arange(self.numCells), np.diff(self.offsets))
+        return self._gids
+
+    def cellTimes(self, gid):
+        return np.asarray(self.times[self.offsets[gid]:self.offsets[gid + 1]])
+
+    def _window(self, tstart, tstop):
+        """Boolean mask of the spikes within [tstart, tstop] (None when unbounded)"""
+
+        if tstart is None and tstop is None:
+            return None
+        t = np.asarray(self.times)
+        keep = np.ones(len(t), dtype=bool)
+        if tstart is not None:
+            keep &= t >= tstart
+        if tstop is not None:
+            keep &= t <= tstop
+        return keep
+
+    ###########################################################################
+    # COUNTS AND RATES
+    ###########################################################################
+
+    def counts(self, tstart=None, tstop=None):
+        """(numCells,) spike count per gid within [tstart, tstop]"""
+
+        keep = self._window(tstart, tstop)
+        if keep is None:
+            return np.diff(self.offsets)
+        cum = np.concatenate([[0], np.cumsum(keep)])
+        return cum[self.offsets[1:]] - cum[self.offsets[:-1]]
+
+    def rates(self, tstart, tstop):
+        """(numCells,) firing rate (Hz) per gid over [tstart, tstop]"""
+
+        return self.counts(tstart, tstop) / ((tstop - tstart) / 1000.0)
+
+    def popRates(self, groups, tstart, tstop):
+        """
+        Mean and per-cell rates of groups of cells
+
+        Args:
+            groups: {label: gids}, e.g. {pop: pop.cellGids}
+
+        Returns:
+            {label: (mean rate in Hz, (nCells,) per-cell rates)}
+        """
+
+        rates = self.rates(tstart, tstop)
+        out = {}
+        for label, gids in groups.items():
+            cellRates = rates[np.asarray(gids, dtype=np.int64)]
+            out[label] = (float(cellRates.mean()) if len(cellRates) else 0.0, cellRates)
+        return out
+
+    ###########################################################################
+    # SPIKES, ISIS, HISTOGRAMS
+    ###########################################################################
+
+    def spikes(self, gids=None, tstart=None, tstop=None):
+        """(t, gid) of a set of cells within [tstart, tstop], sorted by time"""
+
+        if gids is None:
+            t, gid = np.asarray(self.times), self.gids
+        else:
+            gids = np.asarray(gids, dtype=np.int64)
+            lengths = self.offsets[gids + 1] - self.offsets[gids]
+            # Flat positions of all rows of the selected gids
+            starts = np.repeat(self.offsets[gids] - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+            idx = starts + np.arange(lengths.sum())
+            t, gid = np.asarray(self.times)[idx], np.repeat(gids, lengths)
+
+        keep = np.ones(len(t), dtype=bool)
+        if tstart is not None:
+            keep &= t >= tstart
+        if tstop is not None:
+            keep &= t <= tstop
+        t, gid = t[keep], gid[keep]
+        order = np.argsort(t, kind='stable')
+        return t[order], gid[order]
+
+    def isis(self, tstart=None, tstop=None):
+        """
+        Inter-spike intervals between consecutive spikes of the same cell, both in the window
+
+        Returns:
+            isi: (nIsi,) intervals (ms)
+            gid: (nIsi,) owning cell
+        """
+
+        t = np.asarray(self.times)
+        sameCell = self.gids[1:] == self.gids[:-1]
+        keep = self._window(tstart, tstop)
+        if keep is not None:
+            sameCell &= keep[1:] & keep[:-1]
+        return np.diff(t)[sameCell], self.gids[1:][sameCell]
+
+    def isiStats(self, tstart=None, tstop=None):
+        """
+        Per-cell mean ISI (ms) and coefficient of variation, NaN with fewer than 2 ISIs
+
+        Returns:
+            meanIsi, cv: (numCells,) arrays
+        """
+
+        isi, gid = self.isis(tstart, tstop)
+        n = np.bincount(gid, minlength=self.numCells).astype(float)
+        s = np.bincount(gid, weights=isi, minlength=self.numCells)
+        s2 = np.bincount(gid, weights=isi ** 2, minlength=self.numCells)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = s / n
+            std = np.sqrt(np.maximum(s2 / n - mean ** 2, 0.0))
+            cv = std / mean
+        mean[n < 2] = np.nan
+        cv[n < 2] = np.nan
+        return mean, cv
+
+    def histogram(self, binSize, tstart, tstop, groups=None):
+        """
+        Spike counts in time bins [tstart, tstart + binSize, ...) up to tstop
+
+        Args:
+            groups: {label: gids}; one row per group (default: one row, all cells)
+
+        Returns:
+            edges: (nBins + 1,) bin edges (ms)
+            hist: (nGroups, nBins) counts
+        """
+
+        edges = np.arange(tstart, tstop, binSize)
+        nBins = max(len(edges) - 1, 0)
+
+        groupOf = np.zeros(self.numCells, dtype=np.int64)
+        nGroups = 1
+        if groups is not None:
+            groupOf[:] = -1
+            for i, gids in enumerate(groups.values()):
+                groupOf[np.asarray(gids, dtype=np.int64)] = i
+            nGroups = len(groups)
+
+        t = np.asarray(self.times)
+        bins = np.floor((t - tstart) / binSize).astype(np.int64)
+        if nBins:
+            bins[t == edges[-1]] = nBins - 1  # last bin closed on the right, as np.histogram
+        group = groupOf[self.gids]
+        keep = (bins >= 0) & (bins < nBins) & (group >= 0)
+        hist = np.bincount(group[keep] * nBins + bins[keep], minlength=nGroups * nBins)
+        return edges, hist.reshape(nGroups, nBins)
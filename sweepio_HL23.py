@@ -0,0 +1,481 @@
+"""
+sweepio_HL23.py
+
+Sweep I/O layer for simulated and experimental single-cell recordings
+Large sweep files (e.g. data/sweep_45_sim.json) are converted once, with a
+streaming JSON reader that never builds Python lists, into a chunked binary
+store: one float64 time base plus float32 (sweeps x time) voltage chunks.
+Sweeps are then read lazily through memory maps.
+
+Store layout (<name>.sweeps/):
+    meta.json       names, amplitudes, protocol, chunk layout
+    t.npy           (nSamples,) float64 time base (ms)
+    V_0000.npy ...  (chunkSize, nSamples) float32 voltage chunks (mV)
+
+Usage:
+    python sweepio_HL23.py convert data/sweep_45_sim.json        # -> data/sweep_45_sim.sweeps
+    python sweepio_HL23.py convert sweep_*_sim.json -o sims.sweeps
+    python sweepio_HL23.py info sims.sweeps
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import argparse
+import numpy as np
+
+FORMAT = 'sweeps-v1'
+CHUNK_SIZE = 64           # sweeps per chunk file
+READ_SIZE = 1 << 20       # bytes read per JSON streaming step
+
+# Keys whose numeric arrays are taken as voltage traces / the time base
+TRACE_KEYS = ('V_soma', 'V', 'v', 'voltage')
+TIME_KEYS = ('t', 'time')
+
+###############################################################################
+# SWEEP STORE
+###############################################################################
+
+class SweepStore:
+    """
+    Lazy, memory-mapped access to a converted sweep store
+
+    store.t              time base (ms)
+    store.names          sweep names
+    store.amps           step amplitudes (nA) or NaN
+    store[i], store[name]  one sweep (float32 memmap view)
+    store.sweeps(idx)    stacked (len(idx), nSamples) array
+    store.iterChunks()   (indices, block) pairs, one chunk file at a time
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} sweep store")
+
+        self.names = self.meta['names']
+        self.amps = np.array([np.nan if a is None else a for a in self.meta['amps']], dtype=float)
+        self.attrs = self.meta.get('attrs', {})
+        self.chunkSize = self.meta['chunkSize']
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._t = None
+        self._chunks = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"SweepStore('{self.path}', {len(self)} sweeps x {self.meta['nSamples']} samples)"
+
+    @property
+    def t(self):
+        if self._t is None:
+            self._t = np.load(os.path.join(self.path, 't.npy'), mmap_mode='r')
+        return self._t
+
+    def _chunk(self, c):
+        if c not in self._chunks:
+            self._chunks[c] = np.load(os.path.join(self.path, self.meta['chunks'][c]), mmap_mode='r')
+        return self._chunks[c]
+
+    def __getitem__(self, key):
+        i = self._index[key] if isinstance(key, str) else int(key)
+        if i < 0:
+            i += len(self)
+        c, r = divmod(i, self.chunkSize)
+        return self._chunk(c)[r]
+
+    def sweeps(self, indices=None, dtype=np.float32):
+        """Stack sweeps into one (n, nSamples) array, reading only the chunks needed"""
+
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices)
+        out = np.empty((len(indices), self.meta['nSamples']), dtype=dtype)
+        chunkIdx, rowIdx = np.divmod(indices, self.chunkSize)
+        for c in np.unique(chunkIdx):
+            sel = chunkIdx == c
+            out[sel] = self._chunk(c)[rowIdx[sel]]
+        return out
+
+    def iterChunks(self):
+        """Yield (sweep indices, (n, nSamples) float32 block) for each chunk file"""
+
+        for c in range(len(self.meta['chunks'])):
+            block = self._chunk(c)
+            start = c * self.chunkSize
+            yield np.arange(start, start + len(block)), block
+
+###############################################################################
+# WRITING
+###############################################################################
+
+class SweepWriter:
+    """
+    Incremental writer: sweeps are appended and flushed in chunk-sized files,
+    so converting or simulating many sweeps never holds them all in memory
+    """
+
+    def __init__(self, path, t, chunkSize=CHUNK_SIZE, attrs=None, sources=None):
+        self.path = path
+        self.t = np.asarray(t, dtype=np.float64)
+        self.chunkSize = chunkSize
+        self.attrs = attrs or {}
+        self.sources = sources or []
+        self.names = []
+        self.amps = []
+        self.chunks = []
+        self._pending = []
+
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        np.save(os.path.join(path, 't.npy'), self.t)
+
+    def append(self, V, names=None, amps=None):
+        """Append one sweep (1-D) or a block of sweeps (2-D)"""
+
+        V = np.atleast_2d(np.asarray(V, dtype=np.float32))
+        if V.shape[1] != len(self.t):
+            raise ValueError(f"sweep length {V.shape[1]} != time base length {len(self.t)}")
+
+        n0 = len(self.names)
+        names = names if names is not None else [f'sweep_{n0 + i}' for i in range(len(V))]
+        amps = amps if amps is not None else [None] * len(V)
+        self.names.extend(str(n) for n in names)
+        self.amps.extend(None if a is None or not np.isfinite(a) else float(a) for a in amps)
+
+        self._pending.extend(V)
+        while len(self._pending) >= self.chunkSize:
+            self._flush(self._pending[:self.chunkSize])
+            self._pending = self._pending[self.chunkSize:]
+
+    def _flush(self, rows):
+        name = f'V_{len(self.chunks):04d}.npy'
+        np.save(os.path.join(self.path, name), np.asarray(rows, dtype=np.float32))
+        self.chunks.append(name)
+
+    def close(self):
+        if self._pending:
+            self._flush(self._pending)
+            self._pending = []
+
+        meta = {
+            'format': FORMAT,
+            'nSamples': len(self.t),
+            'dt': float(self.t[1] - self.t[0]) if len(self.t) > 1 else None,
+            'chunkSize': self.chunkSize,
+            'chunks': self.chunks,
+            'names': self.names,
+            'amps': self.amps,
+            'attrs': self.attrs,
+            'sources': self.sources,
+        }
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=1)
+
+        return SweepStore(self.path)
+
+def writeSweeps(path, t, V, names=None, amps=None, attrs=None):
+    """Write a (sweeps x time) array as a sweep store and return it opened"""
+
+    writer = SweepWriter(path, t, attrs=attrs)
+    writer.append(V, names, amps)
+    return writer.close()
+
+###############################################################################
+# STREAMING JSON READER
+###############################################################################
+
+_WS = b' \t\r\n'
+_STRING_END = re.compile(rb'(?<!\\)(?:\\\\)*"')
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+
+class _JsonStream:
+    """
+    Minimal pull parser over a file read in fixed-size blocks
+
+    Numeric arrays are parsed in bulk with np.fromstring and handed to a
+    sink block by block, so a multi-GB array never becomes a Python list.
+    NaN/Infinity tokens and several concatenated top-level documents (as left
+    by appending runs to one file) are accepted.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = b''
+        self.pos = 0
+
+    def _fill(self):
+        data = self.f.read(READ_SIZE)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            if not self._fill():
+                return b''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at byte {self.f.tell() - len(self.buf) + self.pos}, "
+                             f"got {self.peek()!r} (truncated file?)")
+        self.pos += 1
+
+    def string(self):
+        self.expect(b'"')
+        while True:
+            m = _STRING_END.search(self.buf, self.pos)
+            if m:
+                raw = self.buf[self.pos:m.end() - 1]
+                self.pos = m.end()
+                return json.loads(b'"' + raw + b'"')
+            if not self._fill():
+                raise ValueError("unterminated string (truncated file?)")
+
+    def scalar(self):
+        self.peek()
+        while True:
+            m = _SCALAR_END.search(self.buf, self.pos)
+            if m or not self._fill():
+                end = m.start() if m else len(self.buf)
+                token = self.buf[self.pos:end]
+                self.pos = end
+                return json.loads(token)
+
+    def numbers(self, sink):
+        """Stream the body of a numeric array (after '[') into sink(block) or skip it"""
+
+        while True:
+            end = self.buf.find(b']', self.pos)
+            cut = end if end >= 0 else self.buf.rfind(b',', self.pos)
+            if cut > self.pos and sink is not None:
+                sink(_parseNumbers(self.buf[self.pos:cut]))
+            if end >= 0:
+                self.pos = end + 1
+                return
+            if cut >= 0:
+                self.pos = cut + 1
+            if not self._fill():
+                raise ValueError("unterminated array (truncated file?)")
+
+def _parseNumbers(text):
+    try:
+        return np.fromstring(text, dtype=np.float64, sep=',')
+    except ValueError:
+        # null entries: slow path, only hit by unusual files
+        return np.array([np.nan if x is None else x for x in json.loads(b'[' + text.strip(b', \t\r\n') + b']')],
+                        dtype=np.float64)
+
+def _walk(stream, path, onArray):
+    """Recursively walk one JSON value; onArray(path) returns a sink or None"""
+
+    c = stream.peek()
+    if c == b'{':
+        stream.pos += 1
+        if stream.peek() == b'}':
+            stream.pos += 1
+            return
+        while True:
+            key = stream.string()
+            stream.expect(b':')
+            _walk(stream, path + (key,), onArray)
+            if stream.peek() == b',':
+                stream.pos += 1
+                continue
+            stream.expect(b'}')
+            return
+    elif c == b'[':
+        stream.pos += 1
+        first = stream.peek()
+        if first == b']':
+            stream.pos += 1
+            return
+        if first in (b'[', b'{', b'"', b't', b'f', b'n'):
+            i = 0
+            while True:
+                _walk(stream, path + (i,), onArray)
+                i += 1
+                if stream.peek() == b',':
+                    stream.pos += 1
+                    continue
+                stream.expect(b']')
+                return
+        stream.numbers(onArray(path))
+    elif c == b'"':
+        stream.string()
+    elif c:
+        stream.scalar()
+    else:
+        raise ValueError("unexpected end of file (truncated file?)")
+
+class _TempArray:
+    """Sink appending float64 blocks to a scratch file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, 'wb')
+        self.n = 0
+
+    def __call__(self, block):
+        block.tofile(self.f)
+        self.n += len(block)
+
+    def load(self):
+        self.f.close()
+        return np.memmap(self.path, dtype=np.float64, mode='r', shape=(self.n,)) if self.n else np.empty(0)
+
+def _isTrace(path):
+    keys = [k for k in path if isinstance(k, str)]
+    return any(k in TRACE_KEYS for k in keys) and keys[-1] not in TIME_KEYS
+
+def _isTime(path):
+    return isinstance(path[-1], str) and path[-1] in TIME_KEYS
+
+###############################################################################
+# CONVERSION
+###############################################################################
+
+def convertJson(sources, path, dt=None, attrs=None):
+    """
+    Convert one or more JSON sweep files into a sweep store
+
+    Every numeric array under a trace key (V_soma, V, ...) becomes one sweep,
+    named '<file stem>/<key path>'; the array under 't'/'time' is the time
+    base. Sweeps shorter than the time base are NaN-padded.
+
+    Args:
+        sources: JSON file path or list of paths
+        path: output store directory
+        dt: sampling interval (ms) if a file has no time array
+
+    Returns:
+        SweepStore
+    """
+
+    sources = [sources] if isinstance(sources, str) else list(sources)
+    scratch = path + '.tmp'
+    os.makedirs(scratch, exist_ok=True)
+
+    found = []   # (name, _TempArray)
+    times = []
+    try:
+        for src in sources:
+            stem = os.path.splitext(os.path.basename(src))[0]
+
+            def onArray(p):
+                if _isTime(p) and not _isTrace(p):
+                    sink = _TempArray(os.path.join(scratch, f'{len(times)}.t'))
+                    times.append(sink)
+                    return sink
+                if _isTrace(p):
+                    name = stem + '/' + '/'.join(str(k) for k in p if k not in ('simData',))
+                    sink = _TempArray(os.path.join(scratch, f'{len(found)}.v'))
+                    found.append((name, sink))
+                    return sink
+                return None
+
+            with open(src, 'rb') as f:
+                stream = _JsonStream(f)
+                doc = 0
+                while stream.peek():
+                    _walk(stream, (), onArray)
+                    doc += 1
+                    stem = os.path.splitext(os.path.basename(src))[0] + f'#{doc}'
+
+        if not found:
+            raise ValueError(f"no voltage traces ({', '.join(TRACE_KEYS)}) found in {sources}")
+
+        traces = [(name, sink.load()) for name, sink in found]
+        nSamples = max(len(v) for _, v in traces)
+        if times:
+            t = np.asarray(max((s.load() for s in times), key=len))
+        elif dt is not None:
+            t = np.arange(nSamples) * dt
+        else:
+            raise ValueError("no time array in file; pass dt")
+        if len(t) < nSamples:
+            raise ValueError(f"time base ({len(t)}) shorter than longest sweep ({nSamples})")
+
+        writer = SweepWriter(path, t, attrs=attrs, sources=[os.path.abspath(s) for s in sources])
+        for name, v in traces:
+            row = np.full(len(t), np.nan, dtype=np.float32)
+            row[:len(v)] = v
+            writer.append(row, [name])
+        return writer.close()
+    finally:
+        for _, sink in found:
+            sink.f.close()
+        for sink in times:
+            sink.f.close()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def openSweeps(path, **kwargs):
+    """
+    Open sweeps through the store, converting once on first access
+
+    Accepts a store directory, a JSON sweep file (converted to <stem>.sweeps
+    next to it and reused while newer than the source) or an .npz with
+    t, V[, amps] arrays.
+    """
+
+    if os.path.isdir(path):
+        return SweepStore(path)
+
+    stem, ext = os.path.splitext(path)
+    store = stem + '.sweeps'
+    if os.path.isdir(store) and os.path.getmtime(store) >= os.path.getmtime(path):
+        return SweepStore(store)
+
+    if ext == '.json':
+        return convertJson(path, store, **kwargs)
+    if ext == '.npz':
+        data = np.load(path)
+        amps = data['amps'] if 'amps' in data else None
+        return writeSweeps(store, data['t'], data['V'], amps=amps)
+    raise ValueError(f"don't know how to read sweeps from {path}")
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Convert and inspect sweep files')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('convert', help='Convert JSON sweep files into a sweep store')
+    p.add_argument('files', nargs='+', help='JSON sweep files')
+    p.add_argument('-o', '--output', type=str, default=None, help='Store directory (default: <first>.sweeps)')
+    p.add_argument('--dt', type=float, default=None, help='Sampling interval if the file has no time array (ms)')
+
+    p = sub.add_parser('info', help='Summarize a sweep store')
+    p.add_argument('store', help='Store directory')
+
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        output = args.output or os.path.splitext(args.files[0])[0] + '.sweeps'
+        try:
+            store = convertJson(args.files, output, dt=args.dt)
+        except ValueError as e:
+            print(f"✗ Conversion failed: {e}")
+            sys.exit(1)
+        print(f"✓ {store}")
+    else:
+        store = openSweeps(args.store)
+        print(store)
+        print(f"  dt: {store.meta['dt']} ms, chunks: {len(store.meta['chunks'])} x {store.chunkSize}")
+        for name, amp in zip(store.names[:20], store.amps[:20]):
+            print(f"  {name}" + (f"  ({amp * 1000:.0f} pA)" if np.isfinite(amp) else ''))
+        if len(store) > 20:
+            print(f"  ... {len(store) - 20} more")
@@ -0,0 +1,227 @@
+"""
+sweeps_HL23.py
+
+Batched single-cell current-clamp sweep engine
+Instantiates N independent copies of one cell (healthy or AD stage) in a single
+NEURON process, gives each copy its own IClamp amplitude and integrates all
+sweeps with one finitialize/continuerun. Somatic voltage is collected into a
+single preallocated (sweeps x time) array.
+
+Usage:
+    python sweeps_HL23.py                                   # HL23PYR, healthy, default steps
+    python sweeps_HL23.py --stage 1                         # AD Stage 1 HL23PYR
+    python sweeps_HL23.py --cell HL23PV                     # Interneuron
+    python sweeps_HL23.py --amps -0.07 0.17 0.25            # Custom amplitudes (nA)
+    python sweeps_HL23.py --allen PYR_531526539.xml         # Long Square amplitudes of Allen specimen
+    python sweeps_HL23.py --stage 3 --save ad3.sweeps       # Save as a sweep store (see sweepio_HL23.py)
+"""
+
+import os
+import argparse
+import xml.etree.ElementTree as ET
+import numpy as np
+
+BASEDIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# PROTOCOL
+###############################################################################
+
+# Long-square step protocol (1 s step as in the Allen Cell Types "Long Square")
+LONG_SQUARE = {
+    'delay': 200.0,   # ms before step onset (lets the cell settle from v_init)
+    'dur': 1000.0,    # ms step duration
+    'tstop': 1500.0,  # ms total sweep length
+}
+
+# Default amplitudes (nA): hyperpolarizing to ~2x HL23PYR rheobase (170 pA)
+DEFAULT_AMPS = np.round(np.arange(-0.1, 0.31, 0.02), 3)
+
+# AD variants are only defined for the pyramidal cell
+AD_STAGES = (1, 3)
+
+###############################################################################
+# ALLEN SPECIMEN PROTOCOL
+###############################################################################
+
+def allenLongSquare(xmlPath):
+    """
+    Long Square sweeps listed in an Allen Cell Types specimen XML
+
+    Args:
+        xmlPath: specimen XML (e.g. PYR_531526539.xml)
+
+    Returns:
+        list of {'sweep', 'amp' (nA), 'numSpikes'} dicts sorted by amplitude
+    """
+
+    root = ET.parse(xmlPath).getroot()
+
+    sweeps = []
+    for sweep in root.iter('ephys-sweep'):
+        if sweep.findtext('stimulus-name') != 'Long Square':
+            continue
+        numSpikes = sweep.findtext('num-spikes')
+        sweeps.append({
+            'sweep': int(sweep.findtext('sweep-number')),
+            'amp': round(float(sweep.findtext('stimulus-absolute-amplitude')) / 1000.0, 4),  # pA -> nA
+            'numSpikes': int(numSpikes) if numSpikes else 0,
+        })
+
+    return sorted(sweeps, key=lambda s: (s['amp'], s['sweep']))
+
+###############################################################################
+# SWEEP ENGINE
+###############################################################################
+
+def applyParams(cell, params):
+    """
+    Overwrite uniform channel densities after the biophysics proc has run
+
+    Args:
+        cell: NEURON cell object
+        params: {(secList, var): value}, e.g. {('soma', 'gbar_SK'): 0.00064}
+    """
+
+    for (region, var), value in params.items():
+        for sec in getattr(cell, region):
+            for seg in sec:
+                setattr(seg, var, value)
+
+def runSweeps(amps, cellName='HL23PYR', ad_stage=None, delay=LONG_SQUARE['delay'],
+              dur=LONG_SQUARE['dur'], tstop=LONG_SQUARE['tstop'], dt=0.025,
+              recordStep=0.1, celsius=34.0, v_init=-80.0, params=None, segmentLength=None,
+              profiler=None):
+    """
+    Run one current step per amplitude, all sweeps in a single simulation
+
+    Args:
+        amps: step amplitudes (nA), one independent cell copy per amplitude
+        cellName: 'HL23PYR', 'HL23SST', 'HL23PV', or 'HL23VIP'
+        ad_stage: None for healthy, 1 or 3 for AD HL23PYR
+        delay, dur, tstop: step onset, step duration, sweep length (ms)
+        dt: integration time step (ms)
+        recordStep: sampling interval of the recorded traces (ms)
+        params: channel-density overrides (see applyParams), either one dict
+            for all sweeps or a list with one dict per sweep
+        segmentLength: maximum segment length (um), None for the template's
+            discretization (see cellwrapper.loadCells)
+        profiler: instrument_Yao1000.PhaseProfiler timing the 'create' and
+            'run' phases (model counts of the cells in profiler.counts['create'])
+
+    Returns:
+        t: (nSamples,) time base in ms
+        V: (nSweeps, nSamples) somatic membrane potential in mV
+    """
+
+    import cellwrapper
+    from neuron import h
+    from instrument_Yao1000 import PhaseProfiler
+
+    if ad_stage is not None and (cellName != 'HL23PYR' or ad_stage not in AD_STAGES):
+        raise ValueError(f"AD stage {ad_stage} not available for {cellName}")
+
+    amps = np.atleast_1d(np.asarray(amps, dtype=float))
+    nSweeps = len(amps)
+    nSamples = int(round(tstop / recordStep)) + 1
+
+    profiler = profiler or PhaseProfiler(script='sweeps')
+    with profiler.phase('create'):
+        cells = cellwrapper.loadCells(cellName, nSweeps, ad=ad_stage is not None, ad_stage=ad_stage,
+                                      segmentLength=segmentLength)
+
+        if params is not None:
+            perSweep = params if isinstance(params, (list, tuple)) else [params] * nSweeps
+            for cell, cellParams in zip(cells, perSweep):
+                applyParams(cell, cellParams)
+    profiler.count('create')
+
+    stims = []
+    vecs = []
+    for cell, amp in zip(cells, amps):
+        stim = h.IClamp(cell.soma[0](0.5))
+        stim.delay = delay
+        stim.dur = dur
+        stim.amp = amp
+        stims.append(stim)
+
+        vec = h.Vector()
+        vec.buffer_size(nSamples)  # no reallocation during the run
+        vec.record(cell.soma[0](0.5)._ref_v, recordStep)
+        vecs.append(vec)
+
+    with profiler.phase('run'):
+        h.CVode().active(0)
+        h.celsius = celsius
+        h.dt = dt
+        h.steps_per_ms = 1.0 / dt
+        h.finitialize(v_init)
+        h.continuerun(tstop)
+
+    # Accumulated round-off of t can drop the sample at tstop
+    nSamples = min(nSamples, min(int(vec.size()) for vec in vecs))
+    V = np.empty((nSweeps, nSamples))
+    for i, vec in enumerate(vecs):
+        V[i] = vec.as_numpy()[:nSamples]
+    t = np.arange(nSamples) * recordStep
+
+    return t, V
+
+def countSpikes(V, threshold=-20.0):
+    """Upward threshold crossings per sweep (quick check, no feature extraction)"""
+
+    above = V >= threshold
+    return np.count_nonzero(~above[:, :-1] & above[:, 1:], axis=1)
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Run a batched current-step protocol on one HL23 cell')
+    parser.add_argument('--cell', type=str, default='HL23PYR', help='Cell type')
+    parser.add_argument('--stage', type=int, default=None, choices=AD_STAGES, help='AD stage (HL23PYR only)')
+    parser.add_argument('--amps', type=float, nargs='+', default=None, help='Step amplitudes (nA)')
+    parser.add_argument('--allen', type=str, default=None, help='Use Long Square amplitudes of an Allen specimen XML')
+    parser.add_argument('--dt', type=float, default=0.025, help='Time step (ms)')
+    parser.add_argument('--save', type=str, default=None, help='Save sweeps to this sweep store (e.g. healthy.sweeps)')
+    args = parser.parse_args()
+
+    from mechanisms_Yao1000 import loadMechanisms
+    loadMechanisms()
+
+    if args.allen:
+        amps = np.unique([s['amp'] for s in allenLongSquare(args.allen)])
+    elif args.amps:
+        amps = np.array(args.amps)
+    else:
+        amps = DEFAULT_AMPS
+
+    label = args.cell + (f' AD Stage {args.stage}' if args.stage else ' (healthy)')
+
+    print("=" * 80)
+    print(f"CURRENT-STEP SWEEPS: {label}")
+    print("=" * 80)
+    print(f"Sweeps: {len(amps)} ({amps.min():.3f} to {amps.max():.3f} nA)")
+    print(f"Step: {LONG_SQUARE['delay']:.0f}-{LONG_SQUARE['delay'] + LONG_SQUARE['dur']:.0f} ms, "
+          f"tstop {LONG_SQUARE['tstop']:.0f} ms, dt {args.dt} ms")
+
+    import time
+    t0 = time.time()
+    t, V = runSweeps(amps, cellName=args.cell, ad_stage=args.stage, dt=args.dt)
+    print(f"Simulated {len(amps)} sweeps in {time.time() - t0:.2f} s")
+    print("-" * 80)
+
+    for amp, n in zip(amps, countSpikes(V)):
+        print(f"  {amp * 1000:7.1f} pA: {n:3d} spikes")
+
+    if args.save:
+        import sweepio_HL23
+        attrs = {'cellName': args.cell, 'ad_stage': args.stage, 'dt': args.dt,
+                 'delay': LONG_SQUARE['delay'], 'dur': LONG_SQUARE['dur']}
+        names = [f'{amp * 1000:.0f}pA' for amp in amps]
+        sweepio_HL23.writeSweeps(args.save, t, V, names=names, amps=amps, attrs=attrs)
+        print(f"\n✓ Sweeps saved to: {args.save}")
+
+    print("=" * 80)
@@ -0,0 +1,309 @@
+"""
+synchrony_Yao1000.py
+
+Pairwise correlation, synchrony and E/I balance analysis for Yao network runs
+Spikes are binned into a sparse (cells x bins) count matrix B. Spike-count
+(Pearson) correlations come from the sparse product B B^T, computed in row
+blocks so only (blockSize x cells) is dense at a time; the full matrix is
+only materialized on request, as a float32 memmap. Per-population synchrony
+(Golomb chi), population-averaged coherence (mean pairwise cross-spectrum
+from summed per-chunk FFTs, no pair loop) and E/I rate tracking are computed
+per run, so healthy and AD runs can be compared side by side.
+
+Usage:
+    python synchrony_Yao1000.py Yao1000.results
+    python synchrony_Yao1000.py healthy.results ad1.results --bin 10 --out synchrony.json
+    python synchrony_Yao1000.py Yao1000.results --save-corr corr.npy      # full float32 matrix (memmap)
+    python synchrony_Yao1000.py big.results --block 1000                   # 10k cells: smaller blocks
+"""
+
+import json
+import argparse
+import numpy as np
+import scipy.sparse
+
+from results_Yao1000 import openResults
+from spikestats_Yao1000 import SpikeIndex
+from spectral_Yao1000 import BANDS
+
+###############################################################################
+# PARAMETERS
+###############################################################################
+
+EXCITATORY = ('HL23PYR',)   # fracE = 1 in netParams_Yao1000.cellTypes
+BIN_SIZE = 10.0             # ms, spike-count correlation bins
+RATE_BIN = 1.0              # ms, bins of the signals used for coherence
+BLOCK_SIZE = 2000           # rows of B B^T computed at once
+SEGMENT = 256               # samples per Welch segment (coherence)
+
+###############################################################################
+# BINNED SPIKE MATRIX
+###############################################################################
+
+def binnedMatrix(index, binSize, tstart, tstop):
+    """
+    Sparse (numCells x nBins) spike counts in bins [tstart, tstart + binSize, ...)
+
+    Args:
+        index: SpikeIndex
+    """
+
+    nBins = int((tstop - tstart) // binSize)
+    t = np.asarray(index.times)
+    col = np.floor((t - tstart) / binSize).astype(np.int64)
+    keep = (col >= 0) & (col < nBins)
+    data = np.ones(np.count_nonzero(keep), dtype=np.float64)
+    return scipy.sparse.csr_matrix((data, (index.gids[keep], col[keep])), shape=(index.numCells, nBins))
+
+def groupLabels(groups, numCells):
+    """(numCells,) group index of every gid, -1 for cells in no group"""
+
+    labels = np.full(numCells, -1, dtype=np.int64)
+    for i, gids in enumerate(groups.values()):
+        labels[np.asarray(gids, dtype=np.int64)] = i
+    return labels
+
+###############################################################################
+# CORRELATIONS
+###############################################################################
+
+def correlationBlocks(B, blockSize=BLOCK_SIZE):
+    """
+    Yield (rows, corr) with corr the (len(rows), numCells) Pearson correlations
+
+    Silent cells (zero variance) give NaN.
+    """
+
+    n = B.shape[1]
+    mean = np.asarray(B.sum(axis=1)).ravel() / n
+    var = np.asarray(B.multiply(B).sum(axis=1)).ravel() / n - mean ** 2
+    std = np.sqrt(np.maximum(var, 0.0))
+    std[std == 0] = np.nan
+    BT = B.T.tocsc()
+
+    for start in range(0, B.shape[0], blockSize):
+        rows = np.arange(start, min(start + blockSize, B.shape[0]))
+        cov = (B[rows] @ BT).toarray() / n - np.outer(mean[rows], mean)
+        yield rows, cov / np.outer(std[rows], std)
+
+def pairCorrelations(B, groups, blockSize=BLOCK_SIZE, save=None):
+    """
+    Mean / std of pairwise correlations for every pair of groups (i != j)
+
+    Args:
+        B: sparse binned matrix
+        groups: {label: gids}
+        save: optional .npy path for the full float32 matrix (written block by block)
+
+    Returns:
+        {(groupA, groupB): {'mean', 'std', 'pairs'}}
+    """
+
+    labels = groupLabels(groups, B.shape[0])
+    nG = len(groups)
+    sums = np.zeros(nG * nG)
+    sums2 = np.zeros(nG * nG)
+    counts = np.zeros(nG * nG)
+    full = None
+    if save:
+        full = np.lib.format.open_memmap(save, mode='w+', dtype=np.float32, shape=(B.shape[0], B.shape[0]))
+
+    for rows, corr in correlationBlocks(B, blockSize):
+        if full is not None:
+            full[rows] = corr
+        corr[np.arange(len(rows)), rows] = np.nan  # no self-pairs
+        pair = labels[rows][:, None] * nG + labels[None, :]
+        valid = np.isfinite(corr) & (labels[rows][:, None] >= 0) & (labels[None, :] >= 0)
+        sums += np.bincount(pair[valid], weights=corr[valid], minlength=nG * nG)
+        sums2 += np.bincount(pair[valid], weights=corr[valid] ** 2, minlength=nG * nG)
+        counts += np.bincount(pair[valid], minlength=nG * nG)
+
+    if full is not None:
+        full.flush()
+
+    names = list(groups)
+    out = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+        std = np.sqrt(np.maximum(sums2 / counts - mean ** 2, 0.0))
+    for a in range(nG):
+        for b in range(nG):
+            k = a * nG + b
+            out[(names[a], names[b])] = {'mean': float(mean[k]), 'std': float(std[k]), 'pairs': int(counts[k])}
+    return out
+
+###############################################################################
+# SYNCHRONY AND COHERENCE
+###############################################################################
+
+def synchronyIndex(B, gids):
+    """
+    Golomb-Rinzel chi: std of the population-averaged signal over the RMS of single-cell stds
+
+    0 for independent cells, 1 for full synchrony; NaN if all cells are silent.
+    """
+
+    sub = B[np.asarray(gids, dtype=np.int64)]
+    n = sub.shape[1]
+    popSignal = np.asarray(sub.mean(axis=0)).ravel()
+    mean = np.asarray(sub.sum(axis=1)).ravel() / n
+    cellVar = np.asarray(sub.multiply(sub).sum(axis=1)).ravel() / n - mean ** 2
+    meanVar = cellVar.mean() if len(cellVar) else 0.0
+    return float(np.sqrt(popSignal.var() / meanVar)) if meanVar > 0 else np.nan
+
+def populationCoherence(B, gids, binSize=RATE_BIN, segment=SEGMENT, blockSize=BLOCK_SIZE):
+    """
+    Population-averaged coherence: mean cross-spectrum over cell pairs / mean auto-spectrum
+
+    With X_i the Welch segment spectra of cell i, the sum over pairs i != j of
+    X_i X_j* is |sum X_i|^2 - sum |X_i|^2, so only two running sums over
+    chunks of cells are needed.
+
+    Returns:
+        freqs: (nFreqs,) Hz
+        coherence: (nFreqs,) real part of the normalized mean cross-spectrum
+    """
+
+    gids = np.asarray(gids, dtype=np.int64)
+    nSeg = B.shape[1] // segment
+    freqs = np.fft.rfftfreq(segment, d=binSize / 1000.0)
+    if nSeg == 0 or len(gids) < 2:
+        return freqs, np.full(len(freqs), np.nan)
+
+    window = np.hanning(segment)
+    sumX = np.zeros((nSeg, len(freqs)), dtype=complex)
+    sumAuto = np.zeros((nSeg, len(freqs)))
+    for start in range(0, len(gids), blockSize):
+        block = B[gids[start:start + blockSize], :nSeg * segment].toarray().reshape(-1, nSeg, segment)
+        block -= block.mean(axis=2, keepdims=True)
+        X = np.fft.rfft(block * window, axis=2)
+        sumX += X.sum(axis=0)
+        sumAuto += (np.abs(X) ** 2).sum(axis=0)
+
+    n = len(gids)
+    cross = ((np.abs(sumX) ** 2 - sumAuto).sum(axis=0)) / (n * (n - 1))
+    auto = sumAuto.sum(axis=0) / n
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return freqs, cross / auto
+
+def bandMeans(freqs, values, bands=BANDS):
+    """{band: mean of values over the band's frequencies}"""
+
+    return {band: float(np.nanmean(values[(freqs >= lo) & (freqs < hi)])) if np.any((freqs >= lo) & (freqs < hi))
+            else np.nan for band, (lo, hi) in bands.items()}
+
+###############################################################################
+# E/I BALANCE
+###############################################################################
+
+def eiBalance(index, groups, tstart, tstop, binSize=BIN_SIZE, maxLag=50.0, excitatory=EXCITATORY):
+    """
+    Rate-based E/I balance measures per population
+
+    For every population: correlation of its rate with the total excitatory
+    and total inhibitory rates, and the lag (ms) at which its rate best
+    follows the excitatory rate (positive: lags behind E). Globally the E/I
+    spike ratio and the E-I rate correlation.
+    """
+
+    _, hist = index.histogram(binSize, tstart, tstop, groups)
+    names = list(groups)
+    isE = np.array([name in excitatory for name in names])
+    exc = hist[isE].sum(axis=0).astype(float)
+    inh = hist[~isE].sum(axis=0).astype(float)
+
+    def corr(a, b):
+        return float(np.corrcoef(a, b)[0, 1]) if a.std() > 0 and b.std() > 0 else np.nan
+
+    def peakLag(signal, ref):
+        lags = np.arange(-int(maxLag // binSize), int(maxLag // binSize) + 1)
+        a, b = signal - signal.mean(), ref - ref.mean()
+        if not a.any() or not b.any():
+            return np.nan
+        xc = [np.dot(a[max(0, k):len(a) + min(0, k)], b[max(0, -k):len(b) - max(0, k)]) for k in lags]
+        return float(lags[int(np.argmax(xc))] * binSize)
+
+    perPop = {}
+    for name, rate in zip(names, hist.astype(float)):
+        perPop[name] = {'corrE': corr(rate, exc), 'corrI': corr(rate, inh), 'lagE': peakLag(rate, exc)}
+
+    return {
+        'pops': perPop,
+        'eiSpikeRatio': float(exc.sum() / inh.sum()) if inh.sum() else np.nan,
+        'eiRateCorr': corr(exc, inh),
+        'inhLag': peakLag(inh, exc),
+    }
+
+###############################################################################
+# RUN SUMMARY
+###############################################################################
+
+def analyzeRun(path, tstart=500.0, tstop=None, binSize=BIN_SIZE, blockSize=BLOCK_SIZE, saveCorr=None):
+    """Correlation, synchrony, coherence and E/I summary of one result store"""
+
+    store = openResults(path)
+    index = SpikeIndex.fromStore(store)
+    tstop = tstop or store.duration
+    groups = {pop: store.popGids(pop) for pop in store.pops}
+
+    B = binnedMatrix(index, binSize, tstart, tstop)
+    pairs = pairCorrelations(B, groups, blockSize, save=saveCorr)
+
+    Bfine = binnedMatrix(index, RATE_BIN, tstart, tstop)
+    summary = {'path': path, 'window': [tstart, tstop], 'binSize': binSize, 'pops': {}}
+    for pop, gids in groups.items():
+        freqs, coh = populationCoherence(Bfine, gids, blockSize=blockSize)
+        summary['pops'][pop] = {
+            'meanCorr': pairs[(pop, pop)]['mean'],
+            'stdCorr': pairs[(pop, pop)]['std'],
+            'chi': synchronyIndex(B, gids),
+            'coherence': bandMeans(freqs, coh),
+        }
+    summary['pairCorr'] = {f'{a}->{b}': v for (a, b), v in pairs.items()}
+    summary['ei'] = eiBalance(index, groups, tstart, tstop, binSize)
+    return summary
+
+###############################################################################
+# MAIN
+###############################################################################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Pairwise correlation / synchrony analysis of result stores')
+    parser.add_argument('paths', type=str, nargs='+', help='Result stores (or NetPyNE pickles)')
+    parser.add_argument('--tstart', type=float, default=500.0, help='Analysis window start (ms)')
+    parser.add_argument('--tstop', type=float, default=None, help='Analysis window end (ms, default: duration)')
+    parser.add_argument('--bin', type=float, default=BIN_SIZE, help='Spike-count bin (ms)')
+    parser.add_argument('--block', type=int, default=BLOCK_SIZE, help='Rows of the correlation matrix per block')
+    parser.add_argument('--save-corr', type=str, default=None, help='Write the full correlation matrix (single run)')
+    parser.add_argument('--out', type=str, default=None, help='Write the summaries as JSON')
+    args = parser.parse_args()
+
+    summaries = []
+    for path in args.paths:
+        summary = analyzeRun(path, args.tstart, args.tstop, args.bin, args.block,
+                             saveCorr=args.save_corr if len(args.paths) == 1 else None)
+        summaries.append(summary)
+
+        print("=" * 80)
+        print(f"SYNCHRONY: {path}  ({summary['window'][0]:.0f}-{summary['window'][1]:.0f} ms, {args.bin} ms bins)")
+        print("=" * 80)
+        print(f"{'Population':<12} {'Corr':>8} {'± std':>8} {'chi':>7}   " + " ".join(f"{b:>7}" for b in BANDS))
+        print("-" * 80)
+        for pop, res in summary['pops'].items():
+            print(f"{pop:<12} {res['meanCorr']:8.4f} {res['stdCorr']:8.4f} {res['chi']:7.3f}   "
+                  + " ".join(f"{res['coherence'][b]:7.4f}" for b in BANDS))
+        ei = summary['ei']
+        print("-" * 80)
+        print(f"E/I spike ratio {ei['eiSpikeRatio']:.2f}, E-I rate corr {ei['eiRateCorr']:.3f}, "
+              f"inhibition lag {ei['inhLag']:.0f} ms")
+        for pop, res in ei['pops'].items():
+            print(f"  {pop:<12} corr E {res['corrE']:6.3f}  corr I {res['corrI']:6.3f}  lag vs E {res['lagE']:5.0f} ms")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(summaries, f, indent=1)
+        print(f"\n✓ Summary saved to: {args.out}")
+    if args.save_corr and len(args.paths) == 1:
+        print(f"✓ Correlation matrix saved to: {args.save_corr}")
+    print("=" * 80)
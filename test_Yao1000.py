@@ -3,10 +3,45 @@ test_Yao1000.py
 
 Quick test script to validate the Yao 1000-cell network setup
 Tests with a small 20-cell network before running full simulation
+--regression compares spikes of small fixed-seed networks and single-cell
+sweeps with the golden outputs in data/golden/ (regression_Yao1000.py).
+
+Usage:
+    python test_Yao1000.py                                # Smoke test
+    python test_Yao1000.py --regression                   # Golden-output check (~1 min), exit 1 on failure
+    python test_Yao1000.py --regression --cases sweeps_HL23PYR net_hh_20
+    python test_Yao1000.py --update-golden                # Regenerate the golden outputs
 """
 
 import sys
 import os
+import argparse
+
+parser = argparse.ArgumentParser(description='Smoke test and golden-output regression check')
+parser.add_argument('--regression', action='store_true', help='Compare spikes with the golden outputs')
+parser.add_argument('--update-golden', action='store_true', help='Regenerate the golden outputs')
+parser.add_argument('--cases', nargs='+', default=None, help='Regression cases (default: all)')
+args = parser.parse_args()
+
+if args.regression or args.update_golden:
+    import time
+    from regression_Yao1000 import CASES, runRegression
+
+    unknown = set(args.cases or []) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))} (available: {', '.join(CASES)})")
+
+    print("=" * 80)
+    print("GOLDEN-OUTPUT " + ("UPDATE" if args.update_golden else "REGRESSION CHECK"))
+    print("=" * 80)
+    t0 = time.time()
+    results = runRegression(args.cases, update=args.update_golden)
+    failed = [case for case, r in results.items() if 'error' in r or r.get('failed')]
+    print("=" * 80)
+    print(f"{'✗' if failed else '✓'} {len(results) - len(failed)}/{len(results)} cases passed "
+          f"in {time.time() - t0:.1f} s" + (f" (failed: {', '.join(failed)})" if failed else ""))
+    print("=" * 80)
+    sys.exit(1 if failed else 0)
 
 # Ensure mechanisms are compiled
 print("=" * 80)
@@ -18,14 +53,12 @@ try:
     from neuron import h
     h.load_file('stdrun.hoc')
 
-    # Try to load mechanisms
-    mech_dir = os.path.join(os.path.dirname(__file__), 'mod')
-    from neuron import load_mechanisms
-    load_mechanisms(mech_dir)
-    print("   ✓ Mechanisms loaded")
+    # Build mod/ into the mechanism cache (reused while the mod files are unchanged)
+    from mechanisms_Yao1000 import loadMechanisms
+    print(f"   ✓ Mechanisms loaded from {loadMechanisms()}")
 except Exception as e:
     print(f"   ✗ Error loading mechanisms: {e}")
-    print("   Run 'nrnivmodl mod/' to compile mechanisms")
+    print("   Run 'python mechanisms_Yao1000.py' to see the nrnivmodl output")
     sys.exit(1)
 
 print("\n2. Testing cell loading...")
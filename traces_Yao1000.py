@@ -0,0 +1,224 @@
+"""
+traces_Yao1000.py
+
+Selective, decimated and compressed voltage-trace recording for the Yao network
+Replaces recording V_soma of every cell as float64 lists. A TraceRecorder
+picks cells per population (by count, or inside a spatial region), records
+them into preallocated h.Vectors at a coarse recordStep, and can reduce a
+fine-step recording on the fly to min/max envelopes. Traces are gathered to
+rank 0 as float32 and added to the result store (results_Yao1000.py),
+optionally with lossless delta compression.
+
+Usage (inside an init script):
+    from traces_Yao1000 import TraceRecorder, selectCells
+    recorder = TraceRecorder(selectCells(sim, perPop=10), recordStep=0.5)
+    recorder.attach(sim)                     # after sim.create / setupRecording, before the run
+    runSimMonitored([recorder])              # see monitor_Yao1000.py
+    recorder.save('Yao1000.results', compress=True)
+
+    # Envelope: 0.025 ms sampling reduced to min/max every 1 ms
+    recorder = TraceRecorder(gids, recordStep=0.025, envelope=1.0)
+"""
+
+import numpy as np
+
+from monitor_Yao1000 import SpikeConsumer, CHECK_INTERVAL
+
+###############################################################################
+# CELL SELECTION
+###############################################################################
+
+def selectCells(sim, perPop=10, mode='even', region=None, pops=None, seed=0):
+    """
+    Global gids of the cells to record
+
+    Args:
+        sim: NetPyNE sim (after sim.create)
+        perPop: cells per population (None for all matching cells)
+        mode: 'even' (evenly spaced gids), 'first' or 'random'
+        region: spatial criterion on cell tags, e.g.
+            {'y': (-800, -600)}            depth range (μm)
+            {'r': 100}                     radial distance from the column axis (μm)
+        pops: populations to include (default: all)
+        seed: random seed for mode='random'
+
+    Returns:
+        sorted list of gids (same on every rank)
+    """
+
+    # Tags of all cells are needed to choose the same cells on every rank
+    local = [(c.gid, c.tags.get('pop'), c.tags.get('x', 0.0), c.tags.get('y', 0.0), c.tags.get('z', 0.0))
+             for c in sim.net.cells]
+    allCells = [c for rankCells in sim.pc.py_allgather(local) for c in rankCells]
+
+    rng = np.random.default_rng(seed)
+    selected = []
+    for pop in (pops or list(sim.net.pops.keys())):
+        cells = sorted(c for c in allCells if c[1] == pop)
+        if region:
+            if 'y' in region:
+                y0, y1 = region['y']
+                cells = [c for c in cells if y0 <= c[3] <= y1]
+            if 'r' in region:
+                cells = [c for c in cells if np.hypot(c[2], c[4]) <= region['r']]
+
+        gids = [c[0] for c in cells]
+        if perPop is None or len(gids) <= perPop:
+            selected.extend(gids)
+        elif mode == 'first':
+            selected.extend(gids[:perPop])
+        elif mode == 'random':
+            selected.extend(rng.choice(gids, perPop, replace=False).tolist())
+        else:
+            selected.extend(gids[i] for i in np.linspace(0, len(gids) - 1, perPop).round().astype(int))
+
+    return sorted(selected)
+
+###############################################################################
+# RECORDER
+###############################################################################
+
+class TraceRecorder(SpikeConsumer):
+    """
+    Preallocated soma (or any section) recording of selected cells
+
+    Args:
+        gids: global gids to record (cells on other ranks are ignored locally)
+        recordStep: sampling interval (ms); decimation relative to dt
+        var: range variable ('v', 'cai', ...)
+        sec, loc: recording site
+        envelope: if set, bin width (ms) of min/max envelopes computed during
+            the run; only the envelopes are kept
+        label: trace label in the result store (default 'V_<sec>' for v)
+    """
+
+    def __init__(self, gids, recordStep=0.1, var='v', sec='soma', loc=0.5, envelope=None, label=None):
+        self.gids = list(gids)
+        self.recordStep = recordStep
+        self.var = var
+        self.sec = sec
+        self.loc = loc
+        self.envelope = envelope
+        self.label = label or (f'V_{sec}' if var == 'v' else f'{var}_{sec}')
+
+    def attach(self, sim):
+        """Create the recording vectors (before finitialize)"""
+
+        from neuron import h
+
+        self.sim = sim
+        self.duration = sim.cfg.duration
+        nSamples = int(round(self.duration / self.recordStep)) + 1
+
+        bufferSize = nSamples
+        if self.envelope:
+            # Vectors are emptied every runSimMonitored() interval
+            self.perBin = int(round(self.envelope / self.recordStep))
+            self.nBins = int(np.ceil((nSamples - 1) / self.perBin))
+            bufferSize = int(CHECK_INTERVAL / self.recordStep) + 2
+
+        wanted = set(self.gids)
+        self.localGids = []
+        self.vecs = []
+        for cell in sim.net.cells:
+            if cell.gid not in wanted or self.sec not in cell.secs:
+                continue
+            seg = cell.secs[self.sec]['hObj'](self.loc)
+            vec = h.Vector()
+            vec.buffer_size(bufferSize)
+            vec.record(getattr(seg, '_ref_' + self.var), self.recordStep)
+            self.localGids.append(cell.gid)
+            self.vecs.append(vec)
+
+        if self.envelope:
+            n = len(self.vecs)
+            self.envMin = np.full((n, self.nBins), np.nan, dtype=np.float32)
+            self.envMax = np.full((n, self.nBins), np.nan, dtype=np.float32)
+            self.carry = np.empty((n, 0), dtype=np.float32)
+            self.binsDone = 0
+
+    def update(self, t, spkt, spkid):
+        if self.envelope and self.vecs:
+            self._reduce(final=False)
+        return False
+
+    def _reduce(self, final):
+        """Fold the samples recorded since the last call into the envelopes"""
+
+        n = min(int(vec.size()) for vec in self.vecs)
+        fresh = np.array([vec.as_numpy()[:n] for vec in self.vecs], dtype=np.float32)
+        for vec in self.vecs:
+            vec.resize(0)
+        samples = np.concatenate([self.carry, fresh], axis=1)
+
+        nBins = samples.shape[1] // self.perBin
+        if final and samples.shape[1] % self.perBin:
+            nBins += 1
+        nBins = min(nBins, self.nBins - self.binsDone)
+        if nBins <= 0:
+            self.carry = samples
+            return
+
+        used = min(nBins * self.perBin, samples.shape[1])
+        block = samples[:, :used]
+        pad = nBins * self.perBin - used
+        if pad:
+            block = np.pad(block, ((0, 0), (0, pad)), constant_values=np.nan)
+        block = block.reshape(len(block), nBins, self.perBin)
+
+        span = slice(self.binsDone, self.binsDone + nBins)
+        self.envMin[:, span] = np.nanmin(block, axis=2)
+        self.envMax[:, span] = np.nanmax(block, axis=2)
+        self.binsDone += nBins
+        self.carry = samples[:, used:]
+
+    def finalize(self, sim):
+        if self.envelope and self.vecs:
+            self._reduce(final=True)
+
+    def data(self):
+        """
+        Traces of this rank as float32
+
+        Returns:
+            {label: (t, gids, data)}; envelopes as '<label>_min' / '<label>_max'
+        """
+
+        if self.envelope:
+            t = (np.arange(self.nBins) + 0.5) * self.envelope
+            return {f'{self.label}_min': (t, self.localGids, self.envMin),
+                    f'{self.label}_max': (t, self.localGids, self.envMax)}
+
+        n = min([int(vec.size()) for vec in self.vecs], default=0)
+        data = np.empty((len(self.vecs), n), dtype=np.float32)
+        for i, vec in enumerate(self.vecs):
+            data[i] = vec.as_numpy()[:n]
+        return {self.label: (np.arange(n) * self.recordStep, self.localGids, data)}
+
+    def gather(self):
+        """All ranks' traces on rank 0 (None elsewhere), rows sorted by gid"""
+
+        parts = self.sim.pc.py_gather(self.data(), 0)
+        if self.sim.rank != 0:
+            return None
+
+        merged = {}
+        for label in parts[0]:
+            t = parts[0][label][0]
+            gids = np.concatenate([np.asarray(p[label][1], dtype=np.int64) for p in parts])
+            rows = [p[label][2] for p in parts if len(p[label][1])]
+            data = np.concatenate(rows) if rows else np.empty((0, len(t)), dtype=np.float32)
+            order = np.argsort(gids)
+            merged[label] = (t, gids[order], data[order])
+        return merged
+
+    def save(self, path, compress=False):
+        """Gather and add the traces to a result store (call on every rank)"""
+
+        from results_Yao1000 import addTraces
+
+        merged = self.gather()
+        if merged is not None:
+            for label, (t, gids, data) in merged.items():
+                addTraces(path, label, gids, data, t=t, compress=compress)
+        return merged
@@ -1,491 +0,0 @@
-/* Created by Language version: 7.7.0 */
-/* VECTORIZED */
-#define NRN_VECTORIZED 1
-#include <stdio.h>
-#include <stdlib.h>
-#include <math.h>
-#include "mech_api.h"
-#undef PI
-#define nil 0
-#include "md1redef.h"
-#include "section.h"
-#include "nrniv_mf.h"
-#include "md2redef.h"
- 
-#if METHOD3
-extern int _method3;
-#endif
-
-#if !NRNGPU
-#undef exp
-#define exp hoc_Exp
-extern double hoc_Exp(double);
-#endif
- 
-#define nrn_init _nrn_init__CaDynamics
-#define _nrn_initial _nrn_initial__CaDynamics
-#define nrn_cur _nrn_cur__CaDynamics
-#define _nrn_current _nrn_current__CaDynamics
-#define nrn_jacob _nrn_jacob__CaDynamics
-#define nrn_state _nrn_state__CaDynamics
-#define _net_receive _net_receive__CaDynamics 
-#define states states__CaDynamics 
- 
-#define _threadargscomma_ _p, _ppvar, _thread, _nt,
-#define _threadargsprotocomma_ double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt,
-#define _threadargs_ _p, _ppvar, _thread, _nt
-#define _threadargsproto_ double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt
- 	/*SUPPRESS 761*/
-	/*SUPPRESS 762*/
-	/*SUPPRESS 763*/
-	/*SUPPRESS 765*/
-	 extern double *getarg();
- /* Thread safe. No static _p or _ppvar. */
- 
-#define t _nt->_t
-#define dt _nt->_dt
-#define gamma _p[0]
-#define gamma_columnindex 0
-#define decay _p[1]
-#define decay_columnindex 1
-#define depth _p[2]
-#define depth_columnindex 2
-#define minCai _p[3]
-#define minCai_columnindex 3
-#define ica _p[4]
-#define ica_columnindex 4
-#define cai _p[5]
-#define cai_columnindex 5
-#define Dcai _p[6]
-#define Dcai_columnindex 6
-#define v _p[7]
-#define v_columnindex 7
-#define _g _p[8]
-#define _g_columnindex 8
-#define _ion_ica	*_ppvar[0]._pval
-#define _ion_cai	*_ppvar[1]._pval
-#define _style_ca	*((int*)_ppvar[2]._pvoid)
- 
-#if MAC
-#if !defined(v)
-#define v _mlhv
-#endif
-#if !defined(h)
-#define h _mlhh
-#endif
-#endif
- 
-#if defined(__cplusplus)
-extern "C" {
-#endif
- static int hoc_nrnpointerindex =  -1;
- static Datum* _extcall_thread;
- static Prop* _extcall_prop;
- /* external NEURON variables */
- /* declaration of user functions */
- static int _mechtype;
-extern void _nrn_cacheloop_reg(int, int);
-extern void hoc_register_prop_size(int, int, int);
-extern void hoc_register_limits(int, HocParmLimits*);
-extern void hoc_register_units(int, HocParmUnits*);
-extern void nrn_promote(Prop*, int, int);
-extern Memb_func* memb_func;
- 
-#define NMODL_TEXT 1
-#if NMODL_TEXT
-static const char* nmodl_file_text;
-static const char* nmodl_filename;
-extern void hoc_reg_nmodl_text(int, const char*);
-extern void hoc_reg_nmodl_filename(int, const char*);
-#endif
-
- extern void _nrn_setdata_reg(int, void(*)(Prop*));
- static void _setdata(Prop* _prop) {
- _extcall_prop = _prop;
- }
- static void _hoc_setdata() {
- Prop *_prop, *hoc_getdata_range(int);
- _prop = hoc_getdata_range(_mechtype);
-   _setdata(_prop);
- hoc_retpushx(1.);
-}
- /* connect user functions to hoc names */
- static VoidFunc hoc_intfunc[] = {
- "setdata_CaDynamics", _hoc_setdata,
- 0, 0
-};
- /* declare global and static user variables */
- /* some parameters have upper and lower limits */
- static HocParmLimits _hoc_parm_limits[] = {
- 0,0,0
-};
- static HocParmUnits _hoc_parm_units[] = {
- "decay_CaDynamics", "ms",
- "depth_CaDynamics", "um",
- "minCai_CaDynamics", "mM",
- 0,0
-};
- static double cai0 = 0;
- static double delta_t = 0.01;
- /* connect global user variables to hoc */
- static DoubScal hoc_scdoub[] = {
- 0,0
-};
- static DoubVec hoc_vdoub[] = {
- 0,0,0
-};
- static double _sav_indep;
- static void nrn_alloc(Prop*);
-static void  nrn_init(NrnThread*, _Memb_list*, int);
-static void nrn_state(NrnThread*, _Memb_list*, int);
- static void nrn_cur(NrnThread*, _Memb_list*, int);
-static void  nrn_jacob(NrnThread*, _Memb_list*, int);
- 
-static int _ode_count(int);
-static void _ode_map(int, double**, double**, double*, Datum*, double*, int);
-static void _ode_spec(NrnThread*, _Memb_list*, int);
-static void _ode_matsol(NrnThread*, _Memb_list*, int);
- 
-#define _cvode_ieq _ppvar[3]._i
- static void _ode_matsol_instance1(_threadargsproto_);
- /* connect range variables in _p that hoc is supposed to know about */
- static const char *_mechanism[] = {
- "7.7.0",
-"CaDynamics",
- "gamma_CaDynamics",
- "decay_CaDynamics",
- "depth_CaDynamics",
- "minCai_CaDynamics",
- 0,
- 0,
- 0,
- 0};
- static Symbol* _ca_sym;
- 
-extern Prop* need_memb(Symbol*);
-
-static void nrn_alloc(Prop* _prop) {
-	Prop *prop_ion;
-	double *_p; Datum *_ppvar;
- 	_p = nrn_prop_data_alloc(_mechtype, 9, _prop);
- 	/*initialize range parameters*/
- 	gamma = 0.05;
- 	decay = 80;
- 	depth = 0.1;
- 	minCai = 0.0001;
- 	_prop->param = _p;
- 	_prop->param_size = 9;
- 	_ppvar = nrn_prop_datum_alloc(_mechtype, 4, _prop);
- 	_prop->dparam = _ppvar;
- 	/*connect ionic variables to this model*/
- prop_ion = need_memb(_ca_sym);
- nrn_check_conc_write(_prop, prop_ion, 1);
- nrn_promote(prop_ion, 3, 0);
- 	_ppvar[0]._pval = &prop_ion->param[3]; /* ica */
- 	_ppvar[1]._pval = &prop_ion->param[1]; /* cai */
- 	_ppvar[2]._pvoid = (void*)(&(prop_ion->dparam[0]._i)); /* iontype for ca */
- 
-}
- static void _initlists();
-  /* some states have an absolute tolerance */
- static Symbol** _atollist;
- static HocStateTolerance _hoc_state_tol[] = {
- 0,0
-};
- static void _update_ion_pointer(Datum*);
- extern Symbol* hoc_lookup(const char*);
-extern void _nrn_thread_reg(int, int, void(*)(Datum*));
-extern void _nrn_thread_table_reg(int, void(*)(double*, Datum*, Datum*, NrnThread*, int));
-extern void hoc_register_tolerance(int, HocStateTolerance*, Symbol***);
-extern void _cvode_abstol( Symbol**, double*, int);
-
- void _CaDynamics_reg() {
-	int _vectorized = 1;
-  _initlists();
- 	ion_reg("ca", -10000.);
- 	_ca_sym = hoc_lookup("ca_ion");
- 	register_mech(_mechanism, nrn_alloc,nrn_cur, nrn_jacob, nrn_state, nrn_init, hoc_nrnpointerindex, 1);
- _mechtype = nrn_get_mechtype(_mechanism[1]);
-     _nrn_setdata_reg(_mechtype, _setdata);
-     _nrn_thread_reg(_mechtype, 2, _update_ion_pointer);
- #if NMODL_TEXT
-  hoc_reg_nmodl_text(_mechtype, nmodl_file_text);
-  hoc_reg_nmodl_filename(_mechtype, nmodl_filename);
-#endif
-  hoc_register_prop_size(_mechtype, 9, 4);
-  hoc_register_dparam_semantics(_mechtype, 0, "ca_ion");
-  hoc_register_dparam_semantics(_mechtype, 1, "ca_ion");
-  hoc_register_dparam_semantics(_mechtype, 2, "#ca_ion");
-  hoc_register_dparam_semantics(_mechtype, 3, "cvodeieq");
- 	nrn_writes_conc(_mechtype, 0);
- 	hoc_register_cvode(_mechtype, _ode_count, _ode_map, _ode_spec, _ode_matsol);
- 	hoc_register_tolerance(_mechtype, _hoc_state_tol, &_atollist);
- 	hoc_register_var(hoc_scdoub, hoc_vdoub, hoc_intfunc);
- 	ivoc_help("help ?1 CaDynamics /Users/tarek/Desktop/HL23PYR_AD-main/mod/CaDynamics.mod\n");
- hoc_register_limits(_mechtype, _hoc_parm_limits);
- hoc_register_units(_mechtype, _hoc_parm_units);
- }
- 
-#define FARADAY _nrnunit_FARADAY[_nrnunit_use_legacy_]
-static double _nrnunit_FARADAY[2] = {0x1.78e555060882cp+16, 96485.3}; /* 96485.3321233100141 */
-static int _reset;
-static char *modelname = "";
-
-static int error;
-static int _ninits = 0;
-static int _match_recurse=1;
-static void _modl_cleanup(){ _match_recurse=1;}
- 
-static int _ode_spec1(_threadargsproto_);
-/*static int _ode_matsol1(_threadargsproto_);*/
- static int _slist1[1], _dlist1[1];
- static int states(_threadargsproto_);
- 
-/*CVODE*/
- static int _ode_spec1 (double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {int _reset = 0; {
-   Dcai = - ( 10000.0 ) * ( ica * gamma / ( 2.0 * FARADAY * depth ) ) - ( cai - minCai ) / decay ;
-   }
- return _reset;
-}
- static int _ode_matsol1 (double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {
- Dcai = Dcai  / (1. - dt*( ( - ( ( 1.0 ) ) / decay ) )) ;
-  return 0;
-}
- /*END CVODE*/
- static int states (double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) { {
-    cai = cai + (1. - exp(dt*(( - ( ( 1.0 ) ) / decay ))))*(- ( ( - ( 10000.0 ) )*( ( ( ( ica )*( gamma ) ) / ( 2.0 * FARADAY * depth ) ) ) - ( ( ( - minCai ) ) ) / decay ) / ( ( - ( ( 1.0 ) ) / decay ) ) - cai) ;
-   }
-  return 0;
-}
- 
-static int _ode_count(int _type){ return 1;}
- 
-static void _ode_spec(NrnThread* _nt, _Memb_list* _ml, int _type) {
-   double* _p; Datum* _ppvar; Datum* _thread;
-   Node* _nd; double _v; int _iml, _cntml;
-  _cntml = _ml->_nodecount;
-  _thread = _ml->_thread;
-  for (_iml = 0; _iml < _cntml; ++_iml) {
-    _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-    _nd = _ml->_nodelist[_iml];
-    v = NODEV(_nd);
-  ica = _ion_ica;
-  cai = _ion_cai;
-     _ode_spec1 (_p, _ppvar, _thread, _nt);
-  _ion_cai = cai;
- }}
- 
-static void _ode_map(int _ieq, double** _pv, double** _pvdot, double* _pp, Datum* _ppd, double* _atol, int _type) { 
-	double* _p; Datum* _ppvar;
- 	int _i; _p = _pp; _ppvar = _ppd;
-	_cvode_ieq = _ieq;
-	for (_i=0; _i < 1; ++_i) {
-		_pv[_i] = _pp + _slist1[_i];  _pvdot[_i] = _pp + _dlist1[_i];
-		_cvode_abstol(_atollist, _atol, _i);
-	}
- 	_pv[0] = &(_ion_cai);
- }
- 
-static void _ode_matsol_instance1(_threadargsproto_) {
- _ode_matsol1 (_p, _ppvar, _thread, _nt);
- }
- 
-static void _ode_matsol(NrnThread* _nt, _Memb_list* _ml, int _type) {
-   double* _p; Datum* _ppvar; Datum* _thread;
-   Node* _nd; double _v; int _iml, _cntml;
-  _cntml = _ml->_nodecount;
-  _thread = _ml->_thread;
-  for (_iml = 0; _iml < _cntml; ++_iml) {
-    _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-    _nd = _ml->_nodelist[_iml];
-    v = NODEV(_nd);
-  ica = _ion_ica;
-  cai = _ion_cai;
- _ode_matsol_instance1(_threadargs_);
- }}
- extern void nrn_update_ion_pointer(Symbol*, Datum*, int, int);
- static void _update_ion_pointer(Datum* _ppvar) {
-   nrn_update_ion_pointer(_ca_sym, _ppvar, 0, 3);
-   nrn_update_ion_pointer(_ca_sym, _ppvar, 1, 1);
- }
-
-static void initmodel(double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {
-  int _i; double _save;{
- {
-   cai = minCai ;
-   }
- 
-}
-}
-
-static void nrn_init(NrnThread* _nt, _Memb_list* _ml, int _type){
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; double _v; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- v = _v;
-  ica = _ion_ica;
-  cai = _ion_cai;
- initmodel(_p, _ppvar, _thread, _nt);
-  _ion_cai = cai;
-  nrn_wrote_conc(_ca_sym, (&(_ion_cai)) - 1, _style_ca);
-}
-}
-
-static double _nrn_current(double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt, double _v){double _current=0.;v=_v;{
-} return _current;
-}
-
-static void nrn_cur(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; int* _ni; double _rhs, _v; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- 
-}
- 
-}
-
-static void nrn_jacob(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-	VEC_D(_ni[_iml]) += _g;
-  }else
-#endif
-  {
-     _nd = _ml->_nodelist[_iml];
-	NODED(_nd) += _g;
-  }
- 
-}
- 
-}
-
-static void nrn_state(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; double _v = 0.0; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
- _nd = _ml->_nodelist[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- v=_v;
-{
-  ica = _ion_ica;
-  cai = _ion_cai;
- {   states(_p, _ppvar, _thread, _nt);
-  } {
-   }
-  _ion_cai = cai;
-}}
-
-}
-
-static void terminal(){}
-
-static void _initlists(){
- double _x; double* _p = &_x;
- int _i; static int _first = 1;
-  if (!_first) return;
- _slist1[0] = cai_columnindex;  _dlist1[0] = Dcai_columnindex;
-_first = 0;
-}
-
-#if defined(__cplusplus)
-} /* extern "C" */
-#endif
-
-#if NMODL_TEXT
-static const char* nmodl_filename = "/Users/tarek/Desktop/HL23PYR_AD-main/mod/CaDynamics.mod";
-static const char* nmodl_file_text = 
-  ": Dynamics that track inside calcium concentration\n"
-  ": modified from Destexhe et al. 1994\n"
-  "\n"
-  "NEURON	{\n"
-  "	SUFFIX CaDynamics\n"
-  "	USEION ca READ ica WRITE cai\n"
-  "	RANGE decay, gamma, minCai, depth\n"
-  "}\n"
-  "\n"
-  "UNITS	{\n"
-  "	(mV) = (millivolt)\n"
-  "	(mA) = (milliamp)\n"
-  "	FARADAY = (faraday) (coulombs)\n"
-  "	(molar) = (1/liter)\n"
-  "	(mM) = (millimolar)\n"
-  "	(um)	= (micron)\n"
-  "}\n"
-  "\n"
-  "PARAMETER	{\n"
-  "	gamma = 0.05 : percent of free calcium (not buffered)\n"
-  "	decay = 80 (ms) : rate of removal of calcium\n"
-  "	depth = 0.1 (um) : depth of shell\n"
-  "	minCai = 1e-4 (mM)\n"
-  "}\n"
-  "\n"
-  "ASSIGNED	{ica (mA/cm2)}\n"
-  "\n"
-  "INITIAL {\n"
-  "	cai = minCai\n"
-  "}\n"
-  "\n"
-  "STATE	{\n"
-  "	cai (mM)\n"
-  "	}\n"
-  "\n"
-  "BREAKPOINT	{ SOLVE states METHOD cnexp }\n"
-  "\n"
-  "DERIVATIVE states	{\n"
-  "	cai' = -(10000)*(ica*gamma/(2*FARADAY*depth)) - (cai - minCai)/decay\n"
-  "}\n"
-  ;
-#endif
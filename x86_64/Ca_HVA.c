@@ -1,587 +0,0 @@
-/* Created by Language version: 7.7.0 */
-/* VECTORIZED */
-#define NRN_VECTORIZED 1
-#include <stdio.h>
-#include <stdlib.h>
-#include <math.h>
-#include "mech_api.h"
-#undef PI
-#define nil 0
-#include "md1redef.h"
-#include "section.h"
-#include "nrniv_mf.h"
-#include "md2redef.h"
- 
-#if METHOD3
-extern int _method3;
-#endif
-
-#if !NRNGPU
-#undef exp
-#define exp hoc_Exp
-extern double hoc_Exp(double);
-#endif
- 
-#define nrn_init _nrn_init__Ca_HVA
-#define _nrn_initial _nrn_initial__Ca_HVA
-#define nrn_cur _nrn_cur__Ca_HVA
-#define _nrn_current _nrn_current__Ca_HVA
-#define nrn_jacob _nrn_jacob__Ca_HVA
-#define nrn_state _nrn_state__Ca_HVA
-#define _net_receive _net_receive__Ca_HVA 
-#define rates rates__Ca_HVA 
-#define states states__Ca_HVA 
- 
-#define _threadargscomma_ _p, _ppvar, _thread, _nt,
-#define _threadargsprotocomma_ double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt,
-#define _threadargs_ _p, _ppvar, _thread, _nt
-#define _threadargsproto_ double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt
- 	/*SUPPRESS 761*/
-	/*SUPPRESS 762*/
-	/*SUPPRESS 763*/
-	/*SUPPRESS 765*/
-	 extern double *getarg();
- /* Thread safe. No static _p or _ppvar. */
- 
-#define t _nt->_t
-#define dt _nt->_dt
-#define gbar _p[0]
-#define gbar_columnindex 0
-#define ica _p[1]
-#define ica_columnindex 1
-#define g _p[2]
-#define g_columnindex 2
-#define m _p[3]
-#define m_columnindex 3
-#define h _p[4]
-#define h_columnindex 4
-#define eca _p[5]
-#define eca_columnindex 5
-#define mInf _p[6]
-#define mInf_columnindex 6
-#define mTau _p[7]
-#define mTau_columnindex 7
-#define mAlpha _p[8]
-#define mAlpha_columnindex 8
-#define mBeta _p[9]
-#define mBeta_columnindex 9
-#define hInf _p[10]
-#define hInf_columnindex 10
-#define hTau _p[11]
-#define hTau_columnindex 11
-#define hAlpha _p[12]
-#define hAlpha_columnindex 12
-#define hBeta _p[13]
-#define hBeta_columnindex 13
-#define Dm _p[14]
-#define Dm_columnindex 14
-#define Dh _p[15]
-#define Dh_columnindex 15
-#define v _p[16]
-#define v_columnindex 16
-#define _g _p[17]
-#define _g_columnindex 17
-#define _ion_eca	*_ppvar[0]._pval
-#define _ion_ica	*_ppvar[1]._pval
-#define _ion_dicadv	*_ppvar[2]._pval
- 
-#if MAC
-#if !defined(v)
-#define v _mlhv
-#endif
-#if !defined(h)
-#define h _mlhh
-#endif
-#endif
- 
-#if defined(__cplusplus)
-extern "C" {
-#endif
- static int hoc_nrnpointerindex =  -1;
- static Datum* _extcall_thread;
- static Prop* _extcall_prop;
- /* external NEURON variables */
- /* declaration of user functions */
- static void _hoc_rates(void);
- static int _mechtype;
-extern void _nrn_cacheloop_reg(int, int);
-extern void hoc_register_prop_size(int, int, int);
-extern void hoc_register_limits(int, HocParmLimits*);
-extern void hoc_register_units(int, HocParmUnits*);
-extern void nrn_promote(Prop*, int, int);
-extern Memb_func* memb_func;
- 
-#define NMODL_TEXT 1
-#if NMODL_TEXT
-static const char* nmodl_file_text;
-static const char* nmodl_filename;
-extern void hoc_reg_nmodl_text(int, const char*);
-extern void hoc_reg_nmodl_filename(int, const char*);
-#endif
-
- extern void _nrn_setdata_reg(int, void(*)(Prop*));
- static void _setdata(Prop* _prop) {
- _extcall_prop = _prop;
- }
- static void _hoc_setdata() {
- Prop *_prop, *hoc_getdata_range(int);
- _prop = hoc_getdata_range(_mechtype);
-   _setdata(_prop);
- hoc_retpushx(1.);
-}
- /* connect user functions to hoc names */
- static VoidFunc hoc_intfunc[] = {
- "setdata_Ca_HVA", _hoc_setdata,
- "rates_Ca_HVA", _hoc_rates,
- 0, 0
-};
- /* declare global and static user variables */
- /* some parameters have upper and lower limits */
- static HocParmLimits _hoc_parm_limits[] = {
- 0,0,0
-};
- static HocParmUnits _hoc_parm_units[] = {
- "gbar_Ca_HVA", "S/cm2",
- "ica_Ca_HVA", "mA/cm2",
- "g_Ca_HVA", "S/cm2",
- 0,0
-};
- static double delta_t = 0.01;
- static double h0 = 0;
- static double m0 = 0;
- /* connect global user variables to hoc */
- static DoubScal hoc_scdoub[] = {
- 0,0
-};
- static DoubVec hoc_vdoub[] = {
- 0,0,0
-};
- static double _sav_indep;
- static void nrn_alloc(Prop*);
-static void  nrn_init(NrnThread*, _Memb_list*, int);
-static void nrn_state(NrnThread*, _Memb_list*, int);
- static void nrn_cur(NrnThread*, _Memb_list*, int);
-static void  nrn_jacob(NrnThread*, _Memb_list*, int);
- 
-static int _ode_count(int);
-static void _ode_map(int, double**, double**, double*, Datum*, double*, int);
-static void _ode_spec(NrnThread*, _Memb_list*, int);
-static void _ode_matsol(NrnThread*, _Memb_list*, int);
- 
-#define _cvode_ieq _ppvar[3]._i
- static void _ode_matsol_instance1(_threadargsproto_);
- /* connect range variables in _p that hoc is supposed to know about */
- static const char *_mechanism[] = {
- "7.7.0",
-"Ca_HVA",
- "gbar_Ca_HVA",
- 0,
- "ica_Ca_HVA",
- "g_Ca_HVA",
- 0,
- "m_Ca_HVA",
- "h_Ca_HVA",
- 0,
- 0};
- static Symbol* _ca_sym;
- 
-extern Prop* need_memb(Symbol*);
-
-static void nrn_alloc(Prop* _prop) {
-	Prop *prop_ion;
-	double *_p; Datum *_ppvar;
- 	_p = nrn_prop_data_alloc(_mechtype, 18, _prop);
- 	/*initialize range parameters*/
- 	gbar = 1e-05;
- 	_prop->param = _p;
- 	_prop->param_size = 18;
- 	_ppvar = nrn_prop_datum_alloc(_mechtype, 4, _prop);
- 	_prop->dparam = _ppvar;
- 	/*connect ionic variables to this model*/
- prop_ion = need_memb(_ca_sym);
- nrn_promote(prop_ion, 0, 1);
- 	_ppvar[0]._pval = &prop_ion->param[0]; /* eca */
- 	_ppvar[1]._pval = &prop_ion->param[3]; /* ica */
- 	_ppvar[2]._pval = &prop_ion->param[4]; /* _ion_dicadv */
- 
-}
- static void _initlists();
-  /* some states have an absolute tolerance */
- static Symbol** _atollist;
- static HocStateTolerance _hoc_state_tol[] = {
- 0,0
-};
- static void _update_ion_pointer(Datum*);
- extern Symbol* hoc_lookup(const char*);
-extern void _nrn_thread_reg(int, int, void(*)(Datum*));
-extern void _nrn_thread_table_reg(int, void(*)(double*, Datum*, Datum*, NrnThread*, int));
-extern void hoc_register_tolerance(int, HocStateTolerance*, Symbol***);
-extern void _cvode_abstol( Symbol**, double*, int);
-
- void _Ca_HVA_reg() {
-	int _vectorized = 1;
-  _initlists();
- 	ion_reg("ca", -10000.);
- 	_ca_sym = hoc_lookup("ca_ion");
- 	register_mech(_mechanism, nrn_alloc,nrn_cur, nrn_jacob, nrn_state, nrn_init, hoc_nrnpointerindex, 1);
- _mechtype = nrn_get_mechtype(_mechanism[1]);
-     _nrn_setdata_reg(_mechtype, _setdata);
-     _nrn_thread_reg(_mechtype, 2, _update_ion_pointer);
- #if NMODL_TEXT
-  hoc_reg_nmodl_text(_mechtype, nmodl_file_text);
-  hoc_reg_nmodl_filename(_mechtype, nmodl_filename);
-#endif
-  hoc_register_prop_size(_mechtype, 18, 4);
-  hoc_register_dparam_semantics(_mechtype, 0, "ca_ion");
-  hoc_register_dparam_semantics(_mechtype, 1, "ca_ion");
-  hoc_register_dparam_semantics(_mechtype, 2, "ca_ion");
-  hoc_register_dparam_semantics(_mechtype, 3, "cvodeieq");
- 	hoc_register_cvode(_mechtype, _ode_count, _ode_map, _ode_spec, _ode_matsol);
- 	hoc_register_tolerance(_mechtype, _hoc_state_tol, &_atollist);
- 	hoc_register_var(hoc_scdoub, hoc_vdoub, hoc_intfunc);
- 	ivoc_help("help ?1 Ca_HVA /Users/tarek/Desktop/HL23PYR_AD-main/mod/Ca_HVA.mod\n");
- hoc_register_limits(_mechtype, _hoc_parm_limits);
- hoc_register_units(_mechtype, _hoc_parm_units);
- }
-static int _reset;
-static char *modelname = "";
-
-static int error;
-static int _ninits = 0;
-static int _match_recurse=1;
-static void _modl_cleanup(){ _match_recurse=1;}
-static int rates(_threadargsproto_);
- 
-static int _ode_spec1(_threadargsproto_);
-/*static int _ode_matsol1(_threadargsproto_);*/
- static int _slist1[2], _dlist1[2];
- static int states(_threadargsproto_);
- 
-/*CVODE*/
- static int _ode_spec1 (double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {int _reset = 0; {
-   rates ( _threadargs_ ) ;
-   Dm = ( mInf - m ) / mTau ;
-   Dh = ( hInf - h ) / hTau ;
-   }
- return _reset;
-}
- static int _ode_matsol1 (double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {
- rates ( _threadargs_ ) ;
- Dm = Dm  / (1. - dt*( ( ( ( - 1.0 ) ) ) / mTau )) ;
- Dh = Dh  / (1. - dt*( ( ( ( - 1.0 ) ) ) / hTau )) ;
-  return 0;
-}
- /*END CVODE*/
- static int states (double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) { {
-   rates ( _threadargs_ ) ;
-    m = m + (1. - exp(dt*(( ( ( - 1.0 ) ) ) / mTau)))*(- ( ( ( mInf ) ) / mTau ) / ( ( ( ( - 1.0 ) ) ) / mTau ) - m) ;
-    h = h + (1. - exp(dt*(( ( ( - 1.0 ) ) ) / hTau)))*(- ( ( ( hInf ) ) / hTau ) / ( ( ( ( - 1.0 ) ) ) / hTau ) - h) ;
-   }
-  return 0;
-}
- 
-static int  rates ( _threadargsproto_ ) {
-    if ( ( v  == - 27.0 ) ) {
-     v = v + 0.0001 ;
-     }
-   mAlpha = ( 0.055 * ( - 27.0 - v ) ) / ( exp ( ( - 27.0 - v ) / 3.8 ) - 1.0 ) ;
-   mBeta = ( 0.94 * exp ( ( - 75.0 - v ) / 17.0 ) ) ;
-   mInf = mAlpha / ( mAlpha + mBeta ) ;
-   mTau = 1.0 / ( mAlpha + mBeta ) ;
-   hAlpha = ( 0.000457 * exp ( ( - 13.0 - v ) / 50.0 ) ) ;
-   hBeta = ( 0.0065 / ( exp ( ( - v - 15.0 ) / 28.0 ) + 1.0 ) ) ;
-   hInf = hAlpha / ( hAlpha + hBeta ) ;
-   hTau = 1.0 / ( hAlpha + hBeta ) ;
-     return 0; }
- 
-static void _hoc_rates(void) {
-  double _r;
-   double* _p; Datum* _ppvar; Datum* _thread; NrnThread* _nt;
-   if (_extcall_prop) {_p = _extcall_prop->param; _ppvar = _extcall_prop->dparam;}else{ _p = (double*)0; _ppvar = (Datum*)0; }
-  _thread = _extcall_thread;
-  _nt = nrn_threads;
- _r = 1.;
- rates ( _p, _ppvar, _thread, _nt );
- hoc_retpushx(_r);
-}
- 
-static int _ode_count(int _type){ return 2;}
- 
-static void _ode_spec(NrnThread* _nt, _Memb_list* _ml, int _type) {
-   double* _p; Datum* _ppvar; Datum* _thread;
-   Node* _nd; double _v; int _iml, _cntml;
-  _cntml = _ml->_nodecount;
-  _thread = _ml->_thread;
-  for (_iml = 0; _iml < _cntml; ++_iml) {
-    _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-    _nd = _ml->_nodelist[_iml];
-    v = NODEV(_nd);
-  eca = _ion_eca;
-     _ode_spec1 (_p, _ppvar, _thread, _nt);
-  }}
- 
-static void _ode_map(int _ieq, double** _pv, double** _pvdot, double* _pp, Datum* _ppd, double* _atol, int _type) { 
-	double* _p; Datum* _ppvar;
- 	int _i; _p = _pp; _ppvar = _ppd;
-	_cvode_ieq = _ieq;
-	for (_i=0; _i < 2; ++_i) {
-		_pv[_i] = _pp + _slist1[_i];  _pvdot[_i] = _pp + _dlist1[_i];
-		_cvode_abstol(_atollist, _atol, _i);
-	}
- }
- 
-static void _ode_matsol_instance1(_threadargsproto_) {
- _ode_matsol1 (_p, _ppvar, _thread, _nt);
- }
- 
-static void _ode_matsol(NrnThread* _nt, _Memb_list* _ml, int _type) {
-   double* _p; Datum* _ppvar; Datum* _thread;
-   Node* _nd; double _v; int _iml, _cntml;
-  _cntml = _ml->_nodecount;
-  _thread = _ml->_thread;
-  for (_iml = 0; _iml < _cntml; ++_iml) {
-    _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-    _nd = _ml->_nodelist[_iml];
-    v = NODEV(_nd);
-  eca = _ion_eca;
- _ode_matsol_instance1(_threadargs_);
- }}
- extern void nrn_update_ion_pointer(Symbol*, Datum*, int, int);
- static void _update_ion_pointer(Datum* _ppvar) {
-   nrn_update_ion_pointer(_ca_sym, _ppvar, 0, 0);
-   nrn_update_ion_pointer(_ca_sym, _ppvar, 1, 3);
-   nrn_update_ion_pointer(_ca_sym, _ppvar, 2, 4);
- }
-
-static void initmodel(double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {
-  int _i; double _save;{
-  h = h0;
-  m = m0;
- {
-   rates ( _threadargs_ ) ;
-   m = mInf ;
-   h = hInf ;
-   }
- 
-}
-}
-
-static void nrn_init(NrnThread* _nt, _Memb_list* _ml, int _type){
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; double _v; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- v = _v;
-  eca = _ion_eca;
- initmodel(_p, _ppvar, _thread, _nt);
- }
-}
-
-static double _nrn_current(double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt, double _v){double _current=0.;v=_v;{ {
-   g = gbar * m * m * h ;
-   ica = g * ( v - eca ) ;
-   }
- _current += ica;
-
-} return _current;
-}
-
-static void nrn_cur(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; int* _ni; double _rhs, _v; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
-  eca = _ion_eca;
- _g = _nrn_current(_p, _ppvar, _thread, _nt, _v + .001);
- 	{ double _dica;
-  _dica = ica;
- _rhs = _nrn_current(_p, _ppvar, _thread, _nt, _v);
-  _ion_dicadv += (_dica - ica)/.001 ;
- 	}
- _g = (_g - _rhs)/.001;
-  _ion_ica += ica ;
-#if CACHEVEC
-  if (use_cachevec) {
-	VEC_RHS(_ni[_iml]) -= _rhs;
-  }else
-#endif
-  {
-	NODERHS(_nd) -= _rhs;
-  }
- 
-}
- 
-}
-
-static void nrn_jacob(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-	VEC_D(_ni[_iml]) += _g;
-  }else
-#endif
-  {
-     _nd = _ml->_nodelist[_iml];
-	NODED(_nd) += _g;
-  }
- 
-}
- 
-}
-
-static void nrn_state(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; double _v = 0.0; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
- _nd = _ml->_nodelist[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- v=_v;
-{
-  eca = _ion_eca;
- {   states(_p, _ppvar, _thread, _nt);
-  } }}
-
-}
-
-static void terminal(){}
-
-static void _initlists(){
- double _x; double* _p = &_x;
- int _i; static int _first = 1;
-  if (!_first) return;
- _slist1[0] = m_columnindex;  _dlist1[0] = Dm_columnindex;
- _slist1[1] = h_columnindex;  _dlist1[1] = Dh_columnindex;
-_first = 0;
-}
-
-#if defined(__cplusplus)
-} /* extern "C" */
-#endif
-
-#if NMODL_TEXT
-static const char* nmodl_filename = "/Users/tarek/Desktop/HL23PYR_AD-main/mod/Ca_HVA.mod";
-static const char* nmodl_file_text = 
-  ":Comment :\n"
-  ":Reference : :		Reuveni, Friedman, Amitai, and Gutnick, J.Neurosci. 1993\n"
-  "\n"
-  "NEURON	{\n"
-  "	SUFFIX Ca_HVA\n"
-  "	USEION ca READ eca WRITE ica\n"
-  "	RANGE gbar, g, ica \n"
-  "}\n"
-  "\n"
-  "UNITS	{\n"
-  "	(S) = (siemens)\n"
-  "	(mV) = (millivolt)\n"
-  "	(mA) = (milliamp)\n"
-  "}\n"
-  "\n"
-  "PARAMETER	{\n"
-  "	gbar = 0.00001 (S/cm2) \n"
-  "}\n"
-  "\n"
-  "ASSIGNED	{\n"
-  "	v	(mV)\n"
-  "	eca	(mV)\n"
-  "	ica	(mA/cm2)\n"
-  "	g	(S/cm2)\n"
-  "	mInf\n"
-  "	mTau\n"
-  "	mAlpha\n"
-  "	mBeta\n"
-  "	hInf\n"
-  "	hTau\n"
-  "	hAlpha\n"
-  "	hBeta\n"
-  "}\n"
-  "\n"
-  "STATE	{ \n"
-  "	m\n"
-  "	h\n"
-  "}\n"
-  "\n"
-  "BREAKPOINT	{\n"
-  "	SOLVE states METHOD cnexp\n"
-  "	g = gbar*m*m*h\n"
-  "	ica = g*(v-eca)\n"
-  "}\n"
-  "\n"
-  "DERIVATIVE states	{\n"
-  "	rates()\n"
-  "	m' = (mInf-m)/mTau\n"
-  "	h' = (hInf-h)/hTau\n"
-  "}\n"
-  "\n"
-  "INITIAL{\n"
-  "	rates()\n"
-  "	m = mInf\n"
-  "	h = hInf\n"
-  "}\n"
-  "\n"
-  "PROCEDURE rates(){\n"
-  "	UNITSOFF\n"
-  "        if((v == -27) ){        \n"
-  "            v = v+0.0001\n"
-  "        }\n"
-  "		mAlpha =  (0.055*(-27-v))/(exp((-27-v)/3.8) - 1)        \n"
-  "		mBeta  =  (0.94*exp((-75-v)/17))\n"
-  "		mInf = mAlpha/(mAlpha + mBeta)\n"
-  "		mTau = 1/(mAlpha + mBeta)\n"
-  "		hAlpha =  (0.000457*exp((-13-v)/50))\n"
-  "		hBeta  =  (0.0065/(exp((-v-15)/28)+1))\n"
-  "		hInf = hAlpha/(hAlpha + hBeta)\n"
-  "		hTau = 1/(hAlpha + hBeta)\n"
-  "	UNITSON\n"
-  "}\n"
-  ;
-#endif
@@ -1,604 +0,0 @@
-/* Created by Language version: 7.7.0 */
-/* VECTORIZED */
-#define NRN_VECTORIZED 1
-#include <stdio.h>
-#include <stdlib.h>
-#include <math.h>
-#include "mech_api.h"
-#undef PI
-#define nil 0
-#include "md1redef.h"
-#include "section.h"
-#include "nrniv_mf.h"
-#include "md2redef.h"
- 
-#if METHOD3
-extern int _method3;
-#endif
-
-#if !NRNGPU
-#undef exp
-#define exp hoc_Exp
-extern double hoc_Exp(double);
-#endif
- 
-#define nrn_init _nrn_init__tonic
-#define _nrn_initial _nrn_initial__tonic
-#define nrn_cur _nrn_cur__tonic
-#define _nrn_current _nrn_current__tonic
-#define nrn_jacob _nrn_jacob__tonic
-#define nrn_state _nrn_state__tonic
-#define _net_receive _net_receive__tonic 
-#define kin kin__tonic 
-#define rates rates__tonic 
- 
-#define _threadargscomma_ _p, _ppvar, _thread, _nt,
-#define _threadargsprotocomma_ double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt,
-#define _threadargs_ _p, _ppvar, _thread, _nt
-#define _threadargsproto_ double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt
- 	/*SUPPRESS 761*/
-	/*SUPPRESS 762*/
-	/*SUPPRESS 763*/
-	/*SUPPRESS 765*/
-	 extern double *getarg();
- /* Thread safe. No static _p or _ppvar. */
- 
-#define t _nt->_t
-#define dt _nt->_dt
-#define g _p[0]
-#define g_columnindex 0
-#define e_gaba _p[1]
-#define e_gaba_columnindex 1
-#define i _p[2]
-#define i_columnindex 2
-#define a _p[3]
-#define a_columnindex 3
-#define b _p[4]
-#define b_columnindex 4
-#define o _p[5]
-#define o_columnindex 5
-#define c _p[6]
-#define c_columnindex 6
-#define Do _p[7]
-#define Do_columnindex 7
-#define Dc _p[8]
-#define Dc_columnindex 8
-#define v _p[9]
-#define v_columnindex 9
-#define _g _p[10]
-#define _g_columnindex 10
- 
-#if MAC
-#if !defined(v)
-#define v _mlhv
-#endif
-#if !defined(h)
-#define h _mlhh
-#endif
-#endif
- 
-#if defined(__cplusplus)
-extern "C" {
-#endif
- static int hoc_nrnpointerindex =  -1;
- static Datum* _extcall_thread;
- static Prop* _extcall_prop;
- /* external NEURON variables */
- /* declaration of user functions */
- static void _hoc_rates(void);
- static int _mechtype;
-extern void _nrn_cacheloop_reg(int, int);
-extern void hoc_register_prop_size(int, int, int);
-extern void hoc_register_limits(int, HocParmLimits*);
-extern void hoc_register_units(int, HocParmUnits*);
-extern void nrn_promote(Prop*, int, int);
-extern Memb_func* memb_func;
- 
-#define NMODL_TEXT 1
-#if NMODL_TEXT
-static const char* nmodl_file_text;
-static const char* nmodl_filename;
-extern void hoc_reg_nmodl_text(int, const char*);
-extern void hoc_reg_nmodl_filename(int, const char*);
-#endif
-
- extern void _nrn_setdata_reg(int, void(*)(Prop*));
- static void _setdata(Prop* _prop) {
- _extcall_prop = _prop;
- }
- static void _hoc_setdata() {
- Prop *_prop, *hoc_getdata_range(int);
- _prop = hoc_getdata_range(_mechtype);
-   _setdata(_prop);
- hoc_retpushx(1.);
-}
- /* connect user functions to hoc names */
- static VoidFunc hoc_intfunc[] = {
- "setdata_tonic", _hoc_setdata,
- "rates_tonic", _hoc_rates,
- 0, 0
-};
- /* declare global and static user variables */
- /* some parameters have upper and lower limits */
- static HocParmLimits _hoc_parm_limits[] = {
- 0,0,0
-};
- static HocParmUnits _hoc_parm_units[] = {
- "g_tonic", "siemens/cm2",
- "e_gaba_tonic", "millivolt",
- "i_tonic", "milliampere",
- "a_tonic", "/ms",
- "b_tonic", "/ms",
- 0,0
-};
- static double c0 = 0;
- static double delta_t = 0.01;
- static double o0 = 0;
- /* connect global user variables to hoc */
- static DoubScal hoc_scdoub[] = {
- 0,0
-};
- static DoubVec hoc_vdoub[] = {
- 0,0,0
-};
- static double _sav_indep;
- static void nrn_alloc(Prop*);
-static void  nrn_init(NrnThread*, _Memb_list*, int);
-static void nrn_state(NrnThread*, _Memb_list*, int);
- static void nrn_cur(NrnThread*, _Memb_list*, int);
-static void  nrn_jacob(NrnThread*, _Memb_list*, int);
- 
-static int _ode_count(int);
-static void _ode_map(int, double**, double**, double*, Datum*, double*, int);
-static void _ode_spec(NrnThread*, _Memb_list*, int);
-static void _ode_matsol(NrnThread*, _Memb_list*, int);
- 
-#define _cvode_ieq _ppvar[0]._i
- static void _ode_matsol_instance1(_threadargsproto_);
- /* connect range variables in _p that hoc is supposed to know about */
- static const char *_mechanism[] = {
- "7.7.0",
-"tonic",
- "g_tonic",
- "e_gaba_tonic",
- 0,
- "i_tonic",
- "a_tonic",
- "b_tonic",
- 0,
- "o_tonic",
- "c_tonic",
- 0,
- 0};
- 
-extern Prop* need_memb(Symbol*);
-
-static void nrn_alloc(Prop* _prop) {
-	Prop *prop_ion;
-	double *_p; Datum *_ppvar;
- 	_p = nrn_prop_data_alloc(_mechtype, 11, _prop);
- 	/*initialize range parameters*/
- 	g = 0.001;
- 	e_gaba = -80;
- 	_prop->param = _p;
- 	_prop->param_size = 11;
- 	_ppvar = nrn_prop_datum_alloc(_mechtype, 1, _prop);
- 	_prop->dparam = _ppvar;
- 	/*connect ionic variables to this model*/
- 
-}
- static void _initlists();
-  /* some states have an absolute tolerance */
- static Symbol** _atollist;
- static HocStateTolerance _hoc_state_tol[] = {
- 0,0
-};
- static void _thread_cleanup(Datum*);
- extern Symbol* hoc_lookup(const char*);
-extern void _nrn_thread_reg(int, int, void(*)(Datum*));
-extern void _nrn_thread_table_reg(int, void(*)(double*, Datum*, Datum*, NrnThread*, int));
-extern void hoc_register_tolerance(int, HocStateTolerance*, Symbol***);
-extern void _cvode_abstol( Symbol**, double*, int);
-
- void _tonic_reg() {
-	int _vectorized = 1;
-  _initlists();
- 	register_mech(_mechanism, nrn_alloc,nrn_cur, nrn_jacob, nrn_state, nrn_init, hoc_nrnpointerindex, 3);
-  _extcall_thread = (Datum*)ecalloc(2, sizeof(Datum));
- _mechtype = nrn_get_mechtype(_mechanism[1]);
-     _nrn_setdata_reg(_mechtype, _setdata);
-     _nrn_thread_reg(_mechtype, 0, _thread_cleanup);
- #if NMODL_TEXT
-  hoc_reg_nmodl_text(_mechtype, nmodl_file_text);
-  hoc_reg_nmodl_filename(_mechtype, nmodl_filename);
-#endif
-  hoc_register_prop_size(_mechtype, 11, 1);
-  hoc_register_dparam_semantics(_mechtype, 0, "cvodeieq");
- 	hoc_register_cvode(_mechtype, _ode_count, _ode_map, _ode_spec, _ode_matsol);
- 	hoc_register_tolerance(_mechtype, _hoc_state_tol, &_atollist);
- 	hoc_register_var(hoc_scdoub, hoc_vdoub, hoc_intfunc);
- 	ivoc_help("help ?1 tonic /Users/tarek/Desktop/HL23PYR_AD-main/mod/tonic.mod\n");
- hoc_register_limits(_mechtype, _hoc_parm_limits);
- hoc_register_units(_mechtype, _hoc_parm_units);
- }
-static int _reset;
-static char *modelname = "";
-
-static int error;
-static int _ninits = 0;
-static int _match_recurse=1;
-static void _modl_cleanup(){ _match_recurse=1;}
-static int rates(_threadargsprotocomma_ double);
- extern double *_nrn_thread_getelm(SparseObj*, int, int);
- 
-#define _MATELM1(_row,_col) *(_nrn_thread_getelm(_so, _row + 1, _col + 1))
- 
-#define _RHS1(_arg) _rhs[_arg+1]
-  
-#define _linmat1  1
- static int _spth1 = 1;
- static int _cvspth1 = 0;
- 
-static int _ode_spec1(_threadargsproto_);
-/*static int _ode_matsol1(_threadargsproto_);*/
- static int _slist1[2], _dlist1[2]; static double *_temp1;
- static int kin();
- 
-static int kin (void* _so, double* _rhs, double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt)
- {int _reset=0;
- {
-   double b_flux, f_flux, _term; int _i;
- {int _i; double _dt1 = 1.0/dt;
-for(_i=1;_i<2;_i++){
-  	_RHS1(_i) = -_dt1*(_p[_slist1[_i]] - _p[_dlist1[_i]]);
-	_MATELM1(_i, _i) = _dt1;
-      
-} }
- rates ( _threadargscomma_ v ) ;
-   /* ~ o <-> c ( b , a )*/
- f_flux =  b * o ;
- b_flux =  a * c ;
- _RHS1( 1) -= (f_flux - b_flux);
- 
- _term =  b ;
- _MATELM1( 1 ,1)  += _term;
- _term =  a ;
- _MATELM1( 1 ,0)  -= _term;
- /*REACTION*/
-   /* o + c = 1.0 */
- _RHS1(0) =  1.0;
- _MATELM1(0, 0) = 1;
- _RHS1(0) -= c ;
- _MATELM1(0, 1) = 1;
- _RHS1(0) -= o ;
- /*CONSERVATION*/
-   } return _reset;
- }
- 
-static int  rates ( _threadargsprotocomma_ double _lv ) {
-   double _lx , _ly ;
-  _lx = 0.1 * ( _lv + 20.0 ) ;
-   if ( fabs ( _lx ) > 1e-6 ) {
-     a = ( 50.0 * _lx ) / ( 1.0 - exp ( - _lx ) ) ;
-     }
-   else {
-     a = 0.25 * ( pow( _lv , 2.0 ) + ( 20.0 * _lv ) + 200.0 ) ;
-     }
-   _ly = - 0.08 * ( _lv - 10.0 ) ;
-   if ( fabs ( _lx ) > 1e-6 ) {
-     b = ( 20.0 * _ly ) / ( 1.0 - exp ( - _ly ) ) ;
-     }
-   else {
-     b = - 0.064 * ( pow( _lv , 2.0 ) - ( 45.0 * _lv ) + 37.5 ) ;
-     }
-     return 0; }
- 
-static void _hoc_rates(void) {
-  double _r;
-   double* _p; Datum* _ppvar; Datum* _thread; NrnThread* _nt;
-   if (_extcall_prop) {_p = _extcall_prop->param; _ppvar = _extcall_prop->dparam;}else{ _p = (double*)0; _ppvar = (Datum*)0; }
-  _thread = _extcall_thread;
-  _nt = nrn_threads;
- _r = 1.;
- rates ( _p, _ppvar, _thread, _nt, *getarg(1) );
- hoc_retpushx(_r);
-}
- 
-/*CVODE ode begin*/
- static int _ode_spec1(double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {int _reset=0;{
- double b_flux, f_flux, _term; int _i;
- {int _i; for(_i=0;_i<2;_i++) _p[_dlist1[_i]] = 0.0;}
- rates ( _threadargscomma_ v ) ;
- /* ~ o <-> c ( b , a )*/
- f_flux =  b * o ;
- b_flux =  a * c ;
- Do -= (f_flux - b_flux);
- Dc += (f_flux - b_flux);
- 
- /*REACTION*/
-   /* o + c = 1.0 */
- /*CONSERVATION*/
-   } return _reset;
- }
- 
-/*CVODE matsol*/
- static int _ode_matsol1(void* _so, double* _rhs, double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {int _reset=0;{
- double b_flux, f_flux, _term; int _i;
-   b_flux = f_flux = 0.;
- {int _i; double _dt1 = 1.0/dt;
-for(_i=0;_i<2;_i++){
-  	_RHS1(_i) = _dt1*(_p[_dlist1[_i]]);
-	_MATELM1(_i, _i) = _dt1;
-      
-} }
- rates ( _threadargscomma_ v ) ;
- /* ~ o <-> c ( b , a )*/
- _term =  b ;
- _MATELM1( 1 ,1)  += _term;
- _MATELM1( 0 ,1)  -= _term;
- _term =  a ;
- _MATELM1( 1 ,0)  -= _term;
- _MATELM1( 0 ,0)  += _term;
- /*REACTION*/
-   /* o + c = 1.0 */
- /*CONSERVATION*/
-   } return _reset;
- }
- 
-/*CVODE end*/
- 
-static int _ode_count(int _type){ return 2;}
- 
-static void _ode_spec(NrnThread* _nt, _Memb_list* _ml, int _type) {
-   double* _p; Datum* _ppvar; Datum* _thread;
-   Node* _nd; double _v; int _iml, _cntml;
-  _cntml = _ml->_nodecount;
-  _thread = _ml->_thread;
-  for (_iml = 0; _iml < _cntml; ++_iml) {
-    _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-    _nd = _ml->_nodelist[_iml];
-    v = NODEV(_nd);
-     _ode_spec1 (_p, _ppvar, _thread, _nt);
- }}
- 
-static void _ode_map(int _ieq, double** _pv, double** _pvdot, double* _pp, Datum* _ppd, double* _atol, int _type) { 
-	double* _p; Datum* _ppvar;
- 	int _i; _p = _pp; _ppvar = _ppd;
-	_cvode_ieq = _ieq;
-	for (_i=0; _i < 2; ++_i) {
-		_pv[_i] = _pp + _slist1[_i];  _pvdot[_i] = _pp + _dlist1[_i];
-		_cvode_abstol(_atollist, _atol, _i);
-	}
- }
- 
-static void _ode_matsol_instance1(_threadargsproto_) {
- _cvode_sparse_thread(&_thread[_cvspth1]._pvoid, 2, _dlist1, _p, _ode_matsol1, _ppvar, _thread, _nt);
- }
- 
-static void _ode_matsol(NrnThread* _nt, _Memb_list* _ml, int _type) {
-   double* _p; Datum* _ppvar; Datum* _thread;
-   Node* _nd; double _v; int _iml, _cntml;
-  _cntml = _ml->_nodecount;
-  _thread = _ml->_thread;
-  for (_iml = 0; _iml < _cntml; ++_iml) {
-    _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-    _nd = _ml->_nodelist[_iml];
-    v = NODEV(_nd);
- _ode_matsol_instance1(_threadargs_);
- }}
- 
-static void _thread_cleanup(Datum* _thread) {
-   _nrn_destroy_sparseobj_thread(_thread[_cvspth1]._pvoid);
-   _nrn_destroy_sparseobj_thread(_thread[_spth1]._pvoid);
- }
-
-static void initmodel(double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt) {
-  int _i; double _save;{
-  c = c0;
-  o = o0;
- {
-    _ss_sparse_thread(&_thread[_spth1]._pvoid, 2, _slist1, _dlist1, _p, &t, dt, kin, _linmat1, _ppvar, _thread, _nt);
-     if (secondorder) {
-    int _i;
-    for (_i = 0; _i < 2; ++_i) {
-      _p[_slist1[_i]] += dt*_p[_dlist1[_i]];
-    }}
- }
- 
-}
-}
-
-static void nrn_init(NrnThread* _nt, _Memb_list* _ml, int _type){
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; double _v; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- v = _v;
- initmodel(_p, _ppvar, _thread, _nt);
-}
-}
-
-static double _nrn_current(double* _p, Datum* _ppvar, Datum* _thread, NrnThread* _nt, double _v){double _current=0.;v=_v;{ {
-   i = g * o * ( v - e_gaba ) ;
-   }
- _current += i;
-
-} return _current;
-}
-
-static void nrn_cur(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; int* _ni; double _rhs, _v; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- _g = _nrn_current(_p, _ppvar, _thread, _nt, _v + .001);
- 	{ _rhs = _nrn_current(_p, _ppvar, _thread, _nt, _v);
- 	}
- _g = (_g - _rhs)/.001;
-#if CACHEVEC
-  if (use_cachevec) {
-	VEC_RHS(_ni[_iml]) -= _rhs;
-  }else
-#endif
-  {
-	NODERHS(_nd) -= _rhs;
-  }
- 
-}
- 
-}
-
-static void nrn_jacob(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; int* _ni; int _iml, _cntml;
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-	VEC_D(_ni[_iml]) += _g;
-  }else
-#endif
-  {
-     _nd = _ml->_nodelist[_iml];
-	NODED(_nd) += _g;
-  }
- 
-}
- 
-}
-
-static void nrn_state(NrnThread* _nt, _Memb_list* _ml, int _type) {
-double* _p; Datum* _ppvar; Datum* _thread;
-Node *_nd; double _v = 0.0; int* _ni; int _iml, _cntml;
-double _dtsav = dt;
-if (secondorder) { dt *= 0.5; }
-#if CACHEVEC
-    _ni = _ml->_nodeindices;
-#endif
-_cntml = _ml->_nodecount;
-_thread = _ml->_thread;
-for (_iml = 0; _iml < _cntml; ++_iml) {
- _p = _ml->_data[_iml]; _ppvar = _ml->_pdata[_iml];
- _nd = _ml->_nodelist[_iml];
-#if CACHEVEC
-  if (use_cachevec) {
-    _v = VEC_V(_ni[_iml]);
-  }else
-#endif
-  {
-    _nd = _ml->_nodelist[_iml];
-    _v = NODEV(_nd);
-  }
- v=_v;
-{
- {  sparse_thread(&_thread[_spth1]._pvoid, 2, _slist1, _dlist1, _p, &t, dt, kin, _linmat1, _ppvar, _thread, _nt);
-     if (secondorder) {
-    int _i;
-    for (_i = 0; _i < 2; ++_i) {
-      _p[_slist1[_i]] += dt*_p[_dlist1[_i]];
-    }}
- }}}
- dt = _dtsav;
-}
-
-static void terminal(){}
-
-static void _initlists(){
- double _x; double* _p = &_x;
- int _i; static int _first = 1;
-  if (!_first) return;
- _slist1[0] = c_columnindex;  _dlist1[0] = Dc_columnindex;
- _slist1[1] = o_columnindex;  _dlist1[1] = Do_columnindex;
-_first = 0;
-}
-
-#if defined(__cplusplus)
-} /* extern "C" */
-#endif
-
-#if NMODL_TEXT
-static const char* nmodl_filename = "/Users/tarek/Desktop/HL23PYR_AD-main/mod/tonic.mod";
-static const char* nmodl_file_text = 
-  ": tonic current with rectification\n"
-  ": based on Pavlov et al (J Neuro 2009)\n"
-  "\n"
-  "NEURON{\n"
-  "SUFFIX tonic\n"
-  "NONSPECIFIC_CURRENT i\n"
-  "RANGE i, v, a, b, g, e_gaba}\n"
-  "\n"
-  "PARAMETER{\n"
-  "g = 0.001 (siemens/cm2)\n"
-  "e_gaba = -80 (millivolt)\n"
-  "}\n"
-  "\n"
-  "ASSIGNED{\n"
-  "v (millivolt)\n"
-  "i (milliampere)\n"
-  "a (/ms)\n"
-  "b (/ms)}\n"
-  "\n"
-  "STATE{o c}\n"
-  "\n"
-  "BREAKPOINT{\n"
-  "SOLVE kin METHOD sparse\n"
-  "i = g*o*(v-e_gaba)}\n"
-  "\n"
-  "INITIAL {SOLVE kin STEADYSTATE sparse}\n"
-  "\n"
-  "KINETIC kin{\n"
-  "rates(v)\n"
-  "~ o<->c (b, a)   : b is forward rate constant, a backward\n"
-  "CONSERVE o+c=1}\n"
-  "\n"
-  "PROCEDURE rates(v(millivolt)) {\n"
-  "LOCAL x, y\n"
-  "UNITSOFF\n"
-  "x = 0.1*(v+20)\n"
-  "if (fabs(x)>1e-6){\n"
-  "a = (50*x)/(1-exp(-x))\n"
-  "} else{\n"
-  "a=0.25*(v^2+(20*v)+200)\n"
-  "}\n"
-  "y = -0.08*(v-10)\n"
-  "if(fabs(x)>1e-6){\n"
-  "b = (20*y)/(1-exp(-y))\n"
-  "} else{\n"
-  "b = -0.064*(v^2-(45*v)+37.5)\n"
-  "}\n"
-  "UNITSON}\n"
-  ;
-#endif